@@ -10,9 +10,10 @@ import os
 import time
 from datetime import datetime
 
-import ccxt
 from dotenv import load_dotenv
 
+from src.exchange.kraken_client import create_kraken_client
+
 load_dotenv()
 
 class AggressiveTrader:
@@ -54,11 +55,7 @@ class AggressiveTrader:
 
     def initialize(self):
         """Initialize exchange"""
-        self.exchange = ccxt.kraken({
-            'apiKey': os.getenv('KRAKEN_KEY'),
-            'secret': os.getenv('KRAKEN_SECRET'),
-            'enableRateLimit': True
-        })
+        self.exchange = create_kraken_client()
         print("✅ Connected to Kraken")
 
     def get_market_data(self):
@@ -0,0 +1,120 @@
+"""
+Market Data Model Benchmark
+===========================
+
+Compares the Decimal dataclass models (TickerUpdate, TradeUpdate, OHLCUpdate)
+with the slot-based float models (CompactTicker, CompactTrade, CompactOHLC):
+- construction + to_dict() time per message
+- allocations and bytes per message (model plus its to_dict() result)
+- retained memory per cached tick
+
+Usage:
+    python benchmarks/bench_market_models.py [--messages 50000]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.websocket.compact_models import CompactOHLC, CompactTicker, CompactTrade  # noqa: E402
+from src.websocket.data_models import OHLCUpdate, TickerUpdate, TradeUpdate  # noqa: E402
+
+TICKER = {
+    "symbol": "BTC/USD",
+    "bid": 64250.1,
+    "ask": 64250.2,
+    "last": 64250.1,
+    "volume": 1234.56789,
+    "vwap": 64100.5,
+    "low": 63000.0,
+    "high": 65000.0,
+}
+TRADE = {
+    "symbol": "BTC/USD",
+    "side": "buy",
+    "price": 64250.1,
+    "qty": 0.0123,
+    "trade_id": 123456,
+    "timestamp": "2025-01-01T00:00:00.123456Z",
+}
+OHLC = {
+    "symbol": "BTC/USD",
+    "open": 64200.0,
+    "high": 64300.0,
+    "low": 64150.0,
+    "close": 64250.1,
+    "volume": 12.5,
+    "interval": 1,
+    "timestamp": "2025-01-01T00:01:00.000000Z",
+}
+
+FAMILIES = {
+    "decimal": ((TickerUpdate, TICKER), (TradeUpdate, TRADE), (OHLCUpdate, OHLC)),
+    "compact": ((CompactTicker, TICKER), (CompactTrade, TRADE), (CompactOHLC, OHLC)),
+}
+
+
+def time_family(models, count: int) -> float:
+    """Seconds per message for from_raw + to_dict"""
+    start = time.perf_counter()
+    for _ in range(count):
+        for model, raw in models:
+            model.from_raw("BTC/USD", raw).to_dict()
+    return (time.perf_counter() - start) / (count * len(models))
+
+
+def allocations_per_message(models, count: int) -> tuple[float, float]:
+    """Allocated blocks and bytes per message (model + to_dict result kept alive)"""
+    keep = []
+    tracemalloc.start()
+    bytes_before, _ = tracemalloc.get_traced_memory()
+    blocks_before = sys.getallocatedblocks()
+    for _ in range(count):
+        for model, raw in models:
+            obj = model.from_raw("BTC/USD", raw)
+            keep.append((obj, obj.to_dict()))
+    blocks_after = sys.getallocatedblocks()
+    bytes_after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    messages = count * len(models)
+    del keep
+    return (blocks_after - blocks_before) / messages, (bytes_after - bytes_before) / messages
+
+
+def retained_per_tick(model, raw, count: int) -> float:
+    """Bytes retained per cached ticker object"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    cache = [model.from_raw("BTC/USD", raw) for _ in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cache
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"messages per model: {args.messages}")
+    for name, models in FAMILIES.items():
+        per_message = time_family(models, args.messages)
+        blocks, allocated = allocations_per_message(models, min(args.messages, 5_000))
+        retained = retained_per_tick(models[0][0], models[0][1], 10_000)
+        print(
+            f"{name:>8}: {per_message * 1e6:6.2f} us/msg, "
+            f"{blocks:5.1f} allocs/msg, {allocated:6.0f} B/msg, "
+            f"{retained:6.0f} B per cached tick"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+WebSocket Decode/Dispatch Micro-benchmark
+=========================================
+
+Compares the legacy ConnectionManager message path (stdlib json + chained
+``message.get`` checks + message_queue copy) with the pluggable decoder and
+single-lookup channel dispatch, using ticker+book+trade frames for 10 pairs.
+
+Usage:
+    python benchmarks/bench_ws_decode.py [--frames 200000] [--decoder auto]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.websocket.message_decoder import get_decoder  # noqa: E402
+
+PAIRS = [
+    "BTC/USD",
+    "ETH/USD",
+    "SOL/USD",
+    "XRP/USD",
+    "ADA/USD",
+    "DOT/USD",
+    "LTC/USD",
+    "LINK/USD",
+    "AVAX/USD",
+    "SHIB/USD",
+]
+
+
+def build_frames() -> list[str]:
+    """Build a representative mix of raw V2 frames"""
+    frames = []
+    for i, symbol in enumerate(PAIRS):
+        price = 100.0 + i
+        frames.append(
+            json.dumps(
+                {
+                    "channel": "ticker",
+                    "type": "update",
+                    "data": [
+                        {
+                            "symbol": symbol,
+                            "bid": price - 0.1,
+                            "bid_qty": 1.5,
+                            "ask": price + 0.1,
+                            "ask_qty": 2.5,
+                            "last": price,
+                            "volume": 12345.678,
+                            "vwap": price,
+                            "low": price - 5,
+                            "high": price + 5,
+                            "change": 0.5,
+                            "change_pct": 0.5,
+                        }
+                    ],
+                }
+            )
+        )
+        frames.append(
+            json.dumps(
+                {
+                    "channel": "book",
+                    "type": "update",
+                    "data": [
+                        {
+                            "symbol": symbol,
+                            "bids": [{"price": price - 0.2, "qty": 0.75}],
+                            "asks": [{"price": price + 0.2, "qty": 0.0}],
+                            "checksum": 1234567890,
+                            "timestamp": "2025-01-01T00:00:00.000000Z",
+                        }
+                    ],
+                }
+            )
+        )
+        frames.append(
+            json.dumps(
+                {
+                    "channel": "trade",
+                    "type": "update",
+                    "data": [
+                        {
+                            "symbol": symbol,
+                            "side": "buy",
+                            "price": price,
+                            "qty": 0.01,
+                            "ord_type": "market",
+                            "trade_id": 4665906,
+                            "timestamp": "2025-01-01T00:00:00.000000Z",
+                        }
+                    ],
+                }
+            )
+        )
+    frames.append(json.dumps({"channel": "heartbeat"}))
+    return frames
+
+
+async def _noop(message):
+    return None
+
+
+async def run_legacy(frames: list[str], count: int) -> float:
+    """Legacy path: json.loads, chained gets, queue copy and on_message"""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+    on_message = _noop
+    n = len(frames)
+
+    start = time.perf_counter()
+    for i in range(count):
+        message = json.loads(frames[i % n])
+        if message.get("channel") == "heartbeat":
+            continue
+        if message.get("method") == "authenticate":
+            continue
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            queue.get_nowait()
+        await on_message(message)
+    return time.perf_counter() - start
+
+
+async def run_dispatch(frames: list[str], count: int, decoder_name: str) -> float:
+    """New path: pluggable decoder and single dict lookup on channel"""
+    decode = get_decoder(decoder_name).decode
+    handlers = {"heartbeat": _noop, None: _noop, "book": _noop}
+    deliver = _noop
+    n = len(frames)
+
+    start = time.perf_counter()
+    for i in range(count):
+        message = decode(frames[i % n])
+        await handlers.get(message.get("channel"), deliver)(message)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=200_000)
+    parser.add_argument("--decoder", default="auto")
+    args = parser.parse_args()
+
+    frames = build_frames()
+    legacy = asyncio.run(run_legacy(frames, args.frames))
+    dispatch = asyncio.run(run_dispatch(frames, args.frames, args.decoder))
+
+    decoder_name = get_decoder(args.decoder).name
+    print(f"frames: {args.frames}")
+    print(f"legacy (json + get chain + queue): {legacy / args.frames * 1e6:.2f} us/frame")
+    print(f"dispatch ({decoder_name} + table):      {dispatch / args.frames * 1e6:.2f} us/frame")
+    print(f"speedup: {legacy / dispatch:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Benchmark Baselines and Regression Check
+========================================
+
+Runs the pytest-benchmark suite in this directory, stores results as JSON
+baselines under benchmarks/baselines/ and compares runs against them.
+A benchmark regresses when its statistic (median by default) is slower than
+the baseline by more than --threshold percent; the command then exits 1.
+
+Usage:
+    python benchmarks/compare.py run --save main
+    python benchmarks/compare.py run --against main [--threshold 10] [-k queue]
+    python benchmarks/compare.py compare baselines/main.json current.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT = BENCH_DIR.parent
+BASELINE_DIR = BENCH_DIR / "baselines"
+
+STATS = ("min", "median", "mean")
+
+
+def baseline_path(name_or_path: str) -> Path:
+    """Resolve a baseline name (baselines/<name>.json) or an explicit file path"""
+    path = Path(name_or_path)
+    if path.suffix == ".json":
+        return path
+    return BASELINE_DIR / f"{name_or_path}.json"
+
+
+def load_results(path: Path, stat: str) -> dict[str, float]:
+    """Map benchmark fullname -> statistic (seconds) from a pytest-benchmark JSON file"""
+    with open(path) as f:
+        report = json.load(f)
+    return {bench["fullname"]: bench["stats"][stat] for bench in report.get("benchmarks", [])}
+
+
+def compare_results(
+    baseline: dict[str, float], current: dict[str, float], threshold: float
+) -> list[dict]:
+    """
+    Compare two result maps
+
+    Returns:
+        One row per benchmark with baseline/current times, change in percent
+        and status: 'regressed', 'improved', 'ok', 'new' or 'missing'
+    """
+    rows = []
+    for name in sorted(baseline.keys() | current.keys()):
+        before = baseline.get(name)
+        after = current.get(name)
+        row = {"name": name, "baseline": before, "current": after, "change_pct": None}
+
+        if before is None:
+            row["status"] = "new"
+        elif after is None:
+            row["status"] = "missing"
+        else:
+            change = (after - before) / before * 100.0 if before else 0.0
+            row["change_pct"] = change
+            if change > threshold:
+                row["status"] = "regressed"
+            elif change < -threshold:
+                row["status"] = "improved"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def _format_time(seconds) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.2f}us"
+    return f"{seconds * 1e3:.3f}ms"
+
+
+def print_report(rows: list[dict], stat: str, threshold: float):
+    width = max((len(row["name"]) for row in rows), default=10)
+    print(f"{'benchmark':<{width}}  {'baseline':>11}  {'current':>11}  {'change':>8}  status")
+    for row in rows:
+        change = "-" if row["change_pct"] is None else f"{row['change_pct']:+.1f}%"
+        print(
+            f"{row['name']:<{width}}  {_format_time(row['baseline']):>11}  "
+            f"{_format_time(row['current']):>11}  {change:>8}  {row['status']}"
+        )
+
+    regressions = [row for row in rows if row["status"] == "regressed"]
+    print(
+        f"\n{len(regressions)} regression(s) beyond {threshold:.1f}% "
+        f"({stat}) across {len(rows)} benchmark(s)"
+    )
+    return regressions
+
+
+def run_suite(output: Path, pytest_args: list[str]) -> int:
+    """Run the benchmark suite writing pytest-benchmark JSON to output"""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    command = [
+        sys.executable,
+        "-m",
+        "pytest",
+        str(BENCH_DIR),
+        "--benchmark-only",
+        f"--benchmark-json={output}",
+        "-p",
+        "no:cacheprovider",
+        "-o",
+        "log_cli=false",
+        *pytest_args,
+    ]
+    return subprocess.call(command, cwd=ROOT)
+
+
+def cmd_run(args) -> int:
+    if args.save:
+        output = baseline_path(args.save)
+    else:
+        output = Path(tempfile.mkdtemp(prefix="bench-")) / "current.json"
+    returncode = run_suite(output, args.pytest_args)
+    if returncode != 0:
+        return returncode
+
+    if args.save:
+        print(f"Saved baseline: {output}")
+    if args.against:
+        return cmd_compare(
+            argparse.Namespace(
+                baseline=args.against,
+                current=str(output),
+                threshold=args.threshold,
+                stat=args.stat,
+            )
+        )
+    return 0
+
+
+def cmd_compare(args) -> int:
+    baseline = load_results(baseline_path(args.baseline), args.stat)
+    current = load_results(baseline_path(args.current), args.stat)
+    rows = compare_results(baseline, current, args.threshold)
+    regressions = print_report(rows, args.stat, args.threshold)
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_compare_options(sub):
+        sub.add_argument(
+            "--threshold", type=float, default=10.0, help="Allowed slowdown in percent"
+        )
+        sub.add_argument("--stat", choices=STATS, default="median")
+
+    run = subparsers.add_parser("run", help="Run the suite, optionally save/compare")
+    run.add_argument("--save", help="Store results as baselines/<name>.json")
+    run.add_argument("--against", help="Baseline name or JSON file to compare with")
+    add_compare_options(run)
+    run.set_defaults(func=cmd_run)
+
+    compare = subparsers.add_parser("compare", help="Compare two result files")
+    compare.add_argument("baseline", help="Baseline name or JSON file")
+    compare.add_argument("current", help="Current results name or JSON file")
+    add_compare_options(compare)
+    compare.set_defaults(func=cmd_compare)
+
+    # Unrecognised options (e.g. -k expr) are passed through to pytest
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command != "run":
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.pytest_args = extra
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
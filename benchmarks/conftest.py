@@ -0,0 +1,51 @@
+"""
+Shared fixtures for the pytest-benchmark suite
+
+Run with:
+    python -m pytest benchmarks --benchmark-only
+    python benchmarks/compare.py run --save <name>
+"""
+
+import importlib.util
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Without the plugin there is no ``benchmark`` fixture; skip collecting the suite.
+if importlib.util.find_spec("pytest_benchmark") is None:
+    collect_ignore_glob = ["test_*.py"]
+
+
+@pytest.fixture(autouse=True)
+def _quiet_logging():
+    """Measure the hot paths at production log levels, not pytest's live INFO log"""
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def _drive(coro):
+    """
+    Run a coroutine that never suspends to completion without an event loop
+
+    The async APIs benchmarked here only take uncontended asyncio locks, so
+    they finish on the first send(). Driving them directly keeps event loop
+    scheduling out of the measurement.
+    """
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("benchmarked coroutine suspended; it needs a running event loop")
+
+
+@pytest.fixture
+def drive():
+    return _drive
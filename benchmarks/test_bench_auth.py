@@ -0,0 +1,30 @@
+import base64
+
+import pytest
+
+from src.auth.signature_generator import SignatureGenerator
+
+PRIVATE_KEY = base64.b64encode(bytes(range(64))).decode()
+
+ORDER_PARAMS = {
+    "ordertype": "limit",
+    "type": "buy",
+    "volume": "0.0123",
+    "pair": "XBTUSD",
+    "price": "64250.1",
+    "oflags": "post",
+}
+
+
+@pytest.mark.benchmark(group="signature")
+@pytest.mark.parametrize(
+    "uri_path,params",
+    [("/0/private/Balance", None), ("/0/private/AddOrder", ORDER_PARAMS)],
+    ids=["balance", "add_order"],
+)
+def test_generate_signature(benchmark, uri_path, params):
+    generator = SignatureGenerator(PRIVATE_KEY)
+    nonce = "1735689600000000"
+
+    signature = benchmark(generator.generate_signature, uri_path, nonce, params)
+    assert len(base64.b64decode(signature)) == 64
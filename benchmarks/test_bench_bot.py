@@ -0,0 +1,42 @@
+import logging
+import time
+
+import pytest
+
+bot_module = pytest.importorskip("src.core.bot")
+
+HISTORY_SIZE = 1000
+
+
+def _bot():
+    # KrakenTradingBot.__init__ builds the whole runtime; the dedup filter only
+    # needs its logger and signal history.
+    bot = bot_module.KrakenTradingBot.__new__(bot_module.KrakenTradingBot)
+    bot.logger = logging.getLogger("benchmarks.bot")
+    bot.signal_cooldown = 3.0
+    now = time.time()
+    bot.last_signal_hash = {f"PAIR{i}/USD_buy_momentum_0.75": now for i in range(HISTORY_SIZE)}
+    return bot
+
+
+@pytest.mark.benchmark(group="signal_filter")
+def test_should_process_signal_new(benchmark):
+    """Unseen signal against HISTORY_SIZE recent hashes (approved, history scanned)"""
+    signal = {"symbol": "BTC/USD", "side": "buy", "reason": "momentum", "confidence": 0.75}
+
+    def setup():
+        return (_bot(), signal), {}
+
+    result = benchmark.pedantic(
+        bot_module.KrakenTradingBot._should_process_signal, setup=setup, rounds=2000
+    )
+    assert result is True
+
+
+@pytest.mark.benchmark(group="signal_filter")
+def test_should_process_signal_duplicate(benchmark):
+    """Repeated signal inside the cooldown (filtered)"""
+    bot = _bot()
+    signal = {"symbol": "PAIR1/USD", "side": "buy", "reason": "momentum", "confidence": 0.75}
+
+    assert benchmark(bot._should_process_signal, signal) is False
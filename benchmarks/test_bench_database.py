@@ -0,0 +1,93 @@
+import itertools
+import sqlite3
+
+import pytest
+
+from src.database.database_manager import DatabaseManager, TradeRecord
+
+SCHEMA = """
+CREATE TABLE trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    amount REAL NOT NULL,
+    price REAL NOT NULL,
+    total_value REAL NOT NULL,
+    fee REAL DEFAULT 0,
+    fee_currency TEXT,
+    timestamp INTEGER NOT NULL,
+    exchange TEXT NOT NULL,
+    order_id TEXT,
+    strategy TEXT,
+    status TEXT,
+    profit_loss REAL
+);
+CREATE TABLE market_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    open_price REAL NOT NULL,
+    high_price REAL NOT NULL,
+    low_price REAL NOT NULL,
+    close_price REAL NOT NULL,
+    volume REAL NOT NULL,
+    timeframe TEXT NOT NULL,
+    exchange TEXT NOT NULL,
+    UNIQUE (symbol, timestamp, timeframe, exchange)
+);
+"""
+
+CANDLES_PER_CALL = 100
+
+
+@pytest.fixture
+def database(tmp_path):
+    # The schema script DatabaseManager falls back to is not part of this tree,
+    # so create the tables it writes to up front.
+    path = tmp_path / "bench.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SCHEMA)
+    return DatabaseManager(str(path))
+
+
+@pytest.mark.benchmark(group="database")
+def test_insert_trade(benchmark, database):
+    trade = TradeRecord(
+        symbol="BTC/USD",
+        side="buy",
+        amount=0.0123,
+        price=64250.1,
+        total_value=790.28,
+        fee=0.0,
+        fee_currency="USD",
+        timestamp=1735689600,
+        order_id="OABCDE-FGHIJ-KLMNOP",
+        strategy="fast_start",
+    )
+
+    trade_id = benchmark(database.insert_trade, trade)
+    assert trade_id > 0
+
+
+@pytest.mark.benchmark(group="database")
+def test_insert_market_data(benchmark, database):
+    """Insert CANDLES_PER_CALL new 1m candles per call"""
+    batches = itertools.count()
+
+    def insert():
+        start = next(batches) * CANDLES_PER_CALL * 60
+        candles = [
+            {
+                "timestamp": start + i * 60,
+                "open": 64200.0,
+                "high": 64300.0,
+                "low": 64150.0,
+                "close": 64250.1,
+                "volume": 12.5,
+            }
+            for i in range(CANDLES_PER_CALL)
+        ]
+        database.insert_market_data("BTC/USD", "1m", candles)
+
+    benchmark(insert)
+    benchmark.extra_info["operations_per_round"] = CANDLES_PER_CALL
@@ -0,0 +1,120 @@
+import itertools
+
+import pytest
+
+from src.rate_limiting.kraken_rate_limiter import KrakenRateLimiter2025
+from src.rate_limiting.request_queue import QueueStrategy, RequestPriority, RequestQueue
+
+QUEUE_DEPTH = 500
+PRIORITIES = list(RequestPriority)
+
+
+def _limiter():
+    return KrakenRateLimiter2025(enable_queue=False)
+
+
+@pytest.mark.benchmark(group="rate_limiter")
+def test_check_rate_limit_allowed(benchmark, drive):
+    """Accepted private call on a fresh limiter (all checks run and are recorded)"""
+
+    def setup():
+        return (_limiter(),), {}
+
+    def target(limiter):
+        return drive(limiter.check_rate_limit("Balance"))
+
+    result = benchmark.pedantic(target, setup=setup, rounds=2000)
+    assert result[0] is True
+
+
+@pytest.mark.benchmark(group="rate_limiter")
+def test_check_rate_limit_rejected(benchmark, drive):
+    """Rejected call on a depleted limiter (the path a busy bot hits repeatedly)"""
+    limiter = _limiter()
+    while drive(limiter.check_rate_limit("AddOrder"))[0]:
+        pass
+
+    result = benchmark(lambda: drive(limiter.check_rate_limit("AddOrder")))
+    assert result[0] is False
+
+
+def _fill(queue, drive, ids):
+    for i, request_id in enumerate(ids):
+        drive(
+            queue.enqueue(
+                request_id, "AddOrder", "POST", priority=PRIORITIES[i % len(PRIORITIES)]
+            )
+        )
+
+
+@pytest.mark.benchmark(group="request_queue")
+@pytest.mark.parametrize("strategy", list(QueueStrategy), ids=lambda s: s.value)
+def test_request_queue_enqueue(benchmark, drive, strategy):
+    """Enqueue QUEUE_DEPTH requests spread over all priorities"""
+    counter = itertools.count()
+
+    def setup():
+        batch = next(counter)
+        ids = [f"req-{batch}-{i}" for i in range(QUEUE_DEPTH)]
+        return (RequestQueue(max_size=QUEUE_DEPTH, strategy=strategy), ids), {}
+
+    def target(queue, ids):
+        _fill(queue, drive, ids)
+        return queue
+
+    queue = benchmark.pedantic(target, setup=setup, rounds=50)
+    benchmark.extra_info["operations_per_round"] = QUEUE_DEPTH
+    assert len(queue) == QUEUE_DEPTH
+
+
+@pytest.mark.benchmark(group="request_queue")
+@pytest.mark.parametrize("strategy", list(QueueStrategy), ids=lambda s: s.value)
+def test_request_queue_dequeue(benchmark, drive, strategy):
+    """Drain a queue holding QUEUE_DEPTH requests"""
+    counter = itertools.count()
+
+    def setup():
+        batch = next(counter)
+        queue = RequestQueue(max_size=QUEUE_DEPTH, strategy=strategy)
+        _fill(queue, drive, [f"req-{batch}-{i}" for i in range(QUEUE_DEPTH)])
+        return (queue,), {}
+
+    def target(queue):
+        return sum(drive(queue.dequeue()) is not None for _ in range(QUEUE_DEPTH))
+
+    drained = benchmark.pedantic(target, setup=setup, rounds=50)
+    benchmark.extra_info["operations_per_round"] = QUEUE_DEPTH
+    assert drained == QUEUE_DEPTH
+
+
+@pytest.mark.benchmark(group="rate_limiter")
+def test_try_acquire_allowed(benchmark):
+    """Synchronous fast path on a fresh limiter"""
+
+    def setup():
+        return (_limiter(), "Balance"), {}
+
+    result = benchmark.pedantic(KrakenRateLimiter2025.try_acquire, setup=setup, rounds=2000)
+    assert result[0] is True
+
+
+@pytest.mark.benchmark(group="request_queue_backlog")
+@pytest.mark.parametrize("strategy", list(QueueStrategy), ids=lambda s: s.value)
+def test_request_queue_dequeue_with_background_backlog(benchmark, drive, strategy):
+    """Serve one trade request while 5000 background requests are queued"""
+    counter = itertools.count()
+
+    def setup():
+        batch = next(counter)
+        queue = RequestQueue(max_size=10_000, strategy=strategy)
+        for i in range(5000):
+            drive(
+                queue.enqueue(
+                    f"bg-{batch}-{i}", "Ticker", "GET", priority=RequestPriority.BACKGROUND
+                )
+            )
+        drive(queue.enqueue(f"trade-{batch}", "AddOrder", "POST", priority=RequestPriority.HIGH))
+        return (queue,), {}
+
+    request = benchmark.pedantic(lambda queue: drive(queue.dequeue()), setup=setup, rounds=20)
+    assert request is not None
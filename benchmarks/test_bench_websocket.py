@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+data_models = pytest.importorskip("src.websocket.data_models")
+message_decoder = pytest.importorskip("src.websocket.message_decoder")
+
+FRAMES = {
+    "ticker": (
+        data_models.TickerUpdate,
+        {
+            "symbol": "BTC/USD",
+            "bid": 64250.1,
+            "bid_qty": 1.5,
+            "ask": 64250.2,
+            "ask_qty": 2.5,
+            "last": 64250.1,
+            "volume": 1234.56789,
+            "vwap": 64100.5,
+            "low": 63000.0,
+            "high": 65000.0,
+            "change": 250.1,
+            "change_pct": 0.39,
+        },
+    ),
+    "trade": (
+        data_models.TradeUpdate,
+        {
+            "symbol": "BTC/USD",
+            "side": "buy",
+            "price": 64250.1,
+            "qty": 0.0123,
+            "ord_type": "market",
+            "trade_id": 123456,
+            "timestamp": "2025-01-01T00:00:00.123456Z",
+        },
+    ),
+    "ohlc": (
+        data_models.OHLCUpdate,
+        {
+            "symbol": "BTC/USD",
+            "open": 64200.0,
+            "high": 64300.0,
+            "low": 64150.0,
+            "close": 64250.1,
+            "volume": 12.5,
+            "interval": 1,
+            "interval_begin": "2025-01-01T00:01:00.000000Z",
+            "timestamp": "2025-01-01T00:01:00.000000Z",
+        },
+    ),
+}
+
+
+def _book(levels: int) -> dict:
+    return {
+        "symbol": "BTC/USD",
+        "bids": [{"price": 64250.1 - i * 0.1, "qty": 0.5 + i} for i in range(levels)],
+        "asks": [{"price": 64250.2 + i * 0.1, "qty": 0.5 + i} for i in range(levels)],
+        "checksum": 1234567890,
+    }
+
+
+@pytest.mark.benchmark(group="message_decode")
+@pytest.mark.parametrize("channel", list(FRAMES))
+def test_decode_message(benchmark, channel):
+    """Raw frame -> decoded dict -> WebSocketMessage -> typed update"""
+    model, payload = FRAMES[channel]
+    frame = json.dumps({"channel": channel, "type": "update", "data": [payload]})
+    decode = message_decoder.get_decoder("auto").decode
+
+    def decode_frame():
+        message = data_models.WebSocketMessage.from_raw(decode(frame))
+        return [model.from_raw(item["symbol"], item) for item in message.data]
+
+    updates = benchmark(decode_frame)
+    assert updates[0].symbol == "BTC/USD"
+
+
+@pytest.mark.benchmark(group="orderbook")
+@pytest.mark.parametrize("levels", [10, 100])
+def test_order_book_update_from_raw(benchmark, levels):
+    raw = _book(levels)
+
+    update = benchmark(data_models.OrderBookUpdate.from_raw, "BTC/USD", raw)
+    assert len(update.bids) == levels
@@ -11,9 +11,10 @@ import os
 import time
 from datetime import datetime
 
-import ccxt
 from dotenv import load_dotenv
 
+from src.exchange.kraken_client import create_kraken_client
+
 load_dotenv()
 
 class BTCAggressiveScalper:
@@ -60,13 +61,7 @@ class BTCAggressiveScalper:
 
     def initialize(self):
         """Initialize Kraken Pro 2025"""
-        self.exchange = ccxt.kraken({
-            'apiKey': os.getenv('KRAKEN_KEY'),
-            'secret': os.getenv('KRAKEN_SECRET'),
-            'enableRateLimit': True,
-            'rateLimit': 200
-        })
-        self.exchange.load_markets()
+        self.exchange = create_kraken_client({'rateLimit': 200})
         print("✅ Connected to Kraken Pro")
 
     def get_balance(self):
@@ -9,12 +9,13 @@ With 0.0001% spread, we profit from natural volatility
 import json
 import os
 import time
-from collections import deque
 from datetime import datetime
 
-import ccxt
 from dotenv import load_dotenv
 
+from src.exchange.kraken_client import create_kraken_client
+from src.strategies.indicators import get_indicator_engine
+
 load_dotenv()
 
 class BTCSpreadExploiter:
@@ -33,8 +34,10 @@ class BTCSpreadExploiter:
         self.normal_exit = 0.00015    # 0.015% = ~$17 movement
         self.good_exit = 0.0003       # 0.03% = ~$35 movement
 
-        # Price tracking for volatility
-        self.price_history = deque(maxlen=20)  # Last 20 prices
+        # Price tracking for volatility (incremental mean/variance over the last 20 prices)
+        self.indicators = get_indicator_engine()
+        self.price_stats = self.indicators.get(self.symbol, 'tick', 'stats', 20)
+        self.price_momentum = self.indicators.get(self.symbol, 'tick', 'momentum', 5)
         self.last_update = 0
 
         # Performance
@@ -64,13 +67,7 @@ class BTCSpreadExploiter:
 
     def initialize(self):
         """Initialize Kraken Pro"""
-        self.exchange = ccxt.kraken({
-            'apiKey': os.getenv('KRAKEN_KEY'),
-            'secret': os.getenv('KRAKEN_SECRET'),
-            'enableRateLimit': True,
-            'rateLimit': 200
-        })
-        self.exchange.load_markets()
+        self.exchange = create_kraken_client({'rateLimit': 200})
         print("✅ Connected to Kraken Pro")
 
     def get_market_data(self):
@@ -83,16 +80,14 @@ class BTCSpreadExploiter:
         spread_percent = spread_dollars / bid
 
         # Track price movement
-        self.price_history.append(ticker['last'])
+        self.indicators.update(self.symbol, 'tick', ticker['last'])
 
         # Calculate volatility (standard deviation of recent prices)
-        if len(self.price_history) >= 5:
-            avg_price = sum(self.price_history) / len(self.price_history)
-            variance = sum((p - avg_price) ** 2 for p in self.price_history) / len(self.price_history)
-            volatility = (variance ** 0.5) / avg_price  # As percentage
+        if len(self.price_stats.window) >= 5:
+            volatility = self.price_stats.std / self.price_stats.mean  # As percentage
 
             # Recent direction
-            recent_move = (self.price_history[-1] - self.price_history[-5]) / self.price_history[-5]
+            recent_move = self.price_momentum.value
         else:
             volatility = 0
             recent_move = 0
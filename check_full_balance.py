@@ -3,18 +3,13 @@
 CHECK FULL BALANCE
 """
 
-import os
-
-import ccxt
 from dotenv import load_dotenv
 
+from src.exchange.kraken_client import create_kraken_client
+
 load_dotenv()
 
-exchange = ccxt.kraken({
-    'apiKey': os.getenv('KRAKEN_KEY'),
-    'secret': os.getenv('KRAKEN_SECRET'),
-    'enableRateLimit': True
-})
+exchange = create_kraken_client()
 
 print("=" * 70)
 print("FULL BALANCE CHECK")
@@ -4,20 +4,16 @@ CHECK RECENT TRADES
 ===================
 """
 
-import os
 from datetime import datetime
 
-import ccxt
 from dotenv import load_dotenv
 
+from src.exchange.kraken_client import create_kraken_client
+
 load_dotenv()
 
 # Connect to Kraken
-exchange = ccxt.kraken({
-    'apiKey': os.getenv('KRAKEN_KEY'),
-    'secret': os.getenv('KRAKEN_SECRET'),
-    'enableRateLimit': True
-})
+exchange = create_kraken_client()
 
 print("=" * 60)
 print("CHECKING YOUR SHIB/USDT TRADES")
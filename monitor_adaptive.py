@@ -7,9 +7,10 @@ import json
 import os
 from datetime import datetime
 
-import ccxt
 from dotenv import load_dotenv
 
+from src.exchange.kraken_client import create_kraken_client
+
 load_dotenv()
 
 # Check position file
@@ -25,11 +26,7 @@ else:
     print("📂 No active position")
 
 # Check market
-exchange = ccxt.kraken({
-    'apiKey': os.getenv('KRAKEN_KEY'),
-    'secret': os.getenv('KRAKEN_SECRET'),
-    'enableRateLimit': True
-})
+exchange = create_kraken_client()
 
 # Get ticker
 ticker = exchange.fetch_ticker('BTC/USDT')
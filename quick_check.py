@@ -1,16 +1,11 @@
 #!/usr/bin/env python3
-import os
-
-import ccxt
 from dotenv import load_dotenv
 
+from src.exchange.kraken_client import create_kraken_client
+
 load_dotenv()
 
-exchange = ccxt.kraken({
-    'apiKey': os.getenv('KRAKEN_KEY'),
-    'secret': os.getenv('KRAKEN_SECRET'),
-    'enableRateLimit': True
-})
+exchange = create_kraken_client()
 
 balance = exchange.fetch_balance()
 usdt = balance.get('USDT', {}).get('free', 0)
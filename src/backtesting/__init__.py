@@ -0,0 +1,26 @@
+"""Offline backtesting for the trading strategies."""
+
+from .data import OHLCV, bars_from_trades, load_ohlcv
+from .engine import (
+    STRATEGIES,
+    BacktestResult,
+    compute_features,
+    parameter_grid,
+    run_backtest,
+    run_sweep,
+)
+from .exchange import SimulatedExchange, Trade
+
+__all__ = [
+    "OHLCV",
+    "STRATEGIES",
+    "BacktestResult",
+    "SimulatedExchange",
+    "Trade",
+    "bars_from_trades",
+    "compute_features",
+    "load_ohlcv",
+    "parameter_grid",
+    "run_backtest",
+    "run_sweep",
+]
@@ -0,0 +1,83 @@
+"""
+Backtest CLI
+
+Usage:
+    python -m src.backtesting btc_scalper data/btc_usdt_1m.csv
+    python -m src.backtesting btc_adaptive_scalper trading.db --symbol BTC/USDT \
+        --param scalp_target=0.0001,0.0002 --param stop_loss=-0.0005,-0.001
+"""
+
+import argparse
+import json
+import logging
+
+from .data import load_ohlcv
+from .engine import STRATEGIES, run_backtest, run_sweep
+
+
+def _parse_param(text: str) -> tuple[str, list]:
+    name, _, values = text.partition("=")
+    if not values:
+        raise argparse.ArgumentTypeError(f"Expected name=value[,value...], got '{text}'")
+    return name, [json.loads(value) for value in values.split(",")]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Backtest a strategy on historical bars")
+    parser.add_argument("strategy", choices=sorted(STRATEGIES))
+    parser.add_argument("source", help="CSV, Parquet or SQLite (market_data table) file")
+    parser.add_argument("--symbol", default="BTC/USDT")
+    parser.add_argument("--timeframe", default="1m")
+    parser.add_argument("--cash", type=float, default=1000.0, help="Starting quote balance")
+    parser.add_argument("--spread", type=float, default=0.0001, help="Spread fraction")
+    parser.add_argument("--maker-fee", type=float, default=None)
+    parser.add_argument("--taker-fee", type=float, default=None)
+    parser.add_argument("--slippage", type=float, default=0.0)
+    parser.add_argument(
+        "--param",
+        type=_parse_param,
+        action="append",
+        default=[],
+        help="Strategy attribute override; several values run a sweep",
+    )
+    parser.add_argument("--processes", type=int, default=None, help="Sweep worker count")
+    parser.add_argument("--top", type=int, default=10, help="Sweep results to print")
+    parser.add_argument("--verbose", action="store_true")
+    return parser
+
+
+def main(argv=None) -> None:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    grid = dict(args.param)
+    options = {
+        "starting_cash": args.cash,
+        "maker_fee": args.maker_fee,
+        "taker_fee": args.taker_fee,
+        "slippage": args.slippage,
+    }
+
+    if any(len(values) > 1 for values in grid.values()):
+        results = run_sweep(
+            args.strategy,
+            args.source,
+            grid,
+            symbol=args.symbol,
+            timeframe=args.timeframe,
+            processes=args.processes,
+            spread=args.spread,
+            **options,
+        )
+        for result in results[: args.top]:
+            print(json.dumps(result, default=str))
+        return
+
+    bars = load_ohlcv(args.source, args.symbol, args.timeframe)
+    params = {name: values[0] for name, values in grid.items()}
+    result = run_backtest(args.strategy, bars, params, spread=args.spread, **options)
+    print(json.dumps(result.summary(), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
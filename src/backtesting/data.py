@@ -0,0 +1,226 @@
+"""
+Backtest Data Loading
+=====================
+
+Loads OHLCV history into NumPy columns from:
+- CSV files (header with timestamp/open/high/low/close/volume, or headerless
+  ccxt-style rows)
+- Parquet files (requires pandas with a Parquet engine)
+- the ``market_data`` table written by ``DatabaseManager.insert_market_data``
+
+Trade prints (timestamp, price, volume) can be bucketed into bars with
+``bars_from_trades``. Timestamps are normalised to seconds.
+"""
+
+import csv
+import logging
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from src.websocket.candle_aggregator import parse_timeframe
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# market_data table column -> OHLCV column
+_SQLITE_COLUMNS = {
+    "timestamp": "timestamp",
+    "open_price": "open",
+    "high_price": "high",
+    "low_price": "low",
+    "close_price": "close",
+    "volume": "volume",
+}
+
+
+@dataclass
+class OHLCV:
+    """Columnar bar history (float64 arrays of equal length)"""
+
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    symbol: str = ""
+    timeframe: str = "1m"
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def slice(self, start: Optional[float] = None, end: Optional[float] = None) -> "OHLCV":
+        """Bars with start <= timestamp < end"""
+        lo = 0 if start is None else int(np.searchsorted(self.timestamp, start, "left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.timestamp, end, "left"))
+        return OHLCV(
+            *(getattr(self, column)[lo:hi] for column in OHLCV_COLUMNS),
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+        )
+
+
+def _to_seconds(timestamps: np.ndarray) -> np.ndarray:
+    """Millisecond epoch timestamps are converted to seconds"""
+    if len(timestamps) and timestamps.max() > 1e11:
+        return timestamps / 1000.0
+    return timestamps
+
+
+def _from_columns(columns: dict[str, np.ndarray], symbol: str, timeframe: str) -> OHLCV:
+    timestamp = _to_seconds(np.asarray(columns["timestamp"], dtype=np.float64))
+    order = np.argsort(timestamp, kind="stable")
+    # Keep the last bar for duplicated timestamps
+    keep = np.ones(len(order), dtype=bool)
+    sorted_ts = timestamp[order]
+    keep[:-1] = sorted_ts[1:] != sorted_ts[:-1]
+    order = order[keep]
+    return OHLCV(
+        timestamp=timestamp[order],
+        **{
+            column: np.asarray(columns[column], dtype=np.float64)[order]
+            for column in OHLCV_COLUMNS[1:]
+        },
+        symbol=symbol,
+        timeframe=timeframe,
+    )
+
+
+def load_csv(path: Union[str, Path], symbol: str = "", timeframe: str = "1m") -> OHLCV:
+    """Load OHLCV rows from a CSV file"""
+    with open(path, newline="") as handle:
+        first = handle.readline()
+    has_header = any(character.isalpha() for character in first.replace("e+", "").replace("e-", ""))
+
+    if has_header:
+        with open(path, newline="") as handle:
+            reader = csv.reader(handle)
+            header = [name.strip().lower() for name in next(reader)]
+        aliases = {"time": "timestamp", "date": "timestamp", "ts": "timestamp"}
+        names = [aliases.get(name, name) for name in header]
+        missing = [column for column in OHLCV_COLUMNS if column not in names]
+        if missing:
+            raise ValueError(f"CSV {path} is missing columns: {missing}")
+        indices = [names.index(column) for column in OHLCV_COLUMNS]
+        data = np.loadtxt(path, delimiter=",", skiprows=1, usecols=indices, ndmin=2)
+    else:
+        data = np.loadtxt(path, delimiter=",", usecols=range(6), ndmin=2)
+
+    columns = {column: data[:, index] for index, column in enumerate(OHLCV_COLUMNS)}
+    return _from_columns(columns, symbol, timeframe)
+
+
+def load_parquet(path: Union[str, Path], symbol: str = "", timeframe: str = "1m") -> OHLCV:
+    """Load OHLCV columns from a Parquet file"""
+    try:
+        import pandas as pd
+    except ImportError as e:
+        raise ImportError("Parquet backtest data requires pandas and pyarrow") from e
+
+    frame = pd.read_parquet(path)
+    frame.columns = [str(name).lower() for name in frame.columns]
+    if "timestamp" not in frame.columns:
+        frame = frame.reset_index().rename(columns={frame.index.name or "index": "timestamp"})
+    if np.issubdtype(frame["timestamp"].dtype, np.datetime64):
+        frame["timestamp"] = frame["timestamp"].astype("int64") / 1e9
+    if symbol and "symbol" in frame.columns:
+        frame = frame[frame["symbol"] == symbol]
+
+    columns = {column: frame[column].to_numpy() for column in OHLCV_COLUMNS}
+    return _from_columns(columns, symbol, timeframe)
+
+
+def load_sqlite(
+    path: Union[str, Path],
+    symbol: str,
+    timeframe: str = "1m",
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> OHLCV:
+    """Load bars from the ``market_data`` table"""
+    query = (
+        f"SELECT {', '.join(_SQLITE_COLUMNS)} FROM market_data "
+        "WHERE symbol = ? AND timeframe = ?"
+    )
+    params: list = [symbol, timeframe]
+    if start is not None:
+        query += " AND timestamp >= ?"
+        params.append(start)
+    if end is not None:
+        query += " AND timestamp < ?"
+        params.append(end)
+    query += " ORDER BY timestamp"
+
+    with sqlite3.connect(str(path)) as conn:
+        rows = conn.execute(query, params).fetchall()
+
+    data = np.array(rows, dtype=np.float64).reshape(-1, len(_SQLITE_COLUMNS))
+    columns = {column: data[:, index] for index, column in enumerate(_SQLITE_COLUMNS.values())}
+    return _from_columns(columns, symbol, timeframe)
+
+
+def load_ohlcv(
+    source: Union[str, Path],
+    symbol: str = "",
+    timeframe: str = "1m",
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> OHLCV:
+    """
+    Load bars from a CSV, Parquet or SQLite file (chosen by extension)
+
+    Args:
+        source: Data file path
+        symbol: Trading pair (required for SQLite, filters Parquet)
+        timeframe: Bar timeframe ('1m', '5m', ...)
+        start: Optional first timestamp (seconds)
+        end: Optional end timestamp (seconds, exclusive)
+    """
+    suffix = Path(source).suffix.lower()
+    if suffix in (".db", ".sqlite", ".sqlite3"):
+        bars = load_sqlite(source, symbol, timeframe, start, end)
+    elif suffix in (".parquet", ".pq"):
+        bars = load_parquet(source, symbol, timeframe)
+    else:
+        bars = load_csv(source, symbol, timeframe)
+
+    if start is not None or end is not None:
+        bars = bars.slice(start, end)
+    logger.info(f"[BACKTEST] Loaded {len(bars)} {timeframe} bars for {symbol or source}")
+    return bars
+
+
+def bars_from_trades(
+    timestamps: np.ndarray,
+    prices: np.ndarray,
+    volumes: np.ndarray,
+    timeframe: Union[str, int] = "1m",
+    symbol: str = "",
+) -> OHLCV:
+    """Bucket trade prints into bars (empty intervals are skipped)"""
+    seconds = parse_timeframe(timeframe)
+    timestamps = _to_seconds(np.asarray(timestamps, dtype=np.float64))
+    order = np.argsort(timestamps, kind="stable")
+    timestamps = timestamps[order]
+    prices = np.asarray(prices, dtype=np.float64)[order]
+    volumes = np.asarray(volumes, dtype=np.float64)[order]
+
+    buckets = np.floor(timestamps / seconds) * seconds
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(prices)]
+
+    return OHLCV(
+        timestamp=buckets[starts],
+        open=prices[starts],
+        high=np.maximum.reduceat(prices, starts),
+        low=np.minimum.reduceat(prices, starts),
+        close=prices[ends - 1],
+        volume=np.add.reduceat(volumes, starts),
+        symbol=symbol,
+        timeframe=timeframe if isinstance(timeframe, str) else f"{seconds}s",
+    )
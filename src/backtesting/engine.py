@@ -0,0 +1,587 @@
+"""
+Backtest Engine
+===============
+
+Replays bar history through the existing strategy decision functions.
+
+Everything that does not depend on strategy state is computed once per data
+set as NumPy columns: synthetic bid/ask, rolling 24h high/low (the ticker
+range the scalpers use), 24h change, momentum and rolling volatility. The
+per-bar loop then only builds the strategy's market data dict from
+precomputed values, calls its buy/sell decision and settles orders on the
+simulated exchange.
+
+Strategies read ``time.time()`` for hold times and cooldowns. Before each
+decision the engine rewrites those timestamps relative to the wall clock so
+the strategy sees the simulated elapsed time.
+
+Usage:
+    bars = load_ohlcv("btc_usdt_1m.csv", symbol="BTC/USDT")
+    result = run_backtest("btc_scalper", bars, params={"micro_target": 0.0003})
+    print(result.summary())
+
+    results = run_sweep(
+        "btc_adaptive_scalper",
+        "btc_usdt_1m.csv",
+        {"scalp_target": [0.0001, 0.0002], "stop_loss": [-0.0005, -0.001]},
+        symbol="BTC/USDT",
+    )
+"""
+
+import importlib
+import itertools
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union
+
+import numpy as np
+
+from src.websocket.candle_aggregator import parse_timeframe
+
+from .data import OHLCV, load_ohlcv
+from .exchange import Fill, SimulatedExchange, Trade
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+def _rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing-window maximum in O(n) (van Herk/Gil-Werman blocks)"""
+    n = len(values)
+    if window <= 1 or n == 0:
+        return values.copy()
+    if n < window:
+        return np.maximum.accumulate(values)
+
+    pad = (-n) % window
+    blocks = np.concatenate([values, np.full(pad, -np.inf)]).reshape(-1, window)
+    prefix = np.maximum.accumulate(blocks, axis=1).ravel()
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    result = np.empty(n)
+    result[: window - 1] = np.maximum.accumulate(values[: window - 1])
+    result[window - 1 :] = np.maximum(suffix[: n - window + 1], prefix[window - 1 : n])
+    return result
+
+
+def _lagged_change(values: np.ndarray, lag: int) -> np.ndarray:
+    """values[i] / values[i - lag] - 1 (0 where no earlier value exists)"""
+    result = np.zeros(len(values))
+    if lag < len(values):
+        previous = values[:-lag]
+        np.divide(values[lag:] - previous, previous, out=result[lag:], where=previous > 0)
+    return result
+
+
+def _relative_volatility(close: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """Population std / mean over a trailing window (expanding until full)"""
+    n = len(close)
+    result = np.zeros(n)
+    for index in range(min_periods - 1, min(window - 1, n)):
+        sample = close[: index + 1]
+        result[index] = sample.std() / sample.mean()
+    if n >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(close, window)
+        result[window - 1 :] = windows.std(axis=1) / windows.mean(axis=1)
+    return result
+
+
+def compute_features(
+    bars: OHLCV, spread: Union[float, np.ndarray] = 0.0001, ticker_window: int = 86400
+) -> dict[str, np.ndarray]:
+    """
+    Per-bar market state shared by all strategy adapters
+
+    Args:
+        bars: Bar history
+        spread: Bid/ask spread as a fraction of price (scalar or per bar)
+        ticker_window: Seconds covered by the ticker high/low/change (24h)
+    """
+    close = bars.close
+    window = max(1, ticker_window // parse_timeframe(bars.timeframe))
+    spread = np.broadcast_to(np.asarray(spread, dtype=np.float64), close.shape)
+
+    bid = close * (1.0 - spread / 2.0)
+    ask = close * (1.0 + spread / 2.0)
+    high = _rolling_max(bars.high, window)
+    low = -_rolling_max(-bars.low, window)
+    span = high - low
+    momentum = _lagged_change(close, 1)
+    range_position = np.full(len(close), 0.5)
+    np.divide(close - low, span, out=range_position, where=span > 0)
+
+    return {
+        "timestamp": bars.timestamp,
+        "open": bars.open,
+        "bar_high": bars.high,
+        "bar_low": bars.low,
+        "price": close,
+        "bid": bid,
+        "ask": ask,
+        "spread": spread,
+        "spread_percent": spread,
+        "spread_dollars": ask - bid,
+        "high": high,
+        "low": low,
+        "range_position": range_position,
+        "change": _lagged_change(close, window) * 100.0,
+        "momentum": momentum,
+        "micro_movement": momentum,
+        "recent_move": _lagged_change(close, 4),
+        "volatility": _relative_volatility(close, 20, 5),
+        "volume": bars.volume,
+    }
+
+
+# Keys of the market data dict handed to strategies (the live get_market_data keys)
+MARKET_DATA_KEYS = (
+    "price",
+    "bid",
+    "ask",
+    "spread",
+    "spread_percent",
+    "spread_dollars",
+    "high",
+    "low",
+    "range_position",
+    "change",
+    "momentum",
+    "micro_movement",
+    "recent_move",
+    "volatility",
+    "volume",
+)
+
+
+@dataclass(frozen=True)
+class StrategySpec:
+    """How to drive one strategy class"""
+
+    target: str  # "module:Class"
+    buy_method: str = "should_buy"
+    sell_method: str = "should_sell"
+    buy_order: str = "market"  # "limit" buys at the bid, sells at the ask
+    sell_order: str = "market"
+    amount_key: str = "amount"  # Position dict key holding the base amount
+    clock_attributes: tuple[str, ...] = ()  # Wall-clock attributes stamped on each fill
+    trade_amount: Optional[float] = None  # Quote per buy when the strategy has none (None = all)
+
+
+STRATEGIES: dict[str, StrategySpec] = {
+    "btc_scalper": StrategySpec(
+        "src.strategies.btc_scalper.strategy:BTCScalper",
+        buy_order="limit",
+        sell_order="limit",
+        amount_key="btc_amount",
+    ),
+    "btc_adaptive_scalper": StrategySpec(
+        "btc_adaptive_scalper:BTCAdaptiveScalper",
+        buy_method="adaptive_buy_decision",
+        clock_attributes=("last_trade_time",),
+    ),
+    "btc_aggressive_scalper": StrategySpec(
+        "btc_aggressive_scalper:BTCAggressiveScalper",
+        buy_method="aggressive_buy_decision",
+        clock_attributes=("last_trade_time",),
+    ),
+    "patient_profit_bot": StrategySpec("patient_profit_bot:PatientProfitBot"),
+    "btc_spread_exploiter": StrategySpec(
+        "btc_spread_exploiter:BTCSpreadExploiter",
+        clock_attributes=("last_update",),
+    ),
+    "fast_start": StrategySpec("src.strategies.fast_start_strategy:FastStartStrategy"),
+}
+
+
+class DecisionAdapter:
+    """Drives a standalone scalper's should_buy/should_sell on simulated time"""
+
+    def __init__(self, spec: StrategySpec, params: Optional[dict[str, Any]] = None):
+        self.spec = spec
+        self.params = dict(params or {})
+        self.strategy = self.build()
+        self.clock: dict[str, float] = {name: 0.0 for name in spec.clock_attributes}
+        self.entry_time = 0.0
+
+    def _instantiate(self) -> Any:
+        module_name, class_name = self.spec.target.split(":")
+        return getattr(importlib.import_module(module_name), class_name)()
+
+    def build(self) -> Any:
+        strategy = self._instantiate()
+        # Never start from (or write to) a live position file
+        strategy.position = None
+        strategy.save_position = lambda: None
+        for name, value in self.params.items():
+            if not hasattr(strategy, name):
+                raise ValueError(f"{type(strategy).__name__} has no parameter '{name}'")
+            setattr(strategy, name, value)
+        return strategy
+
+    def _sync_clock(self, now: float):
+        """Express simulated timestamps relative to the wall clock"""
+        wall = time.time()
+        for name, value in self.clock.items():
+            setattr(self.strategy, name, wall - (now - value) if value else 0)
+        if self.strategy.position:
+            self.strategy.position["time"] = wall - (now - self.entry_time)
+
+    def decide(self, data: dict[str, Any], now: float, cash: float) -> Optional[tuple]:
+        """(side, order_type, limit_price, reason) or None"""
+        self._sync_clock(now)
+        if self.strategy.position:
+            should_sell, reason = getattr(self.strategy, self.spec.sell_method)(data)
+            if should_sell:
+                limit = data["ask"] if self.spec.sell_order == "limit" else None
+                return "sell", self.spec.sell_order, limit, reason
+            return None
+
+        should_buy, reason = getattr(self.strategy, self.spec.buy_method)(data, cash)
+        if should_buy:
+            limit = data["bid"] if self.spec.buy_order == "limit" else None
+            return "buy", self.spec.buy_order, limit, reason
+        return None
+
+    def buy_amount(self, cash: float) -> float:
+        amount = getattr(self.strategy, "trade_amount", self.spec.trade_amount)
+        return cash if amount is None else min(amount, cash)
+
+    def on_fill(self, fill: Fill, data: dict[str, Any]):
+        for name in self.clock:
+            self.clock[name] = fill.time
+        if fill.side == "buy":
+            self.entry_time = fill.time
+            self.strategy.position = {
+                self.spec.amount_key: fill.amount,
+                "price": fill.price,
+                "time": fill.time,
+                "entry_spread": data["spread_dollars"],
+            }
+        else:
+            self.strategy.position = None
+
+
+def _run_coroutine(coroutine) -> Any:
+    """Run a coroutine that never suspends without an event loop round trip"""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coroutine.close()
+    raise RuntimeError("Strategy coroutine suspended; it cannot be driven synchronously")
+
+
+class FastStartAdapter(DecisionAdapter):
+    """Drives FastStartStrategy.generate_signals on a rolling candle window"""
+
+    window = 6  # generate_signals needs more than 5 candles for momentum
+
+    def _instantiate(self) -> Any:
+        from src.strategies.fast_start_strategy import FastStartStrategy
+        from src.strategies.indicators import IndicatorEngine
+
+        strategy = FastStartStrategy({"symbol": "BTC/USDT"})
+        # Backtests must not share (or pollute) the live indicator cache
+        strategy.indicators = IndicatorEngine()
+        return strategy
+
+    def build(self) -> Any:
+        self.candles: list[dict[str, float]] = []
+        self.position_price = 0.0
+        strategy = super().build()
+        strategy.position = None
+        return strategy
+
+    def decide(self, data: dict[str, Any], now: float, cash: float) -> Optional[tuple]:
+        self.candles.append(
+            {"timestamp": now, "close": data["price"], "volume": data["volume"]}
+        )
+        if len(self.candles) > self.window:
+            del self.candles[0]
+
+        strategy = self.strategy
+        if strategy.position:
+            profit = (data["bid"] - self.position_price) / self.position_price * 100
+            if profit >= strategy.profit_target:
+                return "sell", "market", None, f"Profit target: {profit:.2f}%"
+            if profit <= -strategy.stop_loss:
+                return "sell", "market", None, f"Stop loss: {profit:.2f}%"
+
+        signal = _run_coroutine(strategy.generate_signals(self.candles))
+        if signal.get("confidence", 0) < strategy.min_confidence:
+            return None
+        if signal["action"] == "BUY" and not strategy.position:
+            return "buy", "market", None, signal.get("reason", "")
+        if signal["action"] == "SELL" and strategy.position:
+            return "sell", "market", None, signal.get("reason", "")
+        return None
+
+    def buy_amount(self, cash: float) -> float:
+        return min(self.strategy.order_size_usdt, cash)
+
+    def on_fill(self, fill: Fill, data: dict[str, Any]):
+        self.position_price = fill.price
+        self.strategy.position = {"amount": fill.amount} if fill.side == "buy" else None
+
+
+def create_adapter(strategy: str, params: Optional[dict[str, Any]] = None) -> DecisionAdapter:
+    """Adapter for a registered strategy name"""
+    spec = STRATEGIES.get(strategy)
+    if spec is None:
+        raise ValueError(f"Unknown strategy '{strategy}' (available: {sorted(STRATEGIES)})")
+    if strategy == "fast_start":
+        return FastStartAdapter(spec, params)
+    return DecisionAdapter(spec, params)
+
+
+@dataclass
+class BacktestResult:
+    """Outcome of one backtest run"""
+
+    strategy: str
+    params: dict[str, Any]
+    bars: int
+    starting_cash: float
+    trades: list[Trade]
+    equity: np.ndarray
+    fees_paid: float
+    rejected_orders: int
+    bar_seconds: int
+    elapsed: float = 0.0
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def final_equity(self) -> float:
+        return float(self.equity[-1]) if len(self.equity) else self.starting_cash
+
+    @property
+    def net_pnl(self) -> float:
+        return self.final_equity - self.starting_cash
+
+    @property
+    def total_return(self) -> float:
+        return self.net_pnl / self.starting_cash if self.starting_cash else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        if not self.trades:
+            return 0.0
+        return sum(1 for trade in self.trades if trade.pnl > 0) / len(self.trades)
+
+    @property
+    def max_drawdown(self) -> float:
+        if not len(self.equity):
+            return 0.0
+        peaks = np.maximum.accumulate(self.equity)
+        return float(((peaks - self.equity) / peaks).max())
+
+    @property
+    def sharpe(self) -> float:
+        """Annualised Sharpe ratio of per-bar equity returns"""
+        if len(self.equity) < 3:
+            return 0.0
+        returns = np.diff(self.equity) / self.equity[:-1]
+        deviation = returns.std()
+        if deviation == 0:
+            return 0.0
+        return float(returns.mean() / deviation * math.sqrt(SECONDS_PER_YEAR / self.bar_seconds))
+
+    def summary(self) -> dict[str, Any]:
+        """Scalar metrics (cheap to pass between processes)"""
+        return {
+            "strategy": self.strategy,
+            "params": self.params,
+            "bars": self.bars,
+            "trades": len(self.trades),
+            "final_equity": self.final_equity,
+            "net_pnl": self.net_pnl,
+            "total_return": self.total_return,
+            "win_rate": self.win_rate,
+            "max_drawdown": self.max_drawdown,
+            "sharpe": self.sharpe,
+            "fees_paid": self.fees_paid,
+            "rejected_orders": self.rejected_orders,
+            "avg_hold_seconds": (
+                sum(trade.hold_time for trade in self.trades) / len(self.trades)
+                if self.trades
+                else 0.0
+            ),
+            "elapsed": self.elapsed,
+        }
+
+
+def run_backtest(
+    strategy: str,
+    bars: OHLCV,
+    params: Optional[dict[str, Any]] = None,
+    starting_cash: float = 1000.0,
+    maker_fee: Optional[float] = None,
+    taker_fee: Optional[float] = None,
+    spread: Union[float, np.ndarray] = 0.0001,
+    slippage: float = 0.0,
+    warmup: Optional[int] = None,
+    features: Optional[dict[str, np.ndarray]] = None,
+) -> BacktestResult:
+    """
+    Replay bars through a strategy
+
+    Args:
+        strategy: Registered strategy name (see STRATEGIES)
+        bars: Bar history
+        params: Strategy attributes to override (e.g., {"micro_target": 0.0003})
+        starting_cash: Quote balance at the start
+        maker_fee: Maker fee rate (defaults to Kraken's lowest tier)
+        taker_fee: Taker fee rate
+        spread: Bid/ask spread as a fraction of price (scalar or per bar)
+        slippage: Extra fraction paid on market orders
+        warmup: Bars skipped before trading (default: one ticker window when available)
+        features: Precomputed compute_features() output for these bars
+    """
+    started = time.perf_counter()
+    adapter = create_adapter(strategy, params)
+    exchange_options = {"maker_fee": maker_fee, "taker_fee": taker_fee}
+    exchange = SimulatedExchange(
+        starting_cash=starting_cash,
+        slippage=slippage,
+        **{name: value for name, value in exchange_options.items() if value is not None},
+    )
+
+    if features is None:
+        features = compute_features(bars, spread)
+    bar_seconds = parse_timeframe(bars.timeframe)
+    count = len(bars)
+    if warmup is None:
+        day = 86400 // bar_seconds
+        warmup = day if count > 2 * day else 0
+
+    # Python floats index faster than NumPy scalars in the loop
+    columns = {key: features[key].tolist() for key in MARKET_DATA_KEYS}
+    timestamps = features["timestamp"].tolist()
+    opens = features["open"].tolist()
+    highs = features["bar_high"].tolist()
+    lows = features["bar_low"].tolist()
+    spreads = columns["spread"]
+    closes = columns["price"]
+
+    equity = np.full(count, starting_cash, dtype=np.float64)
+    data: dict[str, Any] = {}
+    for index in range(warmup, count):
+        now = timestamps[index]
+
+        if exchange.pending is not None:
+            fill = exchange.fill_pending(
+                now, opens[index], highs[index], lows[index], spreads[index]
+            )
+            if fill is not None:
+                adapter.on_fill(fill, data)
+
+        data = {key: column[index] for key, column in columns.items()}
+        decision = adapter.decide(data, now, exchange.cash)
+        if decision is not None:
+            side, order_type, limit_price, reason = decision
+            amount = adapter.buy_amount(exchange.cash) if side == "buy" else exchange.base
+            exchange.submit(side, amount, order_type, limit_price, reason)
+
+        equity[index] = exchange.cash + exchange.base * closes[index]
+
+    result = BacktestResult(
+        strategy=strategy,
+        params=dict(params or {}),
+        bars=count - warmup,
+        starting_cash=starting_cash,
+        trades=exchange.trades,
+        equity=equity[warmup:],
+        fees_paid=exchange.fees_paid,
+        rejected_orders=exchange.rejected,
+        bar_seconds=bar_seconds,
+        elapsed=time.perf_counter() - started,
+    )
+    logger.info(
+        f"[BACKTEST] {strategy} {result.params}: {len(result.trades)} trades, "
+        f"PnL ${result.net_pnl:.2f} over {result.bars} bars in {result.elapsed:.2f}s"
+    )
+    return result
+
+
+# Per-process data cache for sweeps (each worker loads and featurises once)
+_worker_bars: Optional[OHLCV] = None
+_worker_features: Optional[dict[str, np.ndarray]] = None
+
+
+def _init_sweep_worker(source: str, symbol: str, timeframe: str, spread: float):
+    global _worker_bars, _worker_features
+    _worker_bars = load_ohlcv(source, symbol, timeframe)
+    _worker_features = compute_features(_worker_bars, spread)
+
+
+def _sweep_worker(job: tuple[str, dict[str, Any], dict[str, Any]]) -> dict[str, Any]:
+    strategy, params, options = job
+    try:
+        return run_backtest(
+            strategy, _worker_bars, params, features=_worker_features, **options
+        ).summary()
+    except Exception as e:
+        return {"strategy": strategy, "params": params, "error": str(e)}
+
+
+def parameter_grid(grid: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """Cartesian product of parameter values"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def run_sweep(
+    strategy: str,
+    source: str,
+    grid: dict[str, list[Any]],
+    symbol: str = "",
+    timeframe: str = "1m",
+    processes: Optional[int] = None,
+    sort_by: str = "net_pnl",
+    spread: float = 0.0001,
+    **options: Any,
+) -> list[dict[str, Any]]:
+    """
+    Backtest every parameter combination across a process pool
+
+    Args:
+        strategy: Registered strategy name
+        source: Data file (loaded once per worker process)
+        grid: Parameter name -> candidate values
+        symbol: Trading pair (required for SQLite sources)
+        timeframe: Bar timeframe
+        processes: Worker count (default: CPU count)
+        sort_by: Summary metric to sort results by (descending)
+        spread: Bid/ask spread fraction
+        options: Further run_backtest keyword arguments (fees, starting_cash, ...)
+
+    Returns:
+        Summary dicts, best first
+    """
+    combinations = parameter_grid(grid)
+    options["spread"] = spread
+    jobs = [(strategy, params, options) for params in combinations]
+    workers = min(processes or os.cpu_count() or 1, len(jobs)) or 1
+
+    logger.info(
+        f"[BACKTEST] Sweeping {len(jobs)} parameter sets for {strategy} on {workers} processes"
+    )
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_sweep_worker,
+        initargs=(str(source), symbol, timeframe, spread),
+    ) as pool:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        results = list(pool.map(_sweep_worker, jobs, chunksize=chunksize))
+
+    failed = [result for result in results if "error" in result]
+    for result in failed:
+        logger.error(f"[BACKTEST] {result['params']} failed: {result['error']}")
+    ranked = [result for result in results if "error" not in result]
+    ranked.sort(key=lambda result: result[sort_by], reverse=True)
+    return ranked + failed
@@ -0,0 +1,154 @@
+"""
+Simulated Exchange
+==================
+
+Spot account with fee and spread modelling for backtests.
+
+Bid/ask quotes sit half the modelled spread either side of each bar's
+close (see ``compute_features``). Orders decided on a bar fill on the next
+bar, so a strategy never trades on the price that produced its signal:
+- market orders fill at the next bar's open crossed by half the spread, plus
+  optional slippage, and pay the taker fee
+- limit orders fill at their limit price if the next bar trades through it
+  (maker fee), otherwise they are cancelled
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Kraken spot fees (lowest volume tier)
+DEFAULT_MAKER_FEE = 0.0016
+DEFAULT_TAKER_FEE = 0.0026
+
+
+@dataclass
+class Fill:
+    """Executed order"""
+
+    side: str
+    time: float
+    price: float
+    amount: float
+    fee: float
+    order_type: str
+    reason: str = ""
+
+
+@dataclass
+class Trade:
+    """Round trip (entry and exit fills)"""
+
+    entry: Fill
+    exit: Fill
+
+    @property
+    def pnl(self) -> float:
+        """Net profit in quote currency after both fees"""
+        return (
+            (self.exit.price - self.entry.price) * self.entry.amount
+            - self.entry.fee
+            - self.exit.fee
+        )
+
+    @property
+    def return_pct(self) -> float:
+        cost = self.entry.price * self.entry.amount + self.entry.fee
+        return self.pnl / cost if cost else 0.0
+
+    @property
+    def hold_time(self) -> float:
+        return self.exit.time - self.entry.time
+
+
+@dataclass
+class PendingOrder:
+    side: str
+    amount: float  # Base amount for sells, quote amount for buys
+    order_type: str
+    limit_price: Optional[float]
+    reason: str
+
+
+@dataclass
+class SimulatedExchange:
+    """Long-only spot account for one symbol"""
+
+    starting_cash: float = 1000.0
+    maker_fee: float = DEFAULT_MAKER_FEE
+    taker_fee: float = DEFAULT_TAKER_FEE
+    slippage: float = 0.0  # Extra fraction paid on market orders
+
+    cash: float = field(init=False)
+    base: float = field(init=False, default=0.0)
+    pending: Optional[PendingOrder] = field(init=False, default=None)
+    open_fill: Optional[Fill] = field(init=False, default=None)
+    trades: list[Trade] = field(init=False, default_factory=list)
+    fees_paid: float = field(init=False, default=0.0)
+    rejected: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self.cash = self.starting_cash
+
+    def submit(
+        self,
+        side: str,
+        amount: float,
+        order_type: str = "market",
+        limit_price: Optional[float] = None,
+        reason: str = "",
+    ):
+        """Queue an order for the next bar (buys: quote amount, sells: base amount)"""
+        self.pending = PendingOrder(side, amount, order_type, limit_price, reason)
+
+    def fill_pending(
+        self, time: float, open_: float, high: float, low: float, spread: float
+    ) -> Optional[Fill]:
+        """Try to execute the pending order against a bar"""
+        order = self.pending
+        if order is None:
+            return None
+        self.pending = None
+
+        if order.order_type == "limit":
+            price = order.limit_price
+            if (order.side == "buy" and low > price) or (order.side == "sell" and high < price):
+                self.rejected += 1
+                return None
+            fee_rate = self.maker_fee
+        else:
+            cross = spread / 2.0 + self.slippage
+            price = open_ * (1.0 + cross) if order.side == "buy" else open_ * (1.0 - cross)
+            fee_rate = self.taker_fee
+
+        if order.side == "buy":
+            quote = min(order.amount, self.cash)
+            if quote <= 0:
+                self.rejected += 1
+                return None
+            fee = quote * fee_rate
+            amount = (quote - fee) / price
+            self.cash -= quote
+            self.base += amount
+        else:
+            amount = min(order.amount, self.base)
+            if amount <= 0:
+                self.rejected += 1
+                return None
+            proceeds = amount * price
+            fee = proceeds * fee_rate
+            self.cash += proceeds - fee
+            self.base -= amount
+
+        self.fees_paid += fee
+        fill = Fill(order.side, time, price, amount, fee, order.order_type, order.reason)
+
+        if order.side == "buy":
+            self.open_fill = fill
+        elif self.open_fill is not None:
+            self.trades.append(Trade(self.open_fill, fill))
+            self.open_fill = None
+        return fill
+
+    def equity(self, price: float) -> float:
+        """Cash plus base marked at a price"""
+        return self.cash + self.base * price
@@ -716,6 +716,19 @@ class BalanceManagerV2:
             logger.error(f"[BALANCE_MANAGER_V2] Error getting USDT total: {e}")
             return 0.0
 
+    async def get_balance_for_asset(self, asset: str) -> float:
+        """
+        Free balance for an asset (legacy interface used by the bot's execution path)
+
+        Args:
+            asset: Asset symbol
+
+        Returns:
+            Free balance, 0.0 if unknown
+        """
+        balance = await self.get_balance(asset)
+        return float(balance.get("free", 0.0)) if balance else 0.0
+
     async def force_refresh(self) -> bool:
         """
         Force refresh all balance data
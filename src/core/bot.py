@@ -16,7 +16,7 @@ from dotenv import load_dotenv
 
 # Core imports - moved to top after standard library imports
 from src.config import load_config
-from src.config.constants import MINIMUM_ORDER_SIZE_TIER1
+from src.config.constants import MINIMUM_ORDER_SIZE_TIER1, calculate_minimum_cost
 from src.data.historical_data_saver import HistoricalDataSaver
 from src.guardian.critical_error_guardian import CriticalErrorGuardian
 from src.portfolio.portfolio_manager import PortfolioManager as PortfolioTracker
@@ -31,6 +31,7 @@ from src.utils.event_bus import EventType as BusEventType
 from src.utils.event_bus import get_event_bus, publish_event
 from src.utils.integration_coordinator import get_coordinator
 from src.utils.self_repair import RepairAction, SelfRepairSystem
+from src.websocket.candle_aggregator import CandleAggregator
 
 # Load environment variables from .env file
 load_dotenv()
@@ -174,6 +175,8 @@ class KrakenTradingBot:
         self.balance_manager = None  # Legacy compatibility
         self.balance_manager_v2 = None  # New Balance Manager V2 system
         self.trade_executor = None
+        self.order_batcher = None  # AddOrderBatch execution mode
+        self.rate_limiter = None  # KrakenRateLimiter2025, created during setup
         self.fallback_manager = None
 
         # Self-healing components
@@ -202,6 +205,17 @@ class KrakenTradingBot:
         self.portfolio_position_scanner = None
         self.log_rotation_manager = None
 
+        # Streaming candles (seeded from REST once, then kept current from trades)
+        self.candle_aggregator = CandleAggregator()
+        self.market_data_cache: dict[str, list] = {}
+
+        # Optional process-isolated market data ingestion (shared memory reader)
+        self.market_data_process = None
+        self.shared_market_data = None
+
+        # Event-driven strategy evaluation (woken by ticker/book/trade events)
+        self.strategy_scheduler = None
+
         # Signal queue for unified execution
         self.signal_queue = asyncio.Queue()
 
@@ -417,6 +431,46 @@ class KrakenTradingBot:
             self.logger.error(f"[INIT] Exchange creation failed: {e}")
             raise
 
+        # Share identical in-flight reads (Balance, Ticker) between components
+        coalescing = self.config.get("request_coalescing", {})
+        if coalescing.get("enabled", True):
+            from src.exchange.request_coalescer import CoalescingExchange
+
+            self.exchange = CoalescingExchange(self.exchange, ttls=coalescing.get("ttl"))
+
+        # Tickers and candles read from the market data process once it streams
+        market_data_settings = self.config.get("market_data_process", {})
+        if market_data_settings.get("enabled", False):
+            from src.exchange.shared_market_data_exchange import SharedMarketDataExchange
+
+            self.exchange = SharedMarketDataExchange(
+                self.exchange, max_age=market_data_settings.get("max_age", 5.0)
+            )
+
+        # Penalty-point model shared by the bot's order paths
+        from src.rate_limiting import KrakenRateLimiter2025
+
+        limiter_settings = self.config.get("rate_limiter", {})
+        self.rate_limiter = KrakenRateLimiter2025(
+            account_tier=tier,
+            enable_queue=False,
+            persistence_path=limiter_settings.get("persistence_path"),
+            adaptive=limiter_settings.get("adaptive", False),
+            state_flush_interval=limiter_settings.get("state_flush_interval", 5.0),
+        )
+        await self.rate_limiter.start()  # Restores learned limits from persistence_path
+
+        # Same-pair signals submitted together through AddOrderBatch
+        batching = self.config.get("batch_order_execution", {})
+        if batching.get("enabled", False):
+            from src.exchange.order_batcher import OrderBatcher
+
+            self.order_batcher = OrderBatcher(
+                self.exchange,
+                self.rate_limiter,
+                max_batch_size=batching.get("max_batch_size", 15),
+            )
+
         # Initialize basic symbol mapper (no API calls)
         from src.utils.centralized_symbol_mapper import KrakenSymbolMapper
 
@@ -486,7 +540,8 @@ class KrakenTradingBot:
         await self.historical_data_saver.start()
         self.logger.info("[INIT] Historical data saver started")
 
-        # 3.3: Prefill historical data
+        # 3.3: Prefill historical data (public ingestion moves out first when enabled)
+        self._start_market_data_process()
         await self._load_historical_data()
         self.logger.info("[INIT] Historical data prefilled")
 
@@ -735,6 +790,9 @@ class KrakenTradingBot:
         else:
             self.logger.warning("[INIT] Position recovery failed or returned no data")
 
+        # Trade pairs are final: move public ingestion out before market data loads
+        self._start_market_data_process()
+
         # Connect WebSocket to strategy manager (if supported)
         if self.websocket_manager and hasattr(self.websocket_manager, "strategy_manager"):
             self.websocket_manager.strategy_manager = self.strategy_manager
@@ -920,7 +978,8 @@ class KrakenTradingBot:
             self.logger.info(f"[INIT] Updated trade pairs: {self.trade_pairs}")
 
             # Update all components with new symbols
-            if self.websocket_manager:
+            # Public symbols stay off the in-process socket when the child streams them
+            if self.websocket_manager and not self.shared_market_data:
                 self.websocket_manager.symbols = self.trade_pairs
                 self.logger.info(f"[INIT] Updated WebSocket with {len(self.trade_pairs)} symbols")
 
@@ -942,16 +1001,149 @@ class KrakenTradingBot:
             # Keep existing pairs on error
             self.logger.info(f"[INIT] Keeping existing trade pairs: {self.trade_pairs[:10]}")
 
+    def _get_candle_source(self) -> CandleAggregator:
+        """Candle aggregator fed by the live trade feed (WebSocket's own if it has one)"""
+        return getattr(self.websocket_manager, "candle_aggregator", None) or self.candle_aggregator
+
+    def _get_streamed_ohlcv(self, symbol: str, limit: int = 100) -> Optional[list]:
+        """1m candles from the streaming aggregator, or None if not enough are available"""
+        # Candles published by the ingestion process take precedence
+        for source in (self.shared_market_data, self._get_candle_source()):
+            if source is not None and source.candle_count(symbol, "1m") >= limit:
+                ohlcv = source.get_ohlcv(symbol, "1m", limit=limit, include_open=False)
+                if ohlcv:
+                    return ohlcv
+        return None
+
+    def _start_market_data_process(self) -> None:
+        """Stream public market data from a child process when configured"""
+        settings = self.config.get("market_data_process", {})
+        if not settings.get("enabled", False) or not self.trade_pairs:
+            return
+
+        if self.market_data_process:
+            # The child's symbol set is fixed; restart it if the pairs changed
+            if set(self.market_data_process.symbols) == set(self.trade_pairs):
+                return
+            self.logger.info("[BOT] Trade pairs changed - restarting market data process")
+            self.exchange.attach(None)
+            self.market_data_process.stop()
+            self.market_data_process = None
+            self.shared_market_data = None
+
+        try:
+            from src.websocket.market_data_process import MarketDataProcess
+            from src.websocket.shared_market_data import seqlock_supported
+
+            if not seqlock_supported():
+                self.logger.warning(
+                    "[BOT] Shared market data needs x86-64 memory ordering - "
+                    "keeping ingestion in process"
+                )
+                return
+
+            self.market_data_process = MarketDataProcess(
+                self.trade_pairs,
+                candle_capacity=settings.get("candle_capacity", 500),
+                book_depth=settings.get("book_depth", 10),
+            )
+            self.shared_market_data = self.market_data_process.start()
+            self.logger.info(
+                f"[BOT] Market data ingestion isolated in process "
+                f"{self.market_data_process.process.pid}"
+            )
+        except Exception as e:
+            self.logger.warning(f"[BOT] Market data process startup failed: {e}")
+            self.market_data_process = None
+            self.shared_market_data = None
+            return
+
+        # Ticker and candle reads through the exchange client now hit shared memory
+        self.exchange.attach(self.shared_market_data)
+
+        # The child owns the public channels; the in-process socket keeps balances only
+        if self.websocket_manager and hasattr(self.websocket_manager, "symbols"):
+            self.websocket_manager.symbols = []
+
+    def _start_strategy_scheduler(self) -> None:
+        """Evaluate strategies on market events instead of the 1s main loop poll"""
+        settings = self.config.get("event_driven_strategies", {})
+        if not settings.get("enabled", False) or not self.strategy_manager:
+            return
+
+        # Only a client that emits ticker/book/trade events can replace the poll
+        source = self.websocket_manager
+        events = [
+            event
+            for event in ("ticker", "book", "trade")
+            if event in (getattr(source, "callbacks", None) or {})
+        ]
+        if not events or not hasattr(source, "register_callback") or self.shared_market_data:
+            # Public channels stream in the market data process when it runs
+            self.logger.warning(
+                "[BOT] No market event source - strategies stay on the 1s main loop poll"
+            )
+            return
+
+        from src.core.strategy_scheduler import EventDrivenScheduler
+
+        self.strategy_scheduler = EventDrivenScheduler(
+            on_signals=self._handle_signals,
+            fallback_interval=settings.get("fallback_interval", 1.0),
+            default_debounce=settings.get("debounce_ms", 50) / 1000,
+            default_max_rate=settings.get("max_rate_hz", 10.0),
+        )
+
+        # Per-strategy overrides: {"strategy_manager": {"debounce_ms": .., "max_rate_hz": ..}}
+        overrides = settings.get("strategies", {}).get("strategy_manager", {})
+        debounce_ms = overrides.get("debounce_ms")
+        self.strategy_scheduler.register(
+            "strategy_manager",
+            lambda symbols: self._collect_strategy_signals(),
+            symbols=self.trade_pairs,
+            debounce=debounce_ms / 1000 if debounce_ms is not None else None,
+            max_rate=overrides.get("max_rate_hz"),
+            timeout=self.config.get("strategy_check_timeout", 10.0) + 1.0,
+        )
+
+        for event in events:
+            source.register_callback(event, self._on_market_event)
+
+        self.strategy_scheduler.start()
+
+    async def _on_market_event(self, updates: Any) -> None:
+        """Mark symbols with new ticker/book/trade data dirty for the scheduler"""
+        if not self.strategy_scheduler:
+            return
+
+        event_time = time.time()
+        if not isinstance(updates, list):
+            updates = [updates]
+        for update in updates:
+            if isinstance(update, dict):
+                symbol = update.get("symbol")
+            else:
+                symbol = getattr(update, "symbol", None)
+            if symbol:
+                self.strategy_scheduler.mark_dirty(symbol, event_time)
+
     async def _load_historical_data(self) -> None:
         """Prefill historical data for all trading pairs"""
         for symbol in self.trade_pairs:
             try:
-                # Fetch recent OHLC data
-                ohlc_data = await self.exchange.fetch_ohlcv(
-                    symbol=symbol, timeframe="1m", limit=100
-                )
+                ohlc_data = self._get_streamed_ohlcv(symbol)
+                if ohlc_data is None:
+                    # Fetch recent OHLC data
+                    ohlc_data = await self.exchange.fetch_ohlcv(
+                        symbol=symbol, timeframe="1m", limit=100
+                    )
+                    # Seed streaming candles so later loads need no REST call
+                    if ohlc_data:
+                        self._get_candle_source().seed(symbol, "1m", ohlc_data)
 
                 if ohlc_data:
+                    self.market_data_cache[symbol] = ohlc_data
+
                     # Store in strategy manager
                     if hasattr(self.strategy_manager, "price_history"):
                         self.strategy_manager.price_history[symbol] = ohlc_data
@@ -1059,20 +1251,24 @@ class KrakenTradingBot:
         try:
             self.logger.info("[DATA] Loading historical market data for strategy warm-up...")
 
-            # Create a shared data store if not exists
-            if not hasattr(self, "market_data_cache"):
-                self.market_data_cache = {}
-
             # Load data for each trading pair
             for symbol in self.trade_pairs:
                 try:
-                    # Fetch enough candles for indicators (100 for most strategies)
-                    self.logger.info(f"[DATA] Fetching historical data for {symbol}...")
-                    ohlcv_data = await self.exchange.fetch_ohlcv(
-                        symbol=symbol,
-                        timeframe="1m",
-                        limit=100,  # Enough for RSI, MACD, Bollinger Bands
-                    )
+                    # Prefer candles already streamed/prefilled over another REST round trip
+                    ohlcv_data = self._get_streamed_ohlcv(symbol)
+                    if ohlcv_data is None and len(self.market_data_cache.get(symbol, [])) >= 100:
+                        ohlcv_data = self.market_data_cache[symbol]
+
+                    if ohlcv_data is None:
+                        # Fetch enough candles for indicators (100 for most strategies)
+                        self.logger.info(f"[DATA] Fetching historical data for {symbol}...")
+                        ohlcv_data = await self.exchange.fetch_ohlcv(
+                            symbol=symbol,
+                            timeframe="1m",
+                            limit=100,  # Enough for RSI, MACD, Bollinger Bands
+                        )
+                        if ohlcv_data:
+                            self._get_candle_source().seed(symbol, "1m", ohlcv_data)
 
                     if ohlcv_data and len(ohlcv_data) > 0:
                         # Store in cache
@@ -1293,6 +1489,8 @@ class KrakenTradingBot:
         self._background_tasks = []
 
         try:
+            self._start_strategy_scheduler()
+
             # Start WebSocket message processing (compatibility task) - optional
             try:
                 if hasattr(self, "websocket_manager") and self.websocket_manager:
@@ -1384,6 +1582,9 @@ class KrakenTradingBot:
                     if loop_count % 10 == 0:  # Heartbeat every 10 seconds
                         self.logger.info(f"[BOT] Main loop heartbeat - iteration {loop_count}")
 
+                        if self.market_data_process:
+                            self.market_data_process.ensure_running()
+
                         # Check WebSocket data freshness every 10 iterations
                         if hasattr(self, "websocket_manager") and self.websocket_manager:
                             try:
@@ -1392,7 +1593,9 @@ class KrakenTradingBot:
                                 self.logger.error(f"[BOT] Error checking WebSocket freshness: {e}")
 
                     self.logger.debug(f"[BOT] Running main loop iteration {loop_count}...")
-                    await self.run_once()
+                    # Strategies run from market events when the scheduler is active;
+                    # the remaining sources keep their 1s cadence
+                    await self.run_once(include_strategies=self.strategy_scheduler is None)
                     await asyncio.sleep(1)
 
             except KeyboardInterrupt:
@@ -1414,8 +1617,14 @@ class KrakenTradingBot:
 
             self.logger.info("[BOT] All background tasks cancelled")
 
-    async def run_once(self) -> None:
-        """Single iteration of main loop - unified signal collection"""
+    async def run_once(self, include_strategies: bool = True) -> None:
+        """
+        Single iteration of main loop - unified signal collection
+
+        Args:
+            include_strategies: Also poll the strategy manager (False when the
+                event-driven scheduler evaluates strategies on market events)
+        """
         try:
             time.time()
             self.logger.debug("[BOT] Starting run_once iteration")
@@ -1449,44 +1658,9 @@ class KrakenTradingBot:
                 except Exception as e:
                     self.logger.error(f"[INFINITY] Error getting signals: {e}")
 
-            # 2. Strategy signals (LEGACY - with configurable timeout)
-            if self.strategy_manager:
-                try:
-                    self.logger.debug("[BOT] Checking strategy signals...")
-                    # Use configurable timeout with default of 10s
-                    strategy_timeout = self.config.get("strategy_check_timeout", 10.0)
-
-                    # Run strategies concurrently with individual timeouts
-                    strategy_signals = await asyncio.wait_for(
-                        self.strategy_manager.check_all_strategies_concurrent(),
-                        timeout=strategy_timeout,
-                    )
-
-                    if strategy_signals:
-                        all_signals.extend(strategy_signals)
-                        self.logger.debug(f"[BOT] Found {len(strategy_signals)} strategy signals")
-
-                    # Log strategy performance metrics
-                    if hasattr(self.strategy_manager, "get_performance_metrics"):
-                        metrics = self.strategy_manager.get_performance_metrics()
-                        slow_strategies = metrics.get("slow_strategies", [])
-                        if slow_strategies:
-                            self.logger.warning(
-                                f"[BOT] Slow strategies detected: {slow_strategies}"
-                            )
-
-                except asyncio.TimeoutError:
-                    self.logger.warning(f"[BOT] Strategy check timed out after {strategy_timeout}s")
-                    # Try to get partial results if available
-                    if hasattr(self.strategy_manager, "get_partial_results"):
-                        partial_signals = self.strategy_manager.get_partial_results()
-                        if partial_signals:
-                            all_signals.extend(partial_signals)
-                            self.logger.info(
-                                f"[BOT] Retrieved {len(partial_signals)} partial signals after timeout"
-                            )
-                except Exception as e:
-                    self.logger.error(f"[BOT] Strategy check error: {e}", exc_info=True)
+            # 2. Strategy signals (LEGACY) - event-driven when the scheduler runs them
+            if include_strategies and self.strategy_manager:
+                all_signals.extend(await self._collect_strategy_signals())
 
             # 3. Opportunity scanner signals - ENHANCED
             if self.opportunity_scanner:
@@ -1595,83 +1769,120 @@ class KrakenTradingBot:
 
             self.logger.info(f"[BOT] Total signals collected: {len(all_signals)}")
 
-            # Handle no signals gracefully
-            if not all_signals:
-                self.logger.debug(
-                    "[BOT] No trading signals generated this cycle - waiting for opportunities"
-                )
-            else:
-                # DIRECT EXECUTION - Execute high confidence signals immediately
-                self.logger.info(f"[BOT] Processing {len(all_signals)} signals for execution")
+            await self._handle_signals(all_signals)
 
-                # Sort by confidence and filter
-                sorted_signals = sorted(
-                    all_signals, key=lambda x: x.get("confidence", 0), reverse=True
-                )
+        except Exception as e:
+            self.logger.error(f"[MAIN] Error in run_once: {e}")
 
-                # Route through HFT controller if enabled for fee-free micro-scalping
-                if self.hft_controller and self.config.get("fee_free_scalping", {}).get(
-                    "enabled", False
-                ):
-                    # Convert signals to HFT format and process
-                    hft_signals = []
-                    for signal in sorted_signals:
-                        if signal.get("confidence", 0) >= 0.1:  # Ultra-low threshold for HFT
-                            hft_signal = {
-                                "symbol": signal["symbol"],
-                                "side": signal["side"],
-                                "confidence": signal.get("confidence", 0.5),
-                                "profit_target": self.config.get("fee_free_scalping", {}).get(
-                                    "profit_target", 0.002
-                                ),
-                                "stop_loss": self.config.get("fee_free_scalping", {}).get(
-                                    "stop_loss", 0.001
-                                ),
-                                "metadata": {
-                                    "source": signal.get("source", "unknown"),
-                                    "reason": signal.get("reason", ""),
-                                    "momentum": signal.get("momentum", 0),
-                                    "volume_spike": signal.get("volume_spike", 1.0),
-                                    "spread": signal.get("spread", 0),
-                                },
-                            }
-                            hft_signals.append(hft_signal)
-
-                    if hft_signals:
-                        self.logger.info(
-                            f"[BOT] Routing {len(hft_signals)} signals to HFT controller"
-                        )
-                        await self.hft_controller.process_signals(hft_signals)
-                else:
-                    # Normal execution path when HFT is not enabled
-                    # Execute top signals directly (bypass queue for immediate execution)
-                    for signal in sorted_signals[:3]:  # Max 3 per cycle
-                        if (
-                            signal.get("confidence", 0) >= 0.2
-                        ):  # Very low threshold for more signals
-                            try:
-                                await self._execute_signal(signal)
-                                await asyncio.sleep(0.5)  # Small delay between trades
-                            except Exception as e:
-                                self.logger.error(f"[BOT] Error executing signal: {e}")
+    async def _collect_strategy_signals(self) -> list:
+        """Evaluate the strategy manager with its configured timeout"""
+        signals = []
+        try:
+            self.logger.debug("[BOT] Checking strategy signals...")
+            # Use configurable timeout with default of 10s
+            strategy_timeout = self.config.get("strategy_check_timeout", 10.0)
+
+            # Run strategies concurrently with individual timeouts
+            strategy_signals = await asyncio.wait_for(
+                self.strategy_manager.check_all_strategies_concurrent(),
+                timeout=strategy_timeout,
+            )
 
-                # Also add to batch for normal processing
-                async with self.signal_batch_lock:
-                    self.signal_batch.extend(all_signals)
-                    current_time = time.time()
+            if strategy_signals:
+                signals.extend(strategy_signals)
+                self.logger.debug(f"[BOT] Found {len(strategy_signals)} strategy signals")
+
+            # Log strategy performance metrics
+            if hasattr(self.strategy_manager, "get_performance_metrics"):
+                metrics = self.strategy_manager.get_performance_metrics()
+                slow_strategies = metrics.get("slow_strategies", [])
+                if slow_strategies:
+                    self.logger.warning(f"[BOT] Slow strategies detected: {slow_strategies}")
+
+        except asyncio.TimeoutError:
+            self.logger.warning(f"[BOT] Strategy check timed out after {strategy_timeout}s")
+            # Try to get partial results if available
+            if hasattr(self.strategy_manager, "get_partial_results"):
+                partial_signals = self.strategy_manager.get_partial_results()
+                if partial_signals:
+                    signals.extend(partial_signals)
+                    self.logger.info(
+                        f"[BOT] Retrieved {len(partial_signals)} partial signals after timeout"
+                    )
+        except Exception as e:
+            self.logger.error(f"[BOT] Strategy check error: {e}", exc_info=True)
+        return signals
 
-                    # Process batch if window has elapsed or we have many signals
-                    if (
-                        current_time - self.last_batch_time >= self.batch_window
-                        or len(self.signal_batch) >= 15
-                    ):
-                        # Process the batch
-                        await self._process_signal_batch(self.signal_batch.copy())
-                        self.signal_batch.clear()
-                        self.last_batch_time = current_time
+    async def _handle_signals(self, all_signals: list) -> None:
+        """Execute and batch collected signals (shared by polling and event-driven paths)"""
+        # Handle no signals gracefully
+        if not all_signals:
+            self.logger.debug(
+                "[BOT] No trading signals generated this cycle - waiting for opportunities"
+            )
+        else:
+            # DIRECT EXECUTION - Execute high confidence signals immediately
+            self.logger.info(f"[BOT] Processing {len(all_signals)} signals for execution")
 
-        except Exception as e:
-            self.logger.error(f"[MAIN] Error in run_once: {e}")
+            # Sort by confidence and filter
+            sorted_signals = sorted(all_signals, key=lambda x: x.get("confidence", 0), reverse=True)
+
+            # Route through HFT controller if enabled for fee-free micro-scalping
+            if self.hft_controller and self.config.get("fee_free_scalping", {}).get(
+                "enabled", False
+            ):
+                # Convert signals to HFT format and process
+                hft_signals = []
+                for signal in sorted_signals:
+                    if signal.get("confidence", 0) >= 0.1:  # Ultra-low threshold for HFT
+                        hft_signal = {
+                            "symbol": signal["symbol"],
+                            "side": signal["side"],
+                            "confidence": signal.get("confidence", 0.5),
+                            "profit_target": self.config.get("fee_free_scalping", {}).get(
+                                "profit_target", 0.002
+                            ),
+                            "stop_loss": self.config.get("fee_free_scalping", {}).get(
+                                "stop_loss", 0.001
+                            ),
+                            "metadata": {
+                                "source": signal.get("source", "unknown"),
+                                "reason": signal.get("reason", ""),
+                                "momentum": signal.get("momentum", 0),
+                                "volume_spike": signal.get("volume_spike", 1.0),
+                                "spread": signal.get("spread", 0),
+                            },
+                        }
+                        hft_signals.append(hft_signal)
+
+                if hft_signals:
+                    self.logger.info(f"[BOT] Routing {len(hft_signals)} signals to HFT controller")
+                    await self.hft_controller.process_signals(hft_signals)
+            else:
+                # Normal execution path when HFT is not enabled
+                # Execute top signals directly (bypass queue for immediate execution)
+                for signal in sorted_signals[:3]:  # Max 3 per cycle
+                    if signal.get("confidence", 0) >= 0.2:  # Very low threshold for more signals
+                        try:
+                            await self._execute_signal(signal)
+                            await asyncio.sleep(0.5)  # Small delay between trades
+                        except Exception as e:
+                            self.logger.error(f"[BOT] Error executing signal: {e}")
+
+            # Also add to batch for normal processing
+            async with self.signal_batch_lock:
+                self.signal_batch.extend(all_signals)
+                current_time = time.time()
+
+                # Process batch if window has elapsed or we have many signals
+                if (
+                    current_time - self.last_batch_time >= self.batch_window
+                    or len(self.signal_batch) >= 15
+                ):
+                    # Process the batch
+                    await self._process_signal_batch(self.signal_batch.copy())
+                    self.signal_batch.clear()
+                    self.last_batch_time = current_time
 
     async def _process_signal_queue(self) -> None:
         """Process signals from queue - unified execution pipeline"""
@@ -1935,6 +2146,11 @@ class KrakenTradingBot:
             # Send to HFT controller for high-frequency execution
             await self.hft_controller.process_signals(sorted_signals)
             self.logger.info(f"[BOT] Routed {len(sorted_signals)} signals to HFT controller")
+        elif self.order_batcher:
+            try:
+                await self._execute_signal_batch(sorted_signals)
+            except Exception as e:
+                self.logger.error(f"[BATCH_EXECUTE] Error executing signal batch: {e}")
         else:
             # Add signals to queue for normal processing
             for signal in sorted_signals:
@@ -2129,18 +2345,7 @@ class KrakenTradingBot:
             # BALANCE FIX: Force fresh balance before trade
             if side == "buy":
                 self.logger.info(f"[BALANCE_FIX] Pre-trade balance check for {symbol}")
-                try:
-                    if hasattr(self.balance_manager, "force_fresh_balance"):
-                        fresh_balance = await self.balance_manager.force_fresh_balance("USDT")
-                        self.logger.info(f"[BALANCE_FIX] Fresh balance: ${fresh_balance:.2f}")
-                        balance = fresh_balance
-                    else:
-                        # Fallback to regular balance fetch
-                        balance = await self.balance_manager.get_balance_for_asset("USDT")
-                except Exception as e:
-                    self.logger.error(f"[BALANCE_FIX] Failed to get fresh balance: {e}")
-                    # Fallback to regular balance fetch
-                    balance = await self.balance_manager.get_balance_for_asset("USDT")
+                balance = await self._fresh_usdt_balance()
             else:
                 # For sell orders, regular balance check is fine
                 balance = await self.balance_manager.get_balance_for_asset("USDT")
@@ -2149,24 +2354,7 @@ class KrakenTradingBot:
                 self.logger.warning(
                     f"[EXECUTE] Insufficient balance: ${balance:.2f} < ${amount_usdt:.2f}"
                 )
-
-                # Check if we should generate liquidation signals
-                if self.opportunity_scanner and hasattr(
-                    self.opportunity_scanner, "check_liquidation_opportunities"
-                ):
-                    liquidation_signals = (
-                        await self.opportunity_scanner.check_liquidation_opportunities(
-                            symbol, amount_usdt
-                        )
-                    )
-                    if liquidation_signals:
-                        self.logger.info(
-                            f"[EXECUTE] Generated {len(liquidation_signals)} liquidation signals to free up capital"
-                        )
-                        # Add liquidation signals to queue with high priority
-                        for liq_signal in liquidation_signals:
-                            liq_signal["priority"] = "high"
-                            await self.signal_queue.put(liq_signal)
+                await self._request_liquidation(symbol, amount_usdt)
                 return
 
             # Execute trade through trade executor
@@ -2176,42 +2364,7 @@ class KrakenTradingBot:
                 )
 
                 if result and result.get("success"):
-                    self.logger.info(
-                        f"[EXECUTE] ✓ Trade successful: {side} ${amount_usdt:.2f} of {symbol}"
-                    )
-                    self.metrics["total_trades"] += 1
-                    self.last_trade_time = time.time()
-
-                    # Add position to position cycler if it's a buy order
-                    if self.position_cycler and side == "buy":
-                        entry_price = result.get("price", result.get("average_price", 0))
-                        if entry_price:
-                            self.position_cycler.add_position(
-                                symbol=symbol,
-                                side="buy",
-                                size=amount_usdt,
-                                entry_price=entry_price,
-                                profit_target=signal.get("profit_target", 0.002),
-                                stop_loss=signal.get("stop_loss", 0.001),
-                                metadata={"source": signal.get("source", "unknown")},
-                            )
-
-                    # Remove position from cycler if it's a sell order
-                    elif self.position_cycler and side == "sell":
-                        self.position_cycler.remove_position(symbol, reason="manual_sell")
-                        # Notify HFT controller if active
-                        if self.hft_controller:
-                            await self.hft_controller.on_position_closed(symbol)
-
-                    # Force capital deployment check after successful trade
-                    if self.opportunity_scanner and hasattr(
-                        self.opportunity_scanner, "force_capital_check"
-                    ):
-                        deployment_status = await self.opportunity_scanner.force_capital_check()
-                        self.logger.info(
-                            f"[CAPITAL_CHECK] Post-trade deployment: {deployment_status['deployment_percentage']:.1f}% - "
-                            f"Available: ${deployment_status['available_usdt']:.2f}"
-                        )
+                    await self._on_trade_executed(signal, symbol, side, amount_usdt, result)
                 else:
                     error = result.get("error", "Unknown error") if result else "No result"
                     self.logger.error(f"[EXECUTE] X Trade failed: {error}")
@@ -2224,6 +2377,180 @@ class KrakenTradingBot:
 
             self.logger.error(traceback.format_exc())
 
+    async def _fresh_usdt_balance(self) -> float:
+        """USDT balance refreshed from the exchange, for pre-trade checks on buys"""
+        try:
+            if hasattr(self.balance_manager, "force_fresh_balance"):
+                fresh_balance = await self.balance_manager.force_fresh_balance("USDT")
+                self.logger.info(f"[BALANCE_FIX] Fresh balance: ${fresh_balance:.2f}")
+                return fresh_balance
+            # Fallback to regular balance fetch
+            return await self.balance_manager.get_balance_for_asset("USDT")
+        except Exception as e:
+            self.logger.error(f"[BALANCE_FIX] Failed to get fresh balance: {e}")
+            # Fallback to regular balance fetch
+            return await self.balance_manager.get_balance_for_asset("USDT")
+
+    async def _request_liquidation(self, symbol: str, amount_usdt: float) -> None:
+        """Queue liquidation signals to free capital for a buy the balance cannot cover"""
+        if self.opportunity_scanner and hasattr(
+            self.opportunity_scanner, "check_liquidation_opportunities"
+        ):
+            liquidation_signals = await self.opportunity_scanner.check_liquidation_opportunities(
+                symbol, amount_usdt
+            )
+            if liquidation_signals:
+                self.logger.info(
+                    f"[EXECUTE] Generated {len(liquidation_signals)} liquidation signals "
+                    f"to free up capital"
+                )
+                # Add liquidation signals to queue with high priority
+                for liq_signal in liquidation_signals:
+                    liq_signal["priority"] = "high"
+                    await self.signal_queue.put(liq_signal)
+
+    async def _on_trade_executed(
+        self,
+        signal: dict[str, Any],
+        symbol: str,
+        side: str,
+        amount_usdt: float,
+        result: dict[str, Any],
+    ) -> None:
+        """Update metrics, position cycler and capital state after a filled trade"""
+        self.logger.info(f"[EXECUTE] ✓ Trade successful: {side} ${amount_usdt:.2f} of {symbol}")
+        self.metrics["total_trades"] += 1
+        self.last_trade_time = time.time()
+
+        # Add position to position cycler if it's a buy order
+        if self.position_cycler and side == "buy":
+            entry_price = result.get("price", result.get("average_price", 0))
+            if entry_price:
+                self.position_cycler.add_position(
+                    symbol=symbol,
+                    side="buy",
+                    size=amount_usdt,
+                    entry_price=entry_price,
+                    profit_target=signal.get("profit_target", 0.002),
+                    stop_loss=signal.get("stop_loss", 0.001),
+                    metadata={"source": signal.get("source", "unknown")},
+                )
+
+        # Remove position from cycler if it's a sell order
+        elif self.position_cycler and side == "sell":
+            self.position_cycler.remove_position(symbol, reason="manual_sell")
+            # Notify HFT controller if active
+            if self.hft_controller:
+                await self.hft_controller.on_position_closed(symbol)
+
+        # Force capital deployment check after successful trade
+        if self.opportunity_scanner and hasattr(self.opportunity_scanner, "force_capital_check"):
+            deployment_status = await self.opportunity_scanner.force_capital_check()
+            self.logger.info(
+                f"[CAPITAL_CHECK] Post-trade deployment: {deployment_status['deployment_percentage']:.1f}% - "
+                f"Available: ${deployment_status['available_usdt']:.2f}"
+            )
+
+    async def _execute_signal_batch(self, signals: list[dict[str, Any]]) -> None:
+        """
+        Execute a signal batch with same-pair signals grouped into AddOrderBatch
+        requests.
+
+        Signals without a same-pair, same-side partner, and groups whose price
+        is unavailable, are executed one by one through ``_execute_signal``
+        (they are already validated, so they do not go back through the
+        deduplicating queue). Batched orders get the same pre-trade checks:
+        a fresh USDT balance for buys (with liquidation signals when short),
+        sells capped at the held amount, and the pair's minimum order cost.
+        """
+        groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        for signal in signals:
+            if self._validate_signal(signal):
+                groups.setdefault((signal["symbol"], signal["side"]), []).append(signal)
+
+        tier = self.config.get("kraken_api_tier", "starter")
+        orders = []
+        pending = []  # (signal, symbol, side, amount_usdt) per order
+        available_usdt = None
+        for (symbol, side), group in groups.items():
+            price = await self._batch_price(symbol, side) if len(group) > 1 else None
+            if not price:
+                for signal in group:
+                    await self._execute_signal(signal)
+                continue
+
+            base = symbol.split("/")[0]
+            minimum_cost = calculate_minimum_cost(base, price, tier)
+            if side == "buy":
+                if available_usdt is None:
+                    available_usdt = (
+                        await self._fresh_usdt_balance() if self.balance_manager else 0.0
+                    )
+            else:
+                held = (
+                    await self.balance_manager.get_balance_for_asset(base)
+                    if self.balance_manager
+                    else 0.0
+                )
+
+            for signal in group:
+                amount_usdt = max(
+                    MINIMUM_ORDER_SIZE_TIER1,
+                    signal.get(
+                        "amount_usdt",
+                        self.config.get("min_order_size_usdt", MINIMUM_ORDER_SIZE_TIER1),
+                    ),
+                )
+                amount = amount_usdt / price
+                if side == "sell":
+                    # Never sell more than is held
+                    amount = min(amount, held)
+                    amount_usdt = amount * price
+
+                if amount_usdt < minimum_cost:
+                    self.logger.warning(
+                        f"[BATCH_EXECUTE] {symbol} {side} ${amount_usdt:.2f} below pair "
+                        f"minimum ${minimum_cost:.2f}, skipped"
+                    )
+                    continue
+
+                if side == "buy":
+                    if available_usdt < amount_usdt:
+                        self.logger.warning(
+                            f"[BATCH_EXECUTE] Insufficient balance for {symbol}: "
+                            f"${available_usdt:.2f} < ${amount_usdt:.2f}"
+                        )
+                        await self._request_liquidation(symbol, amount_usdt)
+                        break
+                    available_usdt -= amount_usdt
+                else:
+                    held -= amount
+
+                orders.append({"symbol": symbol, "type": "market", "side": side, "amount": amount})
+                pending.append((signal, symbol, side, amount_usdt))
+
+        if not orders:
+            return
+
+        self.logger.info(f"[BATCH_EXECUTE] Submitting {len(orders)} orders in batches")
+        results = await self.order_batcher.submit(orders)
+        for (signal, symbol, side, amount_usdt), result in zip(pending, results):
+            if result["success"]:
+                order = result["order"]
+                filled = {"price": order.get("average") or order.get("price")}
+                await self._on_trade_executed(signal, symbol, side, amount_usdt, filled)
+            else:
+                self.logger.error(f"[EXECUTE] X Trade failed: {result['error']}")
+
+    async def _batch_price(self, symbol: str, side: str) -> Optional[float]:
+        """Touch price a batched market order is sized at, or None if unavailable"""
+        try:
+            ticker = await self.exchange.fetch_ticker(symbol)
+        except Exception as e:
+            self.logger.error(f"[BATCH_EXECUTE] Ticker for {symbol} failed: {e}")
+            return None
+        return ticker.get("ask" if side == "buy" else "bid") or ticker.get("last")
+
     async def _handle_unified_ticker_update(
         self, symbol: str, ticker: dict[str, Any], source=None
     ) -> None:
@@ -2986,10 +3313,10 @@ class KrakenTradingBot:
                 self.config["kraken"]["use_official_sdk"] = True
 
                 # SDK exchange no longer available - use native implementation recovery
-                if (
-                    hasattr(self.exchange, "__class__")
-                    and "Native" in self.exchange.__class__.__name__
-                ):
+                exchange = self.exchange
+                while hasattr(exchange, "wrapped"):
+                    exchange = exchange.wrapped
+                if hasattr(exchange, "__class__") and "Native" in exchange.__class__.__name__:
                     # Try to reinitialize the native exchange
                     try:
                         await self.exchange.close()
@@ -3152,6 +3479,13 @@ class KrakenTradingBot:
         # Set shutdown event to signal all components
         self.shutdown_event.set()
 
+        if self.strategy_scheduler:
+            try:
+                await self.strategy_scheduler.stop()
+                self.logger.info("[BOT] Strategy scheduler stopped")
+            except Exception as e:
+                self.logger.error(f"[BOT] Error stopping strategy scheduler: {e}")
+
         # Stop data coordinator API worker
         try:
             if hasattr(self, "data_coordinator") and self.data_coordinator:
@@ -3229,6 +3563,12 @@ class KrakenTradingBot:
             except Exception as e:
                 self.logger.error(f"[SHUTDOWN] Error stopping trade executor: {e}")
 
+        if self.rate_limiter:
+            try:
+                await self.rate_limiter.stop()  # Saves learned limits
+            except Exception as e:
+                self.logger.error(f"[SHUTDOWN] Error stopping rate limiter: {e}")
+
         # Phase 4: Stop WebSocket managers (both v1 and v2)
         if hasattr(self, "websocket_manager") and self.websocket_manager:
             try:
@@ -3237,6 +3577,15 @@ class KrakenTradingBot:
             except Exception as e:
                 self.logger.error(f"[SHUTDOWN] Error closing WebSocket: {e}")
 
+        if self.market_data_process:
+            try:
+                self.logger.info("[SHUTDOWN] Stopping market data process...")
+                self.exchange.attach(None)
+                self.market_data_process.stop()
+                self.shared_market_data = None
+            except Exception as e:
+                self.logger.error(f"[SHUTDOWN] Error stopping market data process: {e}")
+
         # Also stop WebSocket v2 if it exists
         if hasattr(self, "websocket_v2") and self.websocket_v2:
             try:
@@ -3404,6 +3753,9 @@ class KrakenTradingBot:
             "trading_mode": "paper"
             if os.environ.get("PAPER_TRADING_ENABLED") == "true"
             else "live",
+            "strategy_scheduler": self.strategy_scheduler.get_metrics()
+            if self.strategy_scheduler
+            else None,
         }
 
     def set_strategy(self, strategy):
@@ -3429,6 +3781,9 @@ class KrakenTradingBot:
         if self.fast_order_router:
             metrics["routing"] = self.fast_order_router.get_performance_stats()
 
+        if self.strategy_scheduler:
+            metrics["tick_to_signal_latency"] = self.strategy_scheduler.latency.to_dict()
+
         return metrics
 
     async def shutdown(self):
@@ -0,0 +1,371 @@
+"""
+Event-Driven Strategy Scheduler
+===============================
+
+Runs strategy evaluation when market data arrives instead of on a fixed
+one-second poll.
+
+Ticker/book/trade events mark their symbol dirty. Every registered strategy
+subscribed to that symbol is woken, waits out its debounce window so a burst
+of updates is evaluated once, respects its max evaluation rate, and is then
+called with the set of dirty symbols. Strategies that see no events are still
+evaluated every ``fallback_interval`` seconds so a silent feed never stalls
+them.
+
+Tick-to-signal latency (first event on a symbol -> signal for that symbol
+leaves the strategy) is recorded in per-strategy and global histograms.
+"""
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in seconds (Prometheus-style, +Inf implied)
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.002,
+    0.005,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+    0.2,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with cumulative export"""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Record one latency sample in seconds"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bucket bound containing the given fraction of samples"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return bound
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summary with cumulative bucket counts keyed by upper bound"""
+        cumulative = {}
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            cumulative[str(bound)] = seen
+        cumulative["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "buckets": cumulative,
+        }
+
+    def to_prometheus(self, name: str, labels: Optional[dict[str, str]] = None) -> list[str]:
+        """Prometheus text exposition lines"""
+        label_text = ",".join(f'{key}="{value}"' for key, value in (labels or {}).items())
+        prefix = f"{label_text}," if label_text else ""
+        suffix = f"{{{label_text}}}" if label_text else ""
+
+        lines = []
+        for bound, count in self.to_dict()["buckets"].items():
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {count}')
+        lines.append(f"{name}_sum{suffix} {self.sum}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+@dataclass
+class StrategySchedule:
+    """Evaluation policy for one registered strategy"""
+
+    name: str
+    evaluate: Callable  # async (symbols: set[str]) -> list[dict]
+    symbols: Optional[set[str]] = None  # None = every symbol
+    debounce: float = 0.0  # Seconds to coalesce a burst of events
+    min_interval: float = 0.0  # 1 / max evaluation rate
+    timeout: float = 10.0
+
+    # Runtime state
+    dirty: dict[str, float] = field(default_factory=dict)  # symbol -> first event time
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    last_run: float = 0.0
+    runs: int = 0
+    signals: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+class EventDrivenScheduler:
+    """
+    Wakes strategies on market events for the symbols they trade
+    """
+
+    def __init__(
+        self,
+        on_signals: Callable,
+        fallback_interval: float = 5.0,
+        default_debounce: float = 0.0,
+        default_max_rate: Optional[float] = None,
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            on_signals: Async callable receiving each non-empty signal list
+            fallback_interval: Evaluate every strategy at least this often (seconds)
+            default_debounce: Debounce for strategies registered without one (seconds)
+            default_max_rate: Max evaluations per second when not set per strategy
+        """
+        self.on_signals = on_signals
+        self.fallback_interval = fallback_interval
+        self.default_debounce = default_debounce
+        self.default_max_rate = default_max_rate
+
+        self.schedules: dict[str, StrategySchedule] = {}
+        self._by_symbol: dict[str, list[StrategySchedule]] = {}
+        self._wildcard: list[StrategySchedule] = []
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.running = False
+
+        self.latency = LatencyHistogram()
+        self.events = 0
+
+    def register(
+        self,
+        name: str,
+        evaluate: Callable,
+        symbols: Optional[Iterable[str]] = None,
+        debounce: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        timeout: float = 10.0,
+    ) -> StrategySchedule:
+        """
+        Register a strategy
+
+        Args:
+            name: Unique strategy name (used in metrics)
+            evaluate: Async callable taking the set of dirty symbols, returning signals
+            symbols: Symbols the strategy trades (None for all)
+            debounce: Seconds to wait after the first event before evaluating
+            max_rate: Max evaluations per second
+            timeout: Evaluation timeout in seconds
+        """
+        if name in self.schedules:
+            self.unregister(name)
+
+        debounce = self.default_debounce if debounce is None else debounce
+        max_rate = self.default_max_rate if max_rate is None else max_rate
+        schedule = StrategySchedule(
+            name=name,
+            evaluate=evaluate,
+            symbols=set(symbols) if symbols is not None else None,
+            debounce=debounce,
+            min_interval=1.0 / max_rate if max_rate else 0.0,
+            timeout=timeout,
+        )
+        self.schedules[name] = schedule
+
+        if schedule.symbols is None:
+            self._wildcard.append(schedule)
+        else:
+            for symbol in schedule.symbols:
+                self._by_symbol.setdefault(symbol, []).append(schedule)
+
+        if self.running:
+            self._tasks[name] = asyncio.create_task(self._run_schedule(schedule))
+
+        logger.info(
+            f"[SCHEDULER] Registered {name} "
+            f"({len(schedule.symbols) if schedule.symbols is not None else 'all'} symbols, "
+            f"debounce {debounce * 1000:.0f}ms, max rate {max_rate or 'unlimited'}/s)"
+        )
+        return schedule
+
+    def unregister(self, name: str):
+        """Remove a strategy and stop its task"""
+        schedule = self.schedules.pop(name, None)
+        if schedule is None:
+            return
+
+        if schedule in self._wildcard:
+            self._wildcard.remove(schedule)
+        for symbol in schedule.symbols or ():
+            subscribers = self._by_symbol.get(symbol, [])
+            if schedule in subscribers:
+                subscribers.remove(schedule)
+
+        task = self._tasks.pop(name, None)
+        if task and not task.done():
+            task.cancel()
+
+    def update_symbols(self, name: str, symbols: Iterable[str]):
+        """Change the symbols a registered strategy is woken for"""
+        schedule = self.schedules.get(name)
+        if schedule is None or schedule.symbols is None:
+            return
+
+        for symbol in schedule.symbols:
+            subscribers = self._by_symbol.get(symbol, [])
+            if schedule in subscribers:
+                subscribers.remove(schedule)
+        schedule.symbols = set(symbols)
+        for symbol in schedule.symbols:
+            self._by_symbol.setdefault(symbol, []).append(schedule)
+
+    def mark_dirty(self, symbol: str, event_time: Optional[float] = None):
+        """
+        Record a market event for a symbol and wake its strategies
+
+        Cheap and synchronous so it can be called from any feed callback.
+        """
+        self.events += 1
+        if event_time is None:
+            event_time = time.time()
+
+        for schedule in self._by_symbol.get(symbol, ()):
+            if symbol not in schedule.dirty:
+                schedule.dirty[symbol] = event_time
+            schedule.wakeup.set()
+
+        for schedule in self._wildcard:
+            if symbol not in schedule.dirty:
+                schedule.dirty[symbol] = event_time
+            schedule.wakeup.set()
+
+    def start(self):
+        """Start one evaluation task per strategy"""
+        self.running = True
+        for name, schedule in self.schedules.items():
+            task = self._tasks.get(name)
+            if task is None or task.done():
+                self._tasks[name] = asyncio.create_task(self._run_schedule(schedule))
+        logger.info(f"[SCHEDULER] Started {len(self._tasks)} strategy tasks")
+
+    async def stop(self):
+        """Stop all evaluation tasks"""
+        self.running = False
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run_schedule(self, schedule: StrategySchedule):
+        """Evaluation loop for one strategy"""
+        while self.running:
+            try:
+                await asyncio.wait_for(schedule.wakeup.wait(), timeout=self.fallback_interval)
+            except asyncio.TimeoutError:
+                pass  # Fallback evaluation without events
+
+            # Coalesce the burst that woke us, then honour the max rate
+            delay = schedule.debounce
+            if schedule.min_interval:
+                delay = max(delay, schedule.last_run + schedule.min_interval - time.time())
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            schedule.wakeup.clear()
+            dirty = schedule.dirty
+            schedule.dirty = {}
+            await self._evaluate(schedule, dirty)
+
+    async def _evaluate(self, schedule: StrategySchedule, dirty: dict[str, float]):
+        """Run one evaluation and hand signals to the sink"""
+        schedule.last_run = time.time()
+        schedule.runs += 1
+
+        try:
+            signals = await asyncio.wait_for(schedule.evaluate(set(dirty)), timeout=schedule.timeout)
+        except asyncio.TimeoutError:
+            schedule.timeouts += 1
+            logger.warning(f"[SCHEDULER] {schedule.name} timed out after {schedule.timeout}s")
+            return
+        except Exception as e:
+            schedule.errors += 1
+            logger.error(f"[SCHEDULER] {schedule.name} evaluation error: {e}")
+            return
+
+        if not signals:
+            return
+
+        now = time.time()
+        if dirty:
+            earliest = min(dirty.values())
+            for signal in signals:
+                symbol = signal.get("symbol") if isinstance(signal, dict) else None
+                latency = now - dirty.get(symbol, earliest)
+                schedule.latency.observe(latency)
+                self.latency.observe(latency)
+
+        schedule.signals += len(signals)
+        try:
+            await self.on_signals(signals)
+        except Exception as e:
+            logger.error(f"[SCHEDULER] Signal handler error for {schedule.name}: {e}")
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Scheduler, per-strategy and latency metrics"""
+        return {
+            "running": self.running,
+            "events": self.events,
+            "tick_to_signal_latency": self.latency.to_dict(),
+            "strategies": {
+                name: {
+                    "symbols": len(schedule.symbols) if schedule.symbols is not None else None,
+                    "debounce": schedule.debounce,
+                    "min_interval": schedule.min_interval,
+                    "runs": schedule.runs,
+                    "signals": schedule.signals,
+                    "timeouts": schedule.timeouts,
+                    "errors": schedule.errors,
+                    "pending_symbols": len(schedule.dirty),
+                    "tick_to_signal_latency": schedule.latency.to_dict(),
+                }
+                for name, schedule in self.schedules.items()
+            },
+        }
+
+    def export_prometheus(self, name: str = "tick_to_signal_latency_seconds") -> str:
+        """Latency histograms in Prometheus text format"""
+        lines = [f"# TYPE {name} histogram"]
+        lines.extend(self.latency.to_prometheus(name, {"strategy": "all"}))
+        for strategy, schedule in self.schedules.items():
+            lines.extend(schedule.latency.to_prometheus(name, {"strategy": strategy}))
+        return "\n".join(lines) + "\n"
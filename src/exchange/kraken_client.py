@@ -0,0 +1,194 @@
+"""
+Kraken REST Client Factory
+==========================
+
+Builds the synchronous ccxt.kraken clients used by the standalone scripts on
+one process-wide HTTP session, and loads their markets from a local cache.
+
+A default ccxt client opens a fresh requests.Session and calls LoadMarkets
+(AssetPairs + Assets) on its first request. Here, instead:
+- Every client shares a pooled session that keeps TLS connections to
+  api.kraken.com alive between calls. TCP_NODELAY is set and TCP keep-alive
+  probes stop idle connections from being dropped by NAT. DNS is only
+  resolved when a new connection is opened.
+- Markets metadata is written to trading_data/cache (under the repository
+  root, whatever the working directory) and reused until the TTL expires, so
+  a launch does not wait for two public requests. Exchange options that
+  ccxt's fetch_markets derives from the markets (kraken's
+  ``marketsByAltname``) are rebuilt on a cache hit.
+
+ccxt and requests are imported on demand so the markets cache can be used
+with any ccxt-style client.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Connection pool: one host, a few concurrent requests at most per script
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 10
+HTTP_TIMEOUT_MS = 10000
+
+# Seconds before an idle pooled connection is probed
+TCP_KEEPALIVE_IDLE = 30
+TCP_KEEPALIVE_INTERVAL = 10
+
+MARKETS_CACHE_DIR = Path(__file__).resolve().parents[2] / "trading_data" / "cache"
+MARKETS_CACHE_TTL = 6 * 3600
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """
+    Process-wide requests.Session with a tuned keep-alive connection pool.
+
+    Returns:
+        Shared requests.Session
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+
+def _build_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection
+
+    # urllib3's defaults already include TCP_NODELAY
+    socket_options = list(HTTPConnection.default_socket_options)
+    socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, TCP_KEEPALIVE_IDLE))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        socket_options.append(
+            (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, TCP_KEEPALIVE_INTERVAL)
+        )
+
+    class KeepAliveAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs["socket_options"] = socket_options
+            super().init_poolmanager(*args, **kwargs)
+
+    # No transport retries: a retried AddOrder could be placed twice
+    adapter = KeepAliveAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=0,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def create_kraken_client(
+    config: Optional[dict[str, Any]] = None,
+    load_markets: bool = True,
+    markets_ttl: float = MARKETS_CACHE_TTL,
+):
+    """
+    Create a ccxt.kraken client on the shared HTTP session.
+
+    Args:
+        config: ccxt options merged over the defaults (credentials from
+            KRAKEN_KEY/KRAKEN_SECRET, enableRateLimit, timeout)
+        load_markets: Load markets now, from the cache when it is fresh
+        markets_ttl: Maximum cache age in seconds
+
+    Returns:
+        ccxt.kraken instance
+    """
+    import ccxt
+
+    options = {
+        "apiKey": os.getenv("KRAKEN_KEY"),
+        "secret": os.getenv("KRAKEN_SECRET"),
+        "enableRateLimit": True,
+        "timeout": HTTP_TIMEOUT_MS,
+    }
+    options.update(config or {})
+    options["session"] = get_http_session()
+
+    exchange = ccxt.kraken(options)
+    if load_markets:
+        load_cached_markets(exchange, ttl=markets_ttl)
+    return exchange
+
+
+def load_cached_markets(
+    exchange,
+    ttl: float = MARKETS_CACHE_TTL,
+    cache_dir: Path = MARKETS_CACHE_DIR,
+) -> bool:
+    """
+    Load markets from the local cache, fetching and saving them when stale.
+
+    Args:
+        exchange: ccxt-style client (id, markets, currencies, set_markets,
+            load_markets)
+        ttl: Maximum cache age in seconds
+        cache_dir: Cache directory
+
+    Returns:
+        True if the markets came from the cache
+    """
+    cache_file = Path(cache_dir) / f"{exchange.id}_markets.json"
+
+    try:
+        cached = json.loads(cache_file.read_text())
+        if time.time() - cached["saved_at"] < ttl:
+            exchange.set_markets(cached["markets"], cached.get("currencies"))
+            _restore_market_options(exchange)
+            return True
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"[KRAKEN_CLIENT] Ignoring unreadable markets cache {cache_file}: {e}")
+
+    exchange.load_markets(True)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "saved_at": time.time(),
+            "markets": exchange.markets,
+            "currencies": exchange.currencies,
+        }
+        tmp_file = cache_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(payload))
+        os.replace(tmp_file, cache_file)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"[KRAKEN_CLIENT] Could not write markets cache {cache_file}: {e}")
+    return False
+
+
+def _restore_market_options(exchange):
+    """
+    Rebuild the options ccxt's fetch_markets sets alongside the markets.
+
+    set_markets() only indexes markets; kraken's fetch_markets also builds
+    ``options['marketsByAltname']``, which resolves altname pairs (XBTUSDT)
+    in order, trade and ledger responses.
+    """
+    options = getattr(exchange, "options", None)
+    if options is None:
+        return
+    by_altname = {}
+    for market in exchange.markets.values():
+        altname = market.get("altname") or (market.get("info") or {}).get("altname")
+        if altname:
+            by_altname[altname] = market
+    if by_altname:
+        options["marketsByAltname"] = by_altname
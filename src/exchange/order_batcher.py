@@ -0,0 +1,205 @@
+"""
+Batched Order Submission
+========================
+
+Packs orders into Kraken AddOrderBatch requests (2-15 orders, one pair).
+
+A batch costs one private request slot (token bucket, sliding window)
+whatever its size, while penalty points are still charged per order. A
+burst of same-pair signals therefore goes out as a handful of requests
+instead of one AddOrder each, which keeps the 15 requests/minute window
+free for balance and order queries.
+
+Batch sizes follow the rate limiter's current headroom: the first batches
+are cut to the number of orders that fit right now so they are sent
+without waiting, the rest are packed full because they wait for penalty
+decay either way. A lone order for a pair is sent with AddOrder.
+"""
+
+import asyncio
+import logging
+import math
+from typing import Any, Optional
+
+from src.rate_limiting.rate_limit_config import MAX_BATCH_ORDERS, MIN_BATCH_ORDERS
+from src.rate_limiting.request_queue import RequestPriority
+
+logger = logging.getLogger(__name__)
+
+
+class OrderBatcher:
+    """
+    Submit orders through AddOrderBatch, packed by pair and rate limit cost.
+
+    Orders are ccxt-style dicts: symbol, type, side, amount and optionally
+    price and params.
+    """
+
+    def __init__(
+        self,
+        exchange: Any,
+        rate_limiter=None,
+        max_batch_size: int = MAX_BATCH_ORDERS,
+        timeout_seconds: Optional[float] = 30.0,
+    ):
+        """
+        Initialize order batcher.
+
+        Args:
+            exchange: Exchange client (create_orders for batches, create_order
+                for single orders)
+            rate_limiter: KrakenRateLimiter2025 used for cost estimates and
+                waiting; None packs full batches without rate limiting
+            max_batch_size: Orders per batch, capped at Kraken's 15
+            timeout_seconds: Maximum rate limit wait per request
+        """
+        self.exchange = exchange
+        self.rate_limiter = rate_limiter
+        self.max_batch_size = max(MIN_BATCH_ORDERS, min(max_batch_size, MAX_BATCH_ORDERS))
+        self.timeout_seconds = timeout_seconds
+
+        self.stats = {
+            "orders": 0,
+            "batches": 0,
+            "batched_orders": 0,
+            "single_orders": 0,
+            "failed_orders": 0,
+            "requests_saved": 0,
+        }
+
+    def pack(self, orders: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        """
+        Group orders by pair and split them into batches.
+
+        Args:
+            orders: Orders to submit
+
+        Returns:
+            Batches in submission order; single-order batches go via AddOrder
+        """
+        groups: dict[str, list[dict[str, Any]]] = {}
+        for order in orders:
+            groups.setdefault(order["symbol"], []).append(order)
+
+        # Orders that can be sent without waiting (unbounded without a limiter)
+        if self.rate_limiter is not None:
+            headroom = self.rate_limiter.get_order_capacity("AddOrderBatch")
+        else:
+            headroom = math.inf
+
+        batches = []
+        for group in groups.values():
+            start = 0
+            while start < len(group):
+                remaining = len(group) - start
+                if headroom >= MIN_BATCH_ORDERS:
+                    size = min(self.max_batch_size, headroom, remaining)
+                    # Do not strand a single order that could have ridden along
+                    if remaining - size == 1 and size > MIN_BATCH_ORDERS:
+                        size -= 1
+                else:
+                    # Waiting anyway: fewest requests, sizes balanced so that
+                    # no batch is left with a single order
+                    size = math.ceil(remaining / math.ceil(remaining / self.max_batch_size))
+                batches.append(group[start : start + size])
+                headroom -= size
+                start += size
+        return batches
+
+    async def submit(
+        self,
+        orders: list[dict[str, Any]],
+        priority: RequestPriority = RequestPriority.HIGH,
+    ) -> list[dict[str, Any]]:
+        """
+        Submit orders in packed batches.
+
+        Args:
+            orders: Orders to submit
+            priority: Rate limit wait priority
+
+        Returns:
+            One result per order, in input order: {"success": True,
+            "order": <exchange order>} or {"success": False, "error": <text>}
+        """
+        if not orders:
+            return []
+
+        batches = self.pack(orders)
+        batch_results = await asyncio.gather(
+            *(self._submit_batch(batch, priority) for batch in batches)
+        )
+
+        by_order = {}
+        for batch, results in zip(batches, batch_results):
+            for order, result in zip(batch, results):
+                by_order[id(order)] = result
+
+        results = [by_order[id(order)] for order in orders]
+        self.stats["orders"] += len(orders)
+        self.stats["failed_orders"] += sum(1 for result in results if not result["success"])
+        return results
+
+    async def _submit_batch(
+        self, batch: list[dict[str, Any]], priority: RequestPriority
+    ) -> list[dict[str, Any]]:
+        if len(batch) > 1 and not hasattr(self.exchange, "create_orders"):
+            # Client without batch support: one AddOrder per order
+            results = await asyncio.gather(
+                *(self._submit_batch([order], priority) for order in batch)
+            )
+            return [result for single in results for result in single]
+
+        if len(batch) == 1:
+            endpoint, func = "AddOrder", self._create_order
+            self.stats["single_orders"] += 1
+        else:
+            endpoint, func = "AddOrderBatch", self.exchange.create_orders
+            self.stats["batches"] += 1
+            self.stats["batched_orders"] += len(batch)
+            self.stats["requests_saved"] += len(batch) - 1
+
+        try:
+            if self.rate_limiter is not None:
+                placed = await self.rate_limiter.execute_with_rate_limit(
+                    endpoint,
+                    func,
+                    batch,
+                    priority=priority,
+                    timeout_seconds=self.timeout_seconds,
+                    order_count=len(batch),
+                )
+            else:
+                placed = await func(batch)
+        except Exception as e:
+            logger.error(f"[ORDER_BATCH] {endpoint} for {batch[0]['symbol']} failed: {e}")
+            return [{"success": False, "error": str(e)} for _ in batch]
+
+        results = [_order_result(order) for order in placed[: len(batch)]]
+        missing = len(batch) - len(results)
+        if missing:
+            logger.error(f"[ORDER_BATCH] {endpoint} returned no result for {missing} order(s)")
+            results += [{"success": False, "error": "No result returned"} for _ in range(missing)]
+        return results
+
+    async def _create_order(self, batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        order = batch[0]
+        placed = await self.exchange.create_order(
+            order["symbol"],
+            order["type"],
+            order["side"],
+            order["amount"],
+            order.get("price"),
+            order.get("params") or {},
+        )
+        return [placed]
+
+
+def _order_result(placed: Any) -> dict[str, Any]:
+    """Per-order result; AddOrderBatch reports failures per order, not per request."""
+    if isinstance(placed, dict):
+        info = placed.get("info")
+        error = placed.get("error") or (info.get("error") if isinstance(info, dict) else None)
+        if error or not placed.get("id"):
+            return {"success": False, "error": str(error or "Order rejected"), "order": placed}
+    return {"success": True, "order": placed}
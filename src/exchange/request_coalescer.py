@@ -0,0 +1,208 @@
+"""
+Request Coalescing for the Exchange Client
+==========================================
+
+Single-flight and short-lived caching in front of the REST exchange client.
+
+Balance managers, the portfolio manager and the capital monitors each call
+``fetch_balance``/``fetch_ticker`` on their own schedule, often within
+milliseconds of each other. Every private Balance call spends penalty
+points, so identical requests are merged:
+
+- Concurrent calls with the same (method, arguments) share one in-flight
+  request.
+- Results can be served from a cache for a per-method TTL (0 = share
+  in-flight calls only).
+- Order-mutating calls (create/cancel/edit/amend) drop the cache, so a
+  balance read after an order never sees the pre-order balance. Each drop
+  starts a new generation: a read that was already in flight is neither
+  cached nor shared with callers arriving after the drop.
+
+Errors are never cached; every waiter of a failed call receives the error.
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds a result may be reused; 0 shares in-flight calls without caching
+DEFAULT_TTLS: dict[str, float] = {
+    "fetch_balance": 1.0,
+    "fetch_ticker": 0.5,
+    "fetch_tickers": 0.5,
+    "fetch_order_book": 0.0,
+    "fetch_ohlcv": 0.0,
+    "fetch_open_orders": 0.0,
+    "fetch_trading_fees": 60.0,
+}
+
+# Calls that change account state and therefore invalidate cached reads
+MUTATING_PREFIXES = ("create_", "cancel_", "edit_", "amend_")
+
+
+class CoalescingExchange:
+    """
+    Exchange client proxy with single-flight and TTL caching for read methods.
+
+    Every attribute not handled here is delegated to the wrapped client, so
+    the proxy can replace the client anywhere it is passed around.
+    """
+
+    def __init__(
+        self,
+        exchange: Any,
+        ttls: Optional[dict[str, float]] = None,
+        copy_results: bool = True,
+    ):
+        """
+        Initialize coalescing proxy.
+
+        Args:
+            exchange: Exchange client to wrap
+            ttls: Per-method TTL overrides merged into DEFAULT_TTLS; a method
+                mapped to None is not coalesced
+            copy_results: Give every caller its own copy of shared results so
+                one caller mutating a dict cannot corrupt another's
+        """
+        merged = dict(DEFAULT_TTLS)
+        merged.update(ttls or {})
+        object.__setattr__(self, "wrapped", exchange)
+        object.__setattr__(
+            self, "_ttls", {name: ttl for name, ttl in merged.items() if ttl is not None}
+        )
+        object.__setattr__(self, "_copy_results", copy_results)
+        object.__setattr__(self, "_inflight", {})
+        object.__setattr__(self, "_cache", {})
+        # Bumped by invalidate(); results of calls started earlier are stale
+        object.__setattr__(self, "_generation", 0)
+        object.__setattr__(self, "_wrappers", {})
+        object.__setattr__(
+            self,
+            "coalescing_stats",
+            {"calls": 0, "exchange_calls": 0, "cache_hits": 0, "coalesced": 0, "errors": 0},
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        wrapper = self._wrappers.get(name)
+        if wrapper is not None:
+            return wrapper
+
+        attr = getattr(self.wrapped, name)
+        if not callable(attr):
+            return attr
+
+        if name in self._ttls:
+            wrapper = self._make_coalesced(name)
+        elif name.startswith(MUTATING_PREFIXES):
+            wrapper = self._make_invalidating(name)
+        else:
+            return attr
+
+        self._wrappers[name] = wrapper
+        return wrapper
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self.wrapped, name, value)
+
+    def _make_coalesced(self, name: str):
+        async def coalesced(*args, **kwargs):
+            return await self._call(name, args, kwargs)
+
+        coalesced.__name__ = name
+        return coalesced
+
+    def _make_invalidating(self, name: str):
+        method = getattr(self.wrapped, name)
+
+        async def invalidating(*args, **kwargs):
+            try:
+                result = method(*args, **kwargs)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                return result
+            finally:
+                self.invalidate()
+
+        invalidating.__name__ = name
+        return invalidating
+
+    async def _call(self, name: str, args: tuple, kwargs: dict) -> Any:
+        stats = self.coalescing_stats
+        stats["calls"] += 1
+        key = _make_key(name, args, kwargs)
+
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            stats["cache_hits"] += 1
+            return self._share(cached[1])
+
+        generation = self._generation
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[0] == generation:
+            stats["coalesced"] += 1
+            # Shield: one waiter being cancelled must not cancel the shared call
+            return self._share(await asyncio.shield(inflight[1]))
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (generation, future)
+        self._inflight[key] = entry
+        stats["exchange_calls"] += 1
+        try:
+            result = await getattr(self.wrapped, name)(*args, **kwargs)
+        except BaseException as e:
+            stats["errors"] += 1
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # Retrieved: no warning when nobody else waited
+            raise
+        finally:
+            if self._inflight.get(key) is entry:
+                del self._inflight[key]
+
+        ttl = self._ttls[name]
+        if ttl > 0 and generation == self._generation:
+            self._cache[key] = (time.monotonic() + ttl, result)
+        future.set_result(result)
+        # Waiters and the cache hold the same object; the leader gets its own too
+        return self._share(result)
+
+    def _share(self, result: Any) -> Any:
+        return copy.deepcopy(result) if self._copy_results else result
+
+    def invalidate(self, name: Optional[str] = None):
+        """
+        Drop cached results.
+
+        Args:
+            name: Method whose results to drop, or None for all
+        """
+        object.__setattr__(self, "_generation", self._generation + 1)
+        if name is None:
+            self._cache.clear()
+            return
+        for key in [key for key in self._cache if key[0] == name]:
+            del self._cache[key]
+
+    def get_coalescing_stats(self) -> dict[str, Any]:
+        """Calls made through the proxy versus calls that reached the exchange."""
+        stats = dict(self.coalescing_stats)
+        stats["saved_calls"] = stats["calls"] - stats["exchange_calls"]
+        stats["cached_entries"] = len(self._cache)
+        stats["inflight"] = len(self._inflight)
+        return stats
+
+
+def _make_key(name: str, args: tuple, kwargs: dict) -> tuple:
+    """Hashable key for a call; unhashable arguments (dict params) fall back to repr."""
+    key = (name, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        key = (name, repr(args), repr(sorted(kwargs.items())))
+    return key
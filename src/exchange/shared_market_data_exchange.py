@@ -0,0 +1,138 @@
+"""
+Shared Memory Market Data for the Exchange Client
+=================================================
+
+Serves ``fetch_ticker`` and ``fetch_ohlcv`` from the ``SharedMarketData``
+block published by the market data process, so strategies and executors
+that read prices through the exchange client stop polling REST once the
+ingestion process is streaming.
+
+Reads fall through to the wrapped client when:
+- no block is attached yet (the process starts after the client is handed
+  out, so the block is attached later with ``attach``),
+- the writer heartbeat or the symbol's ticker is older than ``max_age``,
+- the symbol or timeframe is not published, or not enough candles exist yet.
+"""
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SharedMarketDataExchange:
+    """
+    Exchange client proxy that reads tickers and candles from shared memory.
+
+    Every attribute not handled here is delegated to the wrapped client, so
+    the proxy can replace the client anywhere it is passed around.
+    """
+
+    def __init__(self, exchange: Any, market_data=None, max_age: float = 5.0):
+        """
+        Initialize shared market data proxy.
+
+        Args:
+            exchange: Exchange client to wrap
+            market_data: SharedMarketData reader, or None to attach later
+            max_age: Oldest writer heartbeat/ticker (seconds) still served
+        """
+        object.__setattr__(self, "wrapped", exchange)
+        object.__setattr__(self, "market_data", market_data)
+        object.__setattr__(self, "max_age", max_age)
+        object.__setattr__(self, "shared_stats", {"shared_reads": 0, "fallbacks": 0})
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.wrapped, name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self.wrapped, name, value)
+
+    def attach(self, market_data) -> None:
+        """Serve reads from ``market_data`` (None goes back to REST only)."""
+        object.__setattr__(self, "market_data", market_data)
+
+    def _live_data(self):
+        market_data = self.market_data
+        if market_data is not None and market_data.heartbeat_age <= self.max_age:
+            return market_data
+        return None
+
+    def get_best_bid_ask(self, symbol: str) -> Optional[tuple[float, float]]:
+        """(best_bid, best_ask) from shared memory, or None when unavailable."""
+        market_data = self._live_data()
+        return market_data.get_best_bid_ask(symbol) if market_data is not None else None
+
+    async def fetch_ticker(self, symbol: str, params: Optional[dict] = None) -> dict[str, Any]:
+        """ccxt ticker from shared memory, or from the wrapped client."""
+        market_data = self._live_data()
+        quote = market_data.read_quote(symbol) if market_data is not None else None
+        if quote and quote["ticker_time"] and time.time() - quote["ticker_time"] <= self.max_age:
+            self.shared_stats["shared_reads"] += 1
+            return _ccxt_ticker(symbol, quote)
+
+        self.shared_stats["fallbacks"] += 1
+        if params is None:
+            return await self.wrapped.fetch_ticker(symbol)
+        return await self.wrapped.fetch_ticker(symbol, params)
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = "1m",
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        params: Optional[dict] = None,
+    ) -> list[list[float]]:
+        """Latest candles from shared memory, or from the wrapped client."""
+        market_data = self._live_data()
+        # Only "latest N" requests can be answered from the ring
+        if market_data is not None and since is None and limit:
+            try:
+                if market_data.candle_count(symbol, timeframe, include_open=True) >= limit:
+                    ohlcv = market_data.get_ohlcv(symbol, timeframe, limit=limit)
+                    if len(ohlcv) == limit:
+                        self.shared_stats["shared_reads"] += 1
+                        return ohlcv
+            except ValueError:
+                pass  # Timeframe not expressible by the candle aggregator
+
+        self.shared_stats["fallbacks"] += 1
+        return await self.wrapped.fetch_ohlcv(symbol, timeframe, since, limit, params or {})
+
+    def get_shared_stats(self) -> dict[str, Any]:
+        """Reads served from shared memory versus passed to the wrapped client."""
+        stats = dict(self.shared_stats)
+        stats["attached"] = self.market_data is not None
+        return stats
+
+
+def _ccxt_ticker(symbol: str, quote: dict[str, float]) -> dict[str, Any]:
+    """Build a ccxt-style ticker (as ccxt's kraken parser would) from a quote slot."""
+    timestamp = int(max(quote["ticker_time"], quote["book_time"]) * 1000)
+    last, open_price, vwap, volume = quote["last"], quote["open"], quote["vwap"], quote["volume"]
+    change = last - open_price if open_price else None
+    return {
+        "symbol": symbol,
+        "timestamp": timestamp,
+        "datetime": datetime.fromtimestamp(timestamp / 1000, timezone.utc).isoformat(),
+        "high": quote["high"],
+        "low": quote["low"],
+        "bid": quote["bid"],
+        "bidVolume": quote["bid_qty"] or None,
+        "ask": quote["ask"],
+        "askVolume": quote["ask_qty"] or None,
+        "vwap": vwap,
+        "open": open_price or None,
+        "close": last,
+        "last": last,
+        "previousClose": None,
+        "change": change,
+        "percentage": change / open_price * 100 if change is not None else None,
+        "average": (last + open_price) / 2 if open_price else None,
+        "baseVolume": volume,
+        "quoteVolume": volume * vwap if vwap else None,
+        "info": quote,
+    }
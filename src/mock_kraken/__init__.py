@@ -0,0 +1,20 @@
+"""Local mock of the Kraken REST and WebSocket V2 APIs for load and failure testing."""
+
+from .market import DEFAULT_INSTRUMENTS, Instrument, MarketSimulator, SyntheticBook
+from .matching import MatchingEngine, MockFill, MockKrakenError, MockOrder
+from .server import AIOHTTP_AVAILABLE, FaultConfig, MockKrakenServer, MockServerConfig
+
+__all__ = [
+    "AIOHTTP_AVAILABLE",
+    "DEFAULT_INSTRUMENTS",
+    "FaultConfig",
+    "Instrument",
+    "MarketSimulator",
+    "MatchingEngine",
+    "MockFill",
+    "MockKrakenError",
+    "MockKrakenServer",
+    "MockOrder",
+    "MockServerConfig",
+    "SyntheticBook",
+]
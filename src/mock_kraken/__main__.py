@@ -0,0 +1,129 @@
+"""
+Mock Kraken Server CLI
+
+Usage:
+    python -m src.mock_kraken --port 8765
+    python -m src.mock_kraken --symbol BTC/USDT=60000 --symbol DOGE/USDT=0.12 --rate 200
+    python -m src.mock_kraken --latency 0.05 --jitter 0.05 --rate-limit-errors 0.02 \
+        --disconnect-interval 60 --balance USDT=500 --balance BTC=0.01
+
+Faults can also be changed while running:
+    curl -X POST localhost:8765/mock/faults -d '{"service_error_rate": 0.1}'
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+
+from .market import DEFAULT_INSTRUMENTS, Instrument
+from .server import FaultConfig, MockKrakenServer, MockServerConfig
+
+
+def _parse_instrument(text: str) -> Instrument:
+    symbol, _, price = text.partition("=")
+    if "/" not in symbol or not price:
+        raise argparse.ArgumentTypeError(f"Expected BASE/QUOTE=price, got '{text}'")
+    value = float(price)
+    # Around six significant digits, as Kraken quotes most pairs
+    precision = max(0, 6 - (math.floor(math.log10(value)) + 1))
+    return Instrument(symbol, value, price_precision=precision)
+
+
+def _parse_balance(text: str) -> tuple[str, float]:
+    asset, _, amount = text.partition("=")
+    if not amount:
+        raise argparse.ArgumentTypeError(f"Expected ASSET=amount, got '{text}'")
+    return asset, float(amount)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Mock Kraken REST/WebSocket V2 server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--symbol",
+        type=_parse_instrument,
+        action="append",
+        default=[],
+        help="Instrument BASE/QUOTE=start price (repeatable, default BTC/ETH/SOL vs USDT)",
+    )
+    parser.add_argument(
+        "--balance",
+        type=_parse_balance,
+        action="append",
+        default=[],
+        help="Starting balance ASSET=amount (repeatable, default USDT=10000)",
+    )
+    parser.add_argument("--rate", type=float, default=20.0, help="Market ticks per symbol/s")
+    parser.add_argument("--multiplier", type=float, default=1.0, help="Scale the tick rate")
+    parser.add_argument("--depth", type=int, default=100, help="Book levels per side")
+    parser.add_argument("--tier", default="starter", help="Account tier for rate limits")
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--api-secret", default=None, help="Verify API-Sign with this secret")
+    parser.add_argument("--seed", type=int, default=None)
+
+    faults = parser.add_argument_group("faults")
+    faults.add_argument("--latency", type=float, default=0.0, help="Seconds per response")
+    faults.add_argument("--jitter", type=float, default=0.0, help="Extra random latency")
+    faults.add_argument("--rate-limit-errors", type=float, default=0.0, metavar="P")
+    faults.add_argument("--nonce-errors", type=float, default=0.0, metavar="P")
+    faults.add_argument("--service-errors", type=float, default=0.0, metavar="P")
+    faults.add_argument("--http-errors", type=float, default=0.0, metavar="P")
+    faults.add_argument(
+        "--disconnect-interval", type=float, default=None, help="Mean seconds between WS drops"
+    )
+    faults.add_argument("--abort", action="store_true", help="Drop TCP instead of closing")
+    faults.add_argument("--no-rate-limits", action="store_true")
+    faults.add_argument("--no-nonce-check", action="store_true")
+    parser.add_argument("--verbose", action="store_true")
+    return parser
+
+
+async def serve(config: MockServerConfig):
+    async with MockKrakenServer(config) as server:
+        urls = server.websocket_urls()
+        print(f"REST:       {server.rest_url}")
+        print(f"WS public:  {urls['public_url']}")
+        print(f"WS private: {urls['private_url']}")
+        await asyncio.Event().wait()
+
+
+def main(argv=None) -> None:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    config = MockServerConfig(
+        host=args.host,
+        port=args.port,
+        instruments=tuple(args.symbol) or DEFAULT_INSTRUMENTS,
+        updates_per_second=args.rate,
+        rate_multiplier=args.multiplier,
+        book_depth=args.depth,
+        tier=args.tier,
+        api_key=args.api_key,
+        api_secret=args.api_secret,
+        seed=args.seed,
+        faults=FaultConfig(
+            latency=args.latency,
+            latency_jitter=args.jitter,
+            rate_limit_error_rate=args.rate_limit_errors,
+            nonce_error_rate=args.nonce_errors,
+            service_error_rate=args.service_errors,
+            http_error_rate=args.http_errors,
+            disconnect_interval=args.disconnect_interval,
+            disconnect_mode="abort" if args.abort else "close",
+            enforce_rate_limits=not args.no_rate_limits,
+            enforce_nonce=not args.no_nonce_check,
+        ),
+    )
+    if args.balance:
+        config.balances = dict(args.balance)
+    try:
+        asyncio.run(serve(config))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""
+Synthetic Market
+================
+
+Random-walk market data for the mock Kraken server.
+
+Each instrument has a grid-aligned order book around a mid price that moves by
+a Gaussian step every tick. Book levels sit on a fixed price grid (about one
+basis point apart), so most ticks only add or remove a few levels at the top,
+much like a live book. Random trades take liquidity from the touch.
+
+Book payloads and checksums follow the WebSocket V2 format (prices and
+quantities as numbers, CRC32 over the top 10 levels of each side), so the
+client's incremental ``OrderBook`` verifies every message it receives.
+"""
+
+import math
+import random
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+# Kraken computes the book checksum over the top 10 levels of each side
+CHECKSUM_DEPTH = 10
+
+
+@dataclass
+class Instrument:
+    """Simulated trading pair"""
+
+    symbol: str  # WebSocket V2 name ('BTC/USDT')
+    price: float  # Starting mid price
+    price_precision: int = 1
+    qty_precision: int = 8
+    volatility: float = 0.0002  # Standard deviation of the mid move per tick (fraction)
+    trade_probability: float = 0.3  # Chance that a tick also prints a trade
+
+    @property
+    def base(self) -> str:
+        return self.symbol.split("/")[0]
+
+    @property
+    def quote(self) -> str:
+        return self.symbol.split("/")[1]
+
+    @property
+    def pair_id(self) -> str:
+        """REST pair name ('BTCUSDT')"""
+        return self.base + self.quote
+
+    @property
+    def tick_size(self) -> float:
+        return 10.0**-self.price_precision
+
+    @property
+    def ordermin(self) -> float:
+        return 10.0**-self.qty_precision * 100
+
+
+DEFAULT_INSTRUMENTS = (
+    Instrument("BTC/USDT", 60000.0, price_precision=1, qty_precision=8),
+    Instrument("ETH/USDT", 3000.0, price_precision=2, qty_precision=8),
+    Instrument("SOL/USDT", 150.0, price_precision=2, qty_precision=8),
+)
+
+
+def _checksum_fragment(value: float, precision: int) -> str:
+    return f"{value:.{precision}f}".replace(".", "").lstrip("0")
+
+
+class SyntheticBook:
+    """Grid-aligned two-sided book; sides map grid index -> quantity"""
+
+    def __init__(self, instrument: Instrument, depth: int, rng: random.Random):
+        self.instrument = instrument
+        self.depth = depth
+        self.rng = rng
+
+        tick = instrument.tick_size
+        # About one basis point between levels, never finer than the tick
+        self.spacing = tick * max(1, round(instrument.price * 0.0001 / tick))
+        self.mid = instrument.price
+
+        self.bids: dict[int, float] = {}
+        self.asks: dict[int, float] = {}
+        self.top_bid = 0  # Grid index of the best bid; best ask is top_bid + 1
+        self._rebuild()
+
+    def price(self, index: int) -> float:
+        return round(index * self.spacing, self.instrument.price_precision)
+
+    def _quantity(self, distance: int) -> float:
+        # Thinner at the touch, thicker further out
+        size = self.rng.expovariate(1.0) * (1 + distance * 0.2) * (1000.0 / self.mid)
+        return round(max(size, self.instrument.ordermin), self.instrument.qty_precision)
+
+    def _rebuild(self):
+        self.top_bid = math.floor(self.mid / self.spacing - 0.5)
+        self.bids = {self.top_bid - i: self._quantity(i) for i in range(self.depth)}
+        self.asks = {self.top_bid + 1 + i: self._quantity(i) for i in range(self.depth)}
+
+    def move(self, step: float):
+        """Shift the mid by a relative step, adding/removing levels at the grid edges"""
+        self.mid = max(self.spacing * 2, self.mid * (1 + step))
+        top_bid = math.floor(self.mid / self.spacing - 0.5)
+        moved = top_bid != self.top_bid
+        self.top_bid = top_bid
+        top_ask = top_bid + 1
+
+        if moved:
+            for index in [index for index in self.bids if index > top_bid]:
+                del self.bids[index]
+            for index in [index for index in self.asks if index < top_ask]:
+                del self.asks[index]
+        if moved or len(self.bids) < self.depth or len(self.asks) < self.depth:
+            # Refill levels taken out by trades or uncovered by the move
+            for i in range(self.depth):
+                self.bids.setdefault(top_bid - i, self._quantity(i))
+                self.asks.setdefault(top_ask + i, self._quantity(i))
+        if moved:
+            for index in [index for index in self.bids if index <= top_bid - self.depth]:
+                del self.bids[index]
+            for index in [index for index in self.asks if index >= top_ask + self.depth]:
+                del self.asks[index]
+
+        # Requote one random level per side
+        for side, top, sign in ((self.bids, top_bid, -1), (self.asks, top_ask, 1)):
+            distance = self.rng.randrange(self.depth)
+            side[top + sign * distance] = self._quantity(distance)
+
+    def take(self, side: str, quantity: float, limit: Optional[float] = None) -> list[tuple]:
+        """
+        Consume liquidity as an aggressor
+
+        Args:
+            side: Aggressor side ('buy' takes asks)
+            quantity: Base quantity to fill
+            limit: Worst acceptable price (None = market)
+
+        Returns:
+            (price, quantity) fills, best price first
+        """
+        book = self.asks if side == "buy" else self.bids
+        fills = []
+        for index in sorted(book, reverse=side == "sell"):
+            if quantity <= 0:
+                break
+            price = self.price(index)
+            if limit is not None and (price > limit if side == "buy" else price < limit):
+                break
+            filled = min(quantity, book[index])
+            fills.append((price, filled))
+            quantity -= filled
+            remaining = round(book[index] - filled, self.instrument.qty_precision)
+            if remaining > 0:
+                book[index] = remaining
+            elif len(book) > 1:
+                # Emptied levels are refilled by the next move
+                del book[index]
+            else:
+                book[index] = self._quantity(0)
+        return fills
+
+    @property
+    def best_bid(self) -> float:
+        return self.price(max(self.bids))
+
+    @property
+    def best_ask(self) -> float:
+        return self.price(min(self.asks))
+
+    def levels(self, depth: int) -> tuple[list[tuple], list[tuple]]:
+        """(bids best first, asks best first) as (price, qty)"""
+        bids = [(self.price(i), self.bids[i]) for i in sorted(self.bids, reverse=True)[:depth]]
+        asks = [(self.price(i), self.asks[i]) for i in sorted(self.asks)[:depth]]
+        return bids, asks
+
+    def checksum(self) -> int:
+        """Kraken V2 book checksum over the top 10 levels (asks first)"""
+        price_precision = self.instrument.price_precision
+        qty_precision = self.instrument.qty_precision
+        bids, asks = self.levels(CHECKSUM_DEPTH)
+        payload = "".join(
+            _checksum_fragment(price, price_precision) + _checksum_fragment(qty, qty_precision)
+            for price, qty in asks + bids
+        )
+        return zlib.crc32(payload.encode())
+
+
+@dataclass
+class MarketStats:
+    """Rolling 24h-style ticker statistics"""
+
+    open: float
+    high: float
+    low: float
+    last: float
+    volume: float = 0.0
+    notional: float = 0.0
+    trades: int = 0
+    candles: deque = field(default_factory=lambda: deque(maxlen=720))  # 1m OHLCV rows
+
+    def add_trade(self, price: float, qty: float, timestamp: float):
+        self.last = price
+        self.high = max(self.high, price)
+        self.low = min(self.low, price)
+        self.volume += qty
+        self.notional += price * qty
+        self.trades += 1
+
+        minute = int(timestamp // 60) * 60
+        if self.candles and self.candles[-1][0] == minute:
+            candle = self.candles[-1]
+            candle[2] = max(candle[2], price)
+            candle[3] = min(candle[3], price)
+            candle[4] = price
+            candle[5] += qty
+            candle[6] += 1
+        else:
+            self.candles.append([minute, price, price, price, price, qty, 1])
+
+    @property
+    def vwap(self) -> float:
+        return self.notional / self.volume if self.volume else self.last
+
+
+class MarketSimulator:
+    """Synthetic books, trades and ticker state for a set of instruments"""
+
+    def __init__(
+        self,
+        instruments: tuple[Instrument, ...] = DEFAULT_INSTRUMENTS,
+        depth: int = 100,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize simulator
+
+        Args:
+            instruments: Simulated pairs
+            depth: Levels kept per book side (upper bound for subscription depths)
+            seed: Random seed for reproducible runs
+        """
+        self.rng = random.Random(seed)
+        self.instruments = {instrument.symbol: instrument for instrument in instruments}
+        self.depth = depth
+        self.books = {
+            symbol: SyntheticBook(instrument, depth, self.rng)
+            for symbol, instrument in self.instruments.items()
+        }
+        self.stats = {
+            symbol: MarketStats(book.mid, book.mid, book.mid, book.mid)
+            for symbol, book in self.books.items()
+        }
+        self.recent_trades: dict[str, deque] = {
+            symbol: deque(maxlen=1000) for symbol in self.instruments
+        }
+        self.prints: list[dict[str, Any]] = []  # Trades not yet published
+        self._trade_ids = 0
+
+    def instrument_for(self, name: str) -> Optional[Instrument]:
+        """Look up an instrument by V2 symbol or REST pair name"""
+        instrument = self.instruments.get(name)
+        if instrument is None:
+            for candidate in self.instruments.values():
+                if name == candidate.pair_id:
+                    return candidate
+        return instrument
+
+    def step(self, symbol: str) -> Optional[dict[str, Any]]:
+        """
+        Advance one instrument by a tick
+
+        Returns:
+            V2 trade payload when the tick printed a trade, else None
+            (also queued for ``drain_prints``)
+        """
+        instrument = self.instruments[symbol]
+        book = self.books[symbol]
+        book.move(self.rng.gauss(0.0, instrument.volatility))
+
+        if self.rng.random() >= instrument.trade_probability:
+            return None
+        side = "buy" if self.rng.random() < 0.5 else "sell"
+        touch_qty = book.asks[min(book.asks)] if side == "buy" else book.bids[max(book.bids)]
+        quantity = round(touch_qty * self.rng.uniform(0.05, 0.8), instrument.qty_precision)
+        fills = book.take(side, max(quantity, instrument.ordermin))
+        return self.record_trade(symbol, side, fills[0][0], fills[0][1], "market")
+
+    def record_trade(
+        self, symbol: str, side: str, price: float, qty: float, ord_type: str
+    ) -> dict[str, Any]:
+        """Add a print to the tape (simulated flow and mock account fills alike)"""
+        timestamp = time.time()
+        self._trade_ids += 1
+        trade = {
+            "symbol": symbol,
+            "side": side,
+            "price": price,
+            "qty": qty,
+            "ord_type": ord_type,
+            "trade_id": self._trade_ids,
+            "timestamp": iso_time(timestamp),
+        }
+        self.stats[symbol].add_trade(price, qty, timestamp)
+        self.recent_trades[symbol].append((timestamp, trade))
+        self.prints.append(trade)
+        return trade
+
+    def drain_prints(self) -> list[dict[str, Any]]:
+        """Trades recorded since the last call (for publishing)"""
+        prints, self.prints = self.prints, []
+        return prints
+
+    def ticker(self, symbol: str) -> dict[str, Any]:
+        """V2 ticker payload"""
+        book = self.books[symbol]
+        stats = self.stats[symbol]
+        bids, asks = book.levels(1)
+        change = stats.last - stats.open
+        return {
+            "symbol": symbol,
+            "bid": bids[0][0],
+            "bid_qty": bids[0][1],
+            "ask": asks[0][0],
+            "ask_qty": asks[0][1],
+            "last": stats.last,
+            "volume": round(stats.volume, 8),
+            "vwap": round(stats.vwap, book.instrument.price_precision + 2),
+            "low": stats.low,
+            "high": stats.high,
+            "change": round(change, book.instrument.price_precision),
+            "change_pct": round(change / stats.open * 100, 2) if stats.open else 0.0,
+        }
+
+    def book_payload(
+        self, symbol: str, depth: int, previous: Optional[tuple[list, list]] = None
+    ) -> tuple[Optional[dict[str, Any]], tuple[list, list]]:
+        """
+        V2 book snapshot (previous None) or delta against the previously sent levels
+
+        Returns:
+            (payload or None when nothing changed, levels now held by the client)
+        """
+        book = self.books[symbol]
+        levels = book.levels(depth)
+        if previous is None:
+            bids, asks = levels
+        else:
+            bids = _level_delta(previous[0], levels[0])
+            asks = _level_delta(previous[1], levels[1])
+            if not bids and not asks:
+                return None, levels
+
+        payload = {
+            "symbol": symbol,
+            "bids": [{"price": price, "qty": qty} for price, qty in bids],
+            "asks": [{"price": price, "qty": qty} for price, qty in asks],
+            "checksum": book.checksum(),
+        }
+        if previous is not None:
+            payload["timestamp"] = iso_time(time.time())
+        return payload, levels
+
+    def instrument_payload(self) -> dict[str, Any]:
+        """V2 instrument snapshot data"""
+        assets = {}
+        pairs = []
+        for instrument in self.instruments.values():
+            for asset in (instrument.base, instrument.quote):
+                assets[asset] = {
+                    "id": asset,
+                    "status": "enabled",
+                    "precision": 10 if asset == instrument.base else 8,
+                    "precision_display": 5,
+                    "borrowable": False,
+                    "collateral_value": 0.0,
+                    "margin_rate": 0.0,
+                }
+            pairs.append(
+                {
+                    "symbol": instrument.symbol,
+                    "base": instrument.base,
+                    "quote": instrument.quote,
+                    "status": "online",
+                    "qty_precision": instrument.qty_precision,
+                    "qty_increment": 10.0**-instrument.qty_precision,
+                    "price_precision": instrument.price_precision,
+                    "price_increment": instrument.tick_size,
+                    "cost_precision": 5,
+                    "qty_min": instrument.ordermin,
+                    "marginable": False,
+                }
+            )
+        return {"assets": list(assets.values()), "pairs": pairs}
+
+
+def _level_delta(previous: list[tuple], current: list[tuple]) -> list[tuple]:
+    """Changed levels, with removed prices sent as qty 0"""
+    before = dict(previous)
+    after = dict(current)
+    changes = [(price, 0.0) for price in before if price not in after]
+    changes.extend((price, qty) for price, qty in current if before.get(price) != qty)
+    return changes
+
+
+def iso_time(timestamp: float) -> str:
+    """RFC 3339 timestamp with microseconds, as sent by WebSocket V2"""
+    seconds = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(timestamp))
+    return f"{seconds}.{int(timestamp % 1 * 1e6):06d}Z"
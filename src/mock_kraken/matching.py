@@ -0,0 +1,415 @@
+"""
+Mock Matching Engine
+====================
+
+Spot account and order matching against the synthetic market.
+
+Market orders and the marketable part of limit orders take liquidity from the
+synthetic book at the taker fee. The rest of a limit order rests (funds on
+hold) and fills at its limit price with the maker fee once the simulated
+market trades through it. Errors use Kraken's error strings so client error
+handling is exercised as in production.
+"""
+
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from .market import Instrument, MarketSimulator
+
+logger = logging.getLogger(__name__)
+
+# Kraken spot fees (lowest volume tier)
+DEFAULT_TAKER_FEE = 0.0026
+DEFAULT_MAKER_FEE = 0.0016
+
+
+class MockKrakenError(Exception):
+    """Request rejected by the mock exchange (message is a Kraken error string)"""
+
+
+@dataclass
+class MockOrder:
+    """Order held by the matching engine"""
+
+    txid: str
+    symbol: str
+    side: str  # 'buy' or 'sell'
+    ordertype: str  # 'market' or 'limit'
+    volume: float
+    price: Optional[float] = None  # Limit price
+    userref: Optional[int] = None
+    cl_ord_id: Optional[str] = None
+    post_only: bool = False
+    status: str = "pending"  # pending, open, closed, canceled
+    opentm: float = field(default_factory=time.time)
+    closetm: Optional[float] = None
+    vol_exec: float = 0.0
+    cost: float = 0.0
+    fee: float = 0.0
+    trade_ids: list[str] = field(default_factory=list)
+
+    @property
+    def remaining(self) -> float:
+        return self.volume - self.vol_exec
+
+    @property
+    def average_price(self) -> float:
+        return self.cost / self.vol_exec if self.vol_exec else 0.0
+
+    def description(self, instrument: Instrument) -> str:
+        text = f"{self.side} {self.volume:.{instrument.qty_precision}f} {instrument.pair_id}"
+        if self.ordertype == "limit":
+            return f"{text} @ limit {self.price:.{instrument.price_precision}f}"
+        return f"{text} @ market"
+
+    def to_kraken(self, instrument: Instrument) -> dict[str, Any]:
+        """REST order info (OpenOrders/ClosedOrders/QueryOrders layout)"""
+        info = {
+            "refid": None,
+            "userref": self.userref or 0,
+            "cl_ord_id": self.cl_ord_id,
+            "status": self.status,
+            "opentm": self.opentm,
+            "starttm": 0,
+            "expiretm": 0,
+            "descr": {
+                "pair": instrument.pair_id,
+                "type": self.side,
+                "ordertype": self.ordertype,
+                "price": f"{self.price or 0:.{instrument.price_precision}f}",
+                "price2": "0",
+                "leverage": "none",
+                "order": self.description(instrument),
+                "close": "",
+            },
+            "vol": f"{self.volume:.8f}",
+            "vol_exec": f"{self.vol_exec:.8f}",
+            "cost": f"{self.cost:.8f}",
+            "fee": f"{self.fee:.8f}",
+            "price": f"{self.average_price:.{instrument.price_precision}f}",
+            "stopprice": "0",
+            "limitprice": "0",
+            "misc": "",
+            "oflags": "fciq,post" if self.post_only else "fciq",
+            "trades": list(self.trade_ids),
+        }
+        if self.closetm is not None:
+            info["closetm"] = self.closetm
+        return info
+
+
+@dataclass
+class MockFill:
+    """One execution of an order"""
+
+    trade_id: str
+    order: MockOrder
+    price: float
+    qty: float
+    fee: float
+    liquidity: str  # 'taker' or 'maker'
+    timestamp: float = field(default_factory=time.time)
+
+    def to_kraken(self, instrument: Instrument) -> dict[str, Any]:
+        """REST trade info (TradesHistory layout)"""
+        return {
+            "ordertxid": self.order.txid,
+            "postxid": self.trade_id,
+            "pair": instrument.pair_id,
+            "time": self.timestamp,
+            "type": self.order.side,
+            "ordertype": self.order.ordertype,
+            "price": f"{self.price:.{instrument.price_precision}f}",
+            "cost": f"{self.price * self.qty:.8f}",
+            "fee": f"{self.fee:.8f}",
+            "vol": f"{self.qty:.8f}",
+            "margin": "0.00000000",
+            "maker": self.liquidity == "maker",
+            "misc": "",
+        }
+
+
+class MatchingEngine:
+    """Single-account spot exchange on top of a MarketSimulator"""
+
+    def __init__(
+        self,
+        market: MarketSimulator,
+        balances: Optional[dict[str, float]] = None,
+        taker_fee: float = DEFAULT_TAKER_FEE,
+        maker_fee: float = DEFAULT_MAKER_FEE,
+    ):
+        """
+        Initialize engine
+
+        Args:
+            market: Synthetic market supplying liquidity and prints
+            balances: Starting balances by asset (default 10000 USDT)
+            taker_fee: Fee rate for liquidity-taking fills
+            maker_fee: Fee rate for resting order fills
+        """
+        self.market = market
+        self.balances: dict[str, float] = dict(balances or {"USDT": 10000.0})
+        self.held: dict[str, float] = {}
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+
+        self.orders: dict[str, MockOrder] = {}
+        self.open_orders: dict[str, dict[str, MockOrder]] = {}  # symbol -> txid -> order
+        self.fills: list[MockFill] = []
+        self.on_fill: list[Callable[[MockFill], None]] = []
+        self.on_order: list[Callable[[MockOrder], None]] = []
+
+        self._order_ids = itertools.count(1)
+        self._trade_ids = itertools.count(1)
+
+    # Account
+
+    def free(self, asset: str) -> float:
+        return self.balances.get(asset, 0.0) - self.held.get(asset, 0.0)
+
+    def _hold(self, asset: str, amount: float):
+        self.held[asset] = max(0.0, self.held.get(asset, 0.0) + amount)
+
+    # Orders
+
+    def add_order(
+        self,
+        symbol: str,
+        side: str,
+        ordertype: str,
+        volume: float,
+        price: Optional[float] = None,
+        userref: Optional[int] = None,
+        cl_ord_id: Optional[str] = None,
+        post_only: bool = False,
+        validate: bool = False,
+    ) -> MockOrder:
+        """
+        Place an order
+
+        Args:
+            symbol: V2 symbol or REST pair name
+            side: 'buy' or 'sell'
+            ordertype: 'market' or 'limit'
+            volume: Base quantity
+            price: Limit price (required for limit orders)
+            userref: Client reference number
+            cl_ord_id: Client order id
+            post_only: Reject instead of taking liquidity
+            validate: Check only, do not place
+
+        Returns:
+            MockOrder (status open, closed or canceled)
+
+        Raises:
+            MockKrakenError: With the Kraken error string
+        """
+        instrument = self.market.instrument_for(symbol)
+        if instrument is None:
+            raise MockKrakenError("EQuery:Unknown asset pair")
+        if side not in ("buy", "sell"):
+            raise MockKrakenError("EGeneral:Invalid arguments:type")
+        if ordertype not in ("market", "limit"):
+            raise MockKrakenError("EGeneral:Invalid arguments:ordertype")
+        if ordertype == "limit" and (price is None or price <= 0):
+            raise MockKrakenError("EGeneral:Invalid arguments:price")
+        if volume < instrument.ordermin:
+            raise MockKrakenError("EOrder:Order minimum not met")
+
+        book = self.market.books[instrument.symbol]
+        touch = book.best_ask if side == "buy" else book.best_bid
+        marketable = ordertype == "market" or (price >= touch if side == "buy" else price <= touch)
+        if post_only and marketable:
+            raise MockKrakenError("EOrder:Post only order")
+
+        base, quote = instrument.base, instrument.quote
+        if side == "buy":
+            worst = price if ordertype == "limit" else touch
+            if volume * worst * (1 + self.taker_fee) > self.free(quote) + 1e-12:
+                raise MockKrakenError("EOrder:Insufficient funds")
+        elif volume > self.free(base) + 1e-12:
+            raise MockKrakenError("EOrder:Insufficient funds")
+
+        order = MockOrder(
+            txid=self._next_txid(),
+            symbol=instrument.symbol,
+            side=side,
+            ordertype=ordertype,
+            volume=volume,
+            price=price,
+            userref=userref,
+            cl_ord_id=cl_ord_id,
+            post_only=post_only,
+        )
+        if validate:
+            return order
+
+        self.orders[order.txid] = order
+        if marketable:
+            limit = price if ordertype == "limit" else None
+            for fill_price, fill_qty in book.take(side, volume, limit):
+                self._fill(order, instrument, fill_price, fill_qty, "taker")
+                self.market.record_trade(instrument.symbol, side, fill_price, fill_qty, ordertype)
+
+        if order.remaining <= 10.0**-instrument.qty_precision / 2:
+            self._close(order, "closed")
+        elif ordertype == "market":
+            # Book exhausted: the unfilled part of a market order is cancelled
+            self._close(order, "closed" if order.vol_exec else "canceled")
+        else:
+            order.status = "open"
+            self.open_orders.setdefault(order.symbol, {})[order.txid] = order
+            if side == "buy":
+                self._hold(quote, order.remaining * price * (1 + self.maker_fee))
+            else:
+                self._hold(base, order.remaining)
+            self._notify(order)
+        return order
+
+    def cancel_order(self, txid: str) -> int:
+        """Cancel by txid, userref or cl_ord_id; returns the number cancelled"""
+        matches = [
+            order
+            for order in self._open()
+            if txid in (order.txid, str(order.userref), order.cl_ord_id)
+        ]
+        if not matches:
+            raise MockKrakenError("EOrder:Unknown order")
+        for order in matches:
+            self._release(order)
+            self._close(order, "canceled")
+        return len(matches)
+
+    def cancel_all(self) -> int:
+        orders = list(self._open())
+        for order in orders:
+            self._release(order)
+            self._close(order, "canceled")
+        return len(orders)
+
+    def amend_order(
+        self, txid: str, volume: Optional[float] = None, price: Optional[float] = None
+    ) -> MockOrder:
+        """Change quantity and/or limit price of an open limit order in place"""
+        order = next((o for o in self._open() if txid in (o.txid, o.cl_ord_id)), None)
+        if order is None:
+            raise MockKrakenError("EOrder:Unknown order")
+        instrument = self.market.instruments[order.symbol]
+        book = self.market.books[order.symbol]
+        new_price = price if price is not None else order.price
+        new_volume = volume if volume is not None else order.volume
+        if new_volume <= order.vol_exec:
+            raise MockKrakenError("EOrder:Invalid order quantity")
+        if order.post_only and (
+            new_price >= book.best_ask if order.side == "buy" else new_price <= book.best_bid
+        ):
+            raise MockKrakenError("EOrder:Post only order")
+
+        self._release(order)
+        previous = order.price, order.volume
+        order.price, order.volume = new_price, new_volume
+        if order.side == "buy":
+            short = order.remaining * new_price * (1 + self.maker_fee) > self.free(
+                instrument.quote
+            )
+        else:
+            short = order.remaining > self.free(instrument.base)
+        if short:
+            order.price, order.volume = previous
+            self._hold_order(order, instrument)
+            raise MockKrakenError("EOrder:Insufficient funds")
+        self._hold_order(order, instrument)
+        self._notify(order)
+        self.match_resting(order.symbol)
+        return order
+
+    def match_resting(self, symbol: str) -> int:
+        """Fill resting orders the market has traded through; returns fills made"""
+        orders = self.open_orders.get(symbol)
+        if not orders:
+            return 0
+        book = self.market.books[symbol]
+        instrument = self.market.instruments[symbol]
+        best_bid, best_ask = book.best_bid, book.best_ask
+
+        filled = 0
+        for order in list(orders.values()):
+            crossed = order.price >= best_ask if order.side == "buy" else order.price <= best_bid
+            if not crossed:
+                continue
+            self._release(order)
+            quantity = order.remaining
+            self._fill(order, instrument, order.price, quantity, "maker")
+            self._close(order, "closed")
+            aggressor = "sell" if order.side == "buy" else "buy"
+            self.market.record_trade(symbol, aggressor, order.price, quantity, "market")
+            filled += 1
+        return filled
+
+    def get_order(self, txid: str) -> Optional[MockOrder]:
+        return self.orders.get(txid)
+
+    def _open(self):
+        for orders in self.open_orders.values():
+            yield from list(orders.values())
+
+    def _hold_order(self, order: MockOrder, instrument: Instrument):
+        if order.side == "buy":
+            self._hold(instrument.quote, order.remaining * order.price * (1 + self.maker_fee))
+        else:
+            self._hold(instrument.base, order.remaining)
+
+    def _release(self, order: MockOrder):
+        if order.status != "open":
+            return
+        instrument = self.market.instruments[order.symbol]
+        if order.side == "buy":
+            self._hold(instrument.quote, -order.remaining * order.price * (1 + self.maker_fee))
+        else:
+            self._hold(instrument.base, -order.remaining)
+
+    def _fill(
+        self, order: MockOrder, instrument: Instrument, price: float, qty: float, liquidity: str
+    ):
+        cost = price * qty
+        fee = cost * (self.taker_fee if liquidity == "taker" else self.maker_fee)
+        base, quote = instrument.base, instrument.quote
+        if order.side == "buy":
+            self.balances[quote] = self.balances.get(quote, 0.0) - cost - fee
+            self.balances[base] = self.balances.get(base, 0.0) + qty
+        else:
+            self.balances[base] = self.balances.get(base, 0.0) - qty
+            self.balances[quote] = self.balances.get(quote, 0.0) + cost - fee
+
+        order.vol_exec += qty
+        order.cost += cost
+        order.fee += fee
+        fill = MockFill(f"T{next(self._trade_ids):05d}-MOCK", order, price, qty, fee, liquidity)
+        order.trade_ids.append(fill.trade_id)
+        self.fills.append(fill)
+        for listener in self.on_fill:
+            try:
+                listener(fill)
+            except Exception as e:
+                logger.error(f"[MOCK_KRAKEN] Fill listener error: {e}")
+
+    def _close(self, order: MockOrder, status: str):
+        order.status = status
+        order.closetm = time.time()
+        self.open_orders.get(order.symbol, {}).pop(order.txid, None)
+        self._notify(order)
+
+    def _notify(self, order: MockOrder):
+        for listener in self.on_order:
+            try:
+                listener(order)
+            except Exception as e:
+                logger.error(f"[MOCK_KRAKEN] Order listener error: {e}")
+
+    def _next_txid(self) -> str:
+        number = next(self._order_ids)
+        return f"O{number:05d}-MOCK-{number * 7919 % 1000000:06d}"
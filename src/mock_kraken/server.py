@@ -0,0 +1,1241 @@
+"""
+Mock Kraken Server
+==================
+
+aiohttp stand-in for the Kraken REST API and WebSocket V2 endpoints, backed
+by the synthetic market and matching engine.
+
+Endpoints:
+- ``/0/public/<Method>`` and ``/0/private/<Method>`` (REST, Kraken envelope
+  ``{"error": [...], "result": ...}``)
+- ``/ws/v2`` (public WebSocket V2) and ``/ws-auth/v2`` (authenticated)
+- ``/mock/stats`` (GET) and ``/mock/faults`` (GET/POST JSON to change faults
+  while a load test runs)
+
+Private REST calls are checked like Kraken does: API key, strictly increasing
+nonce, optional HMAC-SHA512 signature, and decaying API/trading counters
+sized from the account tier in ``rate_limit_config``. ``FaultConfig`` adds
+latency, injected rate-limit/nonce/service errors, HTTP 503s and forced
+WebSocket disconnects on top.
+
+Pointing clients at the server::
+
+    server = MockKrakenServer(MockServerConfig(port=0))
+    await server.start()
+    ws_config = KrakenWebSocketConfig(**server.websocket_urls())
+    exchange = ccxt.kraken({"apiKey": ..., "secret": ..., "urls": server.ccxt_urls()})
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import itertools
+import json
+import logging
+import random
+import secrets
+import time
+import urllib.parse
+import zlib
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field, fields
+from email.utils import formatdate
+from typing import Any, Callable, Optional
+
+from ..rate_limiting.rate_limit_config import (
+    ENDPOINT_CONFIGS,
+    AccountTier,
+    calculate_age_penalty,
+    get_tier_config,
+)
+from .market import (
+    CHECKSUM_DEPTH,
+    DEFAULT_INSTRUMENTS,
+    Instrument,
+    MarketSimulator,
+    _checksum_fragment,
+    iso_time,
+)
+from .matching import (
+    DEFAULT_MAKER_FEE,
+    DEFAULT_TAKER_FEE,
+    MatchingEngine,
+    MockFill,
+    MockKrakenError,
+    MockOrder,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    from aiohttp import WSMsgType, web
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+PUBLIC_WS_PATH = "/ws/v2"
+PRIVATE_WS_PATH = "/ws-auth/v2"
+
+# Requests counted against the per-pair trading counter instead of the API counter
+TRADING_METHODS = frozenset(
+    {"AddOrder", "AddOrderBatch", "AmendOrder", "EditOrder", "CancelOrder", "CancelAll"}
+)
+WS_TRADING_METHODS = {
+    "add_order": "WS-AddOrder",
+    "batch_add": "WS-AddOrder",
+    "amend_order": "WS-AmendOrder",
+    "cancel_order": "WS-CancelOrder",
+    "cancel_all": "WS-CancelOrder",
+}
+
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+
+@dataclass
+class FaultConfig:
+    """Injected failures (probabilities are per request)"""
+
+    latency: float = 0.0  # Seconds added to every REST response and WebSocket frame
+    latency_jitter: float = 0.0  # Extra uniform 0..jitter seconds
+    rate_limit_error_rate: float = 0.0  # Spurious 'EAPI/EOrder:Rate limit exceeded'
+    nonce_error_rate: float = 0.0  # Spurious 'EAPI:Invalid nonce' (private REST)
+    service_error_rate: float = 0.0  # 'EService:Unavailable'
+    http_error_rate: float = 0.0  # Bare HTTP 503 (gateway failure, no Kraken envelope)
+    disconnect_interval: Optional[float] = None  # Mean seconds between forced WS disconnects
+    disconnect_mode: str = "close"  # 'close' (1001 going away) or 'abort' (TCP drop)
+    enforce_rate_limits: bool = True  # Apply the tier's API/trading counters
+    enforce_nonce: bool = True  # Require strictly increasing nonces
+
+
+@dataclass
+class MockServerConfig:
+    """Mock server configuration"""
+
+    host: str = "127.0.0.1"
+    port: int = 8765  # 0 picks a free port
+    instruments: tuple[Instrument, ...] = DEFAULT_INSTRUMENTS
+    balances: dict[str, float] = field(default_factory=lambda: {"USDT": 10000.0})
+    taker_fee: float = DEFAULT_TAKER_FEE
+    maker_fee: float = DEFAULT_MAKER_FEE
+    seed: Optional[int] = None
+
+    # Market data rate: ticks per symbol per second, scaled by rate_multiplier
+    updates_per_second: float = 20.0
+    rate_multiplier: float = 1.0
+    book_depth: int = 100  # Deepest book subscription served
+    heartbeat_interval: float = 1.0
+
+    # Authentication (signatures are verified when both are set)
+    api_key: Optional[str] = None
+    api_secret: Optional[str] = None
+    token_ttl: float = 900.0
+
+    # Rate limits: trading counter from the tier, API counter limit/decay below
+    tier: str = "starter"
+    api_counter_decay: float = 0.33  # Points per second
+
+    faults: FaultConfig = field(default_factory=FaultConfig)
+
+
+class _DecayingCounter:
+    """Kraken-style counter: cost added per call, decays linearly, capped at limit"""
+
+    __slots__ = ("limit", "decay", "value", "updated")
+
+    def __init__(self, limit: float, decay: float):
+        self.limit = limit
+        self.decay = decay
+        self.value = 0.0
+        self.updated = time.monotonic()
+
+    def add(self, cost: float) -> bool:
+        now = time.monotonic()
+        self.value = max(0.0, self.value - (now - self.updated) * self.decay)
+        self.updated = now
+        if self.value + cost > self.limit:
+            return False
+        self.value += cost
+        return True
+
+
+class _Client:
+    """One WebSocket connection"""
+
+    def __init__(self, connection_id: int, ws: Any, request: Any, private: bool):
+        self.connection_id = connection_id
+        self.ws = ws
+        self.request = request
+        self.private = private
+        self.token: Optional[str] = None
+        self.keys: set[tuple] = set()  # Subscription keys held in the server index
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        self.sent = 0
+        self.tasks: list[asyncio.Task] = []
+
+
+class MockKrakenServer:
+    """Local Kraken REST + WebSocket V2 server for load and failure testing"""
+
+    def __init__(self, config: Optional[MockServerConfig] = None):
+        """
+        Initialize server
+
+        Args:
+            config: Server configuration
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for the mock Kraken server")
+
+        self.config = config or MockServerConfig()
+        self.faults = self.config.faults
+        self.rng = random.Random(self.config.seed)
+        self.market = MarketSimulator(
+            self.config.instruments, depth=self.config.book_depth, seed=self.config.seed
+        )
+        self.engine = MatchingEngine(
+            self.market, self.config.balances, self.config.taker_fee, self.config.maker_fee
+        )
+        self.engine.on_fill.append(self._publish_fill)
+        self.engine.on_order.append(self._publish_order)
+
+        tier = get_tier_config(AccountTier(self.config.tier))
+        self._api_counter = _DecayingCounter(tier.private_limit, self.config.api_counter_decay)
+        self._trading_counters: dict[str, _DecayingCounter] = defaultdict(
+            lambda: _DecayingCounter(tier.max_penalty_points, tier.penalty_decay_rate)
+        )
+        self._last_nonce = 0
+        self._tokens: dict[str, float] = {}  # token -> expiry
+
+        # Subscription index: (channel, symbol[, depth]) -> clients
+        self._subscribers: dict[tuple, set[_Client]] = defaultdict(set)
+        self._book_views: dict[tuple[str, int], tuple[list, list]] = {}
+        self._clients: set[_Client] = set()
+        self._connection_ids = itertools.count(1)
+
+        self._rest_methods: dict[str, Callable] = {
+            "Time": self._rest_time,
+            "SystemStatus": self._rest_system_status,
+            "Assets": self._rest_assets,
+            "AssetPairs": self._rest_asset_pairs,
+            "Ticker": self._rest_ticker,
+            "Depth": self._rest_depth,
+            "Trades": self._rest_trades,
+            "OHLC": self._rest_ohlc,
+        }
+        self._private_methods: dict[str, Callable] = {
+            "Balance": self._rest_balance,
+            "BalanceEx": self._rest_balance_ex,
+            "TradeBalance": self._rest_trade_balance,
+            "OpenOrders": self._rest_open_orders,
+            "ClosedOrders": self._rest_closed_orders,
+            "QueryOrders": self._rest_query_orders,
+            "TradesHistory": self._rest_trades_history,
+            "GetWebSocketsToken": self._rest_websocket_token,
+            "AddOrder": self._rest_add_order,
+            "AddOrderBatch": self._rest_add_order_batch,
+            "AmendOrder": self._rest_amend_order,
+            "CancelOrder": self._rest_cancel_order,
+            "CancelAll": self._rest_cancel_all,
+        }
+        self._ws_methods: dict[str, Callable] = {
+            "subscribe": self._ws_subscribe,
+            "unsubscribe": self._ws_unsubscribe,
+            "authenticate": self._ws_authenticate,
+            "ping": self._ws_ping,
+            "add_order": self._ws_add_order,
+            "batch_add": self._ws_batch_add,
+            "amend_order": self._ws_amend_order,
+            "cancel_order": self._ws_cancel_order,
+            "cancel_all": self._ws_cancel_all,
+        }
+
+        self.stats: dict[str, Any] = {
+            "rest_requests": 0,
+            "rest_errors": defaultdict(int),
+            "ws_connections": 0,
+            "ws_requests": 0,
+            "ws_messages_sent": 0,
+            "market_ticks": 0,
+            "disconnects_injected": 0,
+        }
+
+        self._runner = None
+        self._tasks: list[asyncio.Task] = []
+        self.port = self.config.port
+
+    # Lifecycle
+
+    @property
+    def rest_url(self) -> str:
+        return f"http://{self.config.host}:{self.port}"
+
+    def websocket_urls(self) -> dict[str, str]:
+        """``public_url``/``private_url`` for KrakenWebSocketConfig"""
+        base = f"ws://{self.config.host}:{self.port}"
+        return {"public_url": base + PUBLIC_WS_PATH, "private_url": base + PRIVATE_WS_PATH}
+
+    def ccxt_urls(self) -> dict[str, Any]:
+        """``urls`` override for ``ccxt.kraken``"""
+        return {"api": {"public": self.rest_url, "private": self.rest_url}}
+
+    def create_app(self) -> "web.Application":
+        app = web.Application()
+        app.router.add_route("*", "/0/public/{method}", self._handle_public)
+        app.router.add_post("/0/private/{method}", self._handle_private)
+        app.router.add_get(PUBLIC_WS_PATH, self._handle_public_ws)
+        app.router.add_get(PRIVATE_WS_PATH, self._handle_private_ws)
+        app.router.add_get("/mock/stats", self._handle_stats)
+        app.router.add_get("/mock/faults", self._handle_faults)
+        app.router.add_post("/mock/faults", self._handle_faults)
+        return app
+
+    async def start(self) -> str:
+        """Start serving; returns the REST base URL"""
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.config.host, self.config.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+        self._tasks = [
+            asyncio.create_task(self._market_loop()),
+            asyncio.create_task(self._heartbeat_loop()),
+        ]
+        logger.info(f"[MOCK_KRAKEN] Serving REST on {self.rest_url}")
+        return self.rest_url
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for client in list(self._clients):
+            await client.ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        logger.info("[MOCK_KRAKEN] Stopped")
+
+    async def __aenter__(self) -> "MockKrakenServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    def get_stats(self) -> dict[str, Any]:
+        stats = dict(self.stats)
+        stats["rest_errors"] = dict(stats["rest_errors"])
+        stats["ws_clients"] = len(self._clients)
+        stats["orders"] = len(self.engine.orders)
+        stats["fills"] = len(self.engine.fills)
+        stats["balances"] = dict(self.engine.balances)
+        return stats
+
+    # Faults
+
+    def _chance(self, rate: float) -> bool:
+        return rate > 0 and self.rng.random() < rate
+
+    def _latency(self) -> float:
+        faults = self.faults
+        if faults.latency_jitter > 0:
+            return faults.latency + self.rng.uniform(0.0, faults.latency_jitter)
+        return faults.latency
+
+    # REST
+
+    async def _read_params(self, request: "web.Request") -> tuple[dict[str, Any], str]:
+        """Query plus body parameters, and the raw body (signed by the client)"""
+        params: dict[str, Any] = dict(request.query)
+        body = await request.text() if request.can_read_body else ""
+        if body:
+            if body.lstrip().startswith("{"):
+                params.update(json.loads(body))
+            else:
+                params.update(_parse_form(body))
+        return params, body
+
+    async def _handle_public(self, request: "web.Request") -> "web.Response":
+        handler = self._rest_methods.get(request.match_info["method"])
+        return await self._serve_rest(request, handler, private=False)
+
+    async def _handle_private(self, request: "web.Request") -> "web.Response":
+        handler = self._private_methods.get(request.match_info["method"])
+        return await self._serve_rest(request, handler, private=True)
+
+    async def _serve_rest(
+        self, request: "web.Request", handler: Optional[Callable], private: bool
+    ) -> "web.Response":
+        self.stats["rest_requests"] += 1
+        latency = self._latency()
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+        if self._chance(self.faults.http_error_rate):
+            self.stats["rest_errors"]["HTTP 503"] += 1
+            return web.Response(status=503, text="503 Service Unavailable")
+
+        method = request.match_info["method"]
+        try:
+            params, body = await self._read_params(request)
+            if handler is None:
+                raise MockKrakenError("EGeneral:Unknown method")
+            if self._chance(self.faults.service_error_rate):
+                raise MockKrakenError("EService:Unavailable")
+            if private:
+                self._check_private(request, method, params, body)
+            result = handler(params)
+        except MockKrakenError as e:
+            self.stats["rest_errors"][str(e)] += 1
+            return web.json_response({"error": [str(e)]})
+        except (ValueError, KeyError, TypeError) as e:
+            error = f"EGeneral:Invalid arguments:{e}"
+            self.stats["rest_errors"]["EGeneral:Invalid arguments"] += 1
+            return web.json_response({"error": [error]})
+
+        return web.json_response({"error": [], "result": result}, dumps=_dumps)
+
+    def _check_private(self, request: "web.Request", method: str, params: dict, body: str):
+        """Key, nonce, signature and rate counters, in Kraken's order"""
+        config = self.config
+        api_key = request.headers.get("API-Key")
+        if not api_key or (config.api_key and api_key != config.api_key):
+            raise MockKrakenError("EAPI:Invalid key")
+
+        if self._chance(self.faults.nonce_error_rate):
+            raise MockKrakenError("EAPI:Invalid nonce")
+        nonce = int(params.get("nonce") or 0)
+        if self.faults.enforce_nonce:
+            if nonce <= self._last_nonce:
+                raise MockKrakenError("EAPI:Invalid nonce")
+            self._last_nonce = nonce
+
+        if config.api_key and config.api_secret:
+            expected = _sign(config.api_secret, request.path, str(params.get("nonce")), body)
+            if not hmac.compare_digest(expected, request.headers.get("API-Sign", "")):
+                raise MockKrakenError("EAPI:Invalid signature")
+
+        if method in TRADING_METHODS:
+            if self._chance(self.faults.rate_limit_error_rate):
+                raise MockKrakenError("EOrder:Rate limit exceeded")
+            if self.faults.enforce_rate_limits:
+                self._charge_trading(method, params)
+        else:
+            if self._chance(self.faults.rate_limit_error_rate):
+                raise MockKrakenError("EAPI:Rate limit exceeded")
+            cost = max(1, _penalty_points(method))
+            if self.faults.enforce_rate_limits and not self._api_counter.add(cost):
+                raise MockKrakenError("EAPI:Rate limit exceeded")
+
+    def _charge_trading(self, endpoint: str, params: dict):
+        """Per-pair trading counter with Kraken's order-age penalties"""
+        charges: dict[str, float] = defaultdict(float)
+        if endpoint in ("AddOrder", "AddOrderBatch", "WS-AddOrder"):
+            pair = params.get("pair") or params.get("symbol")
+            charges[pair] += len(params.get("orders") or ()) or _penalty_points("AddOrder")
+        else:
+            base = _penalty_points(endpoint)
+            for txid in _as_list(params.get("txid") or params.get("order_id") or ()):
+                order = self.engine.get_order(str(txid))
+                if order is None or order.status != "open":
+                    continue
+                age = time.time() - order.opentm
+                charges[order.symbol] += base + calculate_age_penalty(endpoint, age)
+
+        for pair, cost in charges.items():
+            instrument = self.market.instrument_for(str(pair)) if pair else None
+            counter = self._trading_counters[instrument.symbol if instrument else str(pair)]
+            if not counter.add(cost):
+                raise MockKrakenError("EOrder:Rate limit exceeded")
+
+    # Public REST methods
+
+    def _rest_time(self, params: dict) -> dict[str, Any]:
+        now = time.time()
+        return {"unixtime": int(now), "rfc1123": formatdate(now, usegmt=True)}
+
+    def _rest_system_status(self, params: dict) -> dict[str, Any]:
+        return {"status": "online", "timestamp": iso_time(time.time())}
+
+    def _rest_assets(self, params: dict) -> dict[str, Any]:
+        assets = {}
+        for instrument in self.market.instruments.values():
+            for asset in (instrument.base, instrument.quote):
+                assets[asset] = {
+                    "aclass": "currency",
+                    "altname": asset,
+                    "decimals": 10 if asset == instrument.base else 8,
+                    "display_decimals": 5,
+                    "status": "enabled",
+                }
+        return assets
+
+    def _instruments(self, params: dict) -> list[Instrument]:
+        names = params.get("pair")
+        if not names:
+            return list(self.market.instruments.values())
+        instruments = []
+        for name in str(names).split(","):
+            instrument = self.market.instrument_for(name.strip())
+            if instrument is None:
+                raise MockKrakenError("EQuery:Unknown asset pair")
+            instruments.append(instrument)
+        return instruments
+
+    def _rest_asset_pairs(self, params: dict) -> dict[str, Any]:
+        result = {}
+        for instrument in self._instruments(params):
+            result[instrument.pair_id] = {
+                "altname": instrument.pair_id,
+                "wsname": instrument.symbol,
+                "aclass_base": "currency",
+                "base": instrument.base,
+                "aclass_quote": "currency",
+                "quote": instrument.quote,
+                "lot": "unit",
+                "cost_decimals": 5,
+                "pair_decimals": instrument.price_precision,
+                "lot_decimals": instrument.qty_precision,
+                "lot_multiplier": 1,
+                "leverage_buy": [],
+                "leverage_sell": [],
+                "fees": [[0, self.config.taker_fee * 100]],
+                "fees_maker": [[0, self.config.maker_fee * 100]],
+                "fee_volume_currency": "ZUSD",
+                "margin_call": 80,
+                "margin_stop": 40,
+                "ordermin": f"{instrument.ordermin:.{instrument.qty_precision}f}",
+                "costmin": "0.5",
+                "tick_size": f"{instrument.tick_size:.{instrument.price_precision}f}",
+                "status": "online",
+            }
+        return result
+
+    def _rest_ticker(self, params: dict) -> dict[str, Any]:
+        result = {}
+        for instrument in self._instruments(params):
+            ticker = self.market.ticker(instrument.symbol)
+            stats = self.market.stats[instrument.symbol]
+            result[instrument.pair_id] = {
+                "a": [str(ticker["ask"]), "1", str(ticker["ask_qty"])],
+                "b": [str(ticker["bid"]), "1", str(ticker["bid_qty"])],
+                "c": [str(ticker["last"]), "0"],
+                "v": [str(ticker["volume"]), str(ticker["volume"])],
+                "p": [str(ticker["vwap"]), str(ticker["vwap"])],
+                "t": [stats.trades, stats.trades],
+                "l": [str(ticker["low"]), str(ticker["low"])],
+                "h": [str(ticker["high"]), str(ticker["high"])],
+                "o": str(stats.open),
+            }
+        return result
+
+    def _rest_depth(self, params: dict) -> dict[str, Any]:
+        count = min(int(params.get("count") or 100), self.market.depth)
+        now = int(time.time())
+        result = {}
+        for instrument in self._instruments(params):
+            bids, asks = self.market.books[instrument.symbol].levels(count)
+            result[instrument.pair_id] = {
+                "asks": [[str(price), str(qty), now] for price, qty in asks],
+                "bids": [[str(price), str(qty), now] for price, qty in bids],
+            }
+        return result
+
+    def _rest_trades(self, params: dict) -> dict[str, Any]:
+        since = float(params.get("since") or 0) / 1e9
+        result: dict[str, Any] = {}
+        last = 0.0
+        for instrument in self._instruments(params):
+            rows = []
+            for timestamp, trade in self.market.recent_trades[instrument.symbol]:
+                if timestamp <= since:
+                    continue
+                rows.append(
+                    [
+                        str(trade["price"]),
+                        str(trade["qty"]),
+                        timestamp,
+                        "b" if trade["side"] == "buy" else "s",
+                        "m" if trade["ord_type"] == "market" else "l",
+                        "",
+                        trade["trade_id"],
+                    ]
+                )
+                last = max(last, timestamp)
+            result[instrument.pair_id] = rows
+        result["last"] = str(int(last * 1e9))
+        return result
+
+    def _rest_ohlc(self, params: dict) -> dict[str, Any]:
+        interval = int(params.get("interval") or 1) * 60
+        result: dict[str, Any] = {}
+        for instrument in self._instruments(params):
+            candles: dict[int, list] = {}
+            for minute, open_, high, low, close, volume, count in self.market.stats[
+                instrument.symbol
+            ].candles:
+                bucket = minute - minute % interval
+                candle = candles.get(bucket)
+                if candle is None:
+                    candles[bucket] = [bucket, open_, high, low, close, volume, count]
+                else:
+                    candle[2] = max(candle[2], high)
+                    candle[3] = min(candle[3], low)
+                    candle[4] = close
+                    candle[5] += volume
+                    candle[6] += count
+            result[instrument.pair_id] = [
+                [t, str(o), str(h), str(lo), str(c), str(c), str(v), n]
+                for t, o, h, lo, c, v, n in candles.values()
+            ]
+            result["last"] = max(candles, default=0)
+        return result
+
+    # Private REST methods
+
+    def _rest_balance(self, params: dict) -> dict[str, str]:
+        return {asset: f"{amount:.10f}" for asset, amount in self.engine.balances.items()}
+
+    def _rest_balance_ex(self, params: dict) -> dict[str, dict[str, str]]:
+        return {
+            asset: {
+                "balance": f"{amount:.10f}",
+                "hold_trade": f"{self.engine.held.get(asset, 0.0):.10f}",
+            }
+            for asset, amount in self.engine.balances.items()
+        }
+
+    def _rest_trade_balance(self, params: dict) -> dict[str, str]:
+        equity = 0.0
+        for asset, amount in self.engine.balances.items():
+            equity += amount * self._quote_value(asset)
+        value = f"{equity:.4f}"
+        return {"eb": value, "tb": value, "m": "0", "n": "0", "c": "0", "v": "0", "e": value}
+
+    def _quote_value(self, asset: str) -> float:
+        for instrument in self.market.instruments.values():
+            if instrument.base == asset:
+                return self.market.books[instrument.symbol].mid
+        return 1.0
+
+    def _order_info(self, order: MockOrder) -> dict[str, Any]:
+        return order.to_kraken(self.market.instruments[order.symbol])
+
+    def _rest_open_orders(self, params: dict) -> dict[str, Any]:
+        return {
+            "open": {
+                order.txid: self._order_info(order)
+                for orders in self.engine.open_orders.values()
+                for order in orders.values()
+            }
+        }
+
+    def _rest_closed_orders(self, params: dict) -> dict[str, Any]:
+        closed = [o for o in self.engine.orders.values() if o.status in ("closed", "canceled")]
+        closed.sort(key=lambda order: order.closetm or 0, reverse=True)
+        offset = int(params.get("ofs") or 0)
+        return {
+            "closed": {o.txid: self._order_info(o) for o in closed[offset : offset + 50]},
+            "count": len(closed),
+        }
+
+    def _rest_query_orders(self, params: dict) -> dict[str, Any]:
+        result = {}
+        for txid in _as_list(params.get("txid")):
+            order = self.engine.get_order(txid)
+            if order is None:
+                raise MockKrakenError("EOrder:Invalid order")
+            result[txid] = self._order_info(order)
+        return result
+
+    def _rest_trades_history(self, params: dict) -> dict[str, Any]:
+        fills = list(reversed(self.engine.fills))
+        offset = int(params.get("ofs") or 0)
+        return {
+            "trades": {
+                fill.trade_id: fill.to_kraken(self.market.instruments[fill.order.symbol])
+                for fill in fills[offset : offset + 50]
+            },
+            "count": len(fills),
+        }
+
+    def _rest_websocket_token(self, params: dict) -> dict[str, Any]:
+        token = base64.b64encode(secrets.token_bytes(24)).decode()
+        self._tokens[token] = time.time() + self.config.token_ttl
+        return {"token": token, "expires": int(self.config.token_ttl)}
+
+    def _place(self, params: dict, pair: Optional[str] = None) -> MockOrder:
+        price = params.get("price")
+        return self.engine.add_order(
+            symbol=pair or params["pair"],
+            side=params["type"],
+            ordertype=params["ordertype"],
+            volume=float(params["volume"]),
+            price=float(price) if price not in (None, "") else None,
+            userref=int(params["userref"]) if params.get("userref") else None,
+            cl_ord_id=params.get("cl_ord_id"),
+            post_only="post" in str(params.get("oflags", "")).split(","),
+            validate=_truthy(params.get("validate")),
+        )
+
+    def _rest_add_order(self, params: dict) -> dict[str, Any]:
+        order = self._place(params)
+        instrument = self.market.instruments[order.symbol]
+        result: dict[str, Any] = {"descr": {"order": order.description(instrument)}}
+        if not _truthy(params.get("validate")):
+            result["txid"] = [order.txid]
+        return result
+
+    def _rest_add_order_batch(self, params: dict) -> dict[str, Any]:
+        orders = params.get("orders") or []
+        if not 2 <= len(orders) <= 15:
+            raise MockKrakenError("EGeneral:Invalid arguments:orders")
+        results = []
+        for entry in orders:
+            entry = {**entry, "validate": params.get("validate")}
+            try:
+                order = self._place(entry, params["pair"])
+            except MockKrakenError as e:
+                results.append({"error": str(e)})
+                continue
+            instrument = self.market.instruments[order.symbol]
+            results.append({"txid": order.txid, "descr": {"order": order.description(instrument)}})
+        return {"orders": results}
+
+    def _rest_amend_order(self, params: dict) -> dict[str, Any]:
+        txid = params.get("txid") or params.get("cl_ord_id")
+        volume, price = params.get("order_qty"), params.get("limit_price")
+        order = self.engine.amend_order(
+            str(txid),
+            float(volume) if volume not in (None, "") else None,
+            float(price) if price not in (None, "") else None,
+        )
+        return {"amend_id": f"A{order.txid}"}
+
+    def _rest_cancel_order(self, params: dict) -> dict[str, Any]:
+        count = 0
+        for txid in _as_list(params.get("txid") or params.get("cl_ord_id")):
+            count += self.engine.cancel_order(str(txid))
+        return {"count": count}
+
+    def _rest_cancel_all(self, params: dict) -> dict[str, Any]:
+        return {"count": self.engine.cancel_all()}
+
+    # WebSocket
+
+    async def _handle_public_ws(self, request: "web.Request") -> "web.WebSocketResponse":
+        return await self._serve_ws(request, private=False)
+
+    async def _handle_private_ws(self, request: "web.Request") -> "web.WebSocketResponse":
+        return await self._serve_ws(request, private=True)
+
+    async def _serve_ws(self, request: "web.Request", private: bool) -> "web.WebSocketResponse":
+        ws = web.WebSocketResponse(autoping=True)
+        await ws.prepare(request)
+
+        client = _Client(next(self._connection_ids), ws, request, private)
+        self._clients.add(client)
+        self.stats["ws_connections"] += 1
+        client.tasks.append(asyncio.create_task(self._writer_loop(client)))
+        if self.faults.disconnect_interval:
+            client.tasks.append(asyncio.create_task(self._disconnect_later(client)))
+
+        self._send(
+            client,
+            {
+                "channel": "status",
+                "type": "update",
+                "data": [
+                    {
+                        "api_version": "v2",
+                        "connection_id": client.connection_id,
+                        "system": "online",
+                        "version": "2.0.0",
+                    }
+                ],
+            },
+        )
+
+        try:
+            async for message in ws:
+                if message.type == WSMsgType.TEXT:
+                    self._handle_ws_request(client, message.data)
+                elif message.type == WSMsgType.ERROR:
+                    break
+        finally:
+            self._drop_client(client)
+        return ws
+
+    def _drop_client(self, client: _Client):
+        self._clients.discard(client)
+        for key in client.keys:
+            self._subscribers[key].discard(client)
+        client.keys.clear()
+        for task in client.tasks:
+            task.cancel()
+
+    async def _writer_loop(self, client: _Client):
+        """Send queued frames in order, each no earlier than its due time"""
+        loop = asyncio.get_running_loop()
+        outbox = client.outbox
+        try:
+            while True:
+                due, text = await outbox.get()
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await client.ws.send_str(text)
+                client.sent += 1
+                self.stats["ws_messages_sent"] += 1
+        except (ConnectionError, RuntimeError) as e:
+            logger.debug(f"[MOCK_KRAKEN] Client {client.connection_id} writer stopped: {e}")
+
+    async def _disconnect_later(self, client: _Client):
+        await asyncio.sleep(self.rng.expovariate(1.0 / self.faults.disconnect_interval))
+        self.stats["disconnects_injected"] += 1
+        logger.info(f"[MOCK_KRAKEN] Dropping client {client.connection_id}")
+        if self.faults.disconnect_mode == "abort" and client.request.transport is not None:
+            client.request.transport.abort()
+        else:
+            await client.ws.close(code=1001, message=b"Going away")
+
+    def _send(self, client: _Client, message: Any):
+        text = message if isinstance(message, str) else _dumps(message)
+        client.outbox.put_nowait((asyncio.get_running_loop().time() + self._latency(), text))
+
+    def _broadcast(self, key: tuple, message: Any):
+        clients = self._subscribers.get(key)
+        if not clients:
+            return
+        due = asyncio.get_running_loop().time() + self._latency()
+        text = _dumps(message)
+        for client in clients:
+            client.outbox.put_nowait((due, text))
+
+    def _handle_ws_request(self, client: _Client, text: str):
+        self.stats["ws_requests"] += 1
+        time_in = iso_time(time.time())
+        try:
+            request = json.loads(text)
+            method = request.get("method")
+        except ValueError:
+            self._send(client, {"error": "EGeneral:Invalid arguments", "success": False})
+            return
+
+        handler = self._ws_methods.get(method)
+        try:
+            if handler is None:
+                raise MockKrakenError(f"EGeneral:Invalid arguments:method {method}")
+            if method in WS_TRADING_METHODS:
+                self._check_ws_trading(client, method, request.get("params") or {})
+            responses = handler(client, request.get("params") or {})
+        except MockKrakenError as e:
+            responses = [{"success": False, "error": str(e)}]
+
+        for response in responses:
+            response.setdefault("method", method)
+            if request.get("req_id") is not None:
+                response["req_id"] = request["req_id"]
+            response["time_in"] = time_in
+            response["time_out"] = iso_time(time.time())
+            self._send(client, response)
+
+    def _check_ws_trading(self, client: _Client, method: str, params: dict):
+        if not client.private:
+            raise MockKrakenError("EGeneral:Permission denied")
+        self._require_token(params.get("token") or client.token)
+        if self._chance(self.faults.rate_limit_error_rate):
+            raise MockKrakenError("EOrder:Rate limit exceeded")
+        if self.faults.enforce_rate_limits:
+            self._charge_trading(WS_TRADING_METHODS[method], params)
+
+    def _require_token(self, token: Optional[str]):
+        expiry = self._tokens.get(token or "")
+        if expiry is None or expiry < time.time():
+            raise MockKrakenError("EAPI:Invalid token")
+
+    def _ws_ping(self, client: _Client, params: dict) -> list[dict[str, Any]]:
+        return [{"method": "pong"}]
+
+    def _ws_authenticate(self, client: _Client, params: dict) -> list[dict[str, Any]]:
+        self._require_token(params.get("token"))
+        client.token = params["token"]
+        return [{"success": True}]
+
+    def _ws_subscribe(self, client: _Client, params: dict) -> list[dict[str, Any]]:
+        channel = params.get("channel")
+        if channel in ("balances", "executions"):
+            if not client.private:
+                raise MockKrakenError("EGeneral:Permission denied")
+            self._require_token(params.get("token") or client.token)
+            self._subscribe(client, (channel,))
+            result = {"channel": channel, "snapshot": True}
+            return [{"result": result, "success": True}, self._private_snapshot(channel)]
+
+        if channel == "instrument":
+            self._subscribe(client, (channel,))
+            snapshot = {
+                "channel": "instrument",
+                "type": "snapshot",
+                "data": self.market.instrument_payload(),
+            }
+            return [{"result": {"channel": channel, "snapshot": True}, "success": True}, snapshot]
+
+        if channel not in ("ticker", "book", "trade"):
+            raise MockKrakenError(f"EGeneral:Invalid arguments:channel {channel}")
+
+        depth = int(params.get("depth") or 10)
+        responses = []
+        for symbol in params.get("symbol") or ():
+            if symbol not in self.market.instruments:
+                responses.append(
+                    {"success": False, "error": f"Currency pair not supported {symbol}"}
+                )
+                continue
+            result = {"channel": channel, "symbol": symbol, "snapshot": True}
+            responses.append({"result": result, "success": True})
+            if channel == "book":
+                result["depth"] = depth
+                responses.append(self._book_snapshot(client, symbol, depth))
+            elif channel == "ticker":
+                self._subscribe(client, (channel, symbol))
+                responses.append(
+                    {"channel": "ticker", "type": "snapshot", "data": [self.market.ticker(symbol)]}
+                )
+            else:
+                self._subscribe(client, (channel, symbol))
+                trades = [trade for _, trade in list(self.market.recent_trades[symbol])[-50:]]
+                responses.append({"channel": "trade", "type": "snapshot", "data": trades})
+        return responses
+
+    def _book_snapshot(self, client: _Client, symbol: str, depth: int) -> dict[str, Any]:
+        depth = min(depth, self.market.depth)
+        # Joining subscribers share the current view so every client gets the same deltas
+        view = self._book_views.get((symbol, depth))
+        payload, levels = self.market.book_payload(symbol, depth)
+        if view is None:
+            self._book_views[(symbol, depth)] = levels
+        else:
+            bids, asks = view
+            payload["bids"] = [{"price": price, "qty": qty} for price, qty in bids]
+            payload["asks"] = [{"price": price, "qty": qty} for price, qty in asks]
+            payload["checksum"] = _view_checksum(self.market, symbol, view)
+        self._subscribe(client, ("book", symbol, depth))
+        return {"channel": "book", "type": "snapshot", "data": [payload]}
+
+    def _ws_unsubscribe(self, client: _Client, params: dict) -> list[dict[str, Any]]:
+        channel = params.get("channel")
+        symbols = params.get("symbol") or [None]
+        responses = []
+        for symbol in symbols:
+            keys = [
+                key
+                for key in client.keys
+                if key[0] == channel and (symbol is None or key[1:2] == (symbol,))
+            ]
+            for key in keys:
+                client.keys.discard(key)
+                self._subscribers[key].discard(client)
+            result = {"channel": channel}
+            if symbol is not None:
+                result["symbol"] = symbol
+            responses.append({"result": result, "success": bool(keys)})
+        return responses
+
+    def _subscribe(self, client: _Client, key: tuple):
+        client.keys.add(key)
+        self._subscribers[key].add(client)
+
+    def _private_snapshot(self, channel: str) -> dict[str, Any]:
+        if channel == "balances":
+            data = [
+                {
+                    "asset": asset,
+                    "asset_class": "currency",
+                    "balance": amount,
+                    "wallets": [{"type": "spot", "id": "main", "balance": amount}],
+                }
+                for asset, amount in self.engine.balances.items()
+            ]
+        else:
+            data = [
+                _execution(order, "new", "new")
+                for orders in self.engine.open_orders.values()
+                for order in orders.values()
+            ]
+        return {"channel": channel, "type": "snapshot", "data": data}
+
+    def _ws_order_params(self, params: dict) -> dict[str, Any]:
+        return {
+            "pair": params.get("symbol"),
+            "type": params.get("side"),
+            "ordertype": params.get("order_type"),
+            "volume": params.get("order_qty"),
+            "price": params.get("limit_price"),
+            "userref": params.get("order_userref"),
+            "cl_ord_id": params.get("cl_ord_id"),
+            "oflags": "post" if params.get("post_only") else "",
+            "validate": params.get("validate"),
+        }
+
+    def _ws_add_order(self, client: _Client, params: dict) -> list[dict[str, Any]]:
+        try:
+            order = self._place(self._ws_order_params(params))
+        except (KeyError, TypeError, ValueError) as e:
+            raise MockKrakenError(f"EGeneral:Invalid arguments:{e}") from e
+        result = {"order_id": order.txid}
+        if order.cl_ord_id:
+            result["cl_ord_id"] = order.cl_ord_id
+        return [{"result": result, "success": True}]
+
+    def _ws_batch_add(self, client: _Client, params: dict) -> list[dict[str, Any]]:
+        orders = params.get("orders") or []
+        if not 2 <= len(orders) <= 15:
+            raise MockKrakenError("EGeneral:Invalid arguments:orders")
+        results = []
+        for entry in orders:
+            order = self._place(self._ws_order_params({**entry, "symbol": params.get("symbol")}))
+            results.append({"order_id": order.txid})
+        return [{"result": results, "success": True}]
+
+    def _ws_amend_order(self, client: _Client, params: dict) -> list[dict[str, Any]]:
+        txid = params.get("order_id") or params.get("cl_ord_id")
+        volume, price = params.get("order_qty"), params.get("limit_price")
+        order = self.engine.amend_order(
+            str(txid),
+            float(volume) if volume is not None else None,
+            float(price) if price is not None else None,
+        )
+        result = {"amend_id": f"A{order.txid}", "order_id": order.txid}
+        return [{"result": result, "success": True}]
+
+    def _ws_cancel_order(self, client: _Client, params: dict) -> list[dict[str, Any]]:
+        responses = []
+        for txid in _as_list(params.get("order_id") or params.get("cl_ord_id")):
+            try:
+                self.engine.cancel_order(str(txid))
+                responses.append({"result": {"order_id": txid}, "success": True})
+            except MockKrakenError as e:
+                responses.append({"result": {"order_id": txid}, "success": False, "error": str(e)})
+        return responses
+
+    def _ws_cancel_all(self, client: _Client, params: dict) -> list[dict[str, Any]]:
+        return [{"result": {"count": self.engine.cancel_all()}, "success": True}]
+
+    # Publishing
+
+    def _publish_fill(self, fill: MockFill):
+        order = fill.order
+        instrument = self.market.instruments[order.symbol]
+        status = "filled" if order.remaining <= 0 else "partially_filled"
+        execution = _execution(order, "trade", status)
+        execution.update(
+            {
+                "exec_id": fill.trade_id,
+                "trade_id": fill.trade_id,
+                "last_qty": fill.qty,
+                "last_price": fill.price,
+                "liquidity_ind": "t" if fill.liquidity == "taker" else "m",
+                "cost": fill.price * fill.qty,
+                "fees": [{"asset": instrument.quote, "qty": fill.fee}],
+            }
+        )
+        self._broadcast(
+            ("executions",), {"channel": "executions", "type": "update", "data": [execution]}
+        )
+        balances = self.engine.balances
+        self._broadcast(
+            ("balances",),
+            {
+                "channel": "balances",
+                "type": "update",
+                "data": [
+                    {
+                        "asset": asset,
+                        "asset_class": "currency",
+                        "balance": balances.get(asset, 0.0),
+                        "type": "trade",
+                        "wallet_type": "spot",
+                        "wallet_id": "main",
+                        "ref_id": fill.trade_id,
+                        "timestamp": iso_time(fill.timestamp),
+                    }
+                    for asset in (instrument.base, instrument.quote)
+                ],
+            },
+        )
+
+    def _publish_order(self, order: MockOrder):
+        if order.status == "open" and not order.vol_exec:
+            execution = _execution(order, "new", "new")
+        elif order.status == "canceled":
+            execution = _execution(order, "canceled", "canceled")
+        elif order.status == "open":
+            execution = _execution(order, "amended", "partially_filled")
+        else:
+            return  # Fills are published with their trade details
+        self._broadcast(
+            ("executions",), {"channel": "executions", "type": "update", "data": [execution]}
+        )
+
+    def _publish_market(self, symbol: str):
+        self._broadcast(
+            ("ticker", symbol),
+            {"channel": "ticker", "type": "update", "data": [self.market.ticker(symbol)]},
+        )
+        for (book_symbol, depth), view in list(self._book_views.items()):
+            if book_symbol != symbol:
+                continue
+            key = ("book", symbol, depth)
+            if not self._subscribers.get(key):
+                del self._book_views[(symbol, depth)]
+                continue
+            payload, levels = self.market.book_payload(symbol, depth, view)
+            self._book_views[(symbol, depth)] = levels
+            if payload is not None:
+                self._broadcast(key, {"channel": "book", "type": "update", "data": [payload]})
+
+    def _publish_prints(self):
+        for trade in self.market.drain_prints():
+            self._broadcast(
+                ("trade", trade["symbol"]),
+                {"channel": "trade", "type": "update", "data": [trade]},
+            )
+
+    # Background loops
+
+    async def _market_loop(self):
+        """Tick the market at updates_per_second * rate_multiplier per symbol"""
+        loop = asyncio.get_running_loop()
+        symbols = list(self.market.instruments)
+        rate = self.config.updates_per_second * self.config.rate_multiplier * len(symbols)
+        if rate <= 0 or not symbols:
+            return
+        interval = max(1.0 / rate, 0.001)
+        last = loop.time()
+        carry = 0.0
+        counter = itertools.count()
+
+        while True:
+            await asyncio.sleep(interval)
+            now = loop.time()
+            due = (now - last) * rate + carry
+            last = now
+            ticks = int(due)
+            carry = due - ticks
+            try:
+                for _ in range(ticks):
+                    symbol = symbols[next(counter) % len(symbols)]
+                    self.market.step(symbol)
+                    self.engine.match_resting(symbol)
+                    self._publish_market(symbol)
+                    self._publish_prints()
+                self.stats["market_ticks"] += ticks
+            except Exception as e:
+                logger.error(f"[MOCK_KRAKEN] Market loop error: {e}")
+
+    async def _heartbeat_loop(self):
+        heartbeat = _dumps({"channel": "heartbeat"})
+        while True:
+            await asyncio.sleep(self.config.heartbeat_interval)
+            for client in list(self._clients):
+                if client.keys or client.private:
+                    self._send(client, heartbeat)
+
+    # Control endpoints
+
+    async def _handle_stats(self, request: "web.Request") -> "web.Response":
+        return web.json_response(self.get_stats())
+
+    async def _handle_faults(self, request: "web.Request") -> "web.Response":
+        if request.method == "POST":
+            updates = await request.json()
+            names = {item.name for item in fields(FaultConfig)}
+            unknown = set(updates) - names
+            if unknown:
+                error = f"Unknown faults: {sorted(unknown)}"
+                return web.json_response({"error": error}, status=400)
+            for name, value in updates.items():
+                setattr(self.faults, name, value)
+            logger.info(f"[MOCK_KRAKEN] Faults updated: {updates}")
+        return web.json_response(asdict(self.faults))
+
+
+def _execution(order: MockOrder, exec_type: str, status: str) -> dict[str, Any]:
+    """V2 executions payload for an order event"""
+    execution = {
+        "order_id": order.txid,
+        "symbol": order.symbol,
+        "side": order.side,
+        "order_type": order.ordertype,
+        "order_qty": order.volume,
+        "exec_type": exec_type,
+        "order_status": status,
+        "cum_qty": order.vol_exec,
+        "cum_cost": order.cost,
+        "avg_price": order.average_price,
+        "timestamp": iso_time(time.time()),
+    }
+    if order.price is not None:
+        execution["limit_price"] = order.price
+    if order.cl_ord_id:
+        execution["cl_ord_id"] = order.cl_ord_id
+    if order.userref is not None:
+        execution["order_userref"] = order.userref
+    return execution
+
+
+def _view_checksum(market: MarketSimulator, symbol: str, view: tuple[list, list]) -> int:
+    """Checksum of a published book view (may lag the live book within a tick)"""
+    instrument = market.instruments[symbol]
+    bids, asks = view
+    payload = "".join(
+        _checksum_fragment(price, instrument.price_precision)
+        + _checksum_fragment(qty, instrument.qty_precision)
+        for price, qty in asks[:CHECKSUM_DEPTH] + bids[:CHECKSUM_DEPTH]
+    )
+    return zlib.crc32(payload.encode())
+
+
+def _penalty_points(endpoint: str) -> int:
+    config = ENDPOINT_CONFIGS.get(endpoint)
+    return config.penalty_points if config is not None else 1
+
+
+def _sign(secret: str, path: str, nonce: str, body: str) -> str:
+    """Kraken API-Sign: HMAC-SHA512(path + SHA256(nonce + body)) with the decoded secret"""
+    digest = hashlib.sha256((nonce + body).encode()).digest()
+    mac = hmac.new(base64.b64decode(secret), path.encode() + digest, hashlib.sha512)
+    return base64.b64encode(mac.digest()).decode()
+
+
+def _as_list(value: Any) -> list:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [item for item in str(value).split(",") if item]
+
+
+def _truthy(value: Any) -> bool:
+    return value is True or str(value).lower() in ("true", "1")
+
+
+def _parse_form(body: str) -> dict[str, Any]:
+    """Form body, expanding ``orders[0][type]=buy`` style keys into lists of dicts"""
+    params: dict[str, Any] = {}
+    nested: dict[str, dict[int, dict[str, str]]] = defaultdict(dict)
+    for key, value in urllib.parse.parse_qsl(body, keep_blank_values=True):
+        if "[" in key and key.endswith("]"):
+            name, _, rest = key.partition("[")
+            index, _, field_name = rest.rstrip("]").partition("][")
+            if index.isdigit() and field_name:
+                nested[name].setdefault(int(index), {})[field_name] = value
+                continue
+        params[key] = value
+    for name, entries in nested.items():
+        params[name] = [entries[index] for index in sorted(entries)]
+    return params
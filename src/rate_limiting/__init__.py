@@ -15,6 +15,7 @@ Key Features:
 - Automatic recovery and cooldown mechanisms
 """
 
+from .adaptive import AdaptiveConfig
 from .kraken_rate_limiter import KrakenRateLimiter2025
 from .rate_limit_config import ENDPOINT_CONFIGS, RateLimitConfig
 from .request_queue import RequestPriority, RequestQueue
@@ -23,6 +24,7 @@ __version__ = "2025.1.0"
 
 __all__ = [
     "KrakenRateLimiter2025",
+    "AdaptiveConfig",
     "RateLimitConfig",
     "ENDPOINT_CONFIGS",
     "RequestQueue",
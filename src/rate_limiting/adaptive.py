@@ -0,0 +1,245 @@
+"""
+Adaptive Penalty Calibration
+
+Learns the effective penalty-point ceiling and decay rate from what the
+exchange actually does instead of trusting the static TIER_CONFIGS values.
+
+The model follows AIMD (additive increase, multiplicative decrease):
+- Every ``increase_every`` successful requests made while the modelled
+  counter is near its ceiling raise the ceiling by ``increase_points`` and
+  the decay rate by ``decay_increase_ratio`` (the exchange tolerated it).
+- An ``EAPI:Rate limit exceeded`` / ``EOrder:Rate limit exceeded`` response
+  means the real counter is full: the modelled counter is synced to the
+  ceiling and ceiling and decay rate are cut multiplicatively.
+- Response latency well above its baseline while near the ceiling is
+  treated as an early warning and causes a smaller cut.
+
+Learned values stay within [floor_ratio, ceiling_ratio] of the tier values.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ERRORS = ("EAPI:Rate limit exceeded", "EOrder:Rate limit exceeded")
+
+
+def is_rate_limit_error(error: Any) -> bool:
+    """
+    Check whether an exchange error (string, list of strings or exception)
+    reports an exceeded rate counter.
+    """
+    if error is None:
+        return False
+    if isinstance(error, (list, tuple)):
+        return any(is_rate_limit_error(item) for item in error)
+    text = str(error)
+    return any(marker in text for marker in RATE_LIMIT_ERRORS)
+
+
+@dataclass
+class AdaptiveConfig:
+    """Tuning for AdaptiveCalibrator."""
+
+    # Additive increase
+    increase_points: float = 1.0
+    increase_every: int = 10  # Successes near the ceiling per increase
+    decay_increase_ratio: float = 0.01
+    near_limit_ratio: float = 0.8  # Utilization that counts as probing the limit
+
+    # Multiplicative decrease
+    decrease_factor: float = 0.8  # On a rate limit error
+    decay_decrease_factor: float = 0.9
+    latency_decrease_factor: float = 0.95  # On a latency warning
+    decrease_cooldown: float = 2.0  # Seconds; one cut per burst of errors
+
+    # Latency warning
+    latency_alpha: float = 0.2  # Fast EWMA
+    baseline_alpha: float = 0.02  # Slow EWMA
+    latency_warning_ratio: float = 2.0
+    min_latency_samples: int = 20
+
+    # Bounds relative to the tier configuration
+    floor_ratio: float = 0.5
+    ceiling_ratio: float = 2.0
+
+
+class AdaptiveCalibrator:
+    """
+    AIMD estimate of the exchange's penalty ceiling and decay rate.
+
+    Applies its estimate to a PenaltyTracker, which the limiter's checks
+    already read, so adapting costs nothing on the request path.
+    """
+
+    def __init__(
+        self,
+        tracker,
+        base_max_points: float,
+        base_decay_rate: float,
+        config: Optional[AdaptiveConfig] = None,
+    ):
+        """
+        Initialize calibrator.
+
+        Args:
+            tracker: PenaltyTracker to keep in sync with the estimate
+            base_max_points: Tier ceiling the estimate starts from
+            base_decay_rate: Tier decay rate the estimate starts from
+            config: Tuning parameters
+        """
+        self.tracker = tracker
+        self.config = config or AdaptiveConfig()
+        self.base_max_points = float(base_max_points)
+        self.base_decay_rate = float(base_decay_rate)
+
+        self.max_points = self.base_max_points
+        self.decay_rate = self.base_decay_rate
+
+        self._successes_near_limit = 0
+        self._last_decrease = float("-inf")
+        self._latency_fast: Optional[float] = None
+        self._latency_baseline: Optional[float] = None
+        self._latency_samples = 0
+
+        self.stats = {
+            "increases": 0,
+            "decreases": 0,
+            "rate_limit_errors": 0,
+            "latency_warnings": 0,
+        }
+
+        self._apply()
+
+    def on_success(self, latency: Optional[float] = None, now: Optional[float] = None):
+        """
+        Record a request the exchange accepted.
+
+        Args:
+            latency: Response time in seconds
+            now: Monotonic timestamp (defaults to current time)
+        """
+        config = self.config
+        utilization = self.tracker.get_current_points() / self.max_points
+        near_limit = utilization >= config.near_limit_ratio
+
+        if latency is not None and self._observe_latency(latency) and near_limit:
+            self.stats["latency_warnings"] += 1
+            if self._decrease(config.latency_decrease_factor, 1.0, now):
+                logger.info(
+                    f"[ADAPTIVE] Latency {latency * 1000:.0f}ms above baseline near limit, "
+                    f"max_points -> {self.max_points:.1f}"
+                )
+            return
+
+        if not near_limit:
+            return
+
+        self._successes_near_limit += 1
+        if self._successes_near_limit >= config.increase_every:
+            self._successes_near_limit = 0
+            self.max_points += config.increase_points
+            self.decay_rate *= 1.0 + config.decay_increase_ratio
+            self.stats["increases"] += 1
+            self._apply()
+
+    def on_rate_limited(self, now: Optional[float] = None):
+        """
+        Record a rate limit error: the real counter is at its ceiling.
+
+        Args:
+            now: Monotonic timestamp (defaults to current time)
+        """
+        self.stats["rate_limit_errors"] += 1
+        self._successes_near_limit = 0
+
+        config = self.config
+        if self._decrease(config.decrease_factor, config.decay_decrease_factor, now):
+            logger.warning(
+                f"[ADAPTIVE] Rate limit exceeded, max_points -> {self.max_points:.1f}, "
+                f"decay_rate -> {self.decay_rate:.3f}/s"
+            )
+
+        # Whatever we modelled, the exchange's counter is full right now
+        self.tracker.update_decay()
+        self.tracker.points = self.tracker.max_points
+
+    def _observe_latency(self, latency: float) -> bool:
+        """Update latency averages; True if latency is well above baseline."""
+        config = self.config
+        self._latency_samples += 1
+        if self._latency_fast is None:
+            self._latency_fast = self._latency_baseline = latency
+            return False
+
+        self._latency_fast += config.latency_alpha * (latency - self._latency_fast)
+        self._latency_baseline += config.baseline_alpha * (latency - self._latency_baseline)
+        return (
+            self._latency_samples >= config.min_latency_samples
+            and self._latency_fast > self._latency_baseline * config.latency_warning_ratio
+        )
+
+    def _decrease(self, factor: float, decay_factor: float, now: Optional[float]) -> bool:
+        if now is None:
+            now = time.monotonic()
+        if now - self._last_decrease < self.config.decrease_cooldown:
+            return False
+
+        self._last_decrease = now
+        self.max_points *= factor
+        self.decay_rate *= decay_factor
+        self.stats["decreases"] += 1
+        self._apply()
+        return True
+
+    def _apply(self):
+        """Clamp the estimate to its bounds and push it into the tracker."""
+        config = self.config
+        self.max_points = min(
+            max(self.max_points, self.base_max_points * config.floor_ratio),
+            self.base_max_points * config.ceiling_ratio,
+        )
+        self.decay_rate = min(
+            max(self.decay_rate, self.base_decay_rate * config.floor_ratio),
+            self.base_decay_rate * config.ceiling_ratio,
+        )
+
+        tracker = self.tracker
+        tracker.update_decay()
+        tracker.max_points = self.max_points
+        tracker.decay_rate = self.decay_rate
+        tracker.points = min(tracker.points, self.max_points)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Learned parameters for persistence."""
+        return {
+            "base_max_points": self.base_max_points,
+            "base_decay_rate": self.base_decay_rate,
+            "max_points": self.max_points,
+            "decay_rate": self.decay_rate,
+            "latency_baseline": self._latency_baseline,
+            "stats": dict(self.stats),
+        }
+
+    def load_dict(self, state: dict[str, Any]):
+        """
+        Restore learned parameters.
+
+        Values learned against different tier settings are ignored.
+        """
+        if (
+            state.get("base_max_points") != self.base_max_points
+            or state.get("base_decay_rate") != self.base_decay_rate
+        ):
+            logger.info("[ADAPTIVE] Saved calibration is for different tier limits, ignoring")
+            return
+
+        self.max_points = float(state.get("max_points", self.max_points))
+        self.decay_rate = float(state.get("decay_rate", self.decay_rate))
+        self._latency_baseline = state.get("latency_baseline")
+        self._latency_fast = self._latency_baseline
+        self.stats.update(state.get("stats", {}))
+        self._apply()
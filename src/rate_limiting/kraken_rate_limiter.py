@@ -19,21 +19,24 @@ Key Features:
 import asyncio
 import json
 import logging
+import os
 import time
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Optional, Union
 
+from .adaptive import AdaptiveCalibrator, AdaptiveConfig, is_rate_limit_error
 from .rate_limit_config import (
+    MAX_BATCH_ORDERS,
     AccountTier,
     EndpointType,
     calculate_age_penalty,
-    calculate_backoff_delay,
     get_endpoint_config,
     get_tier_config,
 )
 from .request_queue import RequestPriority, RequestQueue
+from .wait_scheduler import RateLimitWaitScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -50,15 +53,21 @@ class TokenBucket:
     capacity: int  # Maximum tokens
     refill_rate: float  # Tokens per second
     tokens: float = field(init=False)  # Current token count
-    last_refill: float = field(default_factory=time.time)
+    last_refill: float = field(default_factory=time.monotonic)
 
     def __post_init__(self):
         """Initialize token count to capacity."""
         self.tokens = float(self.capacity)
 
-    def refill(self):
-        """Refill tokens based on elapsed time."""
-        now = time.time()
+    def refill(self, now: Optional[float] = None):
+        """
+        Refill tokens based on elapsed time.
+
+        Args:
+            now: Monotonic timestamp (defaults to current time)
+        """
+        if now is None:
+            now = time.monotonic()
         elapsed = now - self.last_refill
 
         if elapsed > 0:
@@ -128,7 +137,7 @@ class SlidingWindow:
             timestamp: Request timestamp (defaults to current time)
         """
         if timestamp is None:
-            timestamp = time.time()
+            timestamp = time.monotonic()
 
         self.requests.append(timestamp)
         self._cleanup_old_requests(timestamp)
@@ -144,7 +153,7 @@ class SlidingWindow:
             True if request can be made
         """
         if timestamp is None:
-            timestamp = time.time()
+            timestamp = time.monotonic()
 
         self._cleanup_old_requests(timestamp)
         return len(self.requests) < self.max_requests
@@ -160,7 +169,7 @@ class SlidingWindow:
             Number of requests in window
         """
         if timestamp is None:
-            timestamp = time.time()
+            timestamp = time.monotonic()
 
         self._cleanup_old_requests(timestamp)
         return len(self.requests)
@@ -176,7 +185,7 @@ class SlidingWindow:
             Time in seconds until next request available
         """
         if timestamp is None:
-            timestamp = time.time()
+            timestamp = time.monotonic()
 
         self._cleanup_old_requests(timestamp)
 
@@ -207,22 +216,30 @@ class PenaltyTracker:
     max_points: int  # Maximum penalty points
     decay_rate: float  # Points per second decay
     points: float = 0.0  # Current penalty points
-    last_update: float = field(default_factory=time.time)
+    last_update: float = field(default_factory=time.monotonic)
 
-    def add_penalty(self, points: int):
+    def add_penalty(self, points: int, now: Optional[float] = None):
         """
         Add penalty points.
 
         Args:
             points: Penalty points to add
+            now: Monotonic timestamp (defaults to current time)
         """
-        self.update_decay()
+        self.update_decay(now)
         self.points = min(self.max_points, self.points + points)
-        logger.debug(f"Added {points} penalty points, total: {self.points:.1f}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Added {points} penalty points, total: {self.points:.1f}")
+
+    def update_decay(self, now: Optional[float] = None):
+        """
+        Apply decay to penalty points.
 
-    def update_decay(self):
-        """Apply decay to penalty points."""
-        now = time.time()
+        Args:
+            now: Monotonic timestamp (defaults to current time)
+        """
+        if now is None:
+            now = time.monotonic()
         elapsed = now - self.last_update
 
         if elapsed > 0:
@@ -354,6 +371,36 @@ class CircuitBreaker:
         }
 
 
+class _EndpointState:
+    """
+    Per-endpoint limits resolved once, with references to the shared
+    components a check draws on.
+    """
+
+    __slots__ = (
+        "name",
+        "endpoint_type",
+        "weight",
+        "penalty_points",
+        "has_age_penalty",
+        "bucket",
+        "window",
+        "stats",
+    )
+
+    def __init__(
+        self, name, endpoint_type, weight, penalty_points, has_age_penalty, bucket, window, stats
+    ):
+        self.name = name
+        self.endpoint_type = endpoint_type
+        self.weight = weight
+        self.penalty_points = penalty_points
+        self.has_age_penalty = has_age_penalty
+        self.bucket = bucket
+        self.window = window
+        self.stats = stats
+
+
 class KrakenRateLimiter2025:
     """
     Advanced Kraken Rate Limiter for 2025 API Specifications.
@@ -380,6 +427,9 @@ class KrakenRateLimiter2025:
         enable_queue: bool = True,
         enable_circuit_breaker: bool = True,
         persistence_path: Optional[str] = None,
+        adaptive: bool = False,
+        adaptive_config: Optional[AdaptiveConfig] = None,
+        state_flush_interval: float = 5.0,
     ):
         """
         Initialize Kraken rate limiter.
@@ -390,6 +440,9 @@ class KrakenRateLimiter2025:
             enable_queue: Enable request queuing
             enable_circuit_breaker: Enable circuit breaker protection
             persistence_path: Path to save/load state
+            adaptive: Learn penalty limits from exchange responses
+            adaptive_config: Tuning for adaptive mode
+            state_flush_interval: Seconds between background saves of learned limits
         """
         # Configuration
         if isinstance(account_tier, str):
@@ -400,15 +453,29 @@ class KrakenRateLimiter2025:
         self.config = get_tier_config(account_tier)
 
         # Rate limiting components
+        self._endpoint_states: dict[str, _EndpointState] = {}
         self._init_token_buckets()
         self._init_sliding_windows()
         self._init_penalty_trackers()
 
+        # Adaptive calibration of the penalty model (off: static tier limits)
+        self.adaptive = None
+        if adaptive:
+            self.adaptive = AdaptiveCalibrator(
+                self.penalty_tracker,
+                self.config.max_penalty_points,
+                self.config.penalty_decay_rate,
+                adaptive_config,
+            )
+
         # Circuit breaker
         self.circuit_breaker = None
         if enable_circuit_breaker:
             self.circuit_breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=30.0)
 
+        # Parked callers of wait_for_rate_limit, woken when capacity returns
+        self.wait_scheduler = RateLimitWaitScheduler(self)
+
         # Request queue
         self.request_queue = None
         if enable_queue:
@@ -426,6 +493,7 @@ class KrakenRateLimiter2025:
             "requests_queued": 0,
             "penalty_points_added": 0,
             "circuit_breaker_trips": 0,
+            "rate_limit_errors": 0,
             "average_response_time": 0.0,
             "endpoint_stats": defaultdict(
                 lambda: {"requests": 0, "blocks": 0, "penalties": 0, "average_time": 0.0}
@@ -434,6 +502,8 @@ class KrakenRateLimiter2025:
 
         # Persistence
         self.persistence_path = Path(persistence_path) if persistence_path else None
+        self.state_flush_interval = state_flush_interval
+        self._state_dirty = False  # Adaptive limits changed since the last save
 
         # Background tasks
         self._background_tasks: list[asyncio.Task] = []
@@ -503,6 +573,8 @@ class KrakenRateLimiter2025:
         # Load persistent state
         if self.persistence_path:
             await self._load_state()
+            flush_task = asyncio.create_task(self._background_state_flush())
+            self._background_tasks.append(flush_task)
 
         logger.info("Kraken Rate Limiter 2025 started")
 
@@ -510,6 +582,9 @@ class KrakenRateLimiter2025:
         """Stop the rate limiter and cleanup."""
         self._shutdown = True
 
+        # Release callers waiting for capacity
+        self.wait_scheduler.cancel_all()
+
         # Stop request queue
         if self.request_queue:
             await self.request_queue.stop()
@@ -534,90 +609,135 @@ class KrakenRateLimiter2025:
         weight: Optional[int] = None,
         order_age_seconds: Optional[float] = None,
         priority: RequestPriority = RequestPriority.NORMAL,
+        order_count: int = 1,
     ) -> tuple[bool, str, float]:
         """
         Check if request can proceed within rate limits.
 
+        Coroutine wrapper around try_acquire() for existing async callers.
+
         Args:
             endpoint: API endpoint name
             weight: Request weight (defaults to endpoint config)
             order_age_seconds: Age of order for penalty calculation
             priority: Request priority for queuing
+            order_count: Orders carried by a batch request
 
         Returns:
             Tuple of (can_proceed, reason, wait_time_seconds)
         """
-        start_time = time.time()
+        return self.try_acquire(endpoint, weight, order_age_seconds, order_count)
 
+    def try_acquire(
+        self,
+        endpoint: str,
+        weight: Optional[int] = None,
+        order_age_seconds: Optional[float] = None,
+        order_count: int = 1,
+    ) -> tuple[bool, str, float]:
+        """
+        Synchronously check and record a request against the rate limits.
+
+        Reads the clock once and works on precomputed endpoint state, so the
+        hot order path does not pay for a coroutine or a config lookup.
+
+        Args:
+            endpoint: API endpoint name
+            weight: Request weight (defaults to endpoint config)
+            order_age_seconds: Age of order for penalty calculation
+            order_count: Orders carried by a batch request; penalty points
+                are charged per order, the request slot once
+
+        Returns:
+            Tuple of (can_proceed, reason, wait_time_seconds)
+        """
         try:
-            # Get endpoint configuration
-            endpoint_config = get_endpoint_config(endpoint)
+            state = self._endpoint_states.get(endpoint)
+            if state is None:
+                state = self._build_endpoint_state(endpoint)
             if weight is None:
-                weight = endpoint_config.weight
+                weight = state.weight
 
             # Check circuit breaker
-            if self.circuit_breaker and not self.circuit_breaker.can_proceed():
+            breaker = self.circuit_breaker
+            if breaker is not None and breaker.state != "CLOSED" and not breaker.can_proceed():
                 self.stats["requests_blocked"] += 1
                 return False, "Circuit breaker open", 30.0
 
             # Calculate penalty points
-            penalty_points = endpoint_config.penalty_points
-            if endpoint_config.has_age_penalty and order_age_seconds is not None:
+            penalty_points = state.penalty_points
+            if order_count != 1:
+                penalty_points *= order_count
+            if state.has_age_penalty and order_age_seconds is not None:
                 penalty_points += calculate_age_penalty(endpoint, order_age_seconds)
 
-            # Check global penalty limit
-            if not self.penalty_tracker.can_add_points(penalty_points):
-                wait_time = self.penalty_tracker.time_until_available(penalty_points)
+            now = time.monotonic()
+
+            # Check global penalty limit (decay inlined from PenaltyTracker.update_decay)
+            tracker = self.penalty_tracker
+            elapsed = now - tracker.last_update
+            if elapsed > 0:
+                points = tracker.points - elapsed * tracker.decay_rate
+                tracker.points = points if points > 0.0 else 0.0
+                tracker.last_update = now
+            if tracker.points + penalty_points > tracker.max_points:
                 self.stats["requests_blocked"] += 1
                 return (
                     False,
-                    f"Penalty limit exceeded ({self.penalty_tracker.get_current_points():.1f}/{self.config.max_penalty_points})",
-                    wait_time,
+                    f"Penalty limit exceeded ({tracker.points:.1f}/{tracker.max_points:.0f})",
+                    tracker.time_until_available(penalty_points),
                 )
 
-            # Check token bucket
-            token_bucket = self.token_buckets[endpoint_config.endpoint_type]
-            if not token_bucket.consume(weight):
-                wait_time = token_bucket.time_until_available(weight)
+            # Check token bucket (refill inlined from TokenBucket.refill)
+            bucket = state.bucket
+            elapsed = now - bucket.last_refill
+            if elapsed > 0:
+                tokens = bucket.tokens + elapsed * bucket.refill_rate
+                bucket.tokens = tokens if tokens < bucket.capacity else float(bucket.capacity)
+                bucket.last_refill = now
+            if bucket.tokens < weight:
                 self.stats["requests_blocked"] += 1
                 return (
                     False,
-                    f"Token bucket depleted ({token_bucket.get_available_tokens()}/{token_bucket.capacity})",
-                    wait_time,
+                    f"Token bucket depleted ({int(bucket.tokens)}/{bucket.capacity})",
+                    (weight - bucket.tokens) / bucket.refill_rate,
                 )
 
             # Check sliding window
-            sliding_window = self.sliding_windows[endpoint_config.endpoint_type]
-            if not sliding_window.can_make_request():
-                wait_time = sliding_window.time_until_available()
+            window = state.window
+            requests = window.requests
+            cutoff_time = now - window.window_size
+            while requests and requests[0] < cutoff_time:
+                requests.popleft()
+            if len(requests) >= window.max_requests:
                 self.stats["requests_blocked"] += 1
-                # Return tokens since we can't proceed
-                token_bucket.tokens = min(token_bucket.capacity, token_bucket.tokens + weight)
                 return (
                     False,
-                    f"Sliding window limit exceeded ({sliding_window.get_request_count()}/{sliding_window.max_requests})",
-                    wait_time,
+                    f"Sliding window limit exceeded ({len(requests)}/{window.max_requests})",
+                    window.time_until_available(now),
                 )
 
             # All checks passed - record the request
-            sliding_window.add_request()
-            self.penalty_tracker.add_penalty(penalty_points)
+            bucket.tokens -= weight
+            requests.append(now)
+            points = tracker.points + penalty_points
+            tracker.points = points if points < tracker.max_points else tracker.max_points
 
             # Update statistics
-            self.stats["requests_made"] += 1
-            self.stats["penalty_points_added"] += penalty_points
-            self.stats["endpoint_stats"][endpoint]["requests"] += 1
-            self.stats["endpoint_stats"][endpoint]["penalties"] += penalty_points
-
-            processing_time = time.time() - start_time
-            self._update_response_time_stats(endpoint, processing_time)
-
-            logger.debug(
-                f"Rate limit check passed: {endpoint} "
-                f"(weight={weight}, penalty={penalty_points}, "
-                f"tokens={token_bucket.get_available_tokens()}, "
-                f"penalty_total={self.penalty_tracker.get_current_points():.1f})"
-            )
+            stats = self.stats
+            stats["requests_made"] += 1
+            stats["penalty_points_added"] += penalty_points
+            endpoint_stats = state.stats
+            endpoint_stats["requests"] += 1
+            endpoint_stats["penalties"] += penalty_points
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Rate limit check passed: {endpoint} "
+                    f"(weight={weight}, penalty={penalty_points}, "
+                    f"tokens={int(bucket.tokens)}, "
+                    f"penalty_total={tracker.points:.1f})"
+                )
 
             return True, "OK", 0.0
 
@@ -626,6 +746,30 @@ class KrakenRateLimiter2025:
             # Default to allowing request on error
             return True, "Error - defaulting to allow", 0.0
 
+    def _get_endpoint_state(self, endpoint: str) -> _EndpointState:
+        """Cached endpoint state, built on first use."""
+        state = self._endpoint_states.get(endpoint)
+        if state is None:
+            state = self._build_endpoint_state(endpoint)
+        return state
+
+    def _build_endpoint_state(self, endpoint: str) -> _EndpointState:
+        """Resolve and cache the limits and components used for an endpoint."""
+        endpoint_config = get_endpoint_config(endpoint)
+        endpoint_type = endpoint_config.endpoint_type
+        state = _EndpointState(
+            name=endpoint,
+            endpoint_type=endpoint_type,
+            weight=endpoint_config.weight,
+            penalty_points=endpoint_config.penalty_points,
+            has_age_penalty=endpoint_config.has_age_penalty,
+            bucket=self.token_buckets[endpoint_type],
+            window=self.sliding_windows[endpoint_type],
+            stats=self.stats["endpoint_stats"][endpoint],
+        )
+        self._endpoint_states[endpoint] = state
+        return state
+
     async def wait_for_rate_limit(
         self,
         endpoint: str,
@@ -633,59 +777,32 @@ class KrakenRateLimiter2025:
         order_age_seconds: Optional[float] = None,
         priority: RequestPriority = RequestPriority.NORMAL,
         timeout_seconds: Optional[float] = None,
+        order_count: int = 1,
     ) -> bool:
         """
         Wait until request can proceed within rate limits.
 
+        Waiters are woken in priority order at the moment the blocking
+        limit (token bucket, sliding window or penalty points) frees up,
+        with the capacity already acquired for them.
+
         Args:
             endpoint: API endpoint name
             weight: Request weight
             order_age_seconds: Age of order for penalty calculation
             priority: Request priority
             timeout_seconds: Maximum time to wait
+            order_count: Orders carried by a batch request
 
         Returns:
             True if request can proceed, False if timeout/shutdown
         """
-        start_time = time.time()
-        attempt = 0
-
-        while not self._shutdown:
-            can_proceed, reason, wait_time = await self.check_rate_limit(
-                endpoint, weight, order_age_seconds, priority
-            )
-
-            if can_proceed:
-                return True
-
-            # Check timeout
-            if timeout_seconds:
-                elapsed = time.time() - start_time
-                if elapsed >= timeout_seconds:
-                    logger.warning(f"Rate limit wait timeout for {endpoint} after {elapsed:.1f}s")
-                    return False
-
-            # Calculate backoff delay
-            backoff_delay = calculate_backoff_delay(
-                attempt,
-                self.config.base_backoff_seconds,
-                self.config.backoff_multiplier,
-                min(wait_time, self.config.max_backoff_seconds),
-            )
-
-            logger.info(
-                f"Rate limited {endpoint}: {reason} - "
-                f"waiting {backoff_delay:.1f}s (attempt {attempt + 1})"
-            )
-
-            try:
-                await asyncio.sleep(backoff_delay)
-            except asyncio.CancelledError:
-                return False
-
-            attempt += 1
+        if self._shutdown:
+            return False
 
-        return False
+        return await self.wait_scheduler.wait(
+            endpoint, weight, order_age_seconds, priority, timeout_seconds, order_count
+        )
 
     async def execute_with_rate_limit(
         self,
@@ -696,6 +813,7 @@ class KrakenRateLimiter2025:
         order_age_seconds: Optional[float] = None,
         priority: RequestPriority = RequestPriority.NORMAL,
         timeout_seconds: Optional[float] = None,
+        order_count: int = 1,
         **kwargs,
     ) -> Any:
         """
@@ -709,6 +827,7 @@ class KrakenRateLimiter2025:
             order_age_seconds: Age of order for penalty calculation
             priority: Request priority
             timeout_seconds: Maximum time to wait
+            order_count: Orders carried by a batch request
             **kwargs: Function keyword arguments
 
         Returns:
@@ -719,12 +838,12 @@ class KrakenRateLimiter2025:
         """
         # Wait for rate limit clearance
         if not await self.wait_for_rate_limit(
-            endpoint, weight, order_age_seconds, priority, timeout_seconds
+            endpoint, weight, order_age_seconds, priority, timeout_seconds, order_count
         ):
             raise Exception(f"Rate limit timeout for {endpoint}")
 
         # Execute function
-        start_time = time.time()
+        start_time = time.monotonic()
         try:
             if asyncio.iscoroutinefunction(func):
                 result = await func(*args, **kwargs)
@@ -735,12 +854,18 @@ class KrakenRateLimiter2025:
             if self.circuit_breaker:
                 self.circuit_breaker.record_success()
 
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             self._update_response_time_stats(endpoint, execution_time)
 
+            # Kraken reports rate limits in the response body, not as exceptions
+            errors = result.get("error") if isinstance(result, dict) else None
+            self.record_response(endpoint, errors or None, execution_time)
+
             return result
 
         except Exception as e:
+            self.record_response(endpoint, e)
+
             # Record failure
             if self.circuit_breaker:
                 self.circuit_breaker.record_failure()
@@ -750,6 +875,76 @@ class KrakenRateLimiter2025:
             logger.error(f"Function execution failed for {endpoint}: {e}")
             raise
 
+    def record_response(
+        self, endpoint: str, error: Any = None, latency: Optional[float] = None
+    ):
+        """
+        Feed an exchange response back into the rate model.
+
+        A rate limit error means the exchange's counter is full, so the
+        modelled counter is synced to its ceiling. In adaptive mode the
+        response also updates the learned ceiling and decay rate, and every
+        adjustment marks the state for the background flush to
+        ``persistence_path``, so a crash loses at most one flush interval.
+
+        Args:
+            endpoint: API endpoint name
+            error: Error string(s) or exception from the response, if any
+            latency: Response time in seconds
+        """
+        state = self._get_endpoint_state(endpoint)
+        if state.penalty_points <= 0:
+            return  # Public endpoints do not draw on the penalty counter
+
+        adjustments = self._adaptive_adjustments()
+        if is_rate_limit_error(error):
+            self.stats["rate_limit_errors"] += 1
+            if self.adaptive:
+                self.adaptive.on_rate_limited()
+            else:
+                self.penalty_tracker.update_decay()
+                self.penalty_tracker.points = self.penalty_tracker.max_points
+        elif error is None and self.adaptive:
+            self.adaptive.on_success(latency)
+
+        if self._adaptive_adjustments() != adjustments:
+            self._state_dirty = True
+
+    def _adaptive_adjustments(self) -> int:
+        if not self.adaptive:
+            return 0
+        return self.adaptive.stats["increases"] + self.adaptive.stats["decreases"]
+
+    def get_order_capacity(self, endpoint: str = "AddOrderBatch") -> int:
+        """
+        Estimate how many orders could be sent right now without waiting.
+
+        Used to size batches: a batch that fits the current penalty headroom
+        goes out immediately instead of waiting for a full batch's worth.
+        Nothing is recorded.
+
+        Args:
+            endpoint: Order endpoint whose per-order cost applies
+
+        Returns:
+            Number of orders (0 if no request slot is free)
+        """
+        state = self._get_endpoint_state(endpoint)
+        now = time.monotonic()
+
+        state.bucket.refill(now)
+        if state.bucket.tokens < state.weight or not state.window.can_make_request(now):
+            return 0
+
+        per_order = state.penalty_points
+        if per_order <= 0:
+            return MAX_BATCH_ORDERS
+
+        tracker = self.penalty_tracker
+        tracker.update_decay(now)
+        headroom = tracker.max_points - tracker.points
+        return max(0, int(headroom // per_order))
+
     def record_order_time(self, order_id: str, timestamp: Optional[float] = None):
         """
         Record order creation time for age-based penalty calculation.
@@ -822,10 +1017,17 @@ class KrakenRateLimiter2025:
                 / self.penalty_tracker.max_points,
                 "decay_rate": self.penalty_tracker.decay_rate,
             },
+            # Learned penalty model
+            "adaptive": self.adaptive.to_dict() if self.adaptive else None,
             # Circuit breaker status
             "circuit_breaker": self.circuit_breaker.get_state() if self.circuit_breaker else None,
             # Queue status
             "request_queue": self.request_queue.get_stats() if self.request_queue else None,
+            # Callers parked in wait_for_rate_limit
+            "wait_scheduler": {
+                **self.wait_scheduler.stats,
+                "waiting": self.wait_scheduler.get_waiting_count(),
+            },
             # Order tracking
             "tracked_orders": len(self.order_times),
             # Statistics
@@ -856,11 +1058,14 @@ class KrakenRateLimiter2025:
             "requests_queued": 0,
             "penalty_points_added": 0,
             "circuit_breaker_trips": 0,
+            "rate_limit_errors": 0,
             "average_response_time": 0.0,
             "endpoint_stats": defaultdict(
                 lambda: {"requests": 0, "blocks": 0, "penalties": 0, "average_time": 0.0}
             ),
         }
+        # Cached endpoint states hold references into the old stats
+        self._endpoint_states.clear()
         logger.info("Rate limiter statistics reset")
 
     def _update_response_time_stats(self, endpoint: str, response_time: float):
@@ -911,11 +1116,24 @@ class KrakenRateLimiter2025:
             except Exception as e:
                 logger.error(f"Background cleanup error: {e}")
 
+    async def _background_state_flush(self):
+        """Save learned limits after adaptive adjustments, off the request path."""
+        while not self._shutdown:
+            try:
+                await asyncio.sleep(self.state_flush_interval)
+                if self._state_dirty:
+                    await self._save_state()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Background state flush error: {e}")
+
     async def _save_state(self):
-        """Save rate limiter state to disk."""
+        """Save rate limiter state to disk (file I/O in the default executor)."""
         if not self.persistence_path:
             return
 
+        self._state_dirty = False
         try:
             state = {
                 "account_tier": self.account_tier.value,
@@ -925,11 +1143,26 @@ class KrakenRateLimiter2025:
                 "order_times": self.order_times.copy(),
                 "statistics": self.stats.copy(),
             }
+            if self.adaptive:
+                state["adaptive"] = self.adaptive.to_dict()
+            # Serialised here: the stats dicts keep changing on the loop
+            payload = json.dumps(state, indent=2)
+        except Exception as e:
+            logger.error(f"Failed to save rate limiter state: {e}")
+            return
 
+        await asyncio.get_running_loop().run_in_executor(None, self._write_state, payload)
+
+    def _write_state(self, payload: str):
+        """Write serialised state, replacing the old file atomically."""
+        try:
             self.persistence_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(self.persistence_path, "w") as f:
-                json.dump(state, f, indent=2)
+            # A crash mid-write must not corrupt learned limits
+            tmp_path = self.persistence_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.persistence_path)
 
             logger.debug(f"Rate limiter state saved to {self.persistence_path}")
 
@@ -945,6 +1178,10 @@ class KrakenRateLimiter2025:
             with open(self.persistence_path) as f:
                 state = json.load(f)
 
+            # Learned limits stay valid across restarts, unlike counter state
+            if self.adaptive and state.get("adaptive"):
+                self.adaptive.load_dict(state["adaptive"])
+
             # Restore order times (only recent ones)
             current_time = time.time()
             saved_time = state.get("timestamp", current_time)
@@ -960,7 +1197,7 @@ class KrakenRateLimiter2025:
                     0, saved_penalty - (elapsed * self.penalty_tracker.decay_rate)
                 )
                 self.penalty_tracker.points = decayed_penalty
-                self.penalty_tracker.last_update = current_time
+                self.penalty_tracker.last_update = time.monotonic()
 
                 logger.info(
                     f"Rate limiter state loaded: penalty_points={decayed_penalty:.1f}, orders={len(self.order_times)}"
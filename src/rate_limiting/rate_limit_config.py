@@ -106,6 +106,11 @@ class EndpointConfig:
     has_age_penalty: bool = False  # For order modifications
 
 
+# AddOrderBatch accepts 2-15 orders for a single pair
+MIN_BATCH_ORDERS = 2
+MAX_BATCH_ORDERS = 15
+
+
 # Kraken API endpoint configurations (2025 specifications)
 ENDPOINT_CONFIGS: dict[str, EndpointConfig] = {
     # ===== PUBLIC ENDPOINTS =====
@@ -288,6 +293,16 @@ ENDPOINT_CONFIGS: dict[str, EndpointConfig] = {
         requires_auth=True,
         is_trading_endpoint=True,
     ),
+    "AddOrderBatch": EndpointConfig(
+        name="AddOrderBatch",
+        endpoint_type=EndpointType.PRIVATE,
+        weight=1,  # One request regardless of batch size
+        penalty_points=1,  # Per order in the batch
+        max_requests_per_minute=15,
+        requires_auth=True,
+        is_trading_endpoint=True,
+        supports_batch=True,
+    ),
     "AmendOrder": EndpointConfig(
         name="AmendOrder",
         endpoint_type=EndpointType.PRIVATE,
@@ -372,6 +387,16 @@ ENDPOINT_CONFIGS: dict[str, EndpointConfig] = {
         is_trading_endpoint=True,
         has_age_penalty=True,
     ),
+    "WS-AmendOrder": EndpointConfig(
+        name="WS-AmendOrder",
+        endpoint_type=EndpointType.WEBSOCKET,
+        weight=1,
+        penalty_points=1,  # Base + age penalty
+        max_requests_per_minute=30,
+        requires_auth=True,
+        is_trading_endpoint=True,
+        has_age_penalty=True,
+    ),
     "WS-EditOrder": EndpointConfig(
         name="WS-EditOrder",
         endpoint_type=EndpointType.WEBSOCKET,
@@ -8,8 +8,10 @@ priority levels, queue management strategies, and integration with circuit break
 
 import asyncio
 import heapq
+import itertools
 import logging
 import time
+from collections import deque
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from enum import Enum, IntEnum
@@ -17,6 +19,9 @@ from typing import Any, Callable, Optional
 
 logger = logging.getLogger(__name__)
 
+# Dead entries tolerated per structure before it is rebuilt (amortised O(1))
+COMPACT_MIN_DEAD = 64
+
 
 class RequestPriority(IntEnum):
     """
@@ -121,6 +126,13 @@ class RequestQueue:
     - Circuit breaker integration
     - Request expiration handling
     - Comprehensive metrics
+
+    Requests sit in one arrival-ordered deque per priority plus a global
+    arrival deque (oldest first, for FIFO and max-age expiry) and a min-heap
+    on expires_at. Removal leaves tombstones that are skipped lazily; a
+    structure is rebuilt once its dead entries outnumber the live ones, so
+    enqueue, dequeue, cancel and expiry are amortised O(1)/O(log n) under
+    every strategy.
     """
 
     def __init__(
@@ -144,12 +156,20 @@ class RequestQueue:
         self.cleanup_interval = cleanup_interval
         self.max_age_seconds = max_age_seconds
 
-        # Priority queues for each priority level
-        self._queues: dict[RequestPriority, list[QueuedRequest]] = {
-            priority: [] for priority in RequestPriority
+        # Arrival-ordered queue per priority level
+        self._queues: dict[RequestPriority, deque[QueuedRequest]] = {
+            priority: deque() for priority in RequestPriority
         }
+        self._live: dict[RequestPriority, int] = dict.fromkeys(RequestPriority, 0)
+
+        # All queued requests oldest first, and (expires_at, seq, request) min-heap
+        self._arrivals: deque[QueuedRequest] = deque()
+        self._expiry: list[tuple[float, int, QueuedRequest]] = []
+        self._expiring = 0
+        self._removed_since_compact = 0
+        self._seq = itertools.count()
 
-        # Request tracking
+        # Request tracking (membership here is what makes an entry live)
         self._requests: dict[str, QueuedRequest] = {}
         self._processing: dict[str, QueuedRequest] = {}
 
@@ -211,6 +231,12 @@ class RequestQueue:
             self._requests.clear()
             for queue in self._queues.values():
                 queue.clear()
+            self._live = dict.fromkeys(RequestPriority, 0)
+            self._removed_since_compact = 0
+            self._arrivals.clear()
+            self._expiry.clear()
+            self._expiring = 0
+            self.stats["current_size"] = 0
 
         logger.info("Request queue stopped")
 
@@ -285,8 +311,13 @@ class RequestQueue:
             )
 
             # Add to appropriate queue
-            heapq.heappush(self._queues[priority], request)
+            self._queues[priority].append(request)
+            self._arrivals.append(request)
+            if expires_at is not None:
+                heapq.heappush(self._expiry, (expires_at, next(self._seq), request))
+                self._expiring += 1
             self._requests[request_id] = request
+            self._live[priority] += 1
 
             # Update statistics
             self.stats["total_queued"] += 1
@@ -296,10 +327,11 @@ class RequestQueue:
             # Notify waiting consumers
             self._not_empty.notify()
 
-            logger.debug(
-                f"Request {request_id} queued: endpoint={endpoint}, "
-                f"priority={priority.name}, queue_size={self.stats['current_size']}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Request {request_id} queued: endpoint={endpoint}, "
+                    f"priority={priority.name}, queue_size={self.stats['current_size']}"
+                )
 
             return request
 
@@ -336,22 +368,24 @@ class RequestQueue:
             # Get next request based on strategy
             request = self._get_next_request()
             if request is None:
+                self._compact()
                 return None
 
             # Move to processing state
-            del self._requests[request.request_id]
+            self._remove(request)
+            self._compact()
             self._processing[request.request_id] = request
             request.scheduled_at = time.time()
 
             # Update statistics
-            self.stats["current_size"] -= 1
             wait_time = request.scheduled_at - request.created_at
             self._update_wait_time_stats(wait_time)
 
-            logger.debug(
-                f"Request {request.request_id} dequeued: "
-                f"wait_time={wait_time:.2f}s, queue_size={self.stats['current_size']}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Request {request.request_id} dequeued: "
+                    f"wait_time={wait_time:.2f}s, queue_size={self.stats['current_size']}"
+                )
 
             return request
 
@@ -368,57 +402,97 @@ class RequestQueue:
         else:
             return self._get_priority_fifo_request()  # Default
 
+    def _is_queued(self, request: QueuedRequest) -> bool:
+        """True while the request is live (not dequeued, cancelled or expired)."""
+        return self._requests.get(request.request_id) is request
+
+    def _remove(self, request: QueuedRequest):
+        """Drop a live request; its entries in the other structures become tombstones."""
+        del self._requests[request.request_id]
+        self._live[request.priority] -= 1
+        if request.expires_at is not None:
+            self._expiring -= 1
+        self.stats["current_size"] -= 1
+        self._removed_since_compact += 1
+
+    def _discard_if_stale(self, request: QueuedRequest) -> bool:
+        """Remove a live request that was cancelled directly or has expired."""
+        if request.is_cancelled:
+            self._remove(request)
+            self.stats["total_cancelled"] += 1
+            return True
+        if request.is_expired:
+            request.cancel("Expired")
+            self._remove(request)
+            self.stats["total_expired"] += 1
+            return True
+        return False
+
+    def _pop_live(self, queue: deque) -> Optional[QueuedRequest]:
+        """Pop the oldest live, unexpired request from an arrival-ordered deque."""
+        while queue:
+            request = queue.popleft()
+            if self._is_queued(request) and not self._discard_if_stale(request):
+                return request
+        return None
+
+    def _compact(self):
+        """
+        Rebuild structures whose tombstones outnumber their live entries.
+
+        Called once per operation, never while a structure is being walked.
+        Each removal leaves at most three tombstones, so the structures are
+        only inspected once removals outnumber the live requests.
+        """
+        if self._removed_since_compact <= max(COMPACT_MIN_DEAD, len(self._requests)):
+            return
+        self._removed_since_compact = 0
+
+        for priority, queue in self._queues.items():
+            live = self._live[priority]
+            if len(queue) - live > max(COMPACT_MIN_DEAD, live):
+                self._queues[priority] = deque(r for r in queue if self._is_queued(r))
+
+        live = len(self._requests)
+        if len(self._arrivals) - live > max(COMPACT_MIN_DEAD, live):
+            self._arrivals = deque(r for r in self._arrivals if self._is_queued(r))
+
+        if len(self._expiry) - self._expiring > max(COMPACT_MIN_DEAD, self._expiring):
+            self._expiry = [entry for entry in self._expiry if self._is_queued(entry[2])]
+            heapq.heapify(self._expiry)
+
     def _get_fifo_request(self) -> Optional[QueuedRequest]:
         """Get next request using FIFO strategy."""
-        oldest_request = None
-        oldest_time = float("inf")
-
-        for priority in RequestPriority:
-            queue = self._queues[priority]
-            while queue:
-                request = heapq.heappop(queue)
-                if not request.is_cancelled and not request.is_expired:
-                    if request.created_at < oldest_time:
-                        if oldest_request:
-                            heapq.heappush(self._queues[oldest_request.priority], oldest_request)
-                        oldest_request = request
-                        oldest_time = request.created_at
-                    else:
-                        heapq.heappush(self._queues[request.priority], request)
-                        break
-
-        return oldest_request
+        return self._pop_live(self._arrivals)
 
     def _get_priority_fifo_request(self) -> Optional[QueuedRequest]:
         """Get next request using priority-FIFO strategy."""
         for priority in RequestPriority:
-            queue = self._queues[priority]
-            while queue:
-                request = heapq.heappop(queue)
-                if not request.is_cancelled and not request.is_expired:
+            if self._live[priority]:
+                request = self._pop_live(self._queues[priority])
+                if request is not None:
                     return request
 
         return None
 
     def _get_weighted_fair_request(self) -> Optional[QueuedRequest]:
         """Get next request using weighted fair queuing."""
-        # Find priority with highest credits that has requests
-        best_priority = None
-        best_credits = -1
+        while True:
+            # Find priority with highest credits that has requests
+            best_priority = None
+            best_credits = float("-inf")
 
-        for priority in RequestPriority:
-            if self._queues[priority] and self._wfq_credits[priority] > best_credits:
-                best_priority = priority
-                best_credits = self._wfq_credits[priority]
+            for priority in RequestPriority:
+                if self._live[priority] and self._wfq_credits[priority] > best_credits:
+                    best_priority = priority
+                    best_credits = self._wfq_credits[priority]
 
-        if best_priority is None:
-            return None
+            if best_priority is None:
+                return None
 
-        # Get request from best priority queue
-        queue = self._queues[best_priority]
-        while queue:
-            request = heapq.heappop(queue)
-            if not request.is_cancelled and not request.is_expired:
+            # Get request from best priority queue (retry if only stale ones were left)
+            request = self._pop_live(self._queues[best_priority])
+            if request is not None:
                 # Deduct credits and refresh others
                 self._wfq_credits[best_priority] -= 1.0
                 for p in RequestPriority:
@@ -427,19 +501,17 @@ class RequestQueue:
 
                 return request
 
-        return None
-
     def _get_adaptive_request(self) -> Optional[QueuedRequest]:
         """Get next request using adaptive strategy."""
         # Use weighted fair queuing but adapt credits based on queue sizes
-        total_requests = sum(len(q) for q in self._queues.values())
+        total_requests = len(self._requests)
 
         if total_requests == 0:
             return None
 
         # Adjust credits based on queue sizes
         for priority in RequestPriority:
-            queue_size = len(self._queues[priority])
+            queue_size = self._live[priority]
             if queue_size > 0:
                 ratio = queue_size / total_requests
                 base_credit = self._wfq_credits[priority]
@@ -502,12 +574,12 @@ class RequestQueue:
             True if request was cancelled, False if not found
         """
         async with self._lock:
-            # Check queued requests
+            # Check queued requests (its queue entries become tombstones)
             request = self._requests.get(request_id)
             if request:
                 request.cancel(reason)
-                del self._requests[request_id]
-                self.stats["current_size"] -= 1
+                self._remove(request)
+                self._compact()
                 self.stats["total_cancelled"] += 1
                 return True
 
@@ -533,60 +605,45 @@ class RequestQueue:
                 logger.error(f"Cleanup loop error: {e}")
 
     async def _cleanup_expired_requests(self):
-        """Remove expired and cancelled requests from queues."""
+        """Expire requests past expires_at or max age, oldest first."""
         async with self._lock:
             removed_count = 0
-            time.time()
-
-            # Clean up queued requests
-            for priority in RequestPriority:
-                queue = self._queues[priority]
-                valid_requests = []
-
-                while queue:
-                    request = heapq.heappop(queue)
-
-                    if request.is_cancelled:
-                        removed_count += 1
-                        self.stats["total_cancelled"] += 1
-                        continue
-
-                    if request.is_expired:
-                        request.cancel("Expired")
-                        removed_count += 1
-                        self.stats["total_expired"] += 1
-                        continue
-
-                    # Check max age
-                    if request.age_seconds > self.max_age_seconds:
-                        request.cancel("Max age exceeded")
-                        removed_count += 1
-                        self.stats["total_expired"] += 1
-                        continue
-
-                    valid_requests.append(request)
-
-                # Rebuild heap with valid requests
-                self._queues[priority] = valid_requests
-                heapq.heapify(self._queues[priority])
-
-            # Update request tracking
-            valid_requests = {}
-            for request_id, request in self._requests.items():
-                if not request.is_cancelled and not request.is_expired:
-                    valid_requests[request_id] = request
-
-            removed_from_tracking = len(self._requests) - len(valid_requests)
-            self._requests = valid_requests
-
-            # Update statistics
-            self.stats["current_size"] = len(self._requests)
+            now = time.time()
+
+            # Explicit timeouts: pop the expiry heap up to now
+            expiry = self._expiry
+            while expiry and expiry[0][0] < now:
+                request = heapq.heappop(expiry)[2]
+                if self._is_queued(request):
+                    request.cancel("Expired")
+                    self._remove(request)
+                    self.stats["total_expired"] += 1
+                    removed_count += 1
+
+            # Max age: the arrival deque is oldest first, so stop at the first young request
+            cutoff = now - self.max_age_seconds
+            arrivals = self._arrivals
+            while arrivals:
+                request = arrivals[0]
+                if not self._is_queued(request):
+                    arrivals.popleft()
+                elif request.is_cancelled:
+                    arrivals.popleft()
+                    self._remove(request)
+                    self.stats["total_cancelled"] += 1
+                    removed_count += 1
+                elif request.created_at < cutoff:
+                    arrivals.popleft()
+                    request.cancel("Max age exceeded")
+                    self._remove(request)
+                    self.stats["total_expired"] += 1
+                    removed_count += 1
+                else:
+                    break
 
-            if removed_count > 0 or removed_from_tracking > 0:
-                logger.debug(
-                    f"Cleanup removed {removed_count} queued and "
-                    f"{removed_from_tracking} tracked requests"
-                )
+            if removed_count > 0:
+                self._compact()
+                logger.debug(f"Cleanup removed {removed_count} queued requests")
 
     def get_stats(self) -> dict[str, Any]:
         """Get comprehensive queue statistics."""
@@ -594,7 +651,7 @@ class RequestQueue:
 
         # Add real-time queue sizes
         stats["queue_sizes"] = {
-            priority.name: len(self._queues[priority]) for priority in RequestPriority
+            priority.name: self._live[priority] for priority in RequestPriority
         }
 
         stats["processing_count"] = len(self._processing)
@@ -616,7 +673,7 @@ class RequestQueue:
         """
         if priority is None:
             return self.stats["current_size"]
-        return len(self._queues[priority])
+        return self._live[priority]
 
     def is_full(self) -> bool:
         """Check if queue is at capacity."""
@@ -0,0 +1,224 @@
+"""
+Rate Limit Wait Scheduler
+
+Parks callers that are over the rate limit and wakes them in priority order
+at the moment capacity returns. Instead of polling with exponential backoff,
+the scheduler asks the limiter how long the blocking component (token bucket,
+sliding window or penalty tracker) needs and arms a single timer for that
+instant. Waiters are grouped per endpoint type because each type has its own
+bucket and window; the global penalty tracker is checked on every wake.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Optional
+
+from .request_queue import RequestPriority
+
+logger = logging.getLogger(__name__)
+
+# Floor for timer delays so float rounding in the refill maths cannot spin
+MIN_WAKE_DELAY = 0.001
+
+
+class _Waiter:
+    """A parked request, ordered by priority then arrival."""
+
+    __slots__ = (
+        "priority",
+        "seq",
+        "endpoint",
+        "weight",
+        "order_age_seconds",
+        "order_count",
+        "parked_at",
+        "future",
+    )
+
+    def __init__(
+        self, priority, seq, endpoint, weight, order_age_seconds, order_count, parked_at, future
+    ):
+        self.priority = priority
+        self.seq = seq
+        self.endpoint = endpoint
+        self.weight = weight
+        self.order_age_seconds = order_age_seconds
+        self.order_count = order_count
+        self.parked_at = parked_at
+        self.future = future
+
+    def __lt__(self, other):
+        if self.priority != other.priority:
+            return self.priority < other.priority
+        return self.seq < other.seq
+
+
+class RateLimitWaitScheduler:
+    """
+    Priority-ordered, timer-driven waiting for KrakenRateLimiter2025.
+
+    A wake acquires capacity on behalf of the waiter (via try_acquire) before
+    resolving its future, so a woken caller can proceed immediately and no
+    other caller can take the capacity in between.
+    """
+
+    def __init__(self, limiter):
+        """
+        Initialize scheduler.
+
+        Args:
+            limiter: KrakenRateLimiter2025 whose try_acquire grants capacity
+        """
+        self._limiter = limiter
+        self._waiters: dict[object, list[_Waiter]] = {}
+        self._timers: dict[object, asyncio.TimerHandle] = {}
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.stats = {
+            "parked": 0,
+            "granted": 0,
+            "timed_out": 0,
+            "wakeups": 0,
+            "total_wait_time": 0.0,
+            "max_wait_time": 0.0,
+        }
+
+    async def wait(
+        self,
+        endpoint: str,
+        weight: Optional[int] = None,
+        order_age_seconds: Optional[float] = None,
+        priority: RequestPriority = RequestPriority.NORMAL,
+        timeout_seconds: Optional[float] = None,
+        order_count: int = 1,
+    ) -> bool:
+        """
+        Wait until the request has been granted capacity.
+
+        Args:
+            endpoint: API endpoint name
+            weight: Request weight
+            order_age_seconds: Age of order at call time (ages while parked)
+            priority: Wake order among parked requests of the same type
+            timeout_seconds: Maximum time to wait
+            order_count: Orders carried by a batch request
+
+        Returns:
+            True once capacity was acquired, False on timeout or shutdown
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Waiters and timers from a previous loop can never fire
+            self._reset(loop)
+
+        key = self._limiter._get_endpoint_state(endpoint).endpoint_type
+        heap = self._waiters.setdefault(key, [])
+
+        # Nobody queued ahead of us: take capacity without parking
+        if (
+            not heap
+            and self._limiter.try_acquire(endpoint, weight, order_age_seconds, order_count)[0]
+        ):
+            return True
+
+        parked_at = time.monotonic()
+        waiter = _Waiter(
+            int(priority),
+            next(self._seq),
+            endpoint,
+            weight,
+            order_age_seconds,
+            order_count,
+            parked_at,
+            loop.create_future(),
+        )
+        heapq.heappush(heap, waiter)
+        self.stats["parked"] += 1
+
+        # The new waiter may now be at the head; re-evaluate right away
+        self._wake(key)
+
+        try:
+            granted = await asyncio.wait_for(waiter.future, timeout_seconds)
+        except asyncio.TimeoutError:
+            self.stats["timed_out"] += 1
+            logger.warning(
+                f"Rate limit wait timeout for {endpoint} after {time.monotonic() - parked_at:.1f}s"
+            )
+            # The head may have been this waiter; let the next one in line retry
+            self._wake(key)
+            return False
+        except asyncio.CancelledError:
+            self._wake(key)
+            return False
+
+        if granted:
+            waited = time.monotonic() - parked_at
+            self.stats["granted"] += 1
+            self.stats["total_wait_time"] += waited
+            if waited > self.stats["max_wait_time"]:
+                self.stats["max_wait_time"] = waited
+        return granted
+
+    def _wake(self, key):
+        """Grant capacity to waiters at the head of a group, then re-arm the timer."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        self.stats["wakeups"] += 1
+        heap = self._waiters.get(key)
+        limiter = self._limiter
+        while heap:
+            waiter = heap[0]
+            if waiter.future.done():
+                heapq.heappop(heap)
+                continue
+
+            order_age = waiter.order_age_seconds
+            if order_age is not None:
+                order_age += time.monotonic() - waiter.parked_at
+
+            can_proceed, reason, wait_time = limiter.try_acquire(
+                waiter.endpoint, waiter.weight, order_age, waiter.order_count
+            )
+            if can_proceed:
+                heapq.heappop(heap)
+                waiter.future.set_result(True)
+                continue
+
+            delay = max(wait_time, MIN_WAKE_DELAY)
+            self._timers[key] = self._loop.call_later(delay, self._wake, key)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Rate limited {waiter.endpoint}: {reason} - "
+                    f"waking {len(heap)} waiter(s) in {delay:.3f}s"
+                )
+            return
+
+    def cancel_all(self):
+        """Release every parked waiter with False (used on shutdown)."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+
+        for heap in self._waiters.values():
+            for waiter in heap:
+                if not waiter.future.done():
+                    waiter.future.set_result(False)
+            heap.clear()
+
+    def _reset(self, loop: asyncio.AbstractEventLoop):
+        self._timers.clear()
+        self._waiters.clear()
+        self._loop = loop
+
+    def get_waiting_count(self) -> int:
+        """Number of requests currently parked."""
+        return sum(
+            1 for heap in self._waiters.values() for waiter in heap if not waiter.future.done()
+        )
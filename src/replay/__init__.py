@@ -0,0 +1,24 @@
+"""Deterministic market replay of recorded WebSocket V2 traffic through the bot pipeline."""
+
+from .clock import VirtualClockEventLoop, virtual_wall_clock
+from .exchange import FakeExchange, FakeExchangeError, FakeTradeExecutor
+from .harness import ReplayHarness, ReplayReport, build_replay_bot, run_replay, write_report
+from .recording import RecordedFrame, load_recording
+from .transport import ReplayConnector, ReplaySocket
+
+__all__ = [
+    "FakeExchange",
+    "FakeExchangeError",
+    "FakeTradeExecutor",
+    "RecordedFrame",
+    "ReplayConnector",
+    "ReplayHarness",
+    "ReplayReport",
+    "ReplaySocket",
+    "VirtualClockEventLoop",
+    "build_replay_bot",
+    "load_recording",
+    "run_replay",
+    "virtual_wall_clock",
+    "write_report",
+]
@@ -0,0 +1,88 @@
+"""
+Market Replay CLI
+
+Usage:
+    python -m src.replay session.jsonl
+    python -m src.replay session.jsonl --signals my_research.signals:dip_buyer \
+        --balance USDT=500 --report replay_report.json
+    python -m src.replay incident.jsonl --recorded-account --start 1718000000 --end 1718003600
+    python -m src.replay recordings/ --symbol BTC/USDT --start 1718000000 --end 1718003600
+"""
+
+import argparse
+import importlib
+import json
+import logging
+
+from .harness import run_replay, write_report
+
+
+def _parse_balance(text: str) -> tuple[str, float]:
+    asset, _, amount = text.partition("=")
+    if not amount:
+        raise argparse.ArgumentTypeError(f"Expected ASSET=amount, got '{text}'")
+    return asset, float(amount)
+
+
+def _load_callable(path: str):
+    module_name, _, attribute = path.partition(":")
+    if not attribute:
+        raise argparse.ArgumentTypeError(f"Expected module:callable, got '{path}'")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Replay recorded WebSocket V2 traffic")
+    parser.add_argument(
+        "recording", help="JSON Lines recording (.jsonl or .jsonl.gz), .kwsr file or directory"
+    )
+    parser.add_argument("--start", type=float, default=None, help="First receive time (epoch s)")
+    parser.add_argument("--end", type=float, default=None, help="End receive time (epoch s)")
+    parser.add_argument("--symbol", default=None, help="Only replay this symbol's frames")
+    parser.add_argument(
+        "--signals",
+        type=_load_callable,
+        default=None,
+        help="Signal source module:callable(ticker_update, harness) -> signals",
+    )
+    parser.add_argument(
+        "--balance",
+        type=_parse_balance,
+        action="append",
+        default=[],
+        help="Fake exchange starting balance (repeatable)",
+    )
+    parser.add_argument(
+        "--recorded-account",
+        action="store_true",
+        help="Replay recorded balances/executions instead of simulating the account",
+    )
+    parser.add_argument("--no-execute", action="store_true", help="Count signals only")
+    parser.add_argument("--no-balance-manager", action="store_true")
+    parser.add_argument("--report", default=None, help="Write the JSON report here")
+    parser.add_argument("--verbose", action="store_true")
+    return parser
+
+
+def main(argv=None) -> None:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    report = run_replay(
+        args.recording,
+        start=args.start,
+        end=args.end,
+        symbol=args.symbol,
+        signal_source=args.signals,
+        balances=dict(args.balance) or None,
+        simulate_account=not args.recorded_account,
+        use_balance_manager=not args.no_balance_manager,
+        execute=not args.no_execute,
+    )
+    if args.report:
+        write_report(report, args.report)
+    print(json.dumps(report.to_dict(), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
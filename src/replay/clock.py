@@ -0,0 +1,119 @@
+"""
+Virtual Clock
+=============
+
+Event loop whose clock only moves when the loop would otherwise sleep.
+
+When no callback is ready the clock jumps straight to the earliest pending
+timer instead of blocking in ``select``, so ``asyncio.sleep``, ``wait_for``
+timeouts and recorded inter-frame gaps cost no wall time while their order is
+preserved exactly. CPU time spent in callbacks does not advance the clock.
+
+Executor and socket work still completes in wall time; a jump may overtake
+it when timers are pending, so replayed components should stay on the loop.
+
+The timer jump reads private ``BaseEventLoop`` state (``_ready``,
+``_scheduled``, ``_timer_cancelled_count``), so the loop refuses to start on
+Python versions outside ``SUPPORTED_PYTHON`` or when those internals are
+missing.
+
+``virtual_wall_clock`` patches ``time.time``/``time.monotonic`` for the whole
+process, every thread included. Replays must never run in the same process
+as the live bot: its rate limiters, staleness checks and order timestamps
+would all read the virtual clock.
+"""
+
+import asyncio
+import heapq
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+# Python versions whose BaseEventLoop._run_once internals the clock was checked against
+SUPPORTED_PYTHON = ((3, 9), (3, 13))
+
+_LOOP_INTERNALS = ("_ready", "_scheduled", "_stopping", "_timer_cancelled_count")
+_TIMER_INTERNALS = ("_when", "_cancelled", "_scheduled")
+
+
+def _check_loop_internals(loop: asyncio.AbstractEventLoop, version=None):
+    """Raise RuntimeError unless the private loop state ``_run_once`` reads is in place"""
+    version = tuple((version or sys.version_info)[:2])
+    oldest, newest = SUPPORTED_PYTHON
+    if not oldest <= version <= newest:
+        raise RuntimeError(
+            f"VirtualClockEventLoop supports Python {oldest[0]}.{oldest[1]}-"
+            f"{newest[0]}.{newest[1]}, not {version[0]}.{version[1]}"
+        )
+
+    missing = [name for name in _LOOP_INTERNALS if not hasattr(loop, name)]
+    timer = asyncio.TimerHandle(0.0, lambda: None, (), loop)
+    missing += [f"TimerHandle.{name}" for name in _TIMER_INTERNALS if not hasattr(timer, name)]
+    if missing:
+        raise RuntimeError(f"VirtualClockEventLoop: event loop internals missing: {missing}")
+
+
+class VirtualClockEventLoop(asyncio.SelectorEventLoop):
+    """Selector event loop driven by a virtual clock"""
+
+    def __init__(self, start: float = 0.0):
+        """
+        Initialize loop
+
+        Args:
+            start: Initial clock value (epoch seconds to line up with recorded frames)
+        """
+        super().__init__()
+        try:
+            _check_loop_internals(self)
+        except RuntimeError:
+            self.close()
+            raise
+        self._virtual_time = start
+        # Timers due within this window fire together; must exceed the float spacing
+        # of epoch-sized clock values (~2.4e-7 s) or a due timer would never fire
+        self._clock_resolution = 1e-6
+
+    def time(self) -> float:
+        return self._virtual_time
+
+    def advance(self, seconds: float):
+        """Move the clock forward manually"""
+        self._virtual_time += max(0.0, seconds)
+
+    def _run_once(self):
+        if not self._ready and not self._stopping:
+            scheduled = self._scheduled
+            # Drop cancelled timers first so the clock never jumps to a dead deadline
+            while scheduled and scheduled[0]._cancelled:
+                self._timer_cancelled_count -= 1
+                handle = heapq.heappop(scheduled)
+                handle._scheduled = False
+            if scheduled and scheduled[0]._when > self._virtual_time:
+                self._virtual_time = scheduled[0]._when
+        super()._run_once()
+
+
+@contextmanager
+def virtual_wall_clock(loop: VirtualClockEventLoop) -> Iterator[None]:
+    """
+    Route ``time.time`` and ``time.monotonic`` to the loop's virtual clock
+
+    Timestamps taken by replayed components (staleness checks, rate limiters,
+    heartbeats) then line up with the recorded frame times.
+    ``time.perf_counter`` is left alone for measuring real processing cost.
+
+    The patch is process-wide and cannot be nested; never enter it in a
+    process that also runs the live bot.
+    """
+    if isinstance(getattr(time.time, "__self__", None), VirtualClockEventLoop):
+        raise RuntimeError("time.time is already routed to a virtual clock")
+
+    original_time, original_monotonic = time.time, time.monotonic
+    time.time = loop.time
+    time.monotonic = loop.time
+    try:
+        yield
+    finally:
+        time.time, time.monotonic = original_time, original_monotonic
@@ -0,0 +1,231 @@
+"""
+Replay Exchange
+===============
+
+Local fake exchange for market replay.
+
+Quotes come from the replayed ticker feed. Market orders (and marketable
+limit orders) fill immediately at the current ask/bid with the taker fee;
+limit orders that do not cross the quote are cancelled, since there is no
+resting order book to queue them in. Fills update an in-memory spot account
+and are reported to ``on_fill`` listeners so the harness can stream matching
+``balances``/``executions`` frames back over the private connection.
+"""
+
+import itertools
+import logging
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Kraken spot taker fee (lowest volume tier)
+DEFAULT_TAKER_FEE = 0.0026
+
+
+class FakeExchangeError(Exception):
+    """Order rejected by the fake exchange (message uses Kraken error codes)"""
+
+
+class FakeExchange:
+    """
+    In-process spot exchange with the subset of the ccxt-style client used by
+    the bot, the WebSocket client (token) and BalanceManagerV2 (REST fallback)
+    """
+
+    def __init__(
+        self,
+        balances: Optional[dict[str, float]] = None,
+        taker_fee: float = DEFAULT_TAKER_FEE,
+    ):
+        """
+        Initialize exchange
+
+        Args:
+            balances: Starting balances by asset (default 1000 USDT)
+            taker_fee: Fee rate for every fill (all fills take liquidity)
+        """
+        self.balances: dict[str, float] = dict(balances or {"USDT": 1000.0})
+        self.taker_fee = taker_fee
+
+        self.quotes: dict[str, dict[str, float]] = {}
+        self.orders: list[dict[str, Any]] = []
+        self.rejected = 0
+        self.fees_paid = 0.0
+        self.on_fill: list[Callable] = []
+
+        self._order_ids = itertools.count(1)
+        self._tokens = itertools.count(1)
+
+    # Market data
+
+    def update_quote(self, symbol: str, bid: float, ask: float, last: float):
+        """Record the latest replayed quote for a symbol"""
+        self.quotes[symbol] = {"bid": bid, "ask": ask, "last": last, "timestamp": time.time()}
+
+    async def fetch_ticker(self, symbol: str) -> dict[str, Any]:
+        quote = self.quotes.get(symbol)
+        if quote is None:
+            raise FakeExchangeError(f"EQuery:Unknown asset pair {symbol}")
+        return {"symbol": symbol, **quote}
+
+    # Account
+
+    async def get_websocket_token(self) -> dict[str, Any]:
+        return {"token": f"replay-token-{next(self._tokens)}", "expires": 900}
+
+    async def fetch_balance(self) -> dict[str, Any]:
+        """ccxt layout: per-asset dicts plus free/used/total maps"""
+        result: dict[str, Any] = {"free": {}, "used": {}, "total": {}}
+        for asset, amount in self.balances.items():
+            result[asset] = {"free": amount, "used": 0.0, "total": amount}
+            result["free"][asset] = amount
+            result["used"][asset] = 0.0
+            result["total"][asset] = amount
+        return result
+
+    # Orders
+
+    async def create_order(
+        self,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """
+        Execute an order against the current quote
+
+        Args:
+            symbol: Trading pair ('BTC/USDT')
+            type: 'market' or 'limit'
+            side: 'buy' or 'sell'
+            amount: Base currency amount
+            price: Limit price
+
+        Returns:
+            ccxt-style order dict
+        """
+        quote = self.quotes.get(symbol)
+        if quote is None:
+            self.rejected += 1
+            raise FakeExchangeError(f"EQuery:Unknown asset pair {symbol}")
+
+        base, quote_asset = symbol.split("/")
+        touch = quote["ask"] if side == "buy" else quote["bid"]
+        if type == "limit":
+            marketable = price >= touch if side == "buy" else price <= touch
+            if not marketable:
+                self.rejected += 1
+                return self._record(symbol, type, side, amount, price, 0.0, 0.0, "canceled")
+            # Marketable limits execute at the touch, as on the real book
+        elif type != "market":
+            self.rejected += 1
+            raise FakeExchangeError(f"EOrder:Unsupported order type {type}")
+
+        cost = amount * touch
+        fee = cost * self.taker_fee
+        if side == "buy":
+            if self.balances.get(quote_asset, 0.0) < cost + fee:
+                self.rejected += 1
+                raise FakeExchangeError("EOrder:Insufficient funds")
+            self.balances[quote_asset] = self.balances.get(quote_asset, 0.0) - cost - fee
+            self.balances[base] = self.balances.get(base, 0.0) + amount
+        else:
+            if self.balances.get(base, 0.0) < amount:
+                self.rejected += 1
+                raise FakeExchangeError("EOrder:Insufficient funds")
+            self.balances[base] -= amount
+            self.balances[quote_asset] = self.balances.get(quote_asset, 0.0) + cost - fee
+
+        self.fees_paid += fee
+        order = self._record(symbol, type, side, amount, price, touch, fee, "closed")
+        changed = {base: self.balances[base], quote_asset: self.balances[quote_asset]}
+        for listener in self.on_fill:
+            try:
+                listener(order, changed)
+            except Exception as e:
+                logger.error(f"[REPLAY_EXCHANGE] Fill listener error: {e}")
+        return order
+
+    async def create_market_order(
+        self, symbol: str, side: str, amount: float, params: Optional[dict[str, Any]] = None
+    ) -> dict[str, Any]:
+        return await self.create_order(symbol, "market", side, amount, None, params)
+
+    def _record(
+        self,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float,
+        price: Optional[float],
+        average: float,
+        fee: float,
+        status: str,
+    ) -> dict[str, Any]:
+        filled = amount if status == "closed" else 0.0
+        order = {
+            "id": f"REPLAY-{next(self._order_ids)}",
+            "symbol": symbol,
+            "type": type,
+            "side": side,
+            "amount": amount,
+            "price": price if price is not None else average,
+            "average": average,
+            "filled": filled,
+            "cost": filled * average,
+            "fee": {"cost": fee, "currency": symbol.split("/")[1]},
+            "status": status,
+            "timestamp": time.time() * 1000,
+        }
+        self.orders.append(order)
+        return order
+
+
+class FakeTradeExecutor:
+    """``trade_executor`` for the bot: sizes USDT requests and sends market orders"""
+
+    def __init__(self, exchange: FakeExchange):
+        self.exchange = exchange
+
+    async def execute_trade(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        Execute a bot trade request
+
+        Args:
+            request: {'symbol', 'side', 'amount' (quote currency), 'signal'}
+
+        Returns:
+            {'success': bool, ...} as returned by the production executor
+        """
+        symbol = request["symbol"]
+        side = request.get("side", "buy")
+        quote = self.exchange.quotes.get(symbol)
+        if quote is None:
+            return {"success": False, "error": f"No replayed quote for {symbol}"}
+
+        if side == "buy":
+            amount = request["amount"] / quote["ask"] / (1 + self.exchange.taker_fee)
+        else:
+            held = self.exchange.balances.get(symbol.split("/")[0], 0.0)
+            amount = min(request["amount"] / quote["bid"], held)
+
+        try:
+            order = await self.exchange.create_market_order(symbol, side, amount)
+        except FakeExchangeError as e:
+            return {"success": False, "error": str(e)}
+
+        return {
+            "success": True,
+            "order_id": order["id"],
+            "symbol": symbol,
+            "side": side,
+            "amount": order["filled"],
+            "price": order["average"],
+            "average_price": order["average"],
+            "cost": order["cost"],
+            "fee": order["fee"]["cost"],
+        }
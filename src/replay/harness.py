@@ -0,0 +1,451 @@
+"""
+Market Replay Harness
+=====================
+
+Replays recorded WebSocket V2 traffic through the production pipeline:
+
+    ReplaySocket -> ConnectionManager -> KrakenWebSocketV2 -> BalanceManagerV2
+        -> signal queue -> KrakenTradingBot._execute_signal -> FakeExchange
+
+The run happens on a ``VirtualClockEventLoop`` with ``time.time`` routed to
+the virtual clock, so recorded gaps cost no wall time and every timestamp the
+bot takes matches the recording. A run is deterministic for a given
+recording, configuration and signal source.
+
+Signals come from ``signal_source(update, harness)``, called for every
+replayed ticker update (sync or async, returns a list of signal dicts). With
+``simulate_account`` the recorded account channels are dropped and balances
+and executions are streamed from the fake exchange instead, so fills made
+during the replay are reflected back through the private connection;
+otherwise the recorded private traffic is replayed verbatim.
+
+Wall-clock latencies (``time.perf_counter``):
+- frame_processing: frame received -> dispatch finished (next recv)
+- tick_to_signal: latest public frame received -> signal enqueued
+- signal_to_execution: ``_execute_signal`` duration
+- tick_to_execution: latest public frame received -> ``_execute_signal`` done
+
+Ticker callbacks run behind the conflating fan-out, so tick latencies are
+measured from the newest public frame and are a lower bound.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Union
+
+from src.core.strategy_scheduler import LatencyHistogram
+
+from .clock import VirtualClockEventLoop, virtual_wall_clock
+from .exchange import FakeExchange, FakeTradeExecutor
+from .recording import PRIVATE, PRIVATE_CHANNELS, PUBLIC, RecordedFrame, load_recording
+from .transport import ReplayConnector
+
+logger = logging.getLogger(__name__)
+
+LATENCY_METRICS = ("frame_processing", "tick_to_signal", "signal_to_execution", "tick_to_execution")
+
+
+@dataclass
+class ReplayReport:
+    """Outcome and cost of a replay run"""
+
+    frames: int
+    public_frames: int
+    private_frames: int
+    virtual_duration: float
+    wall_duration: float
+    signals: int
+    executed: int
+    orders: int
+    rejected_orders: int
+    fees_paid: float
+    balances: dict[str, float]
+    latency: dict[str, dict[str, Any]]
+    websocket: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def speedup(self) -> float:
+        """Virtual seconds replayed per wall second"""
+        return self.virtual_duration / self.wall_duration if self.wall_duration else 0.0
+
+    @property
+    def frames_per_second(self) -> float:
+        return self.frames / self.wall_duration if self.wall_duration else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "speedup": self.speedup,
+            "frames_per_second": self.frames_per_second,
+        }
+
+
+def build_replay_bot(
+    exchange: FakeExchange,
+    websocket_client: Any,
+    balance_manager: Any,
+    config: Optional[dict[str, Any]] = None,
+):
+    """
+    KrakenTradingBot wired to replay components instead of live ones
+
+    Only the state ``_execute_signal`` relies on is populated; ``initialize``
+    is not run (it would connect to the real exchange).
+    """
+    from src.core.bot import KrakenTradingBot
+
+    bot = KrakenTradingBot(config)
+    bot.exchange = exchange
+    bot.websocket_manager = websocket_client
+    bot.balance_manager = balance_manager
+    bot.balance_manager_v2 = balance_manager
+    bot.trade_executor = FakeTradeExecutor(exchange)
+    for name in ("position_cycler", "hft_controller"):
+        if not hasattr(bot, name):
+            setattr(bot, name, None)
+    bot.running = True
+    return bot
+
+
+class ReplayHarness:
+    """
+    Drives a recording through the bot pipeline and measures it
+    """
+
+    def __init__(
+        self,
+        frames: list[RecordedFrame],
+        signal_source: Optional[Callable] = None,
+        balances: Optional[dict[str, float]] = None,
+        simulate_account: bool = True,
+        use_balance_manager: bool = True,
+        execute: bool = True,
+        bot: Any = None,
+        bot_config: Optional[dict[str, Any]] = None,
+        websocket_config: Any = None,
+        setup: Optional[Callable] = None,
+        warmup: float = 5.0,
+        settle_time: float = 1.0,
+    ):
+        """
+        Initialize harness
+
+        Args:
+            frames: Time-ordered recording
+            signal_source: Callable(ticker_update, harness) -> list of signals
+            balances: Fake exchange starting balances
+            simulate_account: Stream account state from the fake exchange
+            use_balance_manager: Run BalanceManagerV2 on the replayed client
+            execute: Execute signals through the bot (False: only count them)
+            bot: Prebuilt bot-like object (signal_queue, _execute_signal)
+            bot_config: Config for the default KrakenTradingBot
+            websocket_config: KrakenWebSocketConfig template
+            setup: Async callable(harness) run after connecting (subscriptions)
+            warmup: Seconds between run start and the first frame
+            settle_time: Seconds allowed after the last frame for queued work
+        """
+        if simulate_account:
+            frames = [frame for frame in frames if frame.channel not in PRIVATE_CHANNELS]
+        self.frames = frames
+        self.signal_source = signal_source
+        self.simulate_account = simulate_account
+        self.use_balance_manager = use_balance_manager
+        self.execute = execute
+        self.bot = bot
+        self.bot_config = bot_config
+        self.websocket_config = websocket_config
+        self.setup = setup
+        self.warmup = warmup
+        self.settle_time = settle_time
+
+        self.exchange = FakeExchange(balances)
+        self.connector: Optional[ReplayConnector] = None
+        self.websocket = None
+        self.balance_manager = None
+
+        self.latency = {name: LatencyHistogram() for name in LATENCY_METRICS}
+        self.signals = 0
+        self.executed = 0
+        self._signal_ticks: dict[int, float] = {}
+        self._consumer: Optional[asyncio.Task] = None
+
+    # Wiring
+
+    def _create_websocket(self):
+        from src.websocket.kraken_websocket_v2 import KrakenWebSocketConfig, KrakenWebSocketV2
+
+        config = self.websocket_config or KrakenWebSocketConfig()
+        config.public_shards = 1  # One recorded public stream
+        config.connector = self.connector
+
+        # Dummy credentials enable the private connection; the token comes from the fake exchange
+        websocket = KrakenWebSocketV2("replay", "replay", config)
+        websocket.set_exchange_client(self.exchange)
+        websocket.register_callback("ticker", self._on_ticker)
+        return websocket
+
+    def _handle_private_request(self, request: dict[str, Any]) -> list[dict[str, Any]]:
+        """Simulated account snapshot after a balances subscription"""
+        params = request.get("params") or {}
+        if (
+            self.simulate_account
+            and request.get("method") == "subscribe"
+            and params.get("channel") == "balances"
+        ):
+            return [
+                {
+                    "channel": "balances",
+                    "type": "snapshot",
+                    "data": [
+                        {"asset": asset, "balance": amount}
+                        for asset, amount in self.exchange.balances.items()
+                    ],
+                }
+            ]
+        return []
+
+    def _on_fill(self, order: dict[str, Any], balances: dict[str, float]):
+        """Stream a fake exchange fill back as private executions/balances frames"""
+        if not self.simulate_account or self.connector is None:
+            return
+        private = self.connector.private
+        if private.closed:
+            return
+
+        timestamp = time.time()
+        base, quote = order["symbol"].split("/")
+        private.inject(
+            {
+                "channel": "executions",
+                "type": "update",
+                "data": [
+                    {
+                        "order_id": order["id"],
+                        "symbol": order["symbol"],
+                        "side": order["side"],
+                        "order_type": order["type"],
+                        "exec_type": "trade",
+                        "order_status": "filled",
+                        "last_qty": order["filled"],
+                        "last_price": order["average"],
+                        "cost": order["cost"],
+                        "fees": [{"asset": quote, "qty": order["fee"]["cost"]}],
+                        "timestamp": timestamp,
+                    }
+                ],
+            }
+        )
+        private.inject(
+            {
+                "channel": "balances",
+                "type": "update",
+                "data": [{"asset": asset, "balance": amount} for asset, amount in balances.items()],
+            }
+        )
+
+    async def _wait_authenticated(self, timeout: float = 10.0) -> bool:
+        connection = self.websocket.private_connection
+        deadline = asyncio.get_running_loop().time() + timeout
+        while connection is not None and not connection.is_authenticated:
+            if asyncio.get_running_loop().time() >= deadline:
+                return False
+            await asyncio.sleep(0.01)
+        return connection is not None
+
+    async def _start_balance_manager(self):
+        try:
+            from src.balance.balance_manager_v2 import BalanceManagerV2
+
+            self.balance_manager = BalanceManagerV2(self.websocket, self.exchange)
+            if not await self.balance_manager.initialize():
+                logger.warning("[REPLAY] Balance manager initialization incomplete")
+        except Exception as e:
+            logger.error(f"[REPLAY] Balance manager unavailable: {e}")
+            self.balance_manager = None
+
+    # Signal path
+
+    async def _on_ticker(self, updates: list[Any]):
+        public = self.connector.public
+        for update in updates:
+            self.exchange.update_quote(
+                update.symbol, float(update.bid), float(update.ask), float(update.last)
+            )
+            if self.signal_source is None:
+                continue
+
+            signals = self.signal_source(update, self)
+            if inspect.isawaitable(signals):
+                signals = await signals
+            for signal in signals or ():
+                now = time.perf_counter()
+                self.signals += 1
+                self.latency["tick_to_signal"].observe(now - public.received_at)
+                if self._consumer is not None:
+                    self._signal_ticks[id(signal)] = public.received_at
+                    await self.bot.signal_queue.put(signal)
+
+    async def _consume_signals(self):
+        queue = self.bot.signal_queue
+        while True:
+            signal = await queue.get()
+            try:
+                started = time.perf_counter()
+                await self.bot._execute_signal(signal)
+                finished = time.perf_counter()
+                self.executed += 1
+                self.latency["signal_to_execution"].observe(finished - started)
+                tick = self._signal_ticks.pop(id(signal), None)
+                if tick is not None:
+                    self.latency["tick_to_execution"].observe(finished - tick)
+            except Exception as e:
+                logger.error(f"[REPLAY] Signal execution error: {e}")
+            finally:
+                queue.task_done()
+
+    # Run
+
+    async def run(self) -> ReplayReport:
+        """Replay every frame and return the report"""
+        loop = asyncio.get_running_loop()
+        virtual_start = loop.time()
+        wall_start = time.perf_counter()
+        first = self.frames[0].time if self.frames else virtual_start
+
+        connector_options = {}
+        if self.websocket_config is not None:
+            connector_options["private_url"] = self.websocket_config.private_url
+        self.connector = ReplayConnector(
+            self.frames,
+            time_offset=virtual_start + self.warmup - first,
+            private_request_handler=self._handle_private_request,
+            # Kraken sends heartbeats once a second; a simulated account has no recorded ones
+            private_heartbeat=1.0 if self.simulate_account else None,
+            **connector_options,
+        )
+        self.connector.public.on_processed = self.latency["frame_processing"].observe
+        self.connector.private.on_processed = self.latency["frame_processing"].observe
+        self.exchange.on_fill.append(self._on_fill)
+
+        self.websocket = self._create_websocket()
+        use_private = self.simulate_account or bool(self.connector.private.frames)
+        if not await self.websocket.connect(private_channels=use_private):
+            raise RuntimeError("Replay WebSocket connection failed")
+
+        try:
+            if use_private and await self._wait_authenticated():
+                if self.simulate_account:
+                    await self.websocket.subscribe_balance()
+            if self.setup is not None:
+                await self.setup(self)
+            if self.use_balance_manager:
+                await self._start_balance_manager()
+            if self.execute and self.signal_source is not None:
+                if self.bot is None:
+                    self.bot = build_replay_bot(
+                        self.exchange, self.websocket, self.balance_manager, self.bot_config
+                    )
+                self._consumer = asyncio.create_task(self._consume_signals())
+
+            await self.connector.public.drained.wait()
+            if self.connector.private.connects and self.connector.private.frames:
+                await self.connector.private.drained.wait()
+
+            # Let fan-out mailboxes and queued signals finish on the virtual clock
+            await asyncio.sleep(self.settle_time)
+            if self._consumer is not None:
+                await self.bot.signal_queue.join()
+        finally:
+            if self._consumer is not None:
+                self._consumer.cancel()
+                try:
+                    await self._consumer
+                except asyncio.CancelledError:
+                    pass
+            if self.balance_manager is not None:
+                await self.balance_manager.shutdown()
+            await self.websocket.disconnect()
+
+        return self._report(loop.time() - virtual_start, time.perf_counter() - wall_start)
+
+    def _report(self, virtual_duration: float, wall_duration: float) -> ReplayReport:
+        public = sum(1 for frame in self.frames if frame.connection == PUBLIC)
+        return ReplayReport(
+            frames=len(self.frames),
+            public_frames=public,
+            private_frames=sum(1 for frame in self.frames if frame.connection == PRIVATE),
+            virtual_duration=virtual_duration,
+            wall_duration=wall_duration,
+            signals=self.signals,
+            executed=self.executed,
+            orders=len(self.exchange.orders),
+            rejected_orders=self.exchange.rejected,
+            fees_paid=self.exchange.fees_paid,
+            balances=dict(self.exchange.balances),
+            latency={name: histogram.to_dict() for name, histogram in self.latency.items()},
+            websocket={
+                "reconnects": dict(self.websocket.reconnect_stats),
+                "book_checksums": dict(self.websocket.book_checksum_stats),
+                "replay_connects": {
+                    name: socket.connects for name, socket in self.connector.sockets.items()
+                },
+            },
+        )
+
+
+def run_replay(
+    recording: Union[str, Path, Iterable[RecordedFrame]],
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    symbol: Optional[str] = None,
+    **options,
+) -> ReplayReport:
+    """
+    Replay a recording on a fresh virtual-clock loop
+
+    Args:
+        recording: Recording path (JSON Lines, .kwsr or recorder directory) or frames
+        start: Optional first receive time (seconds)
+        end: Optional end receive time (seconds, exclusive)
+        symbol: Optional symbol to replay (frames without a symbol are kept)
+        **options: ReplayHarness arguments
+
+    Returns:
+        ReplayReport
+    """
+    frames = load_recording(recording, start, end, symbol)
+    if not frames:
+        raise ValueError("Recording contains no frames in the requested window")
+
+    harness = ReplayHarness(frames, **options)
+    loop = VirtualClockEventLoop(start=frames[0].time - harness.warmup)
+    asyncio.set_event_loop(loop)
+    try:
+        with virtual_wall_clock(loop):
+            report = loop.run_until_complete(harness.run())
+            # Stop leftover background loops the way asyncio.run does
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+    logger.info(
+        f"[REPLAY] {report.frames} frames, {report.virtual_duration:.1f}s replayed in "
+        f"{report.wall_duration:.2f}s ({report.speedup:.0f}x), {report.executed} signals executed"
+    )
+    return report
+
+
+def write_report(report: ReplayReport, path: Union[str, Path]):
+    """Save a report as JSON (for comparing runs)"""
+    with open(path, "w") as handle:
+        json.dump(report.to_dict(), handle, indent=2, default=str)
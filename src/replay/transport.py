@@ -0,0 +1,262 @@
+"""
+Replay Transport
+================
+
+In-process stand-in for a ``websockets`` client connection.
+
+``ReplayConnector`` is passed to ``ConnectionManager`` through
+``ConnectionConfig.connector`` (``KrakenWebSocketConfig.connector``) and hands
+out one ``ReplaySocket`` per connection role. Each socket releases its recorded
+frames at their receive time on the loop clock, so the real connection
+manager, decoder and message handlers run unchanged.
+
+Requests sent by the client are answered locally (authenticate, subscribe,
+unsubscribe, ping); recorded method responses belong to the recorded session's
+own requests and are skipped. An optional request handler sees every request
+and may add frames (e.g., a simulated account snapshot after a balances
+subscription); requests nobody handles get an error response.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from .recording import PRIVATE, PUBLIC, RecordedFrame
+
+logger = logging.getLogger(__name__)
+
+
+HEARTBEAT = json.dumps({"channel": "heartbeat"})
+
+
+def _release(waiter: Optional[asyncio.Future]):
+    if waiter is not None and not waiter.done():
+        waiter.set_result(None)
+
+
+class ReplaySocket:
+    """Recorded frame source with the websockets client protocol surface"""
+
+    def __init__(
+        self,
+        name: str,
+        frames: list[RecordedFrame],
+        time_offset: float = 0.0,
+        request_handler: Optional[Callable] = None,
+        heartbeat_interval: Optional[float] = None,
+    ):
+        """
+        Initialize socket
+
+        Args:
+            name: Connection role (PUBLIC or PRIVATE)
+            frames: Time-ordered frames for this connection
+            time_offset: Added to frame times to get loop times
+            request_handler: Callable(request) -> extra frames to send back (every request)
+            heartbeat_interval: Send heartbeats when no frame is due for this long
+                (for connections whose traffic is simulated rather than recorded)
+        """
+        self.name = name
+        self.frames = [frame for frame in frames if not frame.is_response]
+        self.time_offset = time_offset
+        self.request_handler = request_handler
+        self.heartbeat_interval = heartbeat_interval
+
+        self.position = 0
+        self.closed = True
+        self.connects = 0
+        self.sent: list[dict[str, Any]] = []
+
+        self._injected: deque[str] = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self.drained = asyncio.Event()
+
+        # Wall-clock accounting (perf_counter)
+        self.received_at = 0.0  # When the latest frame was handed to the client
+        self.processing_time = 0.0
+        self.frames_delivered = 0
+        self.on_processed: Optional[Callable[[float], None]] = None
+        self._dispatching = False
+
+    def open(self) -> "ReplaySocket":
+        """(Re)open for a new connection; replay resumes where it stopped"""
+        self.closed = False
+        self.connects += 1
+        return self
+
+    def inject(self, message: Any):
+        """Queue a frame to be received before the next recorded one"""
+        self._injected.append(message if isinstance(message, str) else json.dumps(message))
+        _release(self._waiter)
+
+    async def _wait(self, delay: Optional[float]):
+        """Sleep until delay elapses (None: indefinitely) or a frame is injected"""
+        loop = asyncio.get_running_loop()
+        self._waiter = waiter = loop.create_future()
+        handle = loop.call_later(delay, _release, waiter) if delay is not None else None
+        try:
+            await waiter
+        finally:
+            self._waiter = None
+            if handle is not None:
+                handle.cancel()
+
+    async def recv(self) -> str:
+        """Next frame: injected responses first, then recorded frames at their time"""
+        if self._dispatching:
+            # The previous frame has been fully dispatched by the time recv is called again
+            self._dispatching = False
+            elapsed = time.perf_counter() - self.received_at
+            self.processing_time += elapsed
+            if self.on_processed is not None:
+                self.on_processed(elapsed)
+
+        loop = asyncio.get_running_loop()
+        frames = self.frames
+        while True:
+            if self.closed:
+                raise ConnectionError(f"Replay {self.name} socket closed")
+
+            if self._injected:
+                raw = self._injected.popleft()
+            elif self.position < len(frames) and (
+                frames[self.position].time + self.time_offset <= loop.time()
+            ):
+                raw = frames[self.position].raw
+                self.position += 1
+            else:
+                if self.position < len(frames):
+                    delay = frames[self.position].time + self.time_offset - loop.time()
+                else:
+                    self.drained.set()
+                    delay = None
+
+                heartbeat = self.heartbeat_interval
+                if heartbeat is None or (delay is not None and delay <= heartbeat):
+                    await self._wait(delay)
+                    continue
+                await self._wait(heartbeat)
+                if self._injected or self.closed:
+                    continue
+                raw = HEARTBEAT
+
+            self.frames_delivered += 1
+            self._dispatching = True
+            self.received_at = time.perf_counter()
+            return raw
+
+    async def send(self, message: str):
+        """Answer client requests locally"""
+        if self.closed:
+            raise ConnectionError(f"Replay {self.name} socket closed")
+
+        request = json.loads(message)
+        self.sent.append(request)
+
+        responses = self._acknowledge(request)
+        extra = self.request_handler(request) if self.request_handler is not None else None
+        if responses is not None or extra:
+            responses = (responses or []) + (extra or [])
+        else:
+            responses = [
+                {
+                    "method": request.get("method"),
+                    "req_id": request.get("req_id"),
+                    "success": False,
+                    "error": "EGeneral:Unsupported in replay",
+                }
+            ]
+        for response in responses:
+            self.inject(response)
+
+    def _acknowledge(self, request: dict[str, Any]) -> Optional[list[dict[str, Any]]]:
+        """Built-in responses (None for methods the socket does not handle)"""
+        method = request.get("method")
+        req_id = request.get("req_id")
+        now = time.time()
+
+        if method == "authenticate":
+            return [{"method": method, "success": True, "time_in": now, "time_out": now}]
+
+        if method in ("subscribe", "unsubscribe"):
+            params = dict(request.get("params") or {})
+            params.pop("token", None)
+            symbols = params.pop("symbol", None) or [None]
+            responses = []
+            for symbol in symbols:
+                result = dict(params)
+                if symbol is not None:
+                    result["symbol"] = symbol
+                response = {"method": method, "result": result, "success": True}
+                if req_id is not None:
+                    response["req_id"] = req_id
+                responses.append(response)
+            return responses
+
+        if method == "ping":
+            return [{"method": "pong", "req_id": req_id, "time_in": now, "time_out": now}]
+
+        return None
+
+    async def ping(self):
+        return None
+
+    async def close(self):
+        self.closed = True
+        _release(self._waiter)
+
+
+class ReplayConnector:
+    """``websockets.connect`` replacement serving recorded public/private streams"""
+
+    def __init__(
+        self,
+        frames: list[RecordedFrame],
+        time_offset: float = 0.0,
+        private_url: str = "wss://ws-auth.kraken.com/v2",
+        private_request_handler: Optional[Callable] = None,
+        private_heartbeat: Optional[float] = None,
+    ):
+        """
+        Initialize connector
+
+        Args:
+            frames: Time-ordered recording
+            time_offset: Added to frame times to get loop times
+            private_url: URL identifying the authenticated connection
+            private_request_handler: Request handler for the private socket
+            private_heartbeat: Heartbeat interval for the private socket
+        """
+        self.private_url = private_url
+        self.sockets = {
+            PUBLIC: ReplaySocket(
+                PUBLIC, [frame for frame in frames if frame.connection == PUBLIC], time_offset
+            ),
+            PRIVATE: ReplaySocket(
+                PRIVATE,
+                [frame for frame in frames if frame.connection == PRIVATE],
+                time_offset,
+                private_request_handler,
+                private_heartbeat,
+            ),
+        }
+
+    async def __call__(self, url: str, **kwargs) -> ReplaySocket:
+        role = PRIVATE if url == self.private_url else PUBLIC
+        logger.debug(f"[REPLAY] Opening {role} replay socket for {url}")
+        return self.sockets[role].open()
+
+    @property
+    def public(self) -> ReplaySocket:
+        return self.sockets[PUBLIC]
+
+    @property
+    def private(self) -> ReplaySocket:
+        return self.sockets[PRIVATE]
+
+    def drained(self) -> bool:
+        """All recorded frames delivered"""
+        return all(socket.position >= len(socket.frames) for socket in self.sockets.values())
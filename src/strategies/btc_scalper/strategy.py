@@ -3,15 +3,15 @@
 from __future__ import annotations
 
 import json
-import os
 import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-import ccxt
 from dotenv import load_dotenv
 
+from src.exchange.kraken_client import create_kraken_client
+
 load_dotenv()
 
 
@@ -61,11 +61,8 @@ class BTCScalper:
             self.position_file.unlink()
 
     def initialize(self) -> None:
-        self.exchange = ccxt.kraken(
+        self.exchange = create_kraken_client(
             {
-                "apiKey": os.getenv("KRAKEN_KEY"),
-                "secret": os.getenv("KRAKEN_SECRET"),
-                "enableRateLimit": True,
                 "rateLimit": 200,
                 "sandbox": False,
                 "options": {
@@ -76,7 +73,6 @@ class BTCScalper:
                 },
             }
         )
-        self.exchange.load_markets()
         if "BTC/USDT" not in self.exchange.markets:
             raise Exception("BTC/USDT not available")
         print("\u2705 Connected to Kraken Pro (2025 API)")
@@ -8,6 +8,7 @@ import time
 from typing import Any, Union
 
 from .base_strategy import BaseStrategy
+from .indicators import get_indicator_engine
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +49,10 @@ class FastStartStrategy(BaseStrategy):
         self.max_analysis_time = 5  # Max 5 seconds for analysis
         self.priority_pairs = ["BTC/USDT", "ETH/USDT", "ADA/USDT", "DOGE/USDT"]
 
+        # Shared incremental indicators (momentum over the last 5 closes)
+        self.indicators = get_indicator_engine()
+        self.momentum_period = 5
+
         logger.info(f"[FAST_START] Strategy initialized with {self.profit_target}% target")
 
     async def analyze(self, symbol: str, timeframe: str = "1m") -> dict[str, Any]:
@@ -181,7 +186,7 @@ class FastStartStrategy(BaseStrategy):
                 data = market_data
 
             # Extract relevant data
-            data.get("symbol", "")
+            symbol = data.get("symbol") or self.symbol
             current_price = float(data.get("close", 0))
             volume = float(data.get("volume", 0))
 
@@ -190,9 +195,11 @@ class FastStartStrategy(BaseStrategy):
 
             # Quick momentum analysis
             if len(market_data) > 5 and isinstance(market_data, list):
-                # Calculate simple momentum
-                prices = [float(d.get("close", 0)) for d in market_data[-5:]]
-                momentum = (prices[-1] - prices[0]) / prices[0] * 100 if prices[0] > 0 else 0
+                # Only candles newer than the last call advance the shared indicator
+                self.indicators.sync(symbol, "1m", market_data)
+                momentum = (
+                    self.indicators.value(symbol, "1m", "momentum", self.momentum_period) * 100
+                )
 
                 # Generate signal based on momentum
                 if momentum > 1.0:  # 1% positive momentum
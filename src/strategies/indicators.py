@@ -0,0 +1,615 @@
+"""
+Incremental Indicator Engine
+============================
+
+Shared technical indicators keyed by (symbol, timeframe, indicator, params).
+
+Each indicator keeps O(1) state and is advanced one bar at a time, so a new
+candle or tick costs a constant amount of work instead of a recomputation over
+the whole history. Several strategies asking for the same RSI(14) on BTC/USDT
+read one cached instance.
+
+Indicators created after a series already has data are warmed up from the
+series' bounded history in one batch (vectorised with NumPy when installed).
+
+A bar with the same timestamp as the newest one replaces it, so a forming
+candle keeps moving the indicators until it closes: each indicator's state
+from before the newest bar is kept and re-applied with the revised values.
+
+Usage:
+    engine = get_indicator_engine()
+    engine.sync("BTC/USDT", "1m", candles)       # Applies only new candles
+    rsi = engine.value("BTC/USDT", "1m", "rsi", 14)
+    mid, upper, lower = engine.value("BTC/USDT", "1m", "bollinger", 20, 2.0)
+"""
+
+import copy
+import logging
+import math
+from collections import deque
+from typing import Any, Iterable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Bars retained per series for warming up indicators created later
+DEFAULT_HISTORY_SIZE = 500
+
+
+def _smoothed_tail(values: Sequence[float], period: int, alpha: float) -> float:
+    """
+    Final value of an SMA-seeded exponential smoothing, computed in one batch
+
+    The recursion s = s + alpha * (x - s) unrolls to a weighted sum, so the
+    whole warm-up is a dot product instead of a Python loop.
+    """
+    seed = sum(values[:period]) / period
+    rest = values[period:]
+    if len(rest) == 0:
+        return seed
+
+    if NUMPY_AVAILABLE:
+        data = np.asarray(rest, dtype=np.float64)
+        decay = 1.0 - alpha
+        weights = alpha * np.power(decay, np.arange(len(data) - 1, -1, -1, dtype=np.float64))
+        return float(seed * decay ** len(data) + np.dot(weights, data))
+
+    smoothed = seed
+    for value in rest:
+        smoothed += alpha * (value - smoothed)
+    return smoothed
+
+
+class Indicator:
+    """Base class: incremental update plus batch warm-up"""
+
+    # Bars needed before ``value`` is meaningful
+    period = 1
+
+    def __init__(self):
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    def update(self, close: float, high: float, low: float, volume: float):
+        raise NotImplementedError
+
+    def state(self) -> dict[str, Any]:
+        """Copy of the indicator state, for ``restore``"""
+        return copy.deepcopy(self.__dict__)
+
+    def restore(self, state: dict[str, Any]):
+        """Return to a ``state`` snapshot in place (held references stay valid)"""
+        self.__dict__.update(copy.deepcopy(state))
+
+    def warm_up(
+        self,
+        closes: Sequence[float],
+        highs: Sequence[float],
+        lows: Sequence[float],
+        volumes: Sequence[float],
+    ):
+        """Apply a batch of bars (subclasses vectorise where possible)"""
+        for bar in zip(closes, highs, lows, volumes):
+            self.update(*bar)
+
+    @property
+    def value(self) -> Any:
+        raise NotImplementedError
+
+
+class EMA(Indicator):
+    """Exponential moving average seeded with the SMA of the first period"""
+
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self._seed_sum = 0.0
+        self._value: Optional[float] = None
+
+    def update(self, close: float, high: float = 0.0, low: float = 0.0, volume: float = 0.0):
+        self.count += 1
+        if self._value is not None:
+            self._value += self.alpha * (close - self._value)
+        else:
+            self._seed_sum += close
+            if self.count == self.period:
+                self._value = self._seed_sum / self.period
+
+    def warm_up(self, closes, highs, lows, volumes):
+        if self.count or len(closes) < self.period:
+            return super().warm_up(closes, highs, lows, volumes)
+        self._value = _smoothed_tail(closes, self.period, self.alpha)
+        self.count = len(closes)
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._value
+
+
+class RollingStats(Indicator):
+    """
+    Mean and population variance over a sliding window (Welford)
+
+    Exact recomputation every ``period * 64`` updates bounds float drift from
+    the add/remove updates.
+    """
+
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+        self.window: deque[float] = deque(maxlen=period)
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._resync_every = period * 64
+
+    def update(self, close: float, high: float = 0.0, low: float = 0.0, volume: float = 0.0):
+        self.count += 1
+        if len(self.window) < self.period:
+            self.window.append(close)
+            delta = close - self.mean
+            self.mean += delta / len(self.window)
+            self._m2 += delta * (close - self.mean)
+            return
+
+        oldest = self.window[0]
+        self.window.append(close)
+        old_mean = self.mean
+        self.mean += (close - oldest) / self.period
+        self._m2 += (close - oldest) * (close - self.mean + oldest - old_mean)
+
+        if self.count % self._resync_every == 0:
+            self._resync()
+
+    def _resync(self):
+        size = len(self.window)
+        if NUMPY_AVAILABLE:
+            data = np.fromiter(self.window, dtype=np.float64, count=size)
+            self.mean = float(data.mean()) if size else 0.0
+            self._m2 = float(((data - self.mean) ** 2).sum()) if size else 0.0
+        else:
+            self.mean = sum(self.window) / size if size else 0.0
+            self._m2 = sum((value - self.mean) ** 2 for value in self.window)
+
+    def warm_up(self, closes, highs, lows, volumes):
+        self.window.extend(closes[-self.period :])
+        self.count += len(closes)
+        self._resync()
+
+    @property
+    def variance(self) -> float:
+        size = len(self.window)
+        return max(self._m2 / size, 0.0) if size else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def value(self) -> tuple[float, float]:
+        return self.mean, self.std
+
+
+class Momentum(Indicator):
+    """Fractional change between the oldest and newest of the last ``period`` closes"""
+
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+        self.window: deque[float] = deque(maxlen=period)
+
+    def update(self, close: float, high: float = 0.0, low: float = 0.0, volume: float = 0.0):
+        self.count += 1
+        self.window.append(close)
+
+    def warm_up(self, closes, highs, lows, volumes):
+        self.window.extend(closes[-self.period :])
+        self.count += len(closes)
+
+    @property
+    def value(self) -> float:
+        if len(self.window) < 2 or self.window[0] <= 0:
+            return 0.0
+        return (self.window[-1] - self.window[0]) / self.window[0]
+
+
+class RSI(Indicator):
+    """Relative strength index with Wilder smoothing"""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period + 1  # One extra close for the first change
+        self.length = period
+        self._previous: Optional[float] = None
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+
+    def update(self, close: float, high: float = 0.0, low: float = 0.0, volume: float = 0.0):
+        self.count += 1
+        previous = self._previous
+        self._previous = close
+        if previous is None:
+            return
+
+        change = close - previous
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+
+        if self.avg_gain is not None:
+            self.avg_gain += (gain - self.avg_gain) / self.length
+            self.avg_loss += (loss - self.avg_loss) / self.length
+        else:
+            self._gain_sum += gain
+            self._loss_sum += loss
+            if self.count == self.period:
+                self.avg_gain = self._gain_sum / self.length
+                self.avg_loss = self._loss_sum / self.length
+
+    def warm_up(self, closes, highs, lows, volumes):
+        if self.count or len(closes) < self.period or not NUMPY_AVAILABLE:
+            return super().warm_up(closes, highs, lows, volumes)
+
+        changes = np.diff(np.asarray(closes, dtype=np.float64))
+        alpha = 1.0 / self.length
+        self.avg_gain = _smoothed_tail(np.clip(changes, 0, None), self.length, alpha)
+        self.avg_loss = _smoothed_tail(np.clip(-changes, 0, None), self.length, alpha)
+        self._previous = float(closes[-1])
+        self.count = len(closes)
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.avg_gain is None:
+            return None
+        if self.avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+
+class ATR(Indicator):
+    """Average true range with Wilder smoothing"""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self._previous_close: Optional[float] = None
+        self._range_sum = 0.0
+        self._value: Optional[float] = None
+
+    def update(self, close: float, high: float, low: float, volume: float = 0.0):
+        self.count += 1
+        previous = self._previous_close
+        if previous is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - previous), abs(low - previous))
+        self._previous_close = close
+
+        if self._value is not None:
+            self._value += (true_range - self._value) / self.period
+        else:
+            self._range_sum += true_range
+            if self.count == self.period:
+                self._value = self._range_sum / self.period
+
+    def warm_up(self, closes, highs, lows, volumes):
+        if self.count or len(closes) < self.period or not NUMPY_AVAILABLE:
+            return super().warm_up(closes, highs, lows, volumes)
+
+        close = np.asarray(closes, dtype=np.float64)
+        high = np.asarray(highs, dtype=np.float64)
+        low = np.asarray(lows, dtype=np.float64)
+        true_range = high - low
+        previous = close[:-1]
+        true_range[1:] = np.maximum.reduce(
+            [true_range[1:], np.abs(high[1:] - previous), np.abs(low[1:] - previous)]
+        )
+        self._value = _smoothed_tail(true_range, self.period, 1.0 / self.period)
+        self._previous_close = float(closes[-1])
+        self.count = len(closes)
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._value
+
+
+class Bollinger(Indicator):
+    """Bollinger bands (middle, upper, lower) on rolling mean/std"""
+
+    def __init__(self, period: int = 20, width: float = 2.0):
+        super().__init__()
+        self.period = period
+        self.width = width
+        self.stats = RollingStats(period)
+
+    def update(self, close: float, high: float = 0.0, low: float = 0.0, volume: float = 0.0):
+        self.count += 1
+        self.stats.update(close)
+
+    def warm_up(self, closes, highs, lows, volumes):
+        self.stats.warm_up(closes, highs, lows, volumes)
+        self.count += len(closes)
+
+    @property
+    def value(self) -> tuple[float, float, float]:
+        mean = self.stats.mean
+        band = self.width * self.stats.std
+        return mean, mean + band, mean - band
+
+
+class VWAP(Indicator):
+    """Volume-weighted average typical price (cumulative, or rolling over ``period`` bars)"""
+
+    def __init__(self, period: int = 0):
+        super().__init__()
+        self.window = period
+        self._bars: Optional[deque] = deque() if period else None
+        self._price_volume = 0.0
+        self._volume = 0.0
+
+    def update(self, close: float, high: float, low: float, volume: float):
+        self.count += 1
+        price_volume = (high + low + close) / 3.0 * volume
+        self._price_volume += price_volume
+        self._volume += volume
+
+        if self._bars is not None:
+            self._bars.append((price_volume, volume))
+            if len(self._bars) > self.window:
+                old_price_volume, old_volume = self._bars.popleft()
+                self._price_volume -= old_price_volume
+                self._volume -= old_volume
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._price_volume / self._volume if self._volume > 0 else None
+
+
+INDICATORS: dict[str, type[Indicator]] = {
+    "ema": EMA,
+    "stats": RollingStats,
+    "momentum": Momentum,
+    "rsi": RSI,
+    "atr": ATR,
+    "bollinger": Bollinger,
+    "vwap": VWAP,
+}
+
+
+class IndicatorSeries:
+    """Bar history and indicators for one (symbol, timeframe)"""
+
+    def __init__(self, history_size: int = DEFAULT_HISTORY_SIZE):
+        self.closes: deque[float] = deque(maxlen=history_size)
+        self.highs: deque[float] = deque(maxlen=history_size)
+        self.lows: deque[float] = deque(maxlen=history_size)
+        self.volumes: deque[float] = deque(maxlen=history_size)
+        self.indicators: dict[tuple, Indicator] = {}
+        self.last_timestamp: Optional[float] = None
+        # Indicator states from before the newest bar, while it can still be replaced
+        self._before_last: Optional[dict[tuple, dict[str, Any]]] = None
+
+    def __len__(self) -> int:
+        return len(self.closes)
+
+    def append(
+        self, close: float, high: float, low: float, volume: float, revisable: bool = False
+    ):
+        self._before_last = (
+            {key: indicator.state() for key, indicator in self.indicators.items()}
+            if revisable
+            else None
+        )
+        self.closes.append(close)
+        self.highs.append(high)
+        self.lows.append(low)
+        self.volumes.append(volume)
+        for indicator in self.indicators.values():
+            indicator.update(close, high, low, volume)
+
+    def replace_last(self, close: float, high: float, low: float, volume: float) -> bool:
+        """Swap the newest bar for a revised one; False if unchanged or not revisable"""
+        if self._before_last is None or not self.closes:
+            return False
+        if (close, high, low, volume) == (
+            self.closes[-1],
+            self.highs[-1],
+            self.lows[-1],
+            self.volumes[-1],
+        ):
+            return False
+
+        for history, value in (
+            (self.closes, close),
+            (self.highs, high),
+            (self.lows, low),
+            (self.volumes, volume),
+        ):
+            history[-1] = value
+        for key, indicator in self.indicators.items():
+            indicator.restore(self._before_last[key])
+            indicator.update(close, high, low, volume)
+        return True
+
+    def indicator(self, name: str, params: tuple) -> Indicator:
+        key = (name, params)
+        indicator = self.indicators.get(key)
+        if indicator is None:
+            indicator = INDICATORS[name](*params)
+            if self._before_last is not None:
+                # Warm up without the newest bar so it can still be replaced
+                self._warm_up(indicator, -1)
+                self._before_last[key] = indicator.state()
+                indicator.update(self.closes[-1], self.highs[-1], self.lows[-1], self.volumes[-1])
+            else:
+                self._warm_up(indicator)
+            self.indicators[key] = indicator
+        return indicator
+
+    def _warm_up(self, indicator: Indicator, end: Optional[int] = None):
+        if self.closes:
+            histories = (self.closes, self.highs, self.lows, self.volumes)
+            indicator.warm_up(*(list(history)[:end] for history in histories))
+
+    def load(self, rows: Sequence[tuple]):
+        """
+        Replace the history with (close, high, low, volume) rows
+
+        Existing indicators are re-initialised and warmed up in place, so
+        instances callers already hold follow the new history.
+        """
+        for history in (self.closes, self.highs, self.lows, self.volumes):
+            history.clear()
+        for close, high, low, volume in rows:
+            self.closes.append(close)
+            self.highs.append(high)
+            self.lows.append(low)
+            self.volumes.append(volume)
+        self.last_timestamp = None
+        self._before_last = None
+        for (_, params), indicator in self.indicators.items():
+            indicator.__init__(*params)
+            self._warm_up(indicator)
+
+
+def _row_fields(row: Any) -> tuple[Optional[float], float, float, float, float]:
+    """(timestamp, close, high, low, volume) from a candle dict or an OHLCV list"""
+    if isinstance(row, dict):
+        close = float(row.get("close", 0))
+        timestamp = row.get("timestamp")
+        return (
+            float(timestamp) if timestamp is not None else None,
+            close,
+            float(row.get("high", close)),
+            float(row.get("low", close)),
+            float(row.get("volume", 0)),
+        )
+    return float(row[0]), float(row[4]), float(row[2]), float(row[3]), float(row[5])
+
+
+class IndicatorEngine:
+    """
+    Cache of incremental indicators shared by every strategy in the process
+    """
+
+    def __init__(self, history_size: int = DEFAULT_HISTORY_SIZE):
+        self.history_size = history_size
+        self.series: dict[tuple[str, str], IndicatorSeries] = {}
+
+    def _series(self, symbol: str, timeframe: str) -> IndicatorSeries:
+        key = (symbol, timeframe)
+        series = self.series.get(key)
+        if series is None:
+            series = IndicatorSeries(self.history_size)
+            self.series[key] = series
+        return series
+
+    def update(
+        self,
+        symbol: str,
+        timeframe: str,
+        close: float,
+        high: Optional[float] = None,
+        low: Optional[float] = None,
+        volume: float = 0.0,
+        timestamp: Optional[float] = None,
+    ) -> bool:
+        """
+        Apply one bar or tick to every indicator on the series
+
+        A bar with the last applied timestamp replaces the newest bar (the
+        forming candle). Bars before it are ignored, so several strategies
+        feeding the same candles only advance the indicators once.
+
+        Returns:
+            True if the bar was applied
+        """
+        series = self._series(symbol, timeframe)
+        high = close if high is None else high
+        low = close if low is None else low
+        if timestamp is not None and series.last_timestamp is not None:
+            if timestamp == series.last_timestamp:
+                return series.replace_last(close, high, low, volume)
+            if timestamp < series.last_timestamp:
+                return False
+
+        series.append(close, high, low, volume, revisable=timestamp is not None)
+        if timestamp is not None:
+            series.last_timestamp = timestamp
+        return True
+
+    def sync(self, symbol: str, timeframe: str, candles: Iterable[Any]) -> int:
+        """
+        Bring a series up to date with a candle list (dicts or OHLCV rows)
+
+        Only the last applied candle (which may still be forming) and newer
+        ones are processed. Candles without timestamps cannot be matched, so
+        the series is rebuilt from the list in one batch.
+
+        Returns:
+            Number of candles applied
+        """
+        rows = [_row_fields(row) for row in candles]
+        if not rows:
+            return 0
+
+        series = self._series(symbol, timeframe)
+        if rows[-1][0] is None:
+            series.load([row[1:] for row in rows[-self.history_size :]])
+            return len(rows)
+
+        applied = 0
+        for timestamp, close, high, low, volume in rows:
+            if self.update(symbol, timeframe, close, high, low, volume, timestamp):
+                applied += 1
+        return applied
+
+    def get(self, symbol: str, timeframe: str, name: str, *params: Any) -> Indicator:
+        """Shared indicator instance (created and warmed up on first request)"""
+        return self._series(symbol, timeframe).indicator(name, params)
+
+    def value(self, symbol: str, timeframe: str, name: str, *params: Any) -> Any:
+        """Current value of a shared indicator"""
+        return self.get(symbol, timeframe, name, *params).value
+
+    def bar_count(self, symbol: str, timeframe: str) -> int:
+        """Bars retained for a series"""
+        series = self.series.get((symbol, timeframe))
+        return len(series) if series else 0
+
+    def clear(self, symbol: Optional[str] = None):
+        """Drop cached series (all, or one symbol's)"""
+        if symbol is None:
+            self.series.clear()
+            return
+        for key in [key for key in self.series if key[0] == symbol]:
+            del self.series[key]
+
+    def get_status(self) -> dict[str, Any]:
+        """Series and indicator counts"""
+        return {
+            "numpy": NUMPY_AVAILABLE,
+            "series": len(self.series),
+            "indicators": sum(len(series.indicators) for series in self.series.values()),
+        }
+
+
+_engine: Optional[IndicatorEngine] = None
+
+
+def get_indicator_engine() -> IndicatorEngine:
+    """Process-wide shared engine"""
+    global _engine
+    if _engine is None:
+        _engine = IndicatorEngine()
+    return _engine
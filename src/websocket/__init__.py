@@ -65,6 +65,37 @@ from .websocket_v2_channels import WebSocketV2ChannelProcessor
 from .websocket_v2_manager import WebSocketV2Config, WebSocketV2Manager
 from .websocket_v2_orders import OrderRequest, OrderResponse, WebSocketV2OrderManager
 
+# Compact (slots/float) market data models
+from .compact_models import CompactOHLC, CompactTicker, CompactTrade
+
+# Message decoding
+from .message_decoder import MessageDecoder, get_decoder
+
+# Incremental order book engine
+from .order_book import BookSide, OrderBook
+
+# Ring buffer history storage
+from .ring_buffer import ColumnRingBuffer, OHLCBuffer, TradeBuffer
+
+# Streaming candles from the trade feed
+from .candle_aggregator import CandleAggregator, parse_timeframe
+
+# Conflating callback fan-out
+from .fanout import ConflatingFanout, ConflatingMailbox
+
+# Subscription state replayed on reconnect
+from .subscription_registry import SubscriptionRegistry
+
+# Process-isolated ingestion via shared memory
+from .market_data_process import MarketDataProcess
+from .shared_market_data import SharedMarketData
+
+# Wire-level session recording
+from .session_recorder import RecorderConfig, SessionReader, SessionRecorder, read_recordings
+
+# Order entry over the authenticated socket with REST fallback
+from .order_entry import OrderEntryError, WebSocketOrderEntry
+
 __all__ = [
     # Enhanced WebSocket V2 components
     "WebSocketV2Manager",
@@ -80,6 +111,39 @@ __all__ = [
     "KrakenWebSocketV2",
     "ConnectionManager",
     "ConnectionState",
+    # Compact market data models
+    "CompactTicker",
+    "CompactTrade",
+    "CompactOHLC",
+    # Message decoding
+    "MessageDecoder",
+    "get_decoder",
+    # Order book engine
+    "OrderBook",
+    "BookSide",
+    # Ring buffer history storage
+    "ColumnRingBuffer",
+    "TradeBuffer",
+    "OHLCBuffer",
+    # Streaming candles
+    "CandleAggregator",
+    "parse_timeframe",
+    # Callback fan-out
+    "ConflatingFanout",
+    "ConflatingMailbox",
+    # Subscription replay
+    "SubscriptionRegistry",
+    # Process-isolated ingestion
+    "MarketDataProcess",
+    "SharedMarketData",
+    # Session recording
+    "SessionRecorder",
+    "RecorderConfig",
+    "SessionReader",
+    "read_recordings",
+    # Order entry
+    "WebSocketOrderEntry",
+    "OrderEntryError",
     # Data models
     "WebSocketMessage",
     "BalanceUpdate",
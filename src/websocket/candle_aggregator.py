@@ -0,0 +1,251 @@
+"""
+Streaming Candle Aggregator
+===========================
+
+Builds multi-timeframe OHLCV candles per symbol incrementally from the trade
+feed, replacing most REST ``fetch_ohlcv`` polling and providing sub-minute
+bars (1s/5s) that the exchange OHLC channel does not offer.
+
+Candle semantics:
+- Bucket start is ``floor(trade_time / timeframe) * timeframe`` (UTC aligned)
+- The in-progress candle is the last row of each series and is updated in place
+- A trade in a later bucket closes the current candle and opens a new one
+  (intervals without trades produce no candle)
+- Late trades within ``late_trade_tolerance`` seconds amend the candle they
+  belong to (high/low/volume/count); older ones are dropped and counted
+"""
+
+import logging
+from bisect import bisect_left
+from typing import Any, Callable, Optional, Union
+
+from .ring_buffer import ColumnRingBuffer
+
+logger = logging.getLogger(__name__)
+
+# Default timeframes in seconds: 1s, 5s, 1m, 5m, 15m, 1h
+DEFAULT_TIMEFRAMES = (1, 5, 60, 300, 900, 3600)
+
+_TIMEFRAME_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+CANDLE_COLUMNS = {
+    "timestamp": "d",
+    "open": "d",
+    "high": "d",
+    "low": "d",
+    "close": "d",
+    "volume": "d",
+    "count": "l",
+}
+
+
+def parse_timeframe(timeframe: Union[str, int]) -> int:
+    """Convert '1s', '5m', '1h' (or a number of seconds) to seconds"""
+    if isinstance(timeframe, int):
+        return timeframe
+    unit = _TIMEFRAME_UNITS.get(timeframe[-1:])
+    if unit is None or not timeframe[:-1].isdigit():
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return int(timeframe[:-1]) * unit
+
+
+class CandleSeries:
+    """Candles for one (symbol, timeframe) pair"""
+
+    __slots__ = ("timeframe", "buffer", "current_start", "last_trade_time")
+
+    def __init__(self, timeframe: int, capacity: int):
+        self.timeframe = timeframe
+        self.buffer = ColumnRingBuffer(capacity, CANDLE_COLUMNS)
+        self.current_start: Optional[float] = None
+        self.last_trade_time: float = 0.0
+
+
+class CandleAggregator:
+    """
+    Incremental multi-timeframe candle builder fed from trades
+    """
+
+    def __init__(
+        self,
+        timeframes: tuple[int, ...] = DEFAULT_TIMEFRAMES,
+        history_size: int = 500,
+        late_trade_tolerance: float = 5.0,
+    ):
+        """
+        Initialize candle aggregator
+
+        Args:
+            timeframes: Candle timeframes in seconds
+            history_size: Candles retained per (symbol, timeframe)
+            late_trade_tolerance: Max age (seconds behind the newest trade) for
+                an out-of-order trade to still amend its candle
+        """
+        self.timeframes = tuple(sorted(timeframes))
+        self.history_size = history_size
+        self.late_trade_tolerance = late_trade_tolerance
+
+        self.series: dict[str, dict[int, CandleSeries]] = {}
+        self.on_candle_closed: list[Callable] = []
+
+        self.stats = {"trades": 0, "late_trades_amended": 0, "late_trades_dropped": 0}
+
+    def _get_series(self, symbol: str) -> dict[int, CandleSeries]:
+        series = self.series.get(symbol)
+        if series is None:
+            series = {tf: CandleSeries(tf, self.history_size) for tf in self.timeframes}
+            self.series[symbol] = series
+        return series
+
+    def add_trade(self, symbol: str, timestamp: float, price: float, volume: float):
+        """Fold one trade into every timeframe of ``symbol``"""
+        self.stats["trades"] += 1
+        closed = []
+
+        for series in self._get_series(symbol).values():
+            timeframe = series.timeframe
+            start = timestamp - (timestamp % timeframe)
+            buffer = series.buffer
+
+            if series.current_start is None or start > series.current_start:
+                # New bucket: the previous in-progress candle is now closed
+                if series.current_start is not None:
+                    closed.append((timeframe, series.current_start))
+                buffer.append(start, price, price, price, price, volume, 1)
+                series.current_start = start
+                series.last_trade_time = timestamp
+
+            elif start == series.current_start:
+                count = len(buffer) - 1
+                if price > buffer.last("high"):
+                    buffer.set("high", count, price)
+                if price < buffer.last("low"):
+                    buffer.set("low", count, price)
+                if timestamp >= series.last_trade_time:
+                    buffer.set("close", count, price)
+                    series.last_trade_time = timestamp
+                buffer.set("volume", count, buffer.last("volume") + volume)
+                buffer.set("count", count, buffer.last("count") + 1)
+
+            else:
+                self._amend_late_trade(series, start, timestamp, price, volume)
+
+        if closed and self.on_candle_closed:
+            for timeframe, start in closed:
+                for callback in self.on_candle_closed:
+                    try:
+                        callback(symbol, timeframe, start)
+                    except Exception as e:
+                        logger.error(f"[CANDLE_AGGREGATOR] Candle close callback error: {e}")
+
+    def _amend_late_trade(
+        self, series: CandleSeries, start: float, timestamp: float, price: float, volume: float
+    ):
+        """Apply an out-of-order trade to an already closed candle if still tolerated"""
+        if series.last_trade_time - timestamp > self.late_trade_tolerance:
+            self.stats["late_trades_dropped"] += 1
+            return
+
+        timestamps = series.buffer.window("timestamp")
+        index = bisect_left(timestamps, start)
+        if index >= len(timestamps) or timestamps[index] != start:
+            # No candle for that interval (no trades seen in it); drop rather
+            # than inserting out of order
+            self.stats["late_trades_dropped"] += 1
+            return
+
+        buffer = series.buffer
+        if price > buffer.window("high")[index]:
+            buffer.set("high", index, price)
+        if price < buffer.window("low")[index]:
+            buffer.set("low", index, price)
+        buffer.set("volume", index, buffer.window("volume")[index] + volume)
+        buffer.set("count", index, buffer.window("count")[index] + 1)
+        self.stats["late_trades_amended"] += 1
+
+    def seed(self, symbol: str, timeframe: Union[str, int], ohlcv: list[list[float]]):
+        """
+        Prefill a series from ccxt-style OHLCV rows ([ms, open, high, low, close, volume])
+
+        Rows older than the newest stored candle are ignored.
+        """
+        timeframe = parse_timeframe(timeframe)
+        series = self._get_series(symbol).get(timeframe)
+        if series is None:
+            return
+
+        for row in ohlcv:
+            start = row[0] / 1000.0
+            if series.current_start is not None and start <= series.current_start:
+                continue
+            series.buffer.append(start, row[1], row[2], row[3], row[4], row[5], 0)
+            series.current_start = start
+            series.last_trade_time = start
+
+    def candle_count(
+        self, symbol: str, timeframe: Union[str, int], include_open: bool = False
+    ) -> int:
+        """Number of stored candles for a series"""
+        series = self.series.get(symbol, {}).get(parse_timeframe(timeframe))
+        if series is None:
+            return 0
+        count = len(series.buffer)
+        return count if include_open or not count else count - 1
+
+    def get_window(
+        self,
+        symbol: str,
+        timeframe: Union[str, int],
+        limit: Optional[int] = None,
+        include_open: bool = True,
+    ) -> dict[str, memoryview]:
+        """
+        Zero-copy column views (timestamp, open, high, low, close, volume, count)
+
+        Args:
+            symbol: Trading pair
+            timeframe: '1s', '5s', '1m', '5m', '15m', '1h' or seconds
+            limit: Max candles returned (most recent)
+            include_open: Include the in-progress candle as the last row
+        """
+        series = self.series.get(symbol, {}).get(parse_timeframe(timeframe))
+        if series is None:
+            return {}
+
+        views = series.buffer.windows()
+        if not include_open:
+            views = {name: view[:-1] for name, view in views.items()}
+        if limit is not None:
+            views = {name: view[-limit:] if limit else view[:0] for name, view in views.items()}
+        return views
+
+    def get_ohlcv(
+        self,
+        symbol: str,
+        timeframe: Union[str, int],
+        limit: Optional[int] = None,
+        include_open: bool = True,
+    ) -> list[list[float]]:
+        """Candles in ccxt ``fetch_ohlcv`` format ([ms, open, high, low, close, volume])"""
+        views = self.get_window(symbol, timeframe, limit, include_open)
+        if not views:
+            return []
+        return [
+            [timestamp * 1000, open_price, high, low, close, volume]
+            for timestamp, open_price, high, low, close, volume in zip(
+                views["timestamp"],
+                views["open"],
+                views["high"],
+                views["low"],
+                views["close"],
+                views["volume"],
+            )
+        ]
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Aggregator statistics"""
+        return {
+            **self.stats,
+            "symbols": len(self.series),
+            "timeframes": list(self.timeframes),
+        }
@@ -0,0 +1,234 @@
+"""
+Compact WebSocket V2 Market Data Models
+=======================================
+
+Slot-based, float-valued alternatives to the Decimal dataclasses in
+``data_models``. They are built directly from decoded wire dicts, keep no
+per-instance ``__dict__`` and return their values from ``to_dict()`` without
+any Decimal -> float conversion.
+
+Attribute names match TickerUpdate, TradeUpdate and OHLCUpdate so existing
+handlers and callbacks work with either family. Balances stay on the Decimal
+``BalanceUpdate`` model because order sizing depends on exact arithmetic.
+
+Select with ``KrakenWebSocketConfig(market_data_models="compact")``.
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+
+def _to_float(value: Any) -> float:
+    """Convert a wire value to float, treating missing/invalid values as 0"""
+    if value is None:
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_timestamp(value: Any) -> float:
+    """Parse a Kraken RFC3339 timestamp (or epoch number) into epoch seconds"""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return time.time()
+    if value is None:
+        return time.time()
+    return _to_float(value)
+
+
+class CompactTicker:
+    """Ticker update with float fields"""
+
+    __slots__ = (
+        "symbol",
+        "bid",
+        "ask",
+        "last",
+        "volume",
+        "high",
+        "low",
+        "vwap",
+        "open_price",
+        "timestamp",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        bid: float,
+        ask: float,
+        last: float,
+        volume: float,
+        high: float = 0.0,
+        low: float = 0.0,
+        vwap: float = 0.0,
+        open_price: float = 0.0,
+        timestamp: Optional[float] = None,
+    ):
+        self.symbol = symbol
+        self.bid = bid
+        self.ask = ask
+        self.last = last
+        self.volume = volume
+        self.high = high
+        self.low = low
+        self.vwap = vwap
+        self.open_price = open_price
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    @property
+    def spread(self) -> float:
+        """Bid-ask spread"""
+        return self.ask - self.bid if self.ask > 0 and self.bid > 0 else 0.0
+
+    @property
+    def spread_percentage(self) -> float:
+        """Bid-ask spread as percentage"""
+        spread = self.spread
+        if self.bid > 0 and spread > 0:
+            return spread / self.bid * 100
+        return 0.0
+
+    @property
+    def mid_price(self) -> float:
+        """Mid price between bid and ask"""
+        if self.bid > 0 and self.ask > 0:
+            return (self.bid + self.ask) / 2
+        return 0.0
+
+    @classmethod
+    def from_raw(cls, symbol: str, raw_data: dict[str, Any]) -> "CompactTicker":
+        """Create ticker update from raw data"""
+        get = raw_data.get
+        return cls(
+            symbol,
+            _to_float(get("bid")),
+            _to_float(get("ask")),
+            _to_float(get("last")),
+            _to_float(get("volume")),
+            _to_float(get("high")),
+            _to_float(get("low")),
+            _to_float(get("vwap")),
+            _to_float(get("open")),
+            time.time(),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary format compatible with TickerUpdate.to_dict"""
+        return {
+            "bid": self.bid,
+            "ask": self.ask,
+            "last": self.last,
+            "volume": self.volume,
+            "high": self.high,
+            "low": self.low,
+            "vwap": self.vwap,
+            "open": self.open_price,
+            "spread": self.spread,
+            "spread_pct": self.spread_percentage,
+            "mid_price": self.mid_price,
+            "timestamp": self.timestamp,
+        }
+
+
+class CompactTrade:
+    """Trade update with float fields and exchange timestamp"""
+
+    __slots__ = ("symbol", "side", "price", "volume", "timestamp", "trade_id")
+
+    def __init__(
+        self,
+        symbol: str,
+        side: str,
+        price: float,
+        volume: float,
+        timestamp: Optional[float] = None,
+        trade_id: Optional[Any] = None,
+    ):
+        self.symbol = symbol
+        self.side = side
+        self.price = price
+        self.volume = volume
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.trade_id = trade_id
+
+    @classmethod
+    def from_raw(cls, symbol: str, raw_data: dict[str, Any]) -> "CompactTrade":
+        """Create trade update from raw data"""
+        get = raw_data.get
+        return cls(
+            symbol,
+            get("side", "unknown"),
+            _to_float(get("price")),
+            _to_float(get("qty", get("volume"))),
+            parse_timestamp(get("timestamp")),
+            get("trade_id"),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary format compatible with TradeUpdate.to_dict"""
+        return {
+            "side": self.side,
+            "price": self.price,
+            "volume": self.volume,
+            "timestamp": self.timestamp,
+            "trade_id": self.trade_id,
+        }
+
+
+class CompactOHLC:
+    """OHLC (candlestick) update with float fields"""
+
+    __slots__ = ("symbol", "open_price", "high", "low", "close", "volume", "interval", "timestamp")
+
+    def __init__(
+        self,
+        symbol: str,
+        open_price: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        interval: int,
+        timestamp: Optional[float] = None,
+    ):
+        self.symbol = symbol
+        self.open_price = open_price
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.interval = interval
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    @classmethod
+    def from_raw(cls, symbol: str, raw_data: dict[str, Any]) -> "CompactOHLC":
+        """Create OHLC update from raw data"""
+        get = raw_data.get
+        return cls(
+            symbol,
+            _to_float(get("open")),
+            _to_float(get("high")),
+            _to_float(get("low")),
+            _to_float(get("close")),
+            _to_float(get("volume")),
+            get("interval", 1),
+            parse_timestamp(get("timestamp")),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary format compatible with OHLCUpdate.to_dict"""
+        return {
+            "open": self.open_price,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+            "interval": self.interval,
+            "timestamp": self.timestamp,
+        }
@@ -7,7 +7,6 @@ Provides robust connection management with automatic healing and failure recover
 """
 
 import asyncio
-import json
 import logging
 import time
 from dataclasses import dataclass
@@ -18,6 +17,8 @@ import websockets
 from websockets.exceptions import ConnectionClosed
 
 from .data_models import ConnectionStatus
+from .message_decoder import get_decoder
+from .session_recorder import frame_symbol
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +50,11 @@ class ConnectionConfig:
     message_queue_size: int = 1000
     heartbeat_timeout: float = 60.0
     connection_timeout: float = 30.0
+    json_decoder: str = "auto"  # 'auto', 'orjson', 'msgspec' or 'json'
+    queue_messages: bool = True  # Also copy delivered messages into message_queue
+    connector: Optional[Callable] = None  # websockets.connect replacement (e.g., market replay)
+    recorder: Optional[Any] = None  # SessionRecorder receiving every decoded frame
+    record_as: str = "public"  # Connection role stored with recorded frames
 
 
 @dataclass
@@ -93,15 +99,23 @@ class ConnectionManager:
         self.message_handler_task: Optional[asyncio.Task] = None
 
         # Message handling
+        self.decoder = get_decoder(config.json_decoder)
         self.message_queue: asyncio.Queue = asyncio.Queue(maxsize=config.message_queue_size)
         self.pending_messages: list[dict[str, Any]] = []
 
+        # Channel dispatch table; frames without a channel are method responses (key None)
+        self.channel_handlers: dict[Optional[str], Callable] = {
+            "heartbeat": self._handle_heartbeat,
+            None: self._handle_method_response,
+        }
+
         # Callbacks
         self.on_message: Optional[Callable] = None
         self.on_connected: Optional[Callable] = None
         self.on_disconnected: Optional[Callable] = None
         self.on_error: Optional[Callable] = None
         self.on_authenticated: Optional[Callable] = None
+        self.on_reconnected: Optional[Callable] = None
 
         # Connection tracking
         self.last_message_time = 0
@@ -111,7 +125,10 @@ class ConnectionManager:
         # Shutdown flag
         self._shutdown = False
 
-        logger.info(f"[CONNECTION_MANAGER] Initialized with config: {config.url}")
+        logger.info(
+            f"[CONNECTION_MANAGER] Initialized with config: {config.url} "
+            f"(decoder: {self.decoder.name})"
+        )
 
     async def connect(self, auth_token: Optional[str] = None) -> bool:
         """
@@ -142,8 +159,9 @@ class ConnectionManager:
                 headers["Authorization"] = f"Bearer {auth_token}"
 
             # Create WebSocket connection with timeout
+            connect = self.config.connector or websockets.connect
             self.websocket = await asyncio.wait_for(
-                websockets.connect(
+                connect(
                     ws_url,
                     ping_interval=self.config.ping_interval,
                     ping_timeout=self.config.ping_timeout,
@@ -247,17 +265,21 @@ class ConnectionManager:
 
         logger.info("[CONNECTION_MANAGER] Disconnected successfully")
 
-    async def send_message(self, message: dict[str, Any]) -> bool:
+    async def send_message(self, message: dict[str, Any], queue: bool = True) -> bool:
         """
         Send message to WebSocket with queuing for offline scenarios
 
         Args:
             message: Message dictionary to send
+            queue: Queue the message for sending after reconnect if it cannot
+                go out now (order requests must not be replayed late)
 
         Returns:
             bool: True if sent successfully
         """
-        if self.state != ConnectionState.CONNECTED or not self.websocket:
+        if not self.is_connected or not self.websocket:
+            if not queue:
+                return False
             # Queue message for later sending
             if len(self.pending_messages) < self.config.message_queue_size:
                 self.pending_messages.append(message)
@@ -269,7 +291,7 @@ class ConnectionManager:
             return False
 
         try:
-            message_json = json.dumps(message)
+            message_json = self.decoder.encode(message)
             await self.websocket.send(message_json)
             logger.debug(f"[CONNECTION_MANAGER] Sent message: {message.get('method', 'unknown')}")
             return True
@@ -277,7 +299,7 @@ class ConnectionManager:
         except Exception as e:
             logger.error(f"[CONNECTION_MANAGER] Failed to send message: {e}")
             # Re-queue message if connection is lost
-            if len(self.pending_messages) < self.config.message_queue_size:
+            if queue and len(self.pending_messages) < self.config.message_queue_size:
                 self.pending_messages.append(message)
             return False
 
@@ -291,10 +313,69 @@ class ConnectionManager:
         else:
             logger.error("[CONNECTION_MANAGER] Failed to send authentication message")
 
+    def register_channel_handler(self, channel: str, handler: Callable):
+        """
+        Route messages for a channel straight to a handler
+
+        Registered channels bypass message_queue and on_message.
+
+        Args:
+            channel: Channel name (e.g., 'book')
+            handler: Async callable receiving the decoded message
+        """
+        self.channel_handlers[channel] = handler
+        logger.debug(f"[CONNECTION_MANAGER] Registered handler for channel: {channel}")
+
+    async def _handle_heartbeat(self, message: dict[str, Any]):
+        """Handle heartbeat messages"""
+        self.status.last_heartbeat = self.last_message_time
+        logger.debug("[CONNECTION_MANAGER] Heartbeat received")
+
+    async def _handle_method_response(self, message: dict[str, Any]):
+        """Handle method responses, intercepting authentication results"""
+        if message.get("method") != "authenticate":
+            await self._deliver_message(message)
+            return
+
+        if message.get("success"):
+            self.state = ConnectionState.AUTHENTICATED
+            self.status.authenticated = True
+            logger.info("[CONNECTION_MANAGER] Authentication successful")
+
+            if self.on_authenticated:
+                try:
+                    await self.on_authenticated()
+                except Exception as e:
+                    logger.error(f"[CONNECTION_MANAGER] Authentication callback error: {e}")
+        else:
+            error = message.get("error", "Unknown authentication error")
+            logger.error(f"[CONNECTION_MANAGER] Authentication failed: {error}")
+            self.status.last_error = error
+
+    async def _deliver_message(self, message: dict[str, Any]):
+        """Default delivery: optional queue copy plus on_message callback"""
+        # Queue message for processing
+        if self.config.queue_messages:
+            try:
+                self.message_queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning("[CONNECTION_MANAGER] Message queue full, dropping message")
+
+        # Call message callback
+        if self.on_message:
+            await self.on_message(message)
+
     async def _message_handler_loop(self):
         """Main message handling loop"""
         logger.info("[CONNECTION_MANAGER] Starting message handler loop")
 
+        decode = self.decoder.decode
+        decode_errors = self.decoder.errors
+        handlers = self.channel_handlers
+        deliver = self._deliver_message
+        recorder = self.config.recorder
+        record_as = self.config.record_as
+
         while not self._shutdown and self.websocket and not self.websocket.closed:
             try:
                 # Receive message with timeout
@@ -303,53 +384,26 @@ class ConnectionManager:
                 )
 
                 # Update last message time
-                self.last_message_time = time.time()
+                self.last_message_time = receive_time = time.time()
 
                 # Parse JSON message
                 try:
-                    message = json.loads(message_raw)
-                except json.JSONDecodeError as e:
+                    message = decode(message_raw)
+                except decode_errors as e:
                     logger.error(f"[CONNECTION_MANAGER] Invalid JSON received: {e}")
                     continue
 
-                # Handle heartbeat messages
-                if message.get("channel") == "heartbeat":
-                    self.status.last_heartbeat = time.time()
-                    logger.debug("[CONNECTION_MANAGER] Heartbeat received")
-                    continue
-
-                # Handle authentication responses
-                if message.get("method") == "authenticate":
-                    if message.get("success"):
-                        self.state = ConnectionState.AUTHENTICATED
-                        self.status.authenticated = True
-                        logger.info("[CONNECTION_MANAGER] Authentication successful")
-
-                        if self.on_authenticated:
-                            try:
-                                await self.on_authenticated()
-                            except Exception as e:
-                                logger.error(
-                                    f"[CONNECTION_MANAGER] Authentication callback error: {e}"
-                                )
-                    else:
-                        error = message.get("error", "Unknown authentication error")
-                        logger.error(f"[CONNECTION_MANAGER] Authentication failed: {error}")
-                        self.status.last_error = error
-                    continue
+                channel = message.get("channel")
+                if recorder is not None:
+                    recorder.record(
+                        message_raw, receive_time, channel, frame_symbol(message), record_as
+                    )
 
-                # Queue message for processing
+                # Single-lookup dispatch on channel
                 try:
-                    self.message_queue.put_nowait(message)
-                except asyncio.QueueFull:
-                    logger.warning("[CONNECTION_MANAGER] Message queue full, dropping message")
-
-                # Call message callback
-                if self.on_message:
-                    try:
-                        await self.on_message(message)
-                    except Exception as e:
-                        logger.error(f"[CONNECTION_MANAGER] Message callback error: {e}")
+                    await handlers.get(channel, deliver)(message)
+                except Exception as e:
+                    logger.error(f"[CONNECTION_MANAGER] Message callback error: {e}")
 
             except asyncio.TimeoutError:
                 logger.warning(
@@ -429,6 +483,13 @@ class ConnectionManager:
         # Start reconnection process
         await self._reconnect_loop()
 
+    async def reconnect(self):
+        """Retry a connection whose initial connect failed, with the reconnect backoff"""
+        if self._shutdown or self.state == ConnectionState.CONNECTED:
+            return
+        self.state = ConnectionState.RECONNECTING
+        await self._reconnect_loop()
+
     async def _reconnect_loop(self):
         """Automatic reconnection loop with exponential backoff"""
         logger.info("[CONNECTION_MANAGER] Starting reconnection loop")
@@ -461,6 +522,13 @@ class ConnectionManager:
                 if success:
                     logger.info("[CONNECTION_MANAGER] Reconnection successful")
 
+                    # Let the owner restore subscriptions before queued messages go out
+                    if self.on_reconnected:
+                        try:
+                            await self.on_reconnected()
+                        except Exception as e:
+                            logger.error(f"[CONNECTION_MANAGER] Reconnection callback error: {e}")
+
                     # Send any pending messages
                     await self._send_pending_messages()
 
@@ -524,6 +592,8 @@ class ConnectionManager:
             self.on_error = callback
         elif callback_type == "authenticated":
             self.on_authenticated = callback
+        elif callback_type == "reconnected":
+            self.on_reconnected = callback
         else:
             logger.warning(f"[CONNECTION_MANAGER] Unknown callback type: {callback_type}")
 
@@ -539,6 +609,7 @@ class ConnectionManager:
             },
             "pending_messages": len(self.pending_messages),
             "queue_size": self.message_queue.qsize(),
+            "decoder": self.decoder.name,
         }
 
     @property
@@ -13,6 +13,7 @@ from enum import Enum
 from typing import Any, Optional, Union
 
 from ..utils.decimal_precision_fix import safe_decimal, safe_float
+from .compact_models import parse_timestamp
 
 
 class MessageType(Enum):
@@ -361,7 +362,8 @@ class TradeUpdate:
             side=raw_data.get("side", "unknown"),
             price=safe_decimal(raw_data.get("price", "0")),
             volume=safe_decimal(raw_data.get("qty", raw_data.get("volume", "0"))),
-            timestamp=time.time(),
+            # Exchange execution time, so snapshot and replayed trades keep their place
+            timestamp=parse_timestamp(raw_data.get("timestamp")),
             trade_id=raw_data.get("trade_id"),
         )
 
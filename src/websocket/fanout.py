@@ -0,0 +1,190 @@
+"""
+Conflating Fan-out
+==================
+
+Delivers keyed updates (e.g., tickers by symbol) to many async consumers
+without letting a slow consumer delay the others.
+
+Each subscriber owns a bounded mailbox holding only the latest update per
+key and is drained by its own task. Publishing never awaits: a slow consumer
+simply sees the freshest value for each symbol on its next wake-up instead of
+a backlog, and fast consumers are never blocked behind it.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ConflatingMailbox:
+    """
+    Keep-latest-per-key mailbox for a single subscriber
+    """
+
+    def __init__(self, callback: Callable, max_pending: int = 1000):
+        """
+        Initialize mailbox
+
+        Args:
+            callback: Async callable receiving a list of updates
+            max_pending: Max distinct keys held; the oldest key is dropped beyond this
+        """
+        self.callback = callback
+        self.max_pending = max_pending
+        self.name = getattr(callback, "__qualname__", repr(callback))
+
+        self._pending: dict[Any, Any] = {}
+        self._oldest_pending_time: float = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.published = 0
+        self.delivered = 0
+        self.batches = 0
+        self.conflated = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def put(self, key: Any, update: Any, now: float):
+        """Store an update, replacing any undelivered update for the same key"""
+        pending = self._pending
+        self.published += 1
+
+        if key in pending:
+            self.conflated += 1
+        elif len(pending) >= self.max_pending:
+            pending.pop(next(iter(pending)))
+            self.dropped += 1
+
+        if not pending:
+            self._oldest_pending_time = now
+        pending[key] = update
+        self._wakeup.set()
+
+    def start(self):
+        """Start the consumer task"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._consume())
+
+    async def stop(self):
+        """Stop the consumer task"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _consume(self):
+        """Drain the mailbox, delivering the latest update per key"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            if not self._pending:
+                continue
+
+            batch = list(self._pending.values())
+            queued_since = self._oldest_pending_time
+            self._pending = {}
+
+            lag = time.time() - queued_since
+            self.last_lag = lag
+            if lag > self.max_lag:
+                self.max_lag = lag
+
+            try:
+                await self.callback(batch)
+                self.delivered += len(batch)
+                self.batches += 1
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"[FANOUT] Consumer {self.name} error: {e}")
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Per-consumer lag and drop metrics"""
+        return {
+            "consumer": self.name,
+            "pending": len(self._pending),
+            "published": self.published,
+            "delivered": self.delivered,
+            "batches": self.batches,
+            "conflated": self.conflated,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+
+class ConflatingFanout:
+    """
+    Fan-out stage with one conflating mailbox per subscriber
+    """
+
+    def __init__(self, key: Callable[[Any], Any], max_pending: int = 1000):
+        """
+        Initialize fan-out
+
+        Args:
+            key: Extracts the conflation key from an update (e.g., lambda t: t.symbol)
+            max_pending: Per-subscriber mailbox bound (distinct keys)
+        """
+        self.key = key
+        self.max_pending = max_pending
+        self.mailboxes: list[ConflatingMailbox] = []
+        self.running = False
+
+    def subscribe(self, callback: Callable) -> ConflatingMailbox:
+        """Add a consumer; its task starts immediately if the fan-out is running"""
+        mailbox = ConflatingMailbox(callback, self.max_pending)
+        self.mailboxes.append(mailbox)
+        if self.running:
+            mailbox.start()
+        return mailbox
+
+    def remove(self, callback: Callable) -> list[ConflatingMailbox]:
+        """Detach a consumer's mailboxes from publishing (their tasks keep running)"""
+        removed = [m for m in self.mailboxes if m.callback == callback]
+        self.mailboxes = [m for m in self.mailboxes if m.callback != callback]
+        return removed
+
+    async def unsubscribe(self, callback: Callable):
+        """Remove a consumer and stop its task"""
+        for mailbox in self.remove(callback):
+            await mailbox.stop()
+
+    def publish(self, updates: list[Any]):
+        """Offer a batch of updates to every mailbox without awaiting consumers"""
+        if not self.running:
+            self.start()
+
+        now = time.time()
+        key = self.key
+        for mailbox in self.mailboxes:
+            for update in updates:
+                mailbox.put(key(update), update, now)
+
+    def start(self):
+        """Start all consumer tasks (requires a running event loop)"""
+        self.running = True
+        for mailbox in self.mailboxes:
+            mailbox.start()
+
+    async def stop(self):
+        """Stop all consumer tasks"""
+        self.running = False
+        for mailbox in self.mailboxes:
+            await mailbox.stop()
+
+    def get_metrics(self) -> list[dict[str, Any]]:
+        """Metrics for every consumer"""
+        return [mailbox.get_metrics() for mailbox in self.mailboxes]
@@ -14,10 +14,14 @@ High-performance WebSocket V2 implementation for Kraken exchange with:
 import asyncio
 import logging
 import time
+import zlib
 from dataclasses import dataclass
-from typing import Any, Callable, Optional
+from functools import partial
+from typing import Any, Callable, Optional, Union
 
 from ..utils.decimal_precision_fix import safe_decimal
+from .candle_aggregator import DEFAULT_TIMEFRAMES, CandleAggregator
+from .compact_models import CompactOHLC, CompactTicker, CompactTrade
 from .connection_manager import ConnectionConfig, ConnectionManager
 from .data_models import (
     BalanceUpdate,
@@ -28,10 +32,26 @@ from .data_models import (
     TickerUpdate,
     TradeUpdate,
 )
+from .fanout import ConflatingFanout
 from .kraken_v2_message_handler import KrakenV2MessageHandler
+from .order_book import OrderBook
+from .ring_buffer import OHLCBuffer, TradeBuffer
+from .session_recorder import RecorderConfig, SessionRecorder
+from .subscription_registry import SubscriptionRegistry
 
 logger = logging.getLogger(__name__)
 
+# Channels served by the authenticated connection
+PRIVATE_CHANNELS = ("balances", "executions", "openOrders")
+
+# Trading methods whose responses go to 'order_response' callbacks
+ORDER_METHODS = frozenset(
+    {"add_order", "amend_order", "edit_order", "cancel_order", "cancel_all", "batch_add"}
+)
+
+# Channels whose cached state is tracked as stale across a reconnect
+CACHED_CHANNELS = ("ticker", "book", "trade", "ohlc", "balances", "instrument")
+
 
 @dataclass
 class KrakenWebSocketConfig:
@@ -42,6 +62,7 @@ class KrakenWebSocketConfig:
     private_url: str = "wss://ws-auth.kraken.com/v2"
 
     # Connection settings
+    public_shards: int = 1  # Public subscriptions are spread over N sockets by symbol hash
     ping_interval: float = 20.0
     ping_timeout: float = 10.0
     reconnect_delay: float = 1.0
@@ -50,13 +71,52 @@ class KrakenWebSocketConfig:
     # Message settings
     message_queue_size: int = 10000
     heartbeat_timeout: float = 60.0
+    json_decoder: str = "auto"  # 'auto', 'orjson', 'msgspec' or 'json'
+    queue_messages: bool = False  # Callbacks consume messages; skip the redundant queue copy
+
+    # Market data model family for ticker/trade/ohlc: 'decimal' or 'compact'
+    # (balances always use Decimal BalanceUpdate for exact order sizing)
+    market_data_models: str = "decimal"
+
+    # History retained per symbol (fixed-capacity ring buffers)
+    trade_history_size: int = 100
+    ohlc_history_size: int = 1000
+
+    # Streaming candles built from the trade feed
+    enable_candle_aggregation: bool = True
+    candle_timeframes: tuple[int, ...] = DEFAULT_TIMEFRAMES  # seconds
+    candle_history_size: int = 500
+    late_trade_tolerance: float = 5.0
+
+    # Ticker fan-out: one keep-latest-per-symbol mailbox and task per callback
+    conflate_ticker_callbacks: bool = True
+    fanout_max_pending: int = 1000  # Distinct symbols held per consumer mailbox
 
     # Rate limiting
     subscription_rate_limit: int = 5  # Max subscriptions per second
 
+    # Order book integrity
+    verify_book_checksum: bool = True
+    book_resync_timeout: float = 10.0  # Retry a per-symbol resync after this many seconds
+    book_resync_retry_delay: float = 1.0  # First backoff when the resubscribe cannot be sent
+
     # Authentication
     token_refresh_interval: float = 10 * 60  # 10 minutes (5 min before expiry for safety)
 
+    # Transport override passed to every ConnectionManager (None = websockets.connect)
+    connector: Optional[Callable] = None
+
+    # Wire-level session recording for replay (None = off)
+    recorder_config: Optional[RecorderConfig] = None
+
+
+def _symbol_of(update: Any) -> str:
+    return update.symbol
+
+
+def _no_symbol(update: Any) -> None:
+    return None
+
 
 class KrakenWebSocketV2:
     """
@@ -82,9 +142,15 @@ class KrakenWebSocketV2:
         self.config = config or KrakenWebSocketConfig()
 
         # Connection managers for public and private channels
-        self.public_connection: Optional[ConnectionManager] = None
+        self.public_connection: Optional[ConnectionManager] = None  # Shard 0
+        self.public_connections: list[ConnectionManager] = []
         self.private_connection: Optional[ConnectionManager] = None
 
+        # Session recorder shared by every connection
+        self.recorder: Optional[SessionRecorder] = (
+            SessionRecorder(self.config.recorder_config) if self.config.recorder_config else None
+        )
+
         # Message handler
         self.message_handler = KrakenV2MessageHandler(
             enable_sequence_tracking=True, enable_statistics=True
@@ -98,27 +164,68 @@ class KrakenWebSocketV2:
         # Subscription tracking
         self.active_subscriptions: dict[str, dict[str, Any]] = {}
         self.subscription_lock = asyncio.Lock()
+        self.subscription_registry = SubscriptionRegistry()  # Desired state, replayed on reconnect
+
+        # Reconnect recovery: (channel, symbol) streams whose cached data predates
+        # a disconnect, and per-connection (reconnected_at, streams still stale)
+        self.stale_streams: dict[tuple[str, Optional[str]], float] = {}
+        self._recoveries: dict[ConnectionManager, tuple[float, set]] = {}
+        self._disconnected_at: dict[ConnectionManager, float] = {}
+        self.reconnect_stats = {
+            "reconnects": 0,
+            "replayed_requests": 0,
+            "suppressed_updates": 0,
+            "last_gap": 0.0,
+            "last_time_to_fresh": 0.0,
+            "max_time_to_fresh": 0.0,
+        }
 
         # Data storage
         self.balance_data: dict[str, BalanceUpdate] = {}
-        self.ticker_data: dict[str, TickerUpdate] = {}
-        self.orderbook_data: dict[str, OrderBookUpdate] = {}
-        self.trade_data: dict[str, list[TradeUpdate]] = {}
-        self.ohlc_data: dict[str, list[OHLCUpdate]] = {}
+        self.ticker_data: dict[str, Union[TickerUpdate, CompactTicker]] = {}
+        self.order_books: dict[str, OrderBook] = {}
+        self.orderbook_depths: dict[str, int] = {}
+        self.instrument_precisions: dict[str, tuple[int, int]] = {}
+        self.book_resync_requests: dict[str, float] = {}
+        self._resync_tasks: set[asyncio.Task] = set()
+        self._shard_reconnect_tasks: set[asyncio.Task] = set()
+        self._fanout_tasks: set[asyncio.Task] = set()
+        self.book_checksum_stats = {"verified": 0, "mismatches": 0, "resyncs": 0}
+        self.trade_data: dict[str, TradeBuffer] = {}
+        self.ohlc_data: dict[str, OHLCBuffer] = {}
+        self.candle_aggregator: Optional[CandleAggregator] = (
+            CandleAggregator(
+                timeframes=self.config.candle_timeframes,
+                history_size=self.config.candle_history_size,
+                late_trade_tolerance=self.config.late_trade_tolerance,
+            )
+            if self.config.enable_candle_aggregation
+            else None
+        )
 
         # Callbacks
         self.callbacks: dict[str, list[Callable]] = {
             "balance": [],
             "ticker": [],
             "orderbook": [],
+            "book": [],  # Raw OrderBook engines, no OrderBookUpdate materialisation
             "trade": [],
             "ohlc": [],
             "connected": [],
             "disconnected": [],
             "error": [],
             "authenticated": [],
+            "order_response": [],  # add_order/cancel_order/amend_order acknowledgements
+            "private_disconnected": [],
         }
 
+        # Conflating fan-out stages keyed by event type
+        self.fanouts: dict[str, ConflatingFanout] = {}
+        if self.config.conflate_ticker_callbacks:
+            self.fanouts["ticker"] = ConflatingFanout(
+                key=lambda update: update.symbol, max_pending=self.config.fanout_max_pending
+            )
+
         # Status tracking
         self.is_running = False
         self.last_message_time = 0
@@ -157,10 +264,15 @@ class KrakenWebSocketV2:
             # Set up message handler callbacks
             self._setup_message_callbacks()
 
+            if self.recorder:
+                self.recorder.start()
+
             # Connect to public channels
             success = await self._connect_public()
             if not success:
                 logger.error("[KRAKEN_WS_V2] Failed to connect to public channels")
+                if self.recorder:
+                    await asyncio.get_running_loop().run_in_executor(None, self.recorder.stop)
                 return False
 
             # Connect to private channels if requested and credentials available
@@ -196,8 +308,8 @@ class KrakenWebSocketV2:
         self.is_running = False
 
         # Disconnect connection managers
-        if self.public_connection:
-            await self.public_connection.disconnect()
+        for connection in self.public_connections:
+            await connection.disconnect()
 
         if self.private_connection:
             await self.private_connection.disconnect()
@@ -206,48 +318,144 @@ class KrakenWebSocketV2:
         if self.message_handler:
             self.message_handler.shutdown()
 
+        # Flush recorded frames without blocking the loop
+        if self.recorder:
+            await asyncio.get_running_loop().run_in_executor(None, self.recorder.stop)
+
+        # Stop fan-out consumer tasks
+        for fanout in self.fanouts.values():
+            await fanout.stop()
+
+        for task in list(self._resync_tasks) + list(self._shard_reconnect_tasks):
+            task.cancel()
+
         # Clear data
         self.active_subscriptions.clear()
+        self.subscription_registry.clear()
+        self.stale_streams.clear()
+        self._recoveries.clear()
+        self._disconnected_at.clear()
 
         # Call disconnected callbacks
         await self._call_callbacks("disconnected")
 
         logger.info("[KRAKEN_WS_V2] WebSocket V2 disconnected")
 
+    def _create_public_connection(self) -> ConnectionManager:
+        """Create a public connection manager wired to the shared handlers"""
+        config = ConnectionConfig(
+            url=self.config.public_url,
+            ping_interval=self.config.ping_interval,
+            ping_timeout=self.config.ping_timeout,
+            max_reconnect_attempts=self.config.max_reconnect_attempts,
+            reconnect_delay=self.config.reconnect_delay,
+            heartbeat_timeout=self.config.heartbeat_timeout,
+            message_queue_size=self.config.message_queue_size,
+            json_decoder=self.config.json_decoder,
+            queue_messages=self.config.queue_messages,
+            connector=self.config.connector,
+            recorder=self.recorder,
+        )
+
+        # Create connection manager
+        connection = ConnectionManager(config)
+
+        # Book frames go straight into the incremental order book engine
+        connection.register_channel_handler("book", self._handle_book_message)
+        connection.register_channel_handler("instrument", self._handle_instrument_message)
+
+        # Compact models are decoded straight from the wire dicts
+        if self.config.market_data_models == "compact":
+            connection.register_channel_handler("ticker", self._handle_compact_ticker_message)
+            connection.register_channel_handler("trade", self._handle_compact_trade_message)
+            connection.register_channel_handler("ohlc", self._handle_compact_ohlc_message)
+
+        # Set up callbacks
+        connection.set_callback("message", self._handle_public_message)
+        connection.set_callback("error", self._handle_connection_error)
+        connection.set_callback("disconnected", partial(self._handle_connection_lost, connection))
+        connection.set_callback("reconnected", partial(self._handle_reconnected, connection))
+
+        return connection
+
     async def _connect_public(self) -> bool:
-        """Connect to public WebSocket channels"""
+        """Connect to public WebSocket channels (one connection per shard)"""
         try:
-            # Create connection config
-            config = ConnectionConfig(
-                url=self.config.public_url,
-                ping_interval=self.config.ping_interval,
-                ping_timeout=self.config.ping_timeout,
-                max_reconnect_attempts=self.config.max_reconnect_attempts,
-                reconnect_delay=self.config.reconnect_delay,
-                heartbeat_timeout=self.config.heartbeat_timeout,
-            )
-
-            # Create connection manager
-            self.public_connection = ConnectionManager(config)
+            shard_count = max(1, self.config.public_shards)
+            self.public_connections = [
+                self._create_public_connection() for _ in range(shard_count)
+            ]
+            self.public_connection = self.public_connections[0]
 
-            # Set up callbacks
-            self.public_connection.set_callback("message", self._handle_public_message)
-            self.public_connection.set_callback("error", self._handle_connection_error)
+            # Connect all shards concurrently; each keeps its own reconnect state
+            results = await asyncio.gather(
+                *(connection.connect() for connection in self.public_connections),
+                return_exceptions=True,
+            )
+            failed = [
+                connection
+                for connection, result in zip(self.public_connections, results)
+                if result is not True
+            ]
+            connected = shard_count - len(failed)
 
-            # Connect
-            success = await self.public_connection.connect()
+            if not connected:
+                logger.error("[KRAKEN_WS_V2] Failed to connect to public channels")
+                return False
 
-            if success:
-                logger.info("[KRAKEN_WS_V2] Connected to public channels")
+            if failed:
+                # Partial success: the missing shards retry in the background and
+                # replay their registered subscriptions once they are up
+                logger.warning(
+                    f"[KRAKEN_WS_V2] Connected to public channels ({connected}/{shard_count} "
+                    f"shards), retrying {len(failed)} in the background"
+                )
+                for connection in failed:
+                    task = asyncio.create_task(connection.reconnect())
+                    self._shard_reconnect_tasks.add(task)
+                    task.add_done_callback(self._shard_reconnect_tasks.discard)
             else:
-                logger.error("[KRAKEN_WS_V2] Failed to connect to public channels")
+                logger.info(
+                    f"[KRAKEN_WS_V2] Connected to public channels ({connected}/{shard_count} shards)"
+                )
 
-            return success
+            return True
 
         except Exception as e:
             logger.error(f"[KRAKEN_WS_V2] Error connecting to public channels: {e}")
             return False
 
+    def _shard_for_symbol(self, symbol: str) -> int:
+        """Stable shard index for a symbol (crc32, independent of PYTHONHASHSEED)"""
+        return zlib.crc32(symbol.encode()) % max(1, len(self.public_connections))
+
+    def _route_subscription(
+        self, subscription: SubscriptionRequest, private: bool
+    ) -> list[tuple[Optional[ConnectionManager], SubscriptionRequest]]:
+        """Split a subscription into per-connection requests"""
+        if private:
+            return [(self.private_connection, subscription)]
+
+        symbols = subscription.params.get("symbol")
+        if len(self.public_connections) <= 1 or not symbols:
+            return [(self.public_connection, subscription)]
+
+        by_shard: dict[int, list[str]] = {}
+        for symbol in symbols:
+            by_shard.setdefault(self._shard_for_symbol(symbol), []).append(symbol)
+
+        return [
+            (
+                self.public_connections[shard],
+                SubscriptionRequest(
+                    method=subscription.method,
+                    params={**subscription.params, "symbol": shard_symbols},
+                    req_id=subscription.req_id,
+                ),
+            )
+            for shard, shard_symbols in sorted(by_shard.items())
+        ]
+
     async def _connect_private(self) -> bool:
         """Connect to private WebSocket channels"""
         try:
@@ -265,6 +473,12 @@ class KrakenWebSocketV2:
                 max_reconnect_attempts=self.config.max_reconnect_attempts,
                 reconnect_delay=self.config.reconnect_delay,
                 heartbeat_timeout=self.config.heartbeat_timeout,
+                message_queue_size=self.config.message_queue_size,
+                json_decoder=self.config.json_decoder,
+                queue_messages=self.config.queue_messages,
+                connector=self.config.connector,
+                recorder=self.recorder,
+                record_as="private",
             )
 
             # Create connection manager
@@ -274,6 +488,12 @@ class KrakenWebSocketV2:
             self.private_connection.set_callback("message", self._handle_private_message)
             self.private_connection.set_callback("authenticated", self._handle_authentication)
             self.private_connection.set_callback("error", self._handle_connection_error)
+            self.private_connection.set_callback(
+                "disconnected", partial(self._handle_connection_lost, self.private_connection)
+            )
+            self.private_connection.set_callback(
+                "reconnected", partial(self._handle_reconnected, self.private_connection)
+            )
 
             # Connect with authentication token
             success = await self.private_connection.connect(self.auth_token)
@@ -377,6 +597,9 @@ class KrakenWebSocketV2:
     async def _handle_private_message(self, message: dict[str, Any]):
         """Handle private channel messages"""
         self.last_message_time = time.time()
+        if message.get("method") in ORDER_METHODS:
+            await self._call_callbacks("order_response", message)
+            return
         await self.message_handler.process_message(message)
 
     async def _handle_authentication(self):
@@ -389,9 +612,184 @@ class KrakenWebSocketV2:
         logger.error(f"[KRAKEN_WS_V2] Connection error: {error}")
         await self._call_callbacks("error", error)
 
+    # Reconnect Recovery
+
+    def _connection_requests(self, connection: ConnectionManager) -> list[SubscriptionRequest]:
+        """Registered subscriptions owned by a connection, one request per channel group"""
+        if connection is self.private_connection:
+            requests = self.subscription_registry.requests(
+                include_channel=lambda channel: channel in PRIVATE_CHANNELS
+            )
+            if self.auth_token:
+                for request in requests:
+                    request.params["token"] = self.auth_token
+            return requests
+
+        shard = self.public_connections.index(connection)
+        requests = self.subscription_registry.requests(
+            include_channel=lambda channel: channel not in PRIVATE_CHANNELS,
+            include_symbol=lambda symbol: self._shard_for_symbol(symbol) == shard,
+        )
+        # Symbol-less public channels (e.g., instrument) live on shard 0 only
+        return [request for request in requests if shard == 0 or "symbol" in request.params]
+
+    @staticmethod
+    def _request_streams(requests: list[SubscriptionRequest]) -> set[tuple[str, Optional[str]]]:
+        """Cached (channel, symbol) streams fed by a set of requests"""
+        return {
+            (request.params["channel"], symbol)
+            for request in requests
+            if request.params["channel"] in CACHED_CHANNELS
+            for symbol in request.params.get("symbol") or (None,)
+        }
+
+    async def _handle_connection_lost(self, connection: ConnectionManager):
+        """Mark the connection's cached streams stale until fresh data arrives"""
+        if not self.is_running:
+            return
+
+        now = time.time()
+        self._disconnected_at.setdefault(connection, now)
+        streams = self._request_streams(self._connection_requests(connection))
+        for stream in streams:
+            self.stale_streams.setdefault(stream, now)
+
+        logger.warning(f"[KRAKEN_WS_V2] Connection lost, {len(streams)} cached streams marked stale")
+
+        if connection is self.private_connection:
+            await self._call_callbacks("private_disconnected")
+
+    async def _handle_reconnected(self, connection: ConnectionManager):
+        """Replay the connection's subscriptions as one batched request per channel"""
+        now = time.time()
+        gap = now - self._disconnected_at.pop(connection, now)
+        self.reconnect_stats["reconnects"] += 1
+        self.reconnect_stats["last_gap"] = gap
+
+        # Subscription messages queued during the gap are superseded by the replay
+        connection.pending_messages = [
+            message
+            for message in connection.pending_messages
+            if message.get("method") not in ("subscribe", "unsubscribe")
+        ]
+
+        requests = self._connection_requests(connection)
+        stale = {stream for stream in self._request_streams(requests) if stream in self.stale_streams}
+        if stale:
+            self._recoveries[connection] = (now, stale)
+
+        for request in requests:
+            if await connection.send_message(request.to_dict()):
+                self.reconnect_stats["replayed_requests"] += 1
+
+        logger.info(
+            f"[KRAKEN_WS_V2] Reconnected after {gap:.2f}s gap, replayed {len(requests)} "
+            f"subscription requests covering {len(stale)} stale streams"
+        )
+
+    def _mark_fresh(self, channel: str, symbol: Optional[str]):
+        """Clear staleness for a stream and record reconnect-to-fresh-data time"""
+        stream = (channel, symbol)
+        if self.stale_streams.pop(stream, None) is None:
+            return
+
+        now = time.time()
+        for connection, (reconnected_at, pending) in list(self._recoveries.items()):
+            pending.discard(stream)
+            if pending:
+                continue
+
+            del self._recoveries[connection]
+            elapsed = now - reconnected_at
+            self.reconnect_stats["last_time_to_fresh"] = elapsed
+            if elapsed > self.reconnect_stats["max_time_to_fresh"]:
+                self.reconnect_stats["max_time_to_fresh"] = elapsed
+            logger.info(f"[KRAKEN_WS_V2] All streams fresh {elapsed:.3f}s after reconnect")
+
+    def _filter_recovered(
+        self,
+        channel: str,
+        updates: list[Any],
+        is_unchanged: Callable[[Any], bool],
+        symbol_of: Callable[[Any], Optional[str]] = _no_symbol,
+    ) -> list[Any]:
+        """
+        Drop updates of recovering streams that only repeat cached state
+
+        The first message of a stream after a reconnect is the replayed
+        snapshot; updates in it matching the cache are suppressed so consumers
+        only see real changes, then the stream is marked fresh.
+        """
+        recovering = {
+            symbol for symbol in map(symbol_of, updates) if (channel, symbol) in self.stale_streams
+        }
+        if not recovering:
+            return updates
+
+        fresh = [
+            update
+            for update in updates
+            if symbol_of(update) not in recovering or not is_unchanged(update)
+        ]
+        self.reconnect_stats["suppressed_updates"] += len(updates) - len(fresh)
+
+        for symbol in recovering:
+            self._mark_fresh(channel, symbol)
+        return fresh
+
+    def _is_cached_balance(self, update: BalanceUpdate) -> bool:
+        cached = self.balance_data.get(update.asset)
+        return (
+            cached is not None
+            and cached.balance == update.balance
+            and cached.hold_trade == update.hold_trade
+        )
+
+    def _is_cached_ticker(self, update: Union[TickerUpdate, CompactTicker]) -> bool:
+        cached = self.ticker_data.get(update.symbol)
+        return cached is not None and (cached.bid, cached.ask, cached.last, cached.volume) == (
+            update.bid,
+            update.ask,
+            update.last,
+            update.volume,
+        )
+
+    def _is_cached_trade(self, update: Union[TradeUpdate, CompactTrade]) -> bool:
+        buffer = self.trade_data.get(update.symbol)
+        if buffer is None or not len(buffer):
+            return False
+        try:
+            trade_id = int(update.trade_id)
+        except (TypeError, ValueError):
+            trade_id = -1
+        last_id = buffer.last("trade_id")
+        if trade_id >= 0 and last_id >= 0:
+            return trade_id <= last_id
+        return update.timestamp <= buffer.last("timestamp")
+
+    def _is_cached_ohlc(self, update: Union[OHLCUpdate, CompactOHLC]) -> bool:
+        buffer = self.ohlc_data.get(update.symbol)
+        if buffer is None or not len(buffer):
+            return False
+        last_timestamp = buffer.last("timestamp")
+        if update.timestamp < last_timestamp:
+            return True
+        return (
+            update.timestamp == last_timestamp
+            and float(update.close) == buffer.last("close")
+            and float(update.volume) == buffer.last("volume")
+        )
+
     async def _handle_balance_updates(self, balance_updates: list[BalanceUpdate]):
         """Handle balance update messages"""
         try:
+            if self.stale_streams:
+                balance_updates = self._filter_recovered(
+                    "balances", balance_updates, self._is_cached_balance
+                )
+                if not balance_updates:
+                    return
+
             logger.info(f"[KRAKEN_WS_V2] Processing {len(balance_updates)} balance updates")
 
             # Update local balance data
@@ -410,6 +808,13 @@ class KrakenWebSocketV2:
     async def _handle_ticker_updates(self, ticker_updates: list[TickerUpdate]):
         """Handle ticker update messages"""
         try:
+            if self.stale_streams:
+                ticker_updates = self._filter_recovered(
+                    "ticker", ticker_updates, self._is_cached_ticker, _symbol_of
+                )
+                if not ticker_updates:
+                    return
+
             # Update local ticker data
             for ticker_update in ticker_updates:
                 self.ticker_data[ticker_update.symbol] = ticker_update
@@ -423,12 +828,187 @@ class KrakenWebSocketV2:
         except Exception as e:
             logger.error(f"[KRAKEN_WS_V2] Error handling ticker updates: {e}")
 
+    def _get_order_book(self, symbol: str) -> OrderBook:
+        """Get or create the incremental order book for a symbol"""
+        book = self.order_books.get(symbol)
+        if book is None:
+            book = OrderBook(symbol, depth=self.orderbook_depths.get(symbol, 10))
+            precision = self.instrument_precisions.get(symbol)
+            if precision and self.config.verify_book_checksum:
+                book.set_precision(*precision)
+            self.order_books[symbol] = book
+        return book
+
+    async def _handle_instrument_message(self, message: dict[str, Any]):
+        """Record price/qty precision per pair so book checksums can be verified"""
+        self.last_message_time = time.time()
+        if self.stale_streams:
+            self._mark_fresh("instrument", None)
+        try:
+            data = message.get("data") or {}
+            for pair in data.get("pairs", ()):
+                symbol = pair.get("symbol")
+                if not symbol or "price_precision" not in pair or "qty_precision" not in pair:
+                    continue
+
+                precision = (int(pair["price_precision"]), int(pair["qty_precision"]))
+                self.instrument_precisions[symbol] = precision
+
+                book = self.order_books.get(symbol)
+                if book and self.config.verify_book_checksum and not book.checksum_enabled:
+                    book.set_precision(*precision)
+
+        except Exception as e:
+            logger.error(f"[KRAKEN_WS_V2] Error handling instrument message: {e}")
+
+    async def _handle_book_message(self, message: dict[str, Any]):
+        """Apply a raw book snapshot/delta frame to the per-symbol order books"""
+        self.last_message_time = time.time()
+        try:
+            is_snapshot = message.get("type") == "snapshot"
+            updated_books = []
+
+            for book_data in message.get("data", ()):
+                symbol = book_data.get("symbol")
+                if not symbol:
+                    continue
+
+                book = self._get_order_book(symbol)
+                previous_levels = None
+                if is_snapshot:
+                    if ("book", symbol) in self.stale_streams:
+                        # Replayed snapshot: diffed against the cached book below
+                        previous_levels = (book.bids.levels(), book.asks.levels())
+                        self._mark_fresh("book", symbol)
+                    book.apply_snapshot(book_data)
+                elif book.needs_resync:
+                    # Deltas are meaningless until the resync snapshot arrives
+                    self._request_book_resync(symbol)
+                    continue
+                else:
+                    book.apply_update(book_data)
+
+                if book.checksum_enabled and book.checksum is not None:
+                    if not book.verify_checksum():
+                        self.book_checksum_stats["mismatches"] += 1
+                        logger.warning(
+                            f"[KRAKEN_WS_V2] Book checksum mismatch for {symbol}, resyncing"
+                        )
+                        book.needs_resync = True
+                        self._request_book_resync(symbol)
+                        continue
+                    self.book_checksum_stats["verified"] += 1
+
+                if previous_levels is not None and previous_levels == (
+                    book.bids.levels(),
+                    book.asks.levels(),
+                ):
+                    self.reconnect_stats["suppressed_updates"] += 1
+                    continue
+
+                updated_books.append(book)
+
+            if updated_books and self.callbacks["book"]:
+                await self._call_callbacks("book", updated_books)
+
+            # Only materialise OrderBookUpdate objects when someone listens
+            if updated_books and self.callbacks["orderbook"]:
+                await self._call_callbacks(
+                    "orderbook", [book.to_update() for book in updated_books]
+                )
+
+        except Exception as e:
+            logger.error(f"[KRAKEN_WS_V2] Error handling book message: {e}")
+
+    def _request_book_resync(self, symbol: str):
+        """Schedule a per-symbol book resubscribe unless one is already in flight"""
+        requested_at = self.book_resync_requests.get(symbol)
+        if requested_at and time.time() - requested_at < self.config.book_resync_timeout:
+            return
+
+        self.book_resync_requests[symbol] = time.time()
+        # Keep a reference so the task is not garbage-collected mid-flight
+        task = asyncio.create_task(self._resync_order_book(symbol))
+        self._resync_tasks.add(task)
+        task.add_done_callback(self._resync_task_done)
+
+    def _resync_task_done(self, task: asyncio.Task):
+        self._resync_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"[KRAKEN_WS_V2] Order book resync task failed: {task.exception()}")
+
+    async def _resync_order_book(self, symbol: str):
+        """
+        Resubscribe a single symbol's book channel to obtain a fresh snapshot
+
+        Both requests bypass the subscription rate limiter: a subscribe refused
+        after the unsubscribe went through would leave the symbol without a
+        book feed, and so without deltas to trigger another resync. A subscribe
+        that cannot be sent is retried with exponential backoff.
+        """
+        depth = self.orderbook_depths.get(symbol, 10)
+        self.book_checksum_stats["resyncs"] += 1
+        logger.info(f"[KRAKEN_WS_V2] Resyncing order book for {symbol} (depth {depth})")
+
+        unsubscribe = SubscriptionRequest(
+            method="unsubscribe", params={"channel": "book", "symbol": [symbol]}
+        )
+        await self._send_subscription(unsubscribe, private=False, rate_limited=False)
+        subscription = SubscriptionRequest(
+            method="subscribe", params={"channel": "book", "symbol": [symbol], "depth": depth}
+        )
+        delay = self.config.book_resync_retry_delay
+        while not await self._send_subscription(subscription, private=False, rate_limited=False):
+            logger.warning(
+                f"[KRAKEN_WS_V2] Book resubscribe for {symbol} failed, retrying in {delay:.1f}s"
+            )
+            # Keeps deltas from starting a second resync while this one retries
+            self.book_resync_requests[symbol] = time.time() + delay
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.config.book_resync_timeout)
+
+    async def _handle_compact_ticker_message(self, message: dict[str, Any]):
+        """Build CompactTicker updates directly from a raw ticker frame"""
+        self.last_message_time = time.time()
+        updates = [
+            CompactTicker.from_raw(item.get("symbol", ""), item)
+            for item in message.get("data", ())
+        ]
+        if updates:
+            await self._handle_ticker_updates(updates)
+
+    async def _handle_compact_trade_message(self, message: dict[str, Any]):
+        """Build CompactTrade updates directly from a raw trade frame"""
+        self.last_message_time = time.time()
+        updates = [
+            CompactTrade.from_raw(item.get("symbol", ""), item) for item in message.get("data", ())
+        ]
+        if updates:
+            await self._handle_trade_updates(updates)
+
+    async def _handle_compact_ohlc_message(self, message: dict[str, Any]):
+        """Build CompactOHLC updates directly from a raw ohlc frame"""
+        self.last_message_time = time.time()
+        updates = [
+            CompactOHLC.from_raw(item.get("symbol", ""), item) for item in message.get("data", ())
+        ]
+        if updates:
+            await self._handle_ohlc_updates(updates)
+
     async def _handle_orderbook_updates(self, orderbook_updates: list[OrderBookUpdate]):
         """Handle orderbook update messages"""
         try:
-            # Update local orderbook data
+            # Apply levels to the local order books as deltas
             for orderbook_update in orderbook_updates:
-                self.orderbook_data[orderbook_update.symbol] = orderbook_update
+                if self.stale_streams:
+                    self._mark_fresh("book", orderbook_update.symbol)
+                self._get_order_book(orderbook_update.symbol).apply_update(
+                    {
+                        "bids": [(level.price, level.volume) for level in orderbook_update.bids],
+                        "asks": [(level.price, level.volume) for level in orderbook_update.asks],
+                        "checksum": orderbook_update.checksum,
+                    }
+                )
                 logger.debug(f"[KRAKEN_WS_V2] Updated orderbook: {orderbook_update.symbol}")
 
             # Call orderbook callbacks
@@ -437,21 +1017,35 @@ class KrakenWebSocketV2:
         except Exception as e:
             logger.error(f"[KRAKEN_WS_V2] Error handling orderbook updates: {e}")
 
-    async def _handle_trade_updates(self, trade_updates: list[TradeUpdate]):
+    async def _handle_trade_updates(
+        self, trade_updates: list[Union[TradeUpdate, CompactTrade]]
+    ):
         """Handle trade update messages"""
         try:
+            if self.stale_streams:
+                # The replayed snapshot repeats trades already in the buffers
+                trade_updates = self._filter_recovered(
+                    "trade", trade_updates, self._is_cached_trade, _symbol_of
+                )
+                if not trade_updates:
+                    return
+
             # Update local trade data
             for trade_update in trade_updates:
-                if trade_update.symbol not in self.trade_data:
-                    self.trade_data[trade_update.symbol] = []
-
-                self.trade_data[trade_update.symbol].append(trade_update)
-
-                # Keep only recent trades (last 100)
-                if len(self.trade_data[trade_update.symbol]) > 100:
-                    self.trade_data[trade_update.symbol] = self.trade_data[trade_update.symbol][
-                        -100:
-                    ]
+                buffer = self.trade_data.get(trade_update.symbol)
+                if buffer is None:
+                    buffer = TradeBuffer(self.config.trade_history_size)
+                    self.trade_data[trade_update.symbol] = buffer
+
+                buffer.add(trade_update)
+
+                if self.candle_aggregator:
+                    self.candle_aggregator.add_trade(
+                        trade_update.symbol,
+                        trade_update.timestamp,
+                        float(trade_update.price),
+                        float(trade_update.volume),
+                    )
 
                 logger.debug(
                     f"[KRAKEN_WS_V2] New trade: {trade_update.symbol} {trade_update.side} {trade_update.volume} @ ${trade_update.price}"
@@ -463,19 +1057,24 @@ class KrakenWebSocketV2:
         except Exception as e:
             logger.error(f"[KRAKEN_WS_V2] Error handling trade updates: {e}")
 
-    async def _handle_ohlc_updates(self, ohlc_updates: list[OHLCUpdate]):
+    async def _handle_ohlc_updates(self, ohlc_updates: list[Union[OHLCUpdate, CompactOHLC]]):
         """Handle OHLC update messages"""
         try:
+            if self.stale_streams:
+                ohlc_updates = self._filter_recovered(
+                    "ohlc", ohlc_updates, self._is_cached_ohlc, _symbol_of
+                )
+                if not ohlc_updates:
+                    return
+
             # Update local OHLC data
             for ohlc_update in ohlc_updates:
-                if ohlc_update.symbol not in self.ohlc_data:
-                    self.ohlc_data[ohlc_update.symbol] = []
+                buffer = self.ohlc_data.get(ohlc_update.symbol)
+                if buffer is None:
+                    buffer = OHLCBuffer(self.config.ohlc_history_size)
+                    self.ohlc_data[ohlc_update.symbol] = buffer
 
-                self.ohlc_data[ohlc_update.symbol].append(ohlc_update)
-
-                # Keep only recent candles (last 1000)
-                if len(self.ohlc_data[ohlc_update.symbol]) > 1000:
-                    self.ohlc_data[ohlc_update.symbol] = self.ohlc_data[ohlc_update.symbol][-1000:]
+                buffer.add(ohlc_update)
 
                 logger.debug(
                     f"[KRAKEN_WS_V2] New OHLC: {ohlc_update.symbol} close=${ohlc_update.close}"
@@ -514,11 +1113,13 @@ class KrakenWebSocketV2:
         Register callback for WebSocket events
 
         Args:
-            event_type: Type of event ('balance', 'ticker', 'orderbook', 'trade', 'ohlc', 'connected', 'disconnected', 'error', 'authenticated')
+            event_type: Type of event ('balance', 'ticker', 'orderbook', 'book', 'trade', 'ohlc', 'connected', 'disconnected', 'error', 'authenticated', 'order_response', 'private_disconnected')
             callback: Async callback function
         """
         if event_type in self.callbacks:
             self.callbacks[event_type].append(callback)
+            if event_type in self.fanouts:
+                self.fanouts[event_type].subscribe(callback)
             logger.info(f"[KRAKEN_WS_V2] Registered callback for {event_type}")
         else:
             logger.warning(f"[KRAKEN_WS_V2] Unknown event type: {event_type}")
@@ -527,8 +1128,24 @@ class KrakenWebSocketV2:
         """Remove callback for event type"""
         if event_type in self.callbacks and callback in self.callbacks[event_type]:
             self.callbacks[event_type].remove(callback)
+            if event_type in self.fanouts:
+                self._unsubscribe_fanout(self.fanouts[event_type], callback)
             logger.info(f"[KRAKEN_WS_V2] Unregistered callback for {event_type}")
 
+    def _unsubscribe_fanout(self, fanout: ConflatingFanout, callback: Callable):
+        """Detach a fan-out consumer now and stop its task when a loop is running"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop: nothing is draining the mailbox, so detaching is enough
+            fanout.remove(callback)
+            return
+
+        # Keep a reference so the task is not garbage-collected mid-flight
+        task = asyncio.create_task(fanout.unsubscribe(callback))
+        self._fanout_tasks.add(task)
+        task.add_done_callback(self._fanout_tasks.discard)
+
     async def subscribe_balance(self) -> bool:
         """Subscribe to balance updates (requires authentication)"""
         if not self.private_connection or not self.private_connection.is_authenticated:
@@ -560,12 +1177,32 @@ class KrakenWebSocketV2:
             symbols: List of trading pairs
             depth: Orderbook depth (10, 25, 100, 500, 1000)
         """
+        for symbol in symbols:
+            self.orderbook_depths[symbol] = depth
+            if symbol in self.order_books:
+                self.order_books[symbol].depth = depth
+
+        # Checksum verification needs the instrument precision of every pair
+        if self.config.verify_book_checksum and any(
+            symbol not in self.instrument_precisions for symbol in symbols
+        ):
+            await self.subscribe_instrument()
+
         subscription = SubscriptionRequest(
             method="subscribe", params={"channel": "book", "symbol": symbols, "depth": depth}
         )
 
         return await self._send_subscription(subscription, private=False)
 
+    async def subscribe_instrument(self) -> bool:
+        """Subscribe to instrument reference data (pair precisions)"""
+        if "instrument" in self.active_subscriptions:
+            return True
+
+        subscription = SubscriptionRequest(method="subscribe", params={"channel": "instrument"})
+
+        return await self._send_subscription(subscription, private=False)
+
     async def subscribe_trades(self, symbols: list[str]) -> bool:
         """
         Subscribe to trade updates for symbols
@@ -608,32 +1245,34 @@ class KrakenWebSocketV2:
         subscription = SubscriptionRequest(method="unsubscribe", params=params)
 
         # Determine if private or public channel
-        private_channels = ["balances", "executions", "openOrders"]
-        is_private = channel in private_channels
+        is_private = channel in PRIVATE_CHANNELS
 
         return await self._send_subscription(subscription, private=is_private)
 
     async def _send_subscription(
-        self, subscription: SubscriptionRequest, private: bool = False
+        self, subscription: SubscriptionRequest, private: bool = False, rate_limited: bool = True
     ) -> bool:
-        """Send subscription request"""
+        """Send subscription request (``rate_limited=False`` skips the subscription limiter)"""
         try:
             # Rate limiting check
-            if not await self._check_subscription_rate_limit():
+            if rate_limited and not await self._check_subscription_rate_limit():
                 logger.warning("[KRAKEN_WS_V2] Subscription rate limit exceeded")
                 return False
 
-            # Choose connection
-            connection = self.private_connection if private else self.public_connection
+            # Record intent even if the socket is down; it is replayed on reconnect
+            self.subscription_registry.record(subscription)
 
-            if not connection or not connection.is_connected:
-                logger.error(
-                    f"[KRAKEN_WS_V2] No {'private' if private else 'public'} connection available"
-                )
-                return False
+            success = True
+            for connection, request in self._route_subscription(subscription, private):
+                if not connection or not connection.is_connected:
+                    logger.error(
+                        f"[KRAKEN_WS_V2] No {'private' if private else 'public'} connection available"
+                    )
+                    success = False
+                    continue
 
-            # Send subscription
-            success = await connection.send_message(subscription.to_dict())
+                # Send subscription
+                success = await connection.send_message(request.to_dict()) and success
 
             if success:
                 logger.info(
@@ -688,27 +1327,99 @@ class KrakenWebSocketV2:
         """Get current ticker for symbol"""
         ticker_update = self.ticker_data.get(symbol)
         if ticker_update:
-            return ticker_update.to_dict()
+            ticker = ticker_update.to_dict()
+            ticker["stale"] = ("ticker", symbol) in self.stale_streams
+            return ticker
         return None
 
-    def get_orderbook(self, symbol: str) -> Optional[dict[str, Any]]:
+    def get_orderbook(self, symbol: str, depth: Optional[int] = None) -> Optional[dict[str, Any]]:
         """Get current orderbook for symbol"""
-        orderbook_update = self.orderbook_data.get(symbol)
-        if orderbook_update:
-            return orderbook_update.to_dict()
+        book = self.order_books.get(symbol)
+        if book:
+            orderbook = book.to_dict(depth)
+            orderbook["stale"] = ("book", symbol) in self.stale_streams
+            return orderbook
+        return None
+
+    def is_stale(self, symbol: Optional[str] = None, channel: Optional[str] = None) -> bool:
+        """
+        Check whether cached data predates a disconnect and has not been refreshed
+
+        Args:
+            symbol: Trading pair (None for symbol-less channels such as balances)
+            channel: Restrict to one channel; any channel of the symbol otherwise
+        """
+        if channel is not None:
+            return (channel, symbol) in self.stale_streams
+        return any(stream_symbol == symbol for _, stream_symbol in self.stale_streams)
+
+    def get_best_bid_ask(self, symbol: str) -> Optional[tuple[float, float]]:
+        """Get (best_bid, best_ask) prices for symbol in O(1)"""
+        book = self.order_books.get(symbol)
+        if book:
+            best_bid = book.best_bid
+            best_ask = book.best_ask
+            if best_bid and best_ask:
+                return best_bid[0], best_ask[0]
         return None
 
     def get_recent_trades(self, symbol: str, limit: int = 50) -> list[dict[str, Any]]:
         """Get recent trades for symbol"""
-        trades = self.trade_data.get(symbol, [])
-        recent_trades = trades[-limit:] if len(trades) > limit else trades
-        return [trade.to_dict() for trade in recent_trades]
+        buffer = self.trade_data.get(symbol)
+        if buffer is None:
+            return []
+        return buffer.to_dicts(limit)
 
     def get_ohlc_data(self, symbol: str, limit: int = 100) -> list[dict[str, Any]]:
         """Get OHLC data for symbol"""
-        ohlc_list = self.ohlc_data.get(symbol, [])
-        recent_ohlc = ohlc_list[-limit:] if len(ohlc_list) > limit else ohlc_list
-        return [ohlc.to_dict() for ohlc in recent_ohlc]
+        buffer = self.ohlc_data.get(symbol)
+        if buffer is None:
+            return []
+        return buffer.to_dicts(limit)
+
+    def get_trade_window(self, symbol: str, limit: Optional[int] = None) -> dict[str, memoryview]:
+        """
+        Get zero-copy column views of recent trades, oldest first
+
+        Columns: timestamp, price, volume, side (1 buy / -1 sell), trade_id.
+        Views are live; copy them if they must outlive the next update.
+        """
+        buffer = self.trade_data.get(symbol)
+        if buffer is None:
+            return {}
+        return buffer.windows(limit)
+
+    def get_candles(
+        self,
+        symbol: str,
+        timeframe: Union[str, int] = "1m",
+        limit: Optional[int] = None,
+        include_open: bool = True,
+    ) -> dict[str, memoryview]:
+        """
+        Get zero-copy column views of trade-built candles
+
+        Args:
+            symbol: Trading pair
+            timeframe: '1s', '5s', '1m', '5m', '15m', '1h' (or seconds)
+            limit: Max candles returned (most recent)
+            include_open: Include the in-progress candle as the last row
+        """
+        if not self.candle_aggregator:
+            return {}
+        return self.candle_aggregator.get_window(symbol, timeframe, limit, include_open)
+
+    def get_ohlc_window(self, symbol: str, limit: Optional[int] = None) -> dict[str, memoryview]:
+        """
+        Get zero-copy column views of recent candles, oldest first
+
+        Columns: timestamp, open, high, low, close, volume, interval.
+        Views are live; copy them if they must outlive the next update.
+        """
+        buffer = self.ohlc_data.get(symbol)
+        if buffer is None:
+            return {}
+        return buffer.windows(limit)
 
     # Status and Monitoring
 
@@ -726,10 +1437,19 @@ class KrakenWebSocketV2:
             "active_subscriptions": len(self.active_subscriptions),
             "subscription_details": dict(self.active_subscriptions),
             "message_handler_stats": self.message_handler.get_statistics(),
+            "book_checksum_stats": dict(self.book_checksum_stats),
+            "reconnect_stats": {**self.reconnect_stats, "stale_streams": len(self.stale_streams)},
+            "subscription_registry": self.subscription_registry.get_status(),
+            "candle_aggregator_stats": self.candle_aggregator.get_statistics()
+            if self.candle_aggregator
+            else None,
+            "fanout_consumers": {
+                event_type: fanout.get_metrics() for event_type, fanout in self.fanouts.items()
+            },
             "data_counts": {
                 "balances": len(self.balance_data),
                 "tickers": len(self.ticker_data),
-                "orderbooks": len(self.orderbook_data),
+                "orderbooks": len(self.order_books),
                 "trade_symbols": len(self.trade_data),
                 "ohlc_symbols": len(self.ohlc_data),
             },
@@ -739,6 +1459,14 @@ class KrakenWebSocketV2:
         if self.public_connection:
             status["public_connection"] = self.public_connection.get_status()
 
+        if len(self.public_connections) > 1:
+            status["public_shards"] = [
+                connection.get_status() for connection in self.public_connections
+            ]
+            status["public_shards_connected"] = sum(
+                1 for connection in self.public_connections if connection.is_connected
+            )
+
         if self.private_connection:
             status["private_connection"] = self.private_connection.get_status()
 
@@ -746,7 +1474,7 @@ class KrakenWebSocketV2:
 
     def is_connected(self) -> bool:
         """Check if any connection is active"""
-        public_connected = self.public_connection and self.public_connection.is_connected
+        public_connected = any(connection.is_connected for connection in self.public_connections)
         private_connected = self.private_connection and self.private_connection.is_connected
         return public_connected or private_connected
 
@@ -756,6 +1484,12 @@ class KrakenWebSocketV2:
 
     async def _call_callbacks(self, event_type: str, data: Any = None):
         """Call registered callbacks for event type"""
+        # Conflated events are handed to per-consumer mailboxes without awaiting
+        fanout = self.fanouts.get(event_type)
+        if fanout is not None and data is not None:
+            fanout.publish(data)
+            return
+
         callbacks = self.callbacks.get(event_type, [])
 
         for callback in callbacks:
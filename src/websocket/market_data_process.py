@@ -0,0 +1,283 @@
+"""
+Process-Isolated Market Data Ingestion
+======================================
+
+Runs ``KrakenWebSocketV2`` in a dedicated child process so socket reads,
+message decoding and order book maintenance never wait behind strategy CPU
+time in the trading process (which is also what made ``heartbeat_timeout``
+fire spuriously under load).
+
+The child publishes into a ``SharedMarketData`` block owned by the parent:
+- ticker fields from the ticker channel
+- top of book from the incremental order books
+- in-progress and just-closed candles from the trade-fed candle aggregator
+
+Only public channels run in the child. Balances stay on the trading
+process's private connection because order sizing reads them directly.
+
+Usage:
+    process = MarketDataProcess(["BTC/USDT", "ETH/USDT"])
+    market_data = process.start()
+    bid_ask = market_data.get_best_bid_ask("BTC/USDT")
+    candles = market_data.get_ohlcv("BTC/USDT", "1m", limit=100)
+    process.stop()
+"""
+
+import asyncio
+import dataclasses
+import logging
+import multiprocessing
+import time
+from typing import Any, Optional
+
+from .candle_aggregator import DEFAULT_TIMEFRAMES, parse_timeframe
+from .kraken_websocket_v2 import KrakenWebSocketConfig, KrakenWebSocketV2
+from .shared_market_data import SharedMarketData
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_ingestion(
+    shm_name: str,
+    symbols: list[str],
+    timeframes: tuple[int, ...],
+    capacity: int,
+    ws_config: KrakenWebSocketConfig,
+    book_depth: int,
+    heartbeat_interval: float,
+    stop_event: Any,
+):
+    """Child process body: stream public market data into shared memory"""
+    market_data = SharedMarketData.attach(shm_name, symbols, timeframes, capacity)
+    market_data.mark_writer()
+
+    client = KrakenWebSocketV2(config=ws_config)
+    aggregator = client.candle_aggregator
+
+    async def on_ticker(updates):
+        for update in updates:
+            market_data.write_ticker(
+                update.symbol,
+                float(update.bid),
+                float(update.ask),
+                float(update.last),
+                float(update.volume),
+                float(update.vwap),
+                float(update.high),
+                float(update.low),
+                float(update.open_price),
+            )
+
+    async def on_book(books):
+        for book in books:
+            best_bid = book.best_bid
+            best_ask = book.best_ask
+            if best_bid and best_ask:
+                market_data.write_book_top(
+                    book.symbol, best_bid[0], best_bid[1], best_ask[0], best_ask[1]
+                )
+
+    async def on_trade(updates):
+        # The last two rows cover both the in-progress candle and one closed by this batch
+        for symbol in {update.symbol for update in updates}:
+            for timeframe in timeframes:
+                views = aggregator.get_window(symbol, timeframe, limit=2)
+                if not views:
+                    continue
+                for row in zip(
+                    views["timestamp"],
+                    views["open"],
+                    views["high"],
+                    views["low"],
+                    views["close"],
+                    views["volume"],
+                ):
+                    market_data.write_candle(symbol, timeframe, *row)
+
+    client.register_callback("ticker", on_ticker)
+    client.register_callback("book", on_book)
+    if aggregator:
+        client.register_callback("trade", on_trade)
+
+    try:
+        if not await client.connect(private_channels=False):
+            logger.error("[MARKET_DATA_PROCESS] WebSocket connection failed")
+            return
+
+        await client.subscribe_ticker(symbols)
+        await client.subscribe_orderbook(symbols, depth=book_depth)
+        if aggregator:
+            await client.subscribe_trades(symbols)
+
+        logger.info(f"[MARKET_DATA_PROCESS] Streaming {len(symbols)} symbols into {shm_name}")
+
+        while not stop_event.is_set():
+            market_data.heartbeat()
+            await asyncio.sleep(heartbeat_interval)
+
+    finally:
+        await client.disconnect()
+        market_data.close()
+
+
+def _ingestion_main(
+    shm_name: str,
+    symbols: list[str],
+    timeframes: tuple[int, ...],
+    capacity: int,
+    ws_config: KrakenWebSocketConfig,
+    book_depth: int,
+    heartbeat_interval: float,
+    stop_event: Any,
+    log_level: int,
+):
+    """Child process entry point"""
+    logging.basicConfig(level=log_level)
+    try:
+        asyncio.run(
+            _run_ingestion(
+                shm_name,
+                symbols,
+                timeframes,
+                capacity,
+                ws_config,
+                book_depth,
+                heartbeat_interval,
+                stop_event,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+class MarketDataProcess:
+    """
+    Parent-side handle for the market data ingestion process
+    """
+
+    def __init__(
+        self,
+        symbols: list[str],
+        ws_config: Optional[KrakenWebSocketConfig] = None,
+        timeframes: tuple[int, ...] = DEFAULT_TIMEFRAMES,
+        candle_capacity: int = 500,
+        book_depth: int = 10,
+        heartbeat_interval: float = 0.5,
+        start_method: str = "spawn",
+    ):
+        """
+        Initialize ingestion process handle
+
+        Args:
+            symbols: Trading pairs streamed by the child (fixed for its lifetime)
+            ws_config: WebSocket configuration for the child client
+            timeframes: Candle timeframes published (seconds or '1m'-style)
+            candle_capacity: Candles retained per (symbol, timeframe)
+            book_depth: Order book depth subscribed in the child
+            heartbeat_interval: Seconds between child heartbeats
+            start_method: multiprocessing start method ('spawn' avoids
+                inheriting the parent's event loop and sockets)
+        """
+        self.symbols = list(symbols)
+        self.timeframes = tuple(parse_timeframe(timeframe) for timeframe in timeframes)
+        self.candle_capacity = candle_capacity
+        self.book_depth = book_depth
+        self.heartbeat_interval = heartbeat_interval
+
+        # The child builds candles for exactly the published timeframes
+        self.ws_config = dataclasses.replace(
+            ws_config or KrakenWebSocketConfig(),
+            enable_candle_aggregation=True,
+            candle_timeframes=self.timeframes,
+            candle_history_size=candle_capacity,
+        )
+
+        self._context = multiprocessing.get_context(start_method)
+        self._stop_event = self._context.Event()
+        self.process: Optional[multiprocessing.process.BaseProcess] = None
+        self.market_data: Optional[SharedMarketData] = None
+        self.restarts = 0
+        self.started_at: float = 0
+
+    def start(self) -> SharedMarketData:
+        """Create the shared block and launch the child; returns the reader"""
+        if self.market_data is None:
+            self.market_data = SharedMarketData.create(
+                self.symbols, self.timeframes, self.candle_capacity
+            )
+
+        self._stop_event.clear()
+        self.process = self._context.Process(
+            target=_ingestion_main,
+            args=(
+                self.market_data.name,
+                self.symbols,
+                self.timeframes,
+                self.candle_capacity,
+                self.ws_config,
+                self.book_depth,
+                self.heartbeat_interval,
+                self._stop_event,
+                logging.getLogger().level,
+            ),
+            name="kraken-market-data",
+            daemon=True,
+        )
+        self.process.start()
+        self.started_at = time.time()
+
+        logger.info(
+            f"[MARKET_DATA_PROCESS] Started ingestion process pid={self.process.pid} "
+            f"for {len(self.symbols)} symbols"
+        )
+        return self.market_data
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the child and release the shared block"""
+        if self.process is not None:
+            self._stop_event.set()
+            self.process.join(timeout)
+            if self.process.is_alive():
+                logger.warning("[MARKET_DATA_PROCESS] Ingestion process did not exit, terminating")
+                self.process.terminate()
+                self.process.join(timeout)
+            self.process = None
+
+        if self.market_data is not None:
+            self.market_data.close()
+            self.market_data = None
+
+        logger.info("[MARKET_DATA_PROCESS] Ingestion process stopped")
+
+    @property
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def is_healthy(self, max_heartbeat_age: float = 5.0) -> bool:
+        """Child alive and heartbeating"""
+        return (
+            self.is_alive
+            and self.market_data is not None
+            and self.market_data.heartbeat_age <= max_heartbeat_age
+        )
+
+    def ensure_running(self) -> bool:
+        """Restart the child if it exited; the shared block and its data are kept"""
+        if self.is_alive or self.market_data is None:
+            return self.is_alive
+
+        exitcode = self.process.exitcode if self.process else None
+        logger.warning(f"[MARKET_DATA_PROCESS] Ingestion process exited ({exitcode}), restarting")
+        self.restarts += 1
+        self.start()
+        return True
+
+    def get_status(self) -> dict[str, Any]:
+        """Process and shared memory status"""
+        return {
+            "alive": self.is_alive,
+            "pid": self.process.pid if self.process else None,
+            "restarts": self.restarts,
+            "uptime": time.time() - self.started_at if self.started_at else 0,
+            "shared_memory": self.market_data.get_status() if self.market_data else None,
+        }
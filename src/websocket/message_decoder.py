@@ -0,0 +1,106 @@
+"""
+WebSocket Message Decoders
+==========================
+
+Pluggable JSON decoding for WebSocket frames.
+
+Uses the fastest available backend (orjson, then msgspec) and falls back to
+the standard library ``json`` module when neither is installed.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class MessageDecoder:
+    """JSON backend used to decode and encode WebSocket frames"""
+
+    name: str
+    decode: Callable[[Union[str, bytes]], Any]
+    encode: Callable[[Any], str]
+    errors: tuple[type[Exception], ...]
+
+
+def _stdlib_decoder() -> MessageDecoder:
+    return MessageDecoder(
+        name="json",
+        decode=json.loads,
+        encode=json.dumps,
+        errors=(json.JSONDecodeError,),
+    )
+
+
+def _orjson_decoder() -> MessageDecoder:
+    return MessageDecoder(
+        name="orjson",
+        decode=orjson.loads,
+        encode=lambda obj: orjson.dumps(obj).decode(),
+        errors=(orjson.JSONDecodeError,),
+    )
+
+
+def _msgspec_decoder() -> MessageDecoder:
+    json_decoder = msgspec.json.Decoder()
+    json_encoder = msgspec.json.Encoder()
+    return MessageDecoder(
+        name="msgspec",
+        decode=json_decoder.decode,
+        encode=lambda obj: json_encoder.encode(obj).decode(),
+        errors=(msgspec.DecodeError,),
+    )
+
+
+_BACKENDS: dict[str, tuple[bool, Callable[[], MessageDecoder]]] = {
+    "orjson": (ORJSON_AVAILABLE, _orjson_decoder),
+    "msgspec": (MSGSPEC_AVAILABLE, _msgspec_decoder),
+    "json": (True, _stdlib_decoder),
+}
+
+
+def get_decoder(name: str = "auto") -> MessageDecoder:
+    """
+    Get a message decoder by backend name
+
+    Args:
+        name: 'auto', 'orjson', 'msgspec' or 'json'. 'auto' picks the fastest
+            installed backend; unavailable backends fall back to stdlib json.
+
+    Returns:
+        MessageDecoder: Selected decoder
+    """
+    if name == "auto":
+        for backend in ("orjson", "msgspec"):
+            available, factory = _BACKENDS[backend]
+            if available:
+                return factory()
+        return _stdlib_decoder()
+
+    if name not in _BACKENDS:
+        logger.warning(f"[MESSAGE_DECODER] Unknown decoder '{name}', using json")
+        return _stdlib_decoder()
+
+    available, factory = _BACKENDS[name]
+    if not available:
+        logger.warning(f"[MESSAGE_DECODER] Decoder '{name}' not installed, using json")
+        return _stdlib_decoder()
+
+    return factory()
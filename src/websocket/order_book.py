@@ -0,0 +1,287 @@
+"""
+Incremental Order Book Engine
+=============================
+
+Per-symbol order book maintained in place from Kraken WebSocket V2 ``book``
+snapshots and deltas.
+
+Each side keeps its price levels in compact ``array('d')`` columns sorted so
+that the best level sits at the end of the array. This gives:
+- O(1) top-of-book access
+- O(log n) level lookup via ``bisect`` (inserts/removes near the top of the
+  book only move the few levels above them)
+- No per-message allocation of level objects
+
+When the instrument precision is known, each level also carries its
+pre-formatted checksum fragment so Kraken's CRC32 over the top 10 levels
+can be verified on every message for the cost of one join and one crc32.
+"""
+
+import time
+import zlib
+from array import array
+from bisect import bisect_left
+from decimal import Decimal
+from typing import Any, Optional, Union
+
+from .data_models import OrderBookLevel, OrderBookUpdate
+
+Level = tuple[float, float]
+
+# Kraken computes the book checksum over the top 10 levels of each side
+CHECKSUM_DEPTH = 10
+
+
+def _checksum_format(value: float, fmt: str) -> str:
+    """Format a value the way Kraken's checksum expects (no '.', no leading zeros)"""
+    return (fmt % value).replace(".", "").lstrip("0")
+
+
+def _parse_level(raw_level: Union[list, tuple, dict]) -> Level:
+    """Extract (price, qty) from a raw level in array or dict format"""
+    if isinstance(raw_level, dict):
+        return (
+            float(raw_level.get("price", 0)),
+            float(raw_level.get("qty", raw_level.get("volume", 0))),
+        )
+    return float(raw_level[0]), float(raw_level[1])
+
+
+class BookSide:
+    """
+    One side of an order book stored as sorted numeric arrays.
+
+    Keys are sorted ascending with the best level last. Bids use the price as
+    key, asks use the negated price so both sides share the same logic.
+    """
+
+    __slots__ = ("is_bid", "_keys", "_qtys", "_fragments", "_price_fmt", "_qty_fmt")
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self._keys = array("d")
+        self._qtys = array("d")
+
+        # Checksum fragments, kept parallel to the arrays once precision is known
+        self._fragments: Optional[list[str]] = None
+        self._price_fmt = ""
+        self._qty_fmt = ""
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self):
+        """Remove all levels"""
+        del self._keys[:]
+        del self._qtys[:]
+        if self._fragments is not None:
+            self._fragments.clear()
+
+    def set_precision(self, price_precision: int, qty_precision: int):
+        """Enable checksum fragments using the instrument's decimal precision"""
+        self._price_fmt = f"%.{price_precision}f"
+        self._qty_fmt = f"%.{qty_precision}f"
+        sign = 1.0 if self.is_bid else -1.0
+        self._fragments = [
+            self._fragment(sign * key, qty) for key, qty in zip(self._keys, self._qtys)
+        ]
+
+    def _fragment(self, price: float, qty: float) -> str:
+        return _checksum_format(price, self._price_fmt) + _checksum_format(qty, self._qty_fmt)
+
+    def update(self, price: float, qty: float):
+        """Insert, replace or remove (qty == 0) a single price level"""
+        key = price if self.is_bid else -price
+        keys = self._keys
+        fragments = self._fragments
+        index = bisect_left(keys, key)
+
+        if index < len(keys) and keys[index] == key:
+            if qty > 0:
+                self._qtys[index] = qty
+                if fragments is not None:
+                    fragments[index] = self._fragment(price, qty)
+            else:
+                del keys[index]
+                del self._qtys[index]
+                if fragments is not None:
+                    del fragments[index]
+        elif qty > 0:
+            keys.insert(index, key)
+            self._qtys.insert(index, qty)
+            if fragments is not None:
+                fragments.insert(index, self._fragment(price, qty))
+
+    def truncate(self, depth: int):
+        """Drop the worst levels beyond ``depth``"""
+        excess = len(self._keys) - depth
+        if excess > 0:
+            del self._keys[:excess]
+            del self._qtys[:excess]
+            if self._fragments is not None:
+                del self._fragments[:excess]
+
+    def checksum_string(self, count: int = CHECKSUM_DEPTH) -> str:
+        """Concatenated checksum fragments of the best ``count`` levels, best first"""
+        if self._fragments is None:
+            return ""
+        return "".join(self._fragments[: -count - 1 : -1])
+
+    def best(self) -> Optional[Level]:
+        """Best level as (price, qty), or None if the side is empty"""
+        if not self._keys:
+            return None
+        key = self._keys[-1]
+        return (key if self.is_bid else -key), self._qtys[-1]
+
+    def levels(self, depth: Optional[int] = None) -> list[Level]:
+        """Levels ordered best first as (price, qty) tuples"""
+        count = len(self._keys)
+        if depth is not None and depth < count:
+            count = depth
+
+        keys = self._keys
+        qtys = self._qtys
+        last = len(keys) - 1
+        sign = 1.0 if self.is_bid else -1.0
+        return [(sign * keys[last - i], qtys[last - i]) for i in range(count)]
+
+
+class OrderBook:
+    """
+    Incremental order book for a single symbol
+    """
+
+    __slots__ = (
+        "symbol",
+        "depth",
+        "bids",
+        "asks",
+        "timestamp",
+        "update_count",
+        "checksum",
+        "checksum_enabled",
+        "needs_resync",
+    )
+
+    def __init__(self, symbol: str, depth: int = 10):
+        """
+        Initialize order book
+
+        Args:
+            symbol: Trading pair (e.g., 'BTC/USDT')
+            depth: Subscribed depth; levels beyond it are discarded after each update
+        """
+        self.symbol = symbol
+        self.depth = depth
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.timestamp: float = 0
+        self.update_count: int = 0
+        self.checksum: Optional[int] = None
+
+        # Checksum verification (enabled once instrument precision is set)
+        self.checksum_enabled = False
+        self.needs_resync = False
+
+    def set_precision(self, price_precision: int, qty_precision: int):
+        """Set instrument precision, enabling checksum verification"""
+        self.bids.set_precision(price_precision, qty_precision)
+        self.asks.set_precision(price_precision, qty_precision)
+        self.checksum_enabled = True
+
+    def apply_snapshot(self, raw_data: dict[str, Any]):
+        """Replace book contents with a snapshot"""
+        self.bids.clear()
+        self.asks.clear()
+        self.needs_resync = False
+        self.apply_update(raw_data)
+
+    def apply_update(self, raw_data: dict[str, Any]):
+        """Apply a delta (levels with qty 0 are removed)"""
+        bids = self.bids
+        for raw_level in raw_data.get("bids", ()):
+            price, qty = _parse_level(raw_level)
+            bids.update(price, qty)
+
+        asks = self.asks
+        for raw_level in raw_data.get("asks", ()):
+            price, qty = _parse_level(raw_level)
+            asks.update(price, qty)
+
+        bids.truncate(self.depth)
+        asks.truncate(self.depth)
+
+        # Checksums describe the book after this message only
+        self.checksum = raw_data.get("checksum")
+        self.timestamp = time.time()
+        self.update_count += 1
+
+    def compute_checksum(self) -> int:
+        """Kraken CRC32 over the top 10 asks (ascending) then top 10 bids (descending)"""
+        payload = self.asks.checksum_string() + self.bids.checksum_string()
+        return zlib.crc32(payload.encode("ascii"))
+
+    def verify_checksum(self) -> bool:
+        """
+        Verify the local book against the checksum of the last message
+
+        Returns True when verification is disabled or no checksum was received.
+        """
+        if not self.checksum_enabled or self.checksum is None:
+            return True
+        return self.compute_checksum() == int(self.checksum)
+
+    @property
+    def best_bid(self) -> Optional[Level]:
+        """Best bid as (price, qty)"""
+        return self.bids.best()
+
+    @property
+    def best_ask(self) -> Optional[Level]:
+        """Best ask as (price, qty)"""
+        return self.asks.best()
+
+    @property
+    def spread(self) -> float:
+        """Bid-ask spread"""
+        best_bid = self.bids.best()
+        best_ask = self.asks.best()
+        if best_bid and best_ask:
+            return best_ask[0] - best_bid[0]
+        return 0.0
+
+    @property
+    def mid_price(self) -> float:
+        """Mid price between best bid and ask"""
+        best_bid = self.bids.best()
+        best_ask = self.asks.best()
+        if best_bid and best_ask:
+            return (best_bid[0] + best_ask[0]) / 2
+        return 0.0
+
+    def to_dict(self, depth: Optional[int] = None) -> dict[str, Any]:
+        """Convert to dictionary format compatible with OrderBookUpdate.to_dict"""
+        return {
+            "bids": [{"price": p, "volume": q} for p, q in self.bids.levels(depth)],
+            "asks": [{"price": p, "volume": q} for p, q in self.asks.levels(depth)],
+            "spread": self.spread,
+            "mid_price": self.mid_price,
+            "timestamp": self.timestamp,
+        }
+
+    def to_update(self, depth: Optional[int] = None) -> OrderBookUpdate:
+        """Materialise an OrderBookUpdate for callbacks expecting the dataclass format"""
+        return OrderBookUpdate(
+            symbol=self.symbol,
+            bids=[
+                OrderBookLevel(Decimal(str(p)), Decimal(str(q)), self.timestamp)
+                for p, q in self.bids.levels(depth)
+            ],
+            asks=[
+                OrderBookLevel(Decimal(str(p)), Decimal(str(q)), self.timestamp)
+                for p, q in self.asks.levels(depth)
+            ],
+            timestamp=self.timestamp,
+            checksum=self.checksum,
+        )
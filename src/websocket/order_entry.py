@@ -0,0 +1,390 @@
+"""
+WebSocket Order Entry
+=====================
+
+Places, amends and cancels orders over the authenticated Kraken WebSocket V2
+connection, falling back to the REST client whenever the socket cannot take
+the request.
+
+A socket order skips the HTTP round-trip, nonce and request signature; it is
+authenticated with the session token KrakenWebSocketV2 already keeps fresh.
+Every request carries an integer req_id and waits on a future resolved by the
+matching response frame.
+
+Fallback rules keep an order from being placed twice:
+- Not sent (socket down, not authenticated, send failed): retried over REST.
+- Sent but unacknowledged (socket lost, ack timeout): raised as
+  OrderEntryError with ``state_unknown=True``; pass ``cl_ord_id`` in params
+  to reconcile.
+
+Acknowledgement latency is tracked per path (websocket/rest).
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Optional
+
+from src.core.strategy_scheduler import LatencyHistogram
+from src.rate_limiting.request_queue import RequestPriority
+
+logger = logging.getLogger(__name__)
+
+# Kraken WS V2 add_order fields passed through from ccxt-style params
+WS_ORDER_FIELDS = (
+    "cl_ord_id",
+    "order_userref",
+    "time_in_force",
+    "post_only",
+    "reduce_only",
+    "margin",
+    "stp_type",
+    "validate",
+)
+
+
+class OrderEntryError(Exception):
+    """Order request rejected, or sent without an acknowledgement"""
+
+    def __init__(self, message: str, state_unknown: bool = False):
+        super().__init__(message)
+        self.state_unknown = state_unknown
+
+
+class _NotSent(Exception):
+    """The request never reached the socket; REST can safely take it"""
+
+
+class WebSocketOrderEntry:
+    """
+    Order entry over the private WebSocket with automatic REST fallback.
+
+    create_order/cancel_order follow the ccxt signatures of the REST client,
+    so the entry can stand in for it on the order path.
+    """
+
+    def __init__(
+        self,
+        websocket,
+        rest_exchange: Any,
+        rate_limiter=None,
+        ack_timeout: float = 5.0,
+    ):
+        """
+        Initialize order entry.
+
+        Args:
+            websocket: KrakenWebSocketV2 holding the authenticated connection
+            rest_exchange: REST client used when the socket is unavailable
+            rate_limiter: KrakenRateLimiter2025 (WS-* endpoints for socket
+                orders, REST endpoints for fallbacks)
+            ack_timeout: Seconds to wait for an acknowledgement
+        """
+        self.websocket = websocket
+        self.rest = rest_exchange
+        self.rate_limiter = rate_limiter
+        self.ack_timeout = ack_timeout
+
+        self._req_ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+
+        # Request sent -> exchange acknowledgement, per path
+        self.ack_latency = {"websocket": LatencyHistogram(), "rest": LatencyHistogram()}
+        self.stats = {
+            "websocket_requests": 0,
+            "rest_requests": 0,
+            "fallbacks": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "lost": 0,
+        }
+
+        websocket.register_callback("order_response", self._handle_response)
+        websocket.register_callback("private_disconnected", self._handle_connection_lost)
+
+    @property
+    def available(self) -> bool:
+        """True if the private socket can take an order now."""
+        connection = self.websocket.private_connection
+        return (
+            connection is not None
+            and connection.is_authenticated
+            and bool(self.websocket.auth_token)
+        )
+
+    # Orders
+
+    async def create_order(
+        self,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """
+        Place an order.
+
+        Args:
+            symbol: Trading pair ('BTC/USDT')
+            type: Order type ('market', 'limit', ...)
+            side: 'buy' or 'sell'
+            amount: Base currency amount
+            price: Limit price
+            params: Extra order fields (cl_ord_id, post_only, ...)
+
+        Returns:
+            ccxt-style order dict (REST client's result on fallback)
+        """
+        params = params or {}
+        ws_params = {"order_type": type, "side": side, "order_qty": amount, "symbol": symbol}
+        if price is not None:
+            ws_params["limit_price"] = price
+        ws_params.update({key: params[key] for key in WS_ORDER_FIELDS if key in params})
+
+        result, via_websocket = await self._submit(
+            "add_order",
+            ws_params,
+            "WS-AddOrder",
+            "AddOrder",
+            self.rest.create_order,
+            (symbol, type, side, amount, price, params),
+        )
+        if not via_websocket:
+            return result
+
+        order_id = result.get("order_id")
+        if self.rate_limiter is not None and order_id:
+            self.rate_limiter.record_order_time(order_id)
+        return {
+            "id": order_id,
+            "clientOrderId": result.get("cl_ord_id"),
+            "symbol": symbol,
+            "type": type,
+            "side": side,
+            "amount": amount,
+            "price": price,
+            "status": "open",
+            "info": result,
+        }
+
+    async def cancel_order(
+        self, id: str, symbol: Optional[str] = None, params: Optional[dict[str, Any]] = None
+    ) -> dict[str, Any]:
+        """
+        Cancel an order.
+
+        Args:
+            id: Exchange order id
+            symbol: Trading pair (REST fallback)
+            params: Extra REST parameters
+
+        Returns:
+            ccxt-style order dict (REST client's result on fallback)
+        """
+        result, via_websocket = await self._submit(
+            "cancel_order",
+            {"order_id": [id]},
+            "WS-CancelOrder",
+            "CancelOrder",
+            self.rest.cancel_order,
+            (id, symbol, params or {}),
+            order_id=id,
+        )
+        if self.rate_limiter is not None:
+            self.rate_limiter.remove_order_time(id)
+        if not via_websocket:
+            return result
+        return {"id": id, "symbol": symbol, "status": "canceled", "info": result}
+
+    async def amend_order(
+        self,
+        id: str,
+        amount: Optional[float] = None,
+        price: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """
+        Amend quantity and/or limit price of an open order in place.
+
+        Falls back to the REST client's amend_order, if it has one.
+
+        Args:
+            id: Exchange order id
+            amount: New order quantity
+            price: New limit price
+
+        Returns:
+            Dict with the order id and the raw exchange result
+        """
+        ws_params: dict[str, Any] = {"order_id": id}
+        if amount is not None:
+            ws_params["order_qty"] = amount
+        if price is not None:
+            ws_params["limit_price"] = price
+
+        rest_amend = getattr(self.rest, "amend_order", None)
+        result, via_websocket = await self._submit(
+            "amend_order",
+            ws_params,
+            "WS-AmendOrder",
+            "AmendOrder",
+            rest_amend,
+            (id, amount, price),
+            order_id=id,
+        )
+        if not via_websocket:
+            return result
+        return {"id": id, "amount": amount, "price": price, "info": result}
+
+    # Transport
+
+    async def _submit(
+        self,
+        method: str,
+        ws_params: dict[str, Any],
+        ws_endpoint: str,
+        rest_endpoint: str,
+        rest_call,
+        rest_args: tuple,
+        order_id: Optional[str] = None,
+    ) -> tuple[Any, bool]:
+        """
+        Send over the socket, or over REST if the socket cannot take it.
+
+        Returns:
+            Tuple of (result, sent_via_websocket)
+        """
+        order_age = None
+        if order_id is not None and self.rate_limiter is not None:
+            order_age = self.rate_limiter.get_order_age(order_id)
+
+        if self.available:
+            try:
+                return await self._send(method, ws_params, ws_endpoint, order_age), True
+            except _NotSent:
+                pass
+        self.stats["fallbacks"] += 1
+
+        if rest_call is None:
+            raise OrderEntryError(f"{method} unavailable: socket down and no REST equivalent")
+
+        return await self._send_rest(rest_endpoint, rest_call, rest_args, order_age), False
+
+    async def _send(
+        self,
+        method: str,
+        params: dict[str, Any],
+        endpoint: str,
+        order_age: Optional[float],
+    ) -> dict[str, Any]:
+        await self._wait_for_rate_limit(endpoint, order_age)
+
+        connection = self.websocket.private_connection
+        req_id = next(self._req_ids)
+        message = {
+            "method": method,
+            "params": {**params, "token": self.websocket.auth_token},
+            "req_id": req_id,
+        }
+        future = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = future
+
+        sent_at = time.monotonic()
+        try:
+            if not self.available or not await connection.send_message(message, queue=False):
+                raise _NotSent()
+            self.stats["websocket_requests"] += 1
+
+            try:
+                result = await asyncio.wait_for(future, self.ack_timeout)
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                raise OrderEntryError(
+                    f"No {method} acknowledgement within {self.ack_timeout}s (req_id={req_id})",
+                    state_unknown=True,
+                ) from None
+            except OrderEntryError as e:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.record_response(endpoint, str(e))
+                raise
+        finally:
+            self._pending.pop(req_id, None)
+
+        latency = time.monotonic() - sent_at
+        self.ack_latency["websocket"].observe(latency)
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_response(endpoint, latency=latency)
+        return result
+
+    async def _send_rest(
+        self, endpoint: str, call, args: tuple, order_age: Optional[float]
+    ) -> dict[str, Any]:
+        await self._wait_for_rate_limit(endpoint, order_age)
+
+        self.stats["rest_requests"] += 1
+        sent_at = time.monotonic()
+        try:
+            result = await call(*args)
+        except Exception as e:
+            if self.rate_limiter is not None:
+                self.rate_limiter.record_response(endpoint, e)
+            raise
+
+        latency = time.monotonic() - sent_at
+        self.ack_latency["rest"].observe(latency)
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_response(endpoint, latency=latency)
+        return result
+
+    async def _wait_for_rate_limit(self, endpoint: str, order_age: Optional[float]):
+        if self.rate_limiter is None:
+            return
+
+        if not await self.rate_limiter.wait_for_rate_limit(
+            endpoint,
+            order_age_seconds=order_age,
+            priority=RequestPriority.CRITICAL,
+            timeout_seconds=self.ack_timeout,
+        ):
+            raise OrderEntryError(f"Rate limit timeout for {endpoint}")
+
+    # Responses
+
+    async def _handle_response(self, message: dict[str, Any]):
+        """Resolve the future waiting on a response frame's req_id."""
+        future = self._pending.get(message.get("req_id"))
+        if future is None or future.done():
+            return
+
+        if message.get("success"):
+            future.set_result(message.get("result") or {})
+        else:
+            self.stats["rejected"] += 1
+            future.set_exception(OrderEntryError(message.get("error") or "Unknown error"))
+
+    async def _handle_connection_lost(self):
+        """Fail requests still waiting for an acknowledgement."""
+        for req_id, future in list(self._pending.items()):
+            if not future.done():
+                self.stats["lost"] += 1
+                future.set_exception(
+                    OrderEntryError(
+                        f"Connection lost before acknowledgement (req_id={req_id})",
+                        state_unknown=True,
+                    )
+                )
+        if self._pending:
+            logger.warning(
+                f"[ORDER_ENTRY] Socket lost with {len(self._pending)} unacknowledged request(s)"
+            )
+
+    # Metrics
+
+    def get_stats(self) -> dict[str, Any]:
+        """Request counts and acknowledgement latency (seconds) per path."""
+        stats: dict[str, Any] = dict(self.stats)
+        stats["pending"] = len(self._pending)
+        stats["ack_latency"] = {path: hist.to_dict() for path, hist in self.ack_latency.items()}
+        return stats
@@ -0,0 +1,230 @@
+"""
+Columnar Ring Buffers
+=====================
+
+Fixed-capacity, per-symbol history storage for trades and OHLC candles.
+
+Each column is an ``array`` of twice the capacity and every row is written
+at both ``i`` and ``i + capacity``. The latest ``n`` rows are therefore always
+contiguous, so windows are returned as zero-copy ``memoryview`` slices and
+memory stays constant no matter how long the bot runs.
+
+Views are live: they reflect later writes to the same slots. Copy them
+(``view.tolist()`` or ``array(view)``) if a stable snapshot is needed.
+"""
+
+from array import array
+from typing import Any, Optional, Union
+
+# Trade side encoding for the numeric side column
+SIDE_CODES = {"buy": 1, "sell": -1}
+SIDE_NAMES = {1: "buy", -1: "sell", 0: "unknown"}
+
+
+class ColumnRingBuffer:
+    """
+    Fixed-capacity ring buffer of numeric columns with contiguous windows
+    """
+
+    __slots__ = ("capacity", "columns", "_data", "_head", "_count")
+
+    def __init__(self, capacity: int, columns: dict[str, str]):
+        """
+        Initialize ring buffer
+
+        Args:
+            capacity: Maximum number of rows retained
+            columns: Column name -> array typecode (e.g., {'price': 'd'})
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.columns = tuple(columns)
+        self._data = {
+            name: array(typecode, bytes(array(typecode).itemsize * 2 * capacity))
+            for name, typecode in columns.items()
+        }
+        self._head = 0  # Next write position in [0, capacity)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, *values: Union[int, float]):
+        """Append one row; values follow the column order"""
+        head = self._head
+        mirror = head + self.capacity
+        for name, value in zip(self.columns, values):
+            column = self._data[name]
+            column[head] = value
+            column[mirror] = value
+
+        self._head = head + 1 if head + 1 < self.capacity else 0
+        if self._count < self.capacity:
+            self._count += 1
+
+    def replace_last(self, *values: Union[int, float]):
+        """Overwrite the most recent row (e.g., an in-progress candle)"""
+        if not self._count:
+            self.append(*values)
+            return
+
+        last = self._head - 1 if self._head else self.capacity - 1
+        mirror = last + self.capacity
+        for name, value in zip(self.columns, values):
+            column = self._data[name]
+            column[last] = value
+            column[mirror] = value
+
+    def set(self, column: str, offset: int, value: Union[int, float]):
+        """Overwrite one value; ``offset`` indexes the full window (0 = oldest row)"""
+        if not 0 <= offset < self._count:
+            raise IndexError("ring buffer offset out of range")
+
+        position = self._head + self.capacity - self._count + offset
+        other = position - self.capacity if position >= self.capacity else position + self.capacity
+        data = self._data[column]
+        data[position] = value
+        data[other] = value
+
+    def last(self, column: str) -> Optional[Union[int, float]]:
+        """Most recent value of a column"""
+        if not self._count:
+            return None
+        return self._data[column][self._head + self.capacity - 1]
+
+    def window(self, column: str, limit: Optional[int] = None) -> memoryview:
+        """Zero-copy view of the latest ``limit`` values of a column, oldest first"""
+        count = self._count if limit is None else min(limit, self._count)
+        end = self._head + self.capacity
+        return memoryview(self._data[column])[end - count : end]
+
+    def windows(self, limit: Optional[int] = None) -> dict[str, memoryview]:
+        """Zero-copy views of every column"""
+        return {name: self.window(name, limit) for name in self.columns}
+
+    def clear(self):
+        """Drop all rows (storage is kept)"""
+        self._head = 0
+        self._count = 0
+
+
+class TradeBuffer(ColumnRingBuffer):
+    """Ring buffer of trades (timestamp, price, volume, side, trade_id)"""
+
+    __slots__ = ()
+
+    def __init__(self, capacity: int = 100):
+        super().__init__(
+            capacity,
+            {"timestamp": "d", "price": "d", "volume": "d", "side": "b", "trade_id": "q"},
+        )
+
+    def add(self, trade: Any):
+        """Append a TradeUpdate/CompactTrade"""
+        try:
+            trade_id = int(trade.trade_id)
+        except (TypeError, ValueError):
+            trade_id = -1
+
+        self.append(
+            trade.timestamp,
+            float(trade.price),
+            float(trade.volume),
+            SIDE_CODES.get(trade.side, 0),
+            trade_id,
+        )
+
+    def to_dicts(self, limit: Optional[int] = None) -> list[dict[str, Any]]:
+        """Latest trades in TradeUpdate.to_dict format, oldest first"""
+        views = self.windows(limit)
+        return [
+            {
+                "side": SIDE_NAMES.get(side, "unknown"),
+                "price": price,
+                "volume": volume,
+                "timestamp": timestamp,
+                "trade_id": trade_id if trade_id >= 0 else None,
+            }
+            for timestamp, price, volume, side, trade_id in zip(
+                views["timestamp"],
+                views["price"],
+                views["volume"],
+                views["side"],
+                views["trade_id"],
+            )
+        ]
+
+
+class OHLCBuffer(ColumnRingBuffer):
+    """Ring buffer of candles (timestamp, open, high, low, close, volume, interval)"""
+
+    __slots__ = ()
+
+    def __init__(self, capacity: int = 1000):
+        super().__init__(
+            capacity,
+            {
+                "timestamp": "d",
+                "open": "d",
+                "high": "d",
+                "low": "d",
+                "close": "d",
+                "volume": "d",
+                "interval": "i",
+            },
+        )
+
+    def add(self, candle: Any):
+        """
+        Append an OHLCUpdate/CompactOHLC
+
+        Updates falling in the same interval as the last stored candle replace
+        it, so repeated updates of an in-progress candle do not duplicate rows.
+        """
+        interval = int(candle.interval) or 1
+        row = (
+            candle.timestamp,
+            float(candle.open_price),
+            float(candle.high),
+            float(candle.low),
+            float(candle.close),
+            float(candle.volume),
+            interval,
+        )
+
+        last_timestamp = self.last("timestamp")
+        bucket_seconds = interval * 60
+        if (
+            last_timestamp is not None
+            and self.last("interval") == interval
+            and int(last_timestamp // bucket_seconds) == int(candle.timestamp // bucket_seconds)
+        ):
+            self.replace_last(*row)
+        else:
+            self.append(*row)
+
+    def to_dicts(self, limit: Optional[int] = None) -> list[dict[str, Any]]:
+        """Latest candles in OHLCUpdate.to_dict format, oldest first"""
+        views = self.windows(limit)
+        return [
+            {
+                "open": open_price,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume,
+                "interval": interval,
+                "timestamp": timestamp,
+            }
+            for timestamp, open_price, high, low, close, volume, interval in zip(
+                views["timestamp"],
+                views["open"],
+                views["high"],
+                views["low"],
+                views["close"],
+                views["volume"],
+                views["interval"],
+            )
+        ]
@@ -0,0 +1,661 @@
+"""
+WebSocket Session Recorder
+==========================
+
+Wire-level recording of received WebSocket V2 frames for later replay.
+
+``ConnectionManager`` hands every received frame to ``SessionRecorder.record``
+(a queue put); a background writer thread batches frames into per-channel
+blocks, compresses them and appends them to rotating ``.kwsr`` files.
+
+File layout (all integers little-endian)::
+
+    file    := b"KWSR\\x01" codec_len:u8 codec block*
+    block   := compressed_len:u32 raw_len:u32 first:f64 last:f64 records:u32
+               channel_len:u16 channel payload
+    payload := compress(symtab_len:u32 symtab_json record*)
+    record  := time:f64 connection:u8 symbol_index:u16 raw_len:u32 raw
+
+Each block holds one channel, and a JSON Lines sidecar index (``.kwsi``)
+lists every block's offset, channel, time range and symbols, so extracting an
+hour of one symbol only decompresses the blocks that can contain it. The index
+is rebuilt from the block headers when missing (e.g., after a crash).
+
+Compression uses zstandard, then lz4, falling back to the standard library
+``zlib`` module when neither is installed.
+"""
+
+import json
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+try:
+    import lz4.frame
+
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+
+MAGIC = b"KWSR\x01"
+RECORDING_SUFFIX = ".kwsr"
+INDEX_SUFFIX = ".kwsi"
+
+# Connection roles, stored as their position in this tuple
+CONNECTIONS = ("public", "private")
+NO_SYMBOL = 0xFFFF
+
+_BLOCK_HEADER = struct.Struct("<IIddIH")
+_RECORD_HEADER = struct.Struct("<dBHI")
+_SYMTAB_HEADER = struct.Struct("<I")
+
+
+@dataclass(frozen=True)
+class RecorderCodec:
+    """Block compression backend"""
+
+    name: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+def _zlib_codec() -> RecorderCodec:
+    return RecorderCodec(
+        name="zlib",
+        compress=lambda data: zlib.compress(data, 6),
+        decompress=zlib.decompress,
+    )
+
+
+def _zstd_codec() -> RecorderCodec:
+    compressor = zstandard.ZstdCompressor(level=3)
+    decompressor = zstandard.ZstdDecompressor()
+    return RecorderCodec(
+        name="zstd", compress=compressor.compress, decompress=decompressor.decompress
+    )
+
+
+def _lz4_codec() -> RecorderCodec:
+    return RecorderCodec(name="lz4", compress=lz4.frame.compress, decompress=lz4.frame.decompress)
+
+
+_CODECS: dict[str, tuple[bool, Callable[[], RecorderCodec]]] = {
+    "zstd": (ZSTANDARD_AVAILABLE, _zstd_codec),
+    "lz4": (LZ4_AVAILABLE, _lz4_codec),
+    "zlib": (True, _zlib_codec),
+}
+
+
+def get_codec(name: str = "auto") -> RecorderCodec:
+    """
+    Get a block codec by name
+
+    Args:
+        name: 'auto', 'zstd', 'lz4' or 'zlib'. 'auto' picks the best installed
+            backend; unavailable backends fall back to zlib.
+
+    Returns:
+        RecorderCodec: Selected codec
+    """
+    if name == "auto":
+        for backend in ("zstd", "lz4"):
+            available, factory = _CODECS[backend]
+            if available:
+                return factory()
+        return _zlib_codec()
+
+    if name not in _CODECS:
+        logger.warning(f"[SESSION_RECORDER] Unknown codec '{name}', using zlib")
+        return _zlib_codec()
+
+    available, factory = _CODECS[name]
+    if not available:
+        logger.warning(f"[SESSION_RECORDER] Codec '{name}' not installed, using zlib")
+        return _zlib_codec()
+
+    return factory()
+
+
+def _reader_codec(name: str) -> RecorderCodec:
+    """Codec named in a file header (reading needs the exact backend)"""
+    available, factory = _CODECS.get(name, (False, None))
+    if not available:
+        raise ValueError(f"Recording codec '{name}' is not installed")
+    return factory()
+
+
+def frame_symbol(message: Any) -> Optional[str]:
+    """Symbol of a decoded data frame (None for heartbeats, status and responses)"""
+    if not isinstance(message, dict):
+        return None
+    data = message.get("data")
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        return data[0].get("symbol")
+    return None
+
+
+@dataclass
+class RecorderConfig:
+    """Session recorder configuration"""
+
+    directory: str = "recordings"
+    prefix: str = "kraken-ws"
+    codec: str = "auto"  # 'auto', 'zstd', 'lz4' or 'zlib'
+    rotate_interval: float = 86400.0  # New file per UTC-aligned interval (seconds)
+    max_file_bytes: int = 1 << 30  # Also rotate when a file grows past this size
+    block_size: int = 256 * 1024  # Uncompressed bytes per channel block
+    flush_interval: float = 5.0  # Write partial blocks at least this often (seconds)
+    max_pending: int = 100000  # Frames queued for the writer before new ones are dropped
+
+
+@dataclass(frozen=True)
+class RecordedMessage:
+    """One recorded frame"""
+
+    time: float  # Receive timestamp (epoch seconds)
+    connection: str  # 'public' or 'private'
+    channel: Optional[str]  # None for method responses
+    symbol: Optional[str]
+    raw: str  # Frame text as received
+
+
+@dataclass(frozen=True)
+class BlockInfo:
+    """Index entry for one block"""
+
+    offset: int
+    channel: Optional[str]
+    first: float
+    last: float
+    records: int
+    symbols: tuple[str, ...]
+    unkeyed: bool  # Block also holds records without a symbol
+
+    def matches(
+        self,
+        start: Optional[float],
+        end: Optional[float],
+        channel: Optional[str],
+        symbol: Optional[str],
+    ) -> bool:
+        if start is not None and self.last < start:
+            return False
+        if end is not None and self.first >= end:
+            return False
+        if channel is not None and self.channel != channel:
+            return False
+        return symbol is None or self.unkeyed or symbol in self.symbols
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "offset": self.offset,
+            "channel": self.channel,
+            "first": self.first,
+            "last": self.last,
+            "records": self.records,
+            "symbols": list(self.symbols),
+            "unkeyed": self.unkeyed,
+        }
+
+    @classmethod
+    def from_dict(cls, entry: dict[str, Any]) -> "BlockInfo":
+        return cls(
+            offset=entry["offset"],
+            channel=entry["channel"],
+            first=entry["first"],
+            last=entry["last"],
+            records=entry["records"],
+            symbols=tuple(entry["symbols"]),
+            unkeyed=entry["unkeyed"],
+        )
+
+
+class _Block:
+    """Uncompressed records of one channel waiting to be written"""
+
+    __slots__ = ("buffer", "symbols", "first", "last", "records", "unkeyed")
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.symbols: dict[str, int] = {}
+        self.first = 0.0
+        self.last = 0.0
+        self.records = 0
+        self.unkeyed = False
+
+    def add(self, receive_time: float, connection: int, symbol: Optional[str], raw: bytes):
+        if symbol is None:
+            index = NO_SYMBOL
+            self.unkeyed = True
+        else:
+            index = self.symbols.get(symbol)
+            if index is None:
+                index = self.symbols[symbol] = len(self.symbols)
+        if not self.records:
+            self.first = self.last = receive_time
+        elif receive_time < self.first:
+            self.first = receive_time
+        elif receive_time > self.last:
+            self.last = receive_time
+        self.records += 1
+        self.buffer += _RECORD_HEADER.pack(receive_time, connection, index, len(raw))
+        self.buffer += raw
+
+
+_STOP = object()
+
+
+class SessionRecorder:
+    """Background writer for received WebSocket frames"""
+
+    def __init__(self, config: Optional[RecorderConfig] = None):
+        """
+        Initialize recorder
+
+        Args:
+            config: Recorder configuration
+        """
+        self.config = config or RecorderConfig()
+        self.codec = get_codec(self.config.codec)
+        self.directory = Path(self.config.directory)
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._max_pending = self.config.max_pending
+
+        # Writer thread state
+        self._blocks: dict[Optional[str], _Block] = {}
+        self._file = None
+        self._index = None
+        self._segment: Optional[int] = None
+        self._part = 0
+
+        # Counters
+        self.recorded = 0
+        self.dropped = 0
+        self.blocks_written = 0
+        self.bytes_written = 0
+        self.files: list[Path] = []
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the writer thread"""
+        if self.running:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._writer_loop, name="ws-session-recorder", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"[SESSION_RECORDER] Recording to {self.directory} ({self.codec.name} blocks)"
+        )
+
+    def record(
+        self,
+        raw: Union[str, bytes],
+        receive_time: float,
+        channel: Optional[str] = None,
+        symbol: Optional[str] = None,
+        connection: str = "public",
+    ):
+        """Queue one received frame (called on the event loop; never blocks)"""
+        if self._queue.qsize() >= self._max_pending:
+            self.dropped += 1
+            return
+        self._queue.put((receive_time, connection, channel, symbol, raw))
+
+    def stop(self, timeout: Optional[float] = 10.0):
+        """Write everything queued, close the files and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("[SESSION_RECORDER] Writer did not stop in time")
+        self._thread = None
+        logger.info(
+            f"[SESSION_RECORDER] Stopped: {self.recorded} frames in {self.blocks_written} blocks, "
+            f"{self.bytes_written} bytes, {self.dropped} dropped"
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "codec": self.codec.name,
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+            "pending": self._queue.qsize(),
+            "blocks_written": self.blocks_written,
+            "bytes_written": self.bytes_written,
+            "files": [str(path) for path in self.files],
+        }
+
+    # Writer thread
+
+    def _writer_loop(self):
+        get = self._queue.get
+        flush_interval = self.config.flush_interval
+        next_flush = time.monotonic() + flush_interval
+
+        try:
+            while True:
+                try:
+                    item = get(timeout=max(0.0, next_flush - time.monotonic()))
+                except queue.Empty:
+                    item = None
+
+                if item is _STOP:
+                    break
+                if item is not None:
+                    try:
+                        self._add(*item)
+                    except Exception as e:
+                        logger.error(f"[SESSION_RECORDER] Failed to record frame: {e}")
+
+                # Partial blocks are written periodically so a crash loses little
+                if time.monotonic() >= next_flush:
+                    self._write_blocks()
+                    next_flush = time.monotonic() + flush_interval
+        except Exception as e:
+            logger.error(f"[SESSION_RECORDER] Writer stopped: {e}")
+        finally:
+            try:
+                self._write_blocks()
+            finally:
+                self._close_file()
+
+    def _add(
+        self,
+        receive_time: float,
+        connection: str,
+        channel: Optional[str],
+        symbol: Optional[str],
+        raw: Union[str, bytes],
+    ):
+        segment = int(receive_time // self.config.rotate_interval)
+        if segment != self._segment:
+            self._write_blocks()
+            self._close_file()
+            self._segment = segment
+            self._part = 0
+
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        block = self._blocks.get(channel)
+        if block is None:
+            block = self._blocks[channel] = _Block()
+        block.add(receive_time, CONNECTIONS.index(connection), symbol, raw)
+        self.recorded += 1
+
+        if len(block.buffer) >= self.config.block_size:
+            del self._blocks[channel]
+            self._write_block(channel, block)
+
+    def _write_blocks(self):
+        """Compress and append every buffered block"""
+        blocks, self._blocks = self._blocks, {}
+        for channel, block in blocks.items():
+            self._write_block(channel, block)
+
+    def _write_block(self, channel: Optional[str], block: _Block):
+        if self._file is None:
+            self._open_file()
+
+        symbols = list(block.symbols)
+        symtab = json.dumps(symbols, separators=(",", ":")).encode()
+        payload = _SYMTAB_HEADER.pack(len(symtab)) + symtab + block.buffer
+        compressed = self.codec.compress(bytes(payload))
+        channel_bytes = (channel or "").encode()
+
+        offset = self._file.tell()
+        self._file.write(
+            _BLOCK_HEADER.pack(
+                len(compressed),
+                len(payload),
+                block.first,
+                block.last,
+                block.records,
+                len(channel_bytes),
+            )
+        )
+        self._file.write(channel_bytes)
+        self._file.write(compressed)
+        self._file.flush()
+
+        info = BlockInfo(
+            offset, channel, block.first, block.last, block.records, tuple(symbols), block.unkeyed
+        )
+        self._index.write(json.dumps(info.to_dict(), separators=(",", ":")) + "\n")
+        self._index.flush()
+
+        written = self._file.tell() - offset
+        self.blocks_written += 1
+        self.bytes_written += written
+        if self._file.tell() >= self.config.max_file_bytes:
+            self._close_file()
+            self._part += 1
+
+    def _open_file(self):
+        segment_start = (self._segment or 0) * self.config.rotate_interval
+        stamp = datetime.fromtimestamp(segment_start, timezone.utc).strftime("%Y%m%dT%H%M%S")
+        while True:
+            path = self.directory / f"{self.config.prefix}-{stamp}-{self._part:03d}"
+            path = path.with_suffix(RECORDING_SUFFIX)
+            if not path.exists():
+                break
+            # Never append to a file from an earlier session
+            self._part += 1
+
+        codec = self.codec.name.encode()
+        self._file = open(path, "wb")
+        self._file.write(MAGIC + bytes([len(codec)]) + codec)
+        self._index = open(path.with_suffix(INDEX_SUFFIX), "w", encoding="utf-8")
+        self.files.append(path)
+        logger.info(f"[SESSION_RECORDER] Opened {path}")
+
+    def _close_file(self):
+        for handle in (self._file, self._index):
+            if handle is not None:
+                try:
+                    handle.close()
+                except OSError as e:
+                    logger.warning(f"[SESSION_RECORDER] Error closing {handle.name}: {e}")
+        self._file = None
+        self._index = None
+
+
+class SessionReader:
+    """Random access to one ``.kwsr`` recording through its block index"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            header = handle.read(len(MAGIC) + 1)
+            if len(header) < len(MAGIC) + 1 or header[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{self.path} is not a session recording")
+            codec_name = handle.read(header[-1]).decode()
+            self._data_offset = handle.tell()
+        self.codec = _reader_codec(codec_name)
+        self.index = self._load_index()
+
+    def _load_index(self) -> list[BlockInfo]:
+        index_path = self.path.with_suffix(INDEX_SUFFIX)
+        if index_path.exists():
+            blocks = []
+            with open(index_path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        blocks.append(BlockInfo.from_dict(json.loads(line)))
+                    except (ValueError, KeyError):
+                        # Torn final line after a crash
+                        break
+            return blocks
+        return self.rebuild_index()
+
+    def rebuild_index(self) -> list[BlockInfo]:
+        """Scan block headers (reads every symbol table, but no records)"""
+        blocks = []
+        size = self.path.stat().st_size
+        with open(self.path, "rb") as handle:
+            offset = self._data_offset
+            while offset + _BLOCK_HEADER.size <= size:
+                handle.seek(offset)
+                header = _BLOCK_HEADER.unpack(handle.read(_BLOCK_HEADER.size))
+                compressed_len, _, first, last, records, channel_len = header
+                end = offset + _BLOCK_HEADER.size + channel_len + compressed_len
+                if end > size:
+                    break  # Truncated tail
+                channel = handle.read(channel_len).decode() or None
+                payload = self.codec.decompress(handle.read(compressed_len))
+                symbols, unkeyed = self._symbols(payload, records)
+                blocks.append(
+                    BlockInfo(offset, channel, first, last, records, tuple(symbols), unkeyed)
+                )
+                offset = end
+        return blocks
+
+    @staticmethod
+    def _symbols(payload: bytes, records: int) -> tuple[list[str], bool]:
+        (symtab_len,) = _SYMTAB_HEADER.unpack_from(payload)
+        symbols = json.loads(payload[_SYMTAB_HEADER.size : _SYMTAB_HEADER.size + symtab_len])
+        position = _SYMTAB_HEADER.size + symtab_len
+        for _ in range(records):
+            _, _, index, length = _RECORD_HEADER.unpack_from(payload, position)
+            if index == NO_SYMBOL:
+                return symbols, True
+            position += _RECORD_HEADER.size + length
+        return symbols, False
+
+    @property
+    def first(self) -> Optional[float]:
+        return min((block.first for block in self.index), default=None)
+
+    @property
+    def last(self) -> Optional[float]:
+        return max((block.last for block in self.index), default=None)
+
+    def blocks(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        channel: Optional[str] = None,
+        symbol: Optional[str] = None,
+    ) -> list[BlockInfo]:
+        """Index entries of blocks that may hold matching records"""
+        return [block for block in self.index if block.matches(start, end, channel, symbol)]
+
+    def read(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        channel: Optional[str] = None,
+        symbol: Optional[str] = None,
+    ) -> Iterator[RecordedMessage]:
+        """
+        Matching records, block by block (time-ordered within a channel)
+
+        Args:
+            start: Optional first receive time (seconds)
+            end: Optional end receive time (seconds, exclusive)
+            channel: Only this channel
+            symbol: Only records for this symbol, plus records without one
+                (heartbeats, status) so the stream stays replayable
+        """
+        with open(self.path, "rb") as handle:
+            for block in self.blocks(start, end, channel, symbol):
+                handle.seek(block.offset)
+                compressed_len, _, _, _, records, channel_len = _BLOCK_HEADER.unpack(
+                    handle.read(_BLOCK_HEADER.size)
+                )
+                handle.seek(channel_len, os.SEEK_CUR)
+                payload = self.codec.decompress(handle.read(compressed_len))
+                yield from self._records(payload, records, block.channel, start, end, symbol)
+
+    @staticmethod
+    def _records(
+        payload: bytes,
+        records: int,
+        channel: Optional[str],
+        start: Optional[float],
+        end: Optional[float],
+        symbol: Optional[str],
+    ) -> Iterator[RecordedMessage]:
+        (symtab_len,) = _SYMTAB_HEADER.unpack_from(payload)
+        symbols = json.loads(payload[_SYMTAB_HEADER.size : _SYMTAB_HEADER.size + symtab_len])
+        position = _SYMTAB_HEADER.size + symtab_len
+        unpack = _RECORD_HEADER.unpack_from
+        header_size = _RECORD_HEADER.size
+
+        for _ in range(records):
+            receive_time, connection, index, length = unpack(payload, position)
+            position += header_size
+            body_start, position = position, position + length
+
+            if start is not None and receive_time < start:
+                continue
+            if end is not None and receive_time >= end:
+                continue
+            record_symbol = None if index == NO_SYMBOL else symbols[index]
+            if symbol is not None and record_symbol is not None and record_symbol != symbol:
+                continue
+            yield RecordedMessage(
+                receive_time,
+                CONNECTIONS[connection],
+                channel,
+                record_symbol,
+                payload[body_start:position].decode("utf-8"),
+            )
+
+
+def recording_files(source: Union[str, Path]) -> list[Path]:
+    """``.kwsr`` files of a recording directory (or the single file given)"""
+    source = Path(source)
+    if source.is_dir():
+        return sorted(source.glob(f"*{RECORDING_SUFFIX}"))
+    return [source]
+
+
+def read_recordings(
+    source: Union[str, Path],
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    channel: Optional[str] = None,
+    symbol: Optional[str] = None,
+) -> list[RecordedMessage]:
+    """
+    Extract a time window from a recording file or directory
+
+    Files and blocks outside the window (or without the symbol) are skipped
+    without decompressing them.
+
+    Returns:
+        Matching records sorted by receive time (stable within a channel)
+    """
+    messages: list[RecordedMessage] = []
+    for path in recording_files(source):
+        reader = SessionReader(path)
+        messages.extend(reader.read(start, end, channel, symbol))
+    messages.sort(key=lambda message: message.time)
+    return messages
+
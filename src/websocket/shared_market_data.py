@@ -0,0 +1,462 @@
+"""
+Shared Memory Market Data
+=========================
+
+Top-of-book, ticker and candle state published by the ingestion process
+(see ``market_data_process``) into one ``multiprocessing.shared_memory``
+block, readable by the trading process without pickling or pipes.
+
+Layout (all float64, symbols and timeframes fixed when the block is created):
+- Header: layout version, writer pid, writer heartbeat, symbol/timeframe counts
+- One quote slot per symbol: sequence + bid/ask/last/volume/... fields
+- One candle ring per (symbol, timeframe): sequence, count, head, then
+  ``2 * capacity`` mirrored rows of (start, open, high, low, close, volume)
+  so the latest ``n`` rows are always one contiguous slice
+
+Every slot and ring is guarded by a seqlock: the single writer makes the
+sequence odd, writes, then makes it even again. Readers retry while the
+sequence is odd or changed during their read, so they never block the writer
+and never observe a torn row.
+
+The code issues no memory barriers. It relies on x86-64 keeping stores (and
+loads) in program order and not splitting aligned 8-byte stores. Weakly
+ordered CPUs such as arm64 may reorder the sequence and row stores, so
+``seqlock_supported()`` is False there and the block must not be used.
+"""
+
+import logging
+import os
+import platform
+import time
+from array import array
+from multiprocessing import shared_memory
+from typing import Any, Optional, Union
+
+from .candle_aggregator import DEFAULT_TIMEFRAMES, parse_timeframe
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_VERSION = 2.0
+
+# Header: version, writer pid, heartbeat, symbol count, timeframe count, capacity
+HEADER_SIZE = 8
+
+# Quote slot fields (index 0 is the seqlock sequence)
+QUOTE_FIELDS = (
+    "sequence",
+    "bid",
+    "bid_qty",
+    "ask",
+    "ask_qty",
+    "last",
+    "volume",
+    "vwap",
+    "high",
+    "low",
+    "ticker_time",
+    "book_time",
+    "open",
+)
+QUOTE_SIZE = len(QUOTE_FIELDS)
+
+# Candle ring header and row fields
+CANDLE_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+CANDLE_ROW_SIZE = len(CANDLE_FIELDS)
+_RING_HEADER = 3  # sequence, count, head
+
+MAX_READ_RETRIES = 1000
+
+# Architectures with the store/load ordering the barrier-free seqlock needs
+SEQLOCK_MACHINES = frozenset({"x86_64", "amd64"})
+
+
+def seqlock_supported() -> bool:
+    """True if this CPU orders memory strongly enough for the seqlock"""
+    return platform.machine().lower() in SEQLOCK_MACHINES
+
+
+def _ring_size(capacity: int) -> int:
+    return _RING_HEADER + 2 * capacity * CANDLE_ROW_SIZE
+
+
+class SharedMarketData:
+    """
+    Seqlock-protected market data in a shared memory block
+    """
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        symbols: list[str],
+        timeframes: tuple[int, ...],
+        capacity: int,
+        owner: bool,
+    ):
+        """Use ``create`` or ``attach`` instead of calling this directly"""
+        self.shm = shm
+        self.name = shm.name
+        self.symbols = list(symbols)
+        self.timeframes = tuple(timeframes)
+        self.capacity = capacity
+        self.owner = owner
+
+        self._data = shm.buf.cast("d")
+        self._symbol_index = {symbol: index for index, symbol in enumerate(self.symbols)}
+        self._timeframe_index = {timeframe: index for index, timeframe in enumerate(self.timeframes)}
+        self._quotes_offset = HEADER_SIZE
+        self._rings_offset = HEADER_SIZE + QUOTE_SIZE * len(self.symbols)
+        self._ring_size = _ring_size(capacity)
+
+        # Reader statistics
+        self.read_retries = 0
+        self.read_failures = 0
+
+    @staticmethod
+    def required_size(symbol_count: int, timeframe_count: int, capacity: int) -> int:
+        """Block size in bytes for a layout"""
+        doubles = (
+            HEADER_SIZE
+            + QUOTE_SIZE * symbol_count
+            + _ring_size(capacity) * symbol_count * timeframe_count
+        )
+        return doubles * 8
+
+    @classmethod
+    def create(
+        cls,
+        symbols: list[str],
+        timeframes: tuple[int, ...] = DEFAULT_TIMEFRAMES,
+        capacity: int = 500,
+        name: Optional[str] = None,
+    ) -> "SharedMarketData":
+        """Allocate a new zeroed block (the creator owns and unlinks it)"""
+        timeframes = tuple(parse_timeframe(timeframe) for timeframe in timeframes)
+        size = cls.required_size(len(symbols), len(timeframes), capacity)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:size] = bytes(size)
+
+        market_data = cls(shm, symbols, timeframes, capacity, owner=True)
+        header = market_data._data
+        header[0] = LAYOUT_VERSION
+        header[3] = len(symbols)
+        header[4] = len(timeframes)
+        header[5] = capacity
+
+        logger.info(
+            f"[SHARED_MARKET_DATA] Created {shm.name} ({size / 1024:.0f} KB, "
+            f"{len(symbols)} symbols, {len(timeframes)} timeframes)"
+        )
+        return market_data
+
+    @classmethod
+    def attach(
+        cls,
+        name: str,
+        symbols: list[str],
+        timeframes: tuple[int, ...] = DEFAULT_TIMEFRAMES,
+        capacity: int = 500,
+    ) -> "SharedMarketData":
+        """Attach to an existing block created with the same layout"""
+        timeframes = tuple(parse_timeframe(timeframe) for timeframe in timeframes)
+        shm = shared_memory.SharedMemory(name=name)
+        market_data = cls(shm, symbols, timeframes, capacity, owner=False)
+
+        header = market_data._data
+        if (
+            header[0] != LAYOUT_VERSION
+            or header[3] != len(symbols)
+            or header[4] != len(timeframes)
+            or header[5] != capacity
+        ):
+            market_data.close()
+            raise ValueError(f"Shared market data layout mismatch for {name}")
+        return market_data
+
+    def close(self):
+        """Release this process's mapping (and unlink the block if owned)"""
+        try:
+            self._data.release()
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except (BufferError, FileNotFoundError) as e:
+            logger.warning(f"[SHARED_MARKET_DATA] Error closing {self.name}: {e}")
+
+    # Writer side (single writer process)
+
+    def mark_writer(self):
+        """
+        Record the writer pid and a first heartbeat
+
+        A previous writer that died mid-update leaves odd sequences behind;
+        they are closed here so readers stop retrying those slots.
+        """
+        data = self._data
+        sequences = [self._quotes_offset + index * QUOTE_SIZE for index in range(len(self.symbols))]
+        sequences.extend(
+            self._rings_offset + ring * self._ring_size
+            for ring in range(len(self.symbols) * len(self.timeframes))
+        )
+        for offset in sequences:
+            if data[offset] % 2:
+                data[offset] += 1
+
+        data[1] = os.getpid()
+        data[2] = time.time()
+
+    def heartbeat(self):
+        """Refresh the writer heartbeat"""
+        self._data[2] = time.time()
+
+    def _begin(self, offset: int):
+        self._data[offset] += 1  # Odd: write in progress
+
+    def _end(self, offset: int):
+        self._data[offset] += 1  # Even: consistent
+
+    def write_ticker(
+        self,
+        symbol: str,
+        bid: float,
+        ask: float,
+        last: float,
+        volume: float,
+        vwap: float = 0.0,
+        high: float = 0.0,
+        low: float = 0.0,
+        open_price: float = 0.0,
+    ):
+        """Publish ticker fields for a symbol"""
+        index = self._symbol_index.get(symbol)
+        if index is None:
+            return
+
+        data = self._data
+        base = self._quotes_offset + index * QUOTE_SIZE
+        self._begin(base)
+        data[base + 1] = bid
+        data[base + 3] = ask
+        data[base + 5] = last
+        data[base + 6] = volume
+        data[base + 7] = vwap
+        data[base + 8] = high
+        data[base + 9] = low
+        data[base + 10] = time.time()
+        data[base + 12] = open_price
+        self._end(base)
+
+    def write_book_top(self, symbol: str, bid: float, bid_qty: float, ask: float, ask_qty: float):
+        """Publish top of book for a symbol"""
+        index = self._symbol_index.get(symbol)
+        if index is None:
+            return
+
+        data = self._data
+        base = self._quotes_offset + index * QUOTE_SIZE
+        self._begin(base)
+        data[base + 1] = bid
+        data[base + 2] = bid_qty
+        data[base + 3] = ask
+        data[base + 4] = ask_qty
+        data[base + 11] = time.time()
+        self._end(base)
+
+    def _ring_base(self, symbol: str, timeframe: int) -> Optional[int]:
+        symbol_index = self._symbol_index.get(symbol)
+        timeframe_index = self._timeframe_index.get(timeframe)
+        if symbol_index is None or timeframe_index is None:
+            return None
+        ring = symbol_index * len(self.timeframes) + timeframe_index
+        return self._rings_offset + ring * self._ring_size
+
+    def write_candle(
+        self,
+        symbol: str,
+        timeframe: int,
+        start: float,
+        open_price: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ):
+        """Publish a candle; a row with the same start as the last one replaces it"""
+        base = self._ring_base(symbol, timeframe)
+        if base is None:
+            return
+
+        data = self._data
+        capacity = self.capacity
+        count = int(data[base + 1])
+        head = int(data[base + 2])
+
+        self._begin(base)
+        last = head - 1 if head else capacity - 1
+        if count and data[base + _RING_HEADER + last * CANDLE_ROW_SIZE] == start:
+            row = last
+        else:
+            row = head
+            head = head + 1 if head + 1 < capacity else 0
+            if count < capacity:
+                count += 1
+
+        values = array("d", (start, open_price, high, low, close, volume))
+        first = base + _RING_HEADER + row * CANDLE_ROW_SIZE
+        mirror = first + capacity * CANDLE_ROW_SIZE
+        data[first : first + CANDLE_ROW_SIZE] = values
+        data[mirror : mirror + CANDLE_ROW_SIZE] = values
+        data[base + 1] = count
+        data[base + 2] = head
+        self._end(base)
+
+    # Reader side
+
+    @property
+    def writer_pid(self) -> int:
+        return int(self._data[1])
+
+    @property
+    def heartbeat_age(self) -> float:
+        """Seconds since the writer last reported in (inf before it started)"""
+        heartbeat = self._data[2]
+        return time.time() - heartbeat if heartbeat else float("inf")
+
+    def _read_slot(self, base: int, start: int, end: int) -> Optional[list[float]]:
+        """Copy ``data[start:end]`` consistently with the seqlock at ``base``"""
+        data = self._data
+        for attempt in range(MAX_READ_RETRIES):
+            sequence = data[base]
+            if sequence % 2 == 0:
+                values = data[start:end].tolist()
+                if data[base] == sequence:
+                    if attempt:
+                        self.read_retries += attempt
+                    return values
+        self.read_failures += 1
+        return None
+
+    def read_quote(self, symbol: str) -> Optional[dict[str, float]]:
+        """Latest quote fields for a symbol, or None if nothing was published yet"""
+        index = self._symbol_index.get(symbol)
+        if index is None:
+            return None
+
+        base = self._quotes_offset + index * QUOTE_SIZE
+        values = self._read_slot(base, base, base + QUOTE_SIZE)
+        if not values or not values[0]:
+            return None
+        return dict(zip(QUOTE_FIELDS, values))
+
+    def get_best_bid_ask(self, symbol: str) -> Optional[tuple[float, float]]:
+        """(best_bid, best_ask) for a symbol"""
+        quote = self.read_quote(symbol)
+        if quote and quote["bid"] > 0 and quote["ask"] > 0:
+            return quote["bid"], quote["ask"]
+        return None
+
+    def get_ticker(self, symbol: str) -> Optional[dict[str, Any]]:
+        """Ticker in KrakenWebSocketV2.get_ticker format"""
+        quote = self.read_quote(symbol)
+        if not quote or not quote["ticker_time"]:
+            return None
+
+        bid, ask = quote["bid"], quote["ask"]
+        spread = ask - bid if bid > 0 and ask > 0 else 0.0
+        return {
+            "bid": bid,
+            "ask": ask,
+            "last": quote["last"],
+            "volume": quote["volume"],
+            "high": quote["high"],
+            "low": quote["low"],
+            "vwap": quote["vwap"],
+            "open": quote["open"],
+            "spread": spread,
+            "spread_pct": spread / bid * 100 if bid > 0 and spread > 0 else 0.0,
+            "mid_price": (bid + ask) / 2 if bid > 0 and ask > 0 else 0.0,
+            "timestamp": max(quote["ticker_time"], quote["book_time"]),
+        }
+
+    def candles_view(
+        self, symbol: str, timeframe: Union[str, int], limit: Optional[int] = None
+    ) -> tuple[int, Optional[memoryview]]:
+        """
+        Zero-copy (sequence, rows) view of the latest candles, oldest first
+
+        ``rows`` is a 2-D memoryview shaped (n, 6), or None when empty. The writer may overwrite it
+        at any time; call ``candles_valid(symbol, timeframe, sequence)`` after
+        using it and discard the result if that returns False.
+        """
+        base = self._ring_base(symbol, parse_timeframe(timeframe))
+        if base is None:
+            return 0, None
+
+        data = self._data
+        sequence = int(data[base])
+        count = int(data[base + 1])
+        if limit is not None:
+            count = min(count, limit)
+        if not count:
+            return sequence, None
+        end = base + _RING_HEADER + (int(data[base + 2]) + self.capacity) * CANDLE_ROW_SIZE
+        rows = data[end - count * CANDLE_ROW_SIZE : end]
+        return sequence, rows.cast("B").cast("d", [count, CANDLE_ROW_SIZE])
+
+    def candles_valid(self, symbol: str, timeframe: Union[str, int], sequence: int) -> bool:
+        """True if the ring has not been written since ``sequence`` was read"""
+        base = self._ring_base(symbol, parse_timeframe(timeframe))
+        return base is not None and sequence % 2 == 0 and int(self._data[base]) == sequence
+
+    def candle_count(
+        self, symbol: str, timeframe: Union[str, int], include_open: bool = False
+    ) -> int:
+        """Number of stored candles (CandleAggregator-compatible)"""
+        base = self._ring_base(symbol, parse_timeframe(timeframe))
+        if base is None:
+            return 0
+        count = int(self._data[base + 1])
+        return count if include_open or not count else count - 1
+
+    def get_ohlcv(
+        self,
+        symbol: str,
+        timeframe: Union[str, int],
+        limit: Optional[int] = None,
+        include_open: bool = True,
+    ) -> list[list[float]]:
+        """Candles in ccxt ``fetch_ohlcv`` format (CandleAggregator-compatible)"""
+        base = self._ring_base(symbol, parse_timeframe(timeframe))
+        if base is None:
+            return []
+
+        data = self._data
+        for _ in range(MAX_READ_RETRIES):
+            sequence, rows = self.candles_view(symbol, timeframe)
+            if sequence % 2:
+                continue
+            values = rows.tolist() if rows is not None else []
+            if int(data[base]) == sequence:
+                break
+        else:
+            self.read_failures += 1
+            return []
+
+        if not include_open:
+            values = values[:-1]
+        if limit is not None:
+            values = values[-limit:] if limit else []
+        return [[row[0] * 1000, row[1], row[2], row[3], row[4], row[5]] for row in values]
+
+    def get_status(self) -> dict[str, Any]:
+        """Block and reader statistics"""
+        return {
+            "name": self.name,
+            "size": self.shm.size,
+            "symbols": len(self.symbols),
+            "timeframes": list(self.timeframes),
+            "capacity": self.capacity,
+            "writer_pid": self.writer_pid,
+            "heartbeat_age": self.heartbeat_age,
+            "read_retries": self.read_retries,
+            "read_failures": self.read_failures,
+        }
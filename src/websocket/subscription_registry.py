@@ -0,0 +1,139 @@
+"""
+Subscription Registry
+=====================
+
+Records the subscriptions a client wants, independent of whether the socket
+was up when they were requested, so they can be restored after a reconnect.
+
+Subscriptions are grouped by channel and their non-symbol parameters
+(e.g., book depth, OHLC interval). Each group is replayed as a single request
+carrying every symbol, instead of one request per original call.
+"""
+
+from typing import Any, Callable, Optional
+
+from .data_models import SubscriptionRequest
+
+# Parameters that identify a request rather than the data stream it selects
+_TRANSIENT_PARAMS = ("symbol", "req_id", "token")
+
+
+class SubscriptionRegistry:
+    """
+    Desired subscriptions, grouped for batched replay
+    """
+
+    def __init__(self):
+        # (channel, frozen params) -> {"channel", "params", "symbols"}
+        # "symbols" is an insertion-ordered dict used as a set, or None for
+        # channels that take no symbols (balances, instrument, ...)
+        self._entries: dict[tuple, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(channel: str, params: dict[str, Any]) -> tuple:
+        return (
+            channel,
+            tuple(sorted((name, repr(value)) for name, value in params.items())),
+        )
+
+    def record(self, request: SubscriptionRequest):
+        """Apply a subscribe/unsubscribe request to the desired state"""
+        channel = request.params.get("channel")
+        if not channel:
+            return
+
+        symbols = request.params.get("symbol")
+
+        if request.method == "unsubscribe":
+            self._remove(channel, symbols)
+            return
+
+        if request.method != "subscribe":
+            return
+
+        params = {
+            name: value
+            for name, value in request.params.items()
+            if name not in _TRANSIENT_PARAMS
+        }
+        key = self._key(channel, params)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = {"channel": channel, "params": params, "symbols": None}
+            self._entries[key] = entry
+
+        if symbols:
+            # A symbol belongs to one group per channel (e.g., a new depth
+            # replaces the old one)
+            self._remove(channel, symbols, keep=key)
+            if entry["symbols"] is None:
+                entry["symbols"] = {}
+            for symbol in symbols:
+                entry["symbols"][symbol] = True
+
+    def _remove(self, channel: str, symbols: Optional[list[str]], keep: Optional[tuple] = None):
+        """Drop symbols (or the whole channel) from every group of a channel"""
+        for key, entry in list(self._entries.items()):
+            if entry["channel"] != channel or key == keep:
+                continue
+
+            if not symbols:
+                del self._entries[key]
+                continue
+
+            if entry["symbols"] is None:
+                continue
+            for symbol in symbols:
+                entry["symbols"].pop(symbol, None)
+            if not entry["symbols"]:
+                del self._entries[key]
+
+    def requests(
+        self,
+        include_channel: Optional[Callable[[str], bool]] = None,
+        include_symbol: Optional[Callable[[str], bool]] = None,
+    ) -> list[SubscriptionRequest]:
+        """
+        Build one subscribe request per group
+
+        Args:
+            include_channel: Optional channel filter (e.g., private channels only)
+            include_symbol: Optional symbol filter (e.g., symbols owned by one shard)
+        """
+        requests = []
+        for entry in self._entries.values():
+            channel = entry["channel"]
+            if include_channel and not include_channel(channel):
+                continue
+
+            params = {"channel": channel, **entry["params"]}
+            if entry["symbols"] is not None:
+                symbols = [
+                    symbol
+                    for symbol in entry["symbols"]
+                    if include_symbol is None or include_symbol(symbol)
+                ]
+                if not symbols:
+                    continue
+                params["symbol"] = symbols
+
+            requests.append(SubscriptionRequest(method="subscribe", params=params))
+        return requests
+
+    def clear(self):
+        """Forget all subscriptions"""
+        self._entries.clear()
+
+    def get_status(self) -> list[dict[str, Any]]:
+        """Registered groups with their symbol counts"""
+        return [
+            {
+                "channel": entry["channel"],
+                "params": dict(entry["params"]),
+                "symbols": len(entry["symbols"]) if entry["symbols"] is not None else None,
+            }
+            for entry in self._entries.values()
+        ]
@@ -4,23 +4,20 @@ TEST KRAKEN PRO 2025 API FORMATS
 =================================
 """
 
-import os
-
-import ccxt
 from dotenv import load_dotenv
 
+from src.exchange.kraken_client import create_kraken_client
+
 load_dotenv()
 
-exchange = ccxt.kraken({
-    'apiKey': os.getenv('KRAKEN_KEY'),
-    'secret': os.getenv('KRAKEN_SECRET'),
-    'enableRateLimit': True,
+# Markets are fetched live below, not from the local cache
+exchange = create_kraken_client({
     'sandbox': False,  # Production
     'options': {
         'adjustForTimeDifference': True,
         'recvWindow': 10000
     }
-})
+}, load_markets=False)
 
 print("=" * 70)
 print("KRAKEN PRO 2025 API COMPATIBILITY TEST")
@@ -0,0 +1,90 @@
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+backtesting = pytest.importorskip("src.backtesting")
+engine = pytest.importorskip("src.backtesting.engine")
+
+
+class BuyDipSellRip:
+    """Minimal scalper with the standalone scripts' interface"""
+
+    def __init__(self):
+        self.position = None
+        self.trade_amount = 100.0
+        self.target = 0.01
+        self.max_hold_minutes = 30
+
+    def should_buy(self, data, usdt_balance):
+        return data["momentum"] < -0.005, "dip"
+
+    def should_sell(self, data):
+        profit = (data["bid"] - self.position["price"]) / self.position["price"]
+        held = (time.time() - self.position["time"]) / 60
+        return profit >= self.target or held >= self.max_hold_minutes, "exit"
+
+
+def make_bars(closes):
+    closes = np.asarray(closes, dtype=np.float64)
+    return backtesting.OHLCV(
+        timestamp=np.arange(len(closes)) * 60.0,
+        open=closes.copy(),
+        high=closes * 1.001,
+        low=closes * 0.999,
+        close=closes,
+        volume=np.ones(len(closes)),
+        symbol="BTC/USDT",
+    )
+
+
+def test_rolling_max_and_trade_bucketing():
+    values = np.random.default_rng(3).normal(size=257)
+    expected = [values[max(0, index - 9) : index + 1].max() for index in range(len(values))]
+    assert np.allclose(engine._rolling_max(values, 10), expected)
+
+    bars = backtesting.bars_from_trades(
+        [0, 10, 59, 61, 200], [5.0, 7.0, 6.0, 4.0, 9.0], [1, 1, 1, 2, 1], "1m"
+    )
+    assert bars.timestamp.tolist() == [0, 60, 180]
+    assert bars.open.tolist() == [5.0, 4.0, 9.0]
+    assert bars.high.tolist() == [7.0, 4.0, 9.0]
+    assert bars.close.tolist() == [6.0, 4.0, 9.0]
+    assert bars.volume.tolist() == [3.0, 2.0, 1.0]
+
+
+def test_backtest_fills_next_bar_with_fees_and_simulated_hold_time(monkeypatch):
+    monkeypatch.setitem(
+        engine.STRATEGIES, "dip", engine.StrategySpec("tests.test_backtesting:BuyDipSellRip")
+    )
+    closes = [100.0] * 5 + [99.0, 99.0] + [99.0] * 40
+    result = backtesting.run_backtest(
+        "dip",
+        make_bars(closes),
+        starting_cash=1000.0,
+        taker_fee=0.001,
+        spread=0.0,
+        warmup=0,
+    )
+
+    assert len(result.trades) == 1
+    trade = result.trades[0]
+    # Signal on the 99 bar, filled at the next bar's open
+    assert trade.entry.time == 6 * 60
+    assert trade.entry.price == pytest.approx(99.0)
+    assert trade.entry.fee == pytest.approx(0.1)
+    # Time exit after 30 simulated minutes, not 30 wall-clock minutes
+    assert trade.hold_time == pytest.approx(31 * 60)
+    assert result.net_pnl == pytest.approx(trade.pnl)
+    assert trade.pnl == pytest.approx(-0.1 - 99.9 / 99.0 * 99.0 * 0.001)
+
+
+def test_parameter_grid_and_unknown_parameter(monkeypatch):
+    grid = backtesting.parameter_grid({"a": [1, 2], "b": [3]})
+    assert grid == [{"a": 1, "b": 3}, {"a": 2, "b": 3}]
+
+    monkeypatch.setitem(
+        engine.STRATEGIES, "dip", engine.StrategySpec("tests.test_backtesting:BuyDipSellRip")
+    )
+    with pytest.raises(ValueError):
+        backtesting.run_backtest("dip", make_bars([100.0] * 3), params={"missing": 1})
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+kraken_websocket_v2 = pytest.importorskip("src.websocket.kraken_websocket_v2")
+KrakenWebSocketConfig = kraken_websocket_v2.KrakenWebSocketConfig
+KrakenWebSocketV2 = kraken_websocket_v2.KrakenWebSocketV2
+
+
+class FakeConnection:
+    def __init__(self, failures=0):
+        self.is_connected = True
+        self.failures = failures
+        self.sent = []
+
+    async def send_message(self, message, queue=True):
+        if message["method"] == "subscribe" and self.failures:
+            self.failures -= 1
+            return False
+        self.sent.append((message["method"], message["params"]["symbol"]))
+        return True
+
+
+def _client(connection):
+    client = KrakenWebSocketV2(config=KrakenWebSocketConfig(book_resync_retry_delay=0.01))
+    client.public_connections = [connection]
+    client.public_connection = connection
+    return client
+
+
+def test_resync_is_not_blocked_by_the_subscription_rate_limit():
+    connection = FakeConnection()
+    client = _client(connection)
+    # Subscription budget for this second already spent
+    client.subscription_timestamps = [kraken_websocket_v2.time.time()] * 5
+
+    asyncio.run(client._resync_order_book("BTC/USD"))
+
+    assert connection.sent == [("unsubscribe", ["BTC/USD"]), ("subscribe", ["BTC/USD"])]
+    # Restored on reconnect
+    assert [request.params["symbol"] for request in client.subscription_registry.requests()] == [
+        ["BTC/USD"]
+    ]
+
+
+def test_failed_resubscribe_is_retried_with_backoff():
+    connection = FakeConnection(failures=2)
+    client = _client(connection)
+
+    asyncio.run(client._resync_order_book("BTC/USD"))
+
+    assert connection.sent == [("unsubscribe", ["BTC/USD"]), ("subscribe", ["BTC/USD"])]
+    assert connection.failures == 0
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+
+bot_module = pytest.importorskip("src.core.bot")
+KrakenTradingBot = bot_module.KrakenTradingBot
+
+PAIRS = ["XRP/USDT", "ADA/USDT"]
+
+
+class EventSource:
+    """WebSocket client exposing KrakenWebSocketV2's callback registry"""
+
+    def __init__(self):
+        self.callbacks = {"ticker": [], "book": [], "trade": [], "balance": []}
+
+    def register_callback(self, event_type, callback):
+        self.callbacks[event_type].append(callback)
+
+
+class BalanceOnlySource:
+    """Balance stream without market events"""
+
+    def set_callback(self, callback_type, callback):
+        pass
+
+
+def _bot(config=None):
+    bot = KrakenTradingBot({"kraken_api_tier": "pro", **(config or {})})
+    bot.trade_pairs = list(PAIRS)
+    bot.strategy_manager = object()
+    return bot
+
+
+def test_scheduler_needs_a_market_event_source():
+    bot = _bot({"event_driven_strategies": {"enabled": True}})
+    bot.websocket_manager = BalanceOnlySource()
+
+    bot._start_strategy_scheduler()
+
+    # The main loop keeps polling strategies every second
+    assert bot.strategy_scheduler is None
+
+
+def test_scheduler_subscribes_to_market_events_with_1s_fallback():
+    bot = _bot({"event_driven_strategies": {"enabled": True}})
+    bot.websocket_manager = source = EventSource()
+
+    async def run():
+        bot._start_strategy_scheduler()
+        await bot.strategy_scheduler.stop()
+
+    asyncio.run(run())
+
+    assert bot.strategy_scheduler.fallback_interval == 1.0
+    assert {event for event, callbacks in source.callbacks.items() if callbacks} == {
+        "ticker",
+        "book",
+        "trade",
+    }
+
+
+class BalanceManager:
+    def __init__(self, balances):
+        self.balances = balances
+        self.fresh_reads = 0
+
+    async def force_fresh_balance(self, asset):
+        self.fresh_reads += 1
+        return self.balances.get(asset, 0.0)
+
+    async def get_balance_for_asset(self, asset):
+        return self.balances.get(asset, 0.0)
+
+
+class TradeExecutor:
+    def __init__(self):
+        self.trades = []
+
+    async def execute_trade(self, request):
+        self.trades.append(request)
+        return {"success": True, "price": 5.0}
+
+
+class OrderBatcher:
+    def __init__(self):
+        self.orders = []
+
+    async def submit(self, orders):
+        self.orders.extend(orders)
+        return [{"success": True, "order": {"average": 5.0}} for _ in orders]
+
+
+class TickerExchange:
+    async def fetch_ticker(self, symbol):
+        return {"bid": 5.0, "ask": 5.0, "last": 5.0}
+
+
+def _batch_bot(balances):
+    bot = _bot({"batch_order_execution": {"enabled": True}})
+    bot.exchange = TickerExchange()
+    bot.balance_manager = BalanceManager(balances)
+    bot.trade_executor = TradeExecutor()
+    bot.order_batcher = OrderBatcher()
+    bot.position_cycler = bot.hft_controller = None  # Created during setup
+    return bot
+
+
+def _signal(symbol, side, reason, amount_usdt=10.0):
+    return {
+        "symbol": symbol,
+        "side": side,
+        "confidence": 0.9,
+        "reason": reason,
+        "amount_usdt": amount_usdt,
+    }
+
+
+def test_lone_batch_signal_is_executed_not_dropped_by_dedup():
+    bot = _batch_bot({"USDT": 100.0})
+    signals = [
+        _signal("SOL/USDT", "buy", "breakout"),
+        _signal("DOT/USDT", "buy", "breakout"),
+        _signal("DOT/USDT", "buy", "momentum"),
+    ]
+
+    asyncio.run(bot._execute_signal_batch(signals))
+
+    assert [trade["symbol"] for trade in bot.trade_executor.trades] == ["SOL/USDT"]
+    assert [order["amount"] for order in bot.order_batcher.orders] == [2.0, 2.0]
+    assert bot.balance_manager.fresh_reads == 2  # SOL trade and the DOT batch
+    assert bot.signal_queue.empty()
+
+
+def test_batched_sells_are_capped_at_holdings_and_pair_minimum():
+    bot = _batch_bot({"USDT": 0.0, "DOT": 4.2})
+    signals = [_signal("DOT/USDT", "sell", reason) for reason in ("a", "b", "c")]
+
+    asyncio.run(bot._execute_signal_batch(signals))
+
+    # 2 + 2 DOT held; the 0.2 DOT left ($1) is under the $2 pair minimum
+    assert [order["amount"] for order in bot.order_batcher.orders] == pytest.approx([2.0, 2.0])
+    assert bot.trade_executor.trades == []
+
+
+def test_batched_buys_stop_at_the_fresh_balance():
+    bot = _batch_bot({"USDT": 15.0})
+    signals = [_signal("DOT/USDT", "buy", reason) for reason in ("a", "b")]
+
+    asyncio.run(bot._execute_signal_batch(signals))
+
+    assert len(bot.order_batcher.orders) == 1
+    assert bot.balance_manager.fresh_reads == 1
@@ -0,0 +1,61 @@
+import pytest
+
+candle_aggregator = pytest.importorskip("src.websocket.candle_aggregator")
+CandleAggregator = candle_aggregator.CandleAggregator
+
+
+def test_trades_build_aligned_candles_per_timeframe():
+    aggregator = CandleAggregator(timeframes=(5, 60))
+    for timestamp, price in ((60.5, 10.0), (61.0, 12.0), (63.0, 9.0), (65.2, 11.0)):
+        aggregator.add_trade("BTC/USD", timestamp, price, 1.0)
+
+    assert aggregator.get_ohlcv("BTC/USD", "5s") == [
+        [60000.0, 10.0, 12.0, 9.0, 9.0, 3.0],
+        [65000.0, 11.0, 11.0, 11.0, 11.0, 1.0],
+    ]
+    assert aggregator.get_ohlcv("BTC/USD", "1m") == [[60000.0, 10.0, 12.0, 9.0, 11.0, 4.0]]
+    assert aggregator.candle_count("BTC/USD", "5s") == 1
+
+
+def test_late_trade_amends_closed_candle_within_tolerance():
+    aggregator = CandleAggregator(timeframes=(5,), late_trade_tolerance=5.0)
+    aggregator.add_trade("BTC/USD", 60.0, 10.0, 1.0)
+    aggregator.add_trade("BTC/USD", 65.0, 11.0, 1.0)
+
+    aggregator.add_trade("BTC/USD", 62.0, 15.0, 2.0)
+    aggregator.add_trade("BTC/USD", 50.0, 1.0, 1.0)
+
+    window = aggregator.get_window("BTC/USD", "5s", include_open=False)
+    assert window["high"].tolist() == [15.0]
+    assert window["close"].tolist() == [10.0]
+    assert window["volume"].tolist() == [3.0]
+    assert aggregator.stats["late_trades_amended"] == 1
+    assert aggregator.stats["late_trades_dropped"] == 1
+
+
+def test_seed_prefills_from_ccxt_rows():
+    aggregator = CandleAggregator(timeframes=(60,))
+    aggregator.seed("BTC/USD", "1m", [[0, 1, 2, 0.5, 1.5, 10], [60000, 1.5, 2, 1, 1.8, 5]])
+    aggregator.add_trade("BTC/USD", 125.0, 2.0, 1.0)
+
+    assert aggregator.get_ohlcv("BTC/USD", "1m", include_open=False)[-1][4] == 1.8
+    assert aggregator.candle_count("BTC/USD", "1m", include_open=True) == 3
+
+
+def test_trade_snapshot_lands_in_candles_of_its_exchange_time():
+    data_models = pytest.importorskip("src.websocket.data_models")
+    snapshot = [
+        {"side": "buy", "price": 10.0, "qty": 1.0, "timestamp": "1970-01-01T00:01:00.500000Z"},
+        {"side": "sell", "price": 12.0, "qty": 2.0, "timestamp": "1970-01-01T00:02:03.000000Z"},
+    ]
+    aggregator = CandleAggregator(timeframes=(60,))
+
+    for raw in snapshot:
+        trade = data_models.TradeUpdate.from_raw("BTC/USD", raw)
+        aggregator.add_trade(trade.symbol, trade.timestamp, float(trade.price), float(trade.volume))
+
+    assert trade.timestamp == 123.0
+    assert aggregator.get_ohlcv("BTC/USD", "1m") == [
+        [60000.0, 10.0, 10.0, 10.0, 10.0, 1.0],
+        [120000.0, 12.0, 12.0, 12.0, 12.0, 2.0],
+    ]
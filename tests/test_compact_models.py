@@ -0,0 +1,128 @@
+import time
+
+import pytest
+
+compact_models = pytest.importorskip("src.websocket.compact_models")
+data_models = pytest.importorskip("src.websocket.data_models")
+
+TICKER = {
+    "symbol": "BTC/USD",
+    "bid": 64250.1,
+    "ask": 64250.3,
+    "last": 64250.2,
+    "volume": 1234.56789,
+    "vwap": 64100.5,
+    "low": 63000.0,
+    "high": 65000.0,
+    "open": 64000.0,
+}
+TRADE = {
+    "symbol": "BTC/USD",
+    "side": "buy",
+    "price": 64250.1,
+    "qty": 0.0123,
+    "trade_id": 123456,
+    "timestamp": "2025-01-01T00:00:00.123456Z",
+}
+OHLC = {
+    "symbol": "BTC/USD",
+    "open": 64200.0,
+    "high": 64300.0,
+    "low": 64150.0,
+    "close": 64250.1,
+    "volume": 12.5,
+    "interval": 5,
+    "timestamp": "2025-01-01T00:01:00.000000Z",
+}
+
+PAIRS = [
+    (compact_models.CompactTicker, data_models.TickerUpdate, TICKER),
+    (compact_models.CompactTrade, data_models.TradeUpdate, TRADE),
+    (compact_models.CompactOHLC, data_models.OHLCUpdate, OHLC),
+]
+
+
+def _as_strings(raw):
+    return {key: str(value) if isinstance(value, float) else value for key, value in raw.items()}
+
+
+@pytest.mark.parametrize("compact, decimal, raw", PAIRS)
+@pytest.mark.parametrize("stringify", [False, True])
+def test_to_dict_matches_the_decimal_model(compact, decimal, raw, stringify):
+    raw = _as_strings(raw) if stringify else raw
+    expected = decimal.from_raw("BTC/USD", raw).to_dict()
+    actual = compact.from_raw("BTC/USD", raw).to_dict()
+
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if key == "timestamp" and compact is compact_models.CompactTicker:
+            # Both stamp the receive time
+            assert actual[key] == pytest.approx(value, abs=1.0)
+        elif isinstance(value, float):
+            # Float subtraction drifts from Decimal in the last few digits
+            assert actual[key] == pytest.approx(value, rel=1e-9, abs=1e-8), key
+        else:
+            assert actual[key] == value, key
+
+
+@pytest.mark.parametrize("compact, decimal, raw", PAIRS)
+def test_attributes_match_the_decimal_model(compact, decimal, raw):
+    expected = decimal.from_raw("BTC/USD", raw)
+    actual = compact.from_raw("BTC/USD", raw)
+
+    assert not hasattr(actual, "__dict__")
+    for name in decimal.__dataclass_fields__:
+        value = getattr(expected, name)
+        if name == "timestamp":
+            continue
+        if isinstance(value, (str, int)) or value is None:
+            assert getattr(actual, name) == value, name
+        else:
+            assert getattr(actual, name) == pytest.approx(float(value), rel=1e-9, abs=1e-8), name
+
+
+def test_missing_fields_default_to_zero_and_now():
+    before = time.time()
+    ticker = compact_models.CompactTicker.from_raw("BTC/USD", {})
+    trade = compact_models.CompactTrade.from_raw("BTC/USD", {})
+    ohlc = compact_models.CompactOHLC.from_raw("BTC/USD", {})
+
+    assert ticker.to_dict() == {
+        "bid": 0.0,
+        "ask": 0.0,
+        "last": 0.0,
+        "volume": 0.0,
+        "high": 0.0,
+        "low": 0.0,
+        "vwap": 0.0,
+        "open": 0.0,
+        "spread": 0.0,
+        "spread_pct": 0.0,
+        "mid_price": 0.0,
+        "timestamp": ticker.timestamp,
+    }
+    assert (trade.side, trade.price, trade.volume, trade.trade_id) == ("unknown", 0.0, 0.0, None)
+    assert (ohlc.open_price, ohlc.close, ohlc.interval) == (0.0, 0.0, 1)
+    for update in (ticker, trade, ohlc):
+        assert before <= update.timestamp <= time.time()
+
+
+def test_str_and_invalid_fields():
+    ticker = compact_models.CompactTicker.from_raw(
+        "BTC/USD", {"bid": "100.5", "ask": "101.5", "last": None, "volume": "n/a"}
+    )
+    assert (ticker.bid, ticker.ask, ticker.last, ticker.volume) == (100.5, 101.5, 0.0, 0.0)
+    assert ticker.spread == 1.0
+    assert ticker.mid_price == 101.0
+
+    # qty is the V2 name; volume is accepted as a fallback
+    trade = compact_models.CompactTrade.from_raw("BTC/USD", {"price": "2.5", "volume": "4"})
+    assert (trade.price, trade.volume) == (2.5, 4.0)
+
+    ohlc = compact_models.CompactOHLC.from_raw("BTC/USD", {"timestamp": 1_700_000_000})
+    assert ohlc.timestamp == 1_700_000_000.0
+
+
+def test_trade_keeps_the_exchange_timestamp():
+    trade = compact_models.CompactTrade.from_raw("BTC/USD", TRADE)
+    assert trade.timestamp == pytest.approx(1735689600.123456)
@@ -0,0 +1,54 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+fanout_module = pytest.importorskip("src.websocket.fanout")
+
+
+def test_slow_consumer_gets_latest_and_does_not_block_fast_consumer():
+    async def scenario():
+        fanout = fanout_module.ConflatingFanout(key=lambda update: update.symbol)
+        fast_seen, slow_seen = [], []
+        release_slow = asyncio.Event()
+
+        async def fast(batch):
+            fast_seen.extend(update.last for update in batch)
+
+        async def slow(batch):
+            await release_slow.wait()
+            slow_seen.extend(update.last for update in batch)
+
+        fanout.subscribe(fast)
+        slow_mailbox = fanout.subscribe(slow)
+
+        for price in (1.0, 2.0, 3.0):
+            fanout.publish([SimpleNamespace(symbol="BTC/USD", last=price)])
+            await asyncio.sleep(0)
+
+        # The slow consumer is still stuck on its first batch
+        assert fast_seen == [1.0, 2.0, 3.0]
+        release_slow.set()
+        await asyncio.sleep(0.01)
+        await fanout.stop()
+        return slow_seen, slow_mailbox.get_metrics()
+
+    slow_seen, metrics = asyncio.run(scenario())
+    assert slow_seen == [1.0, 3.0]
+    assert metrics["conflated"] == 1
+    assert metrics["delivered"] == 2
+
+
+def test_mailbox_drops_oldest_key_when_full():
+    async def scenario():
+        async def consumer(batch):
+            return None
+
+        mailbox = fanout_module.ConflatingMailbox(consumer, max_pending=2)
+        for symbol in ("A", "B", "C"):
+            mailbox.put(symbol, symbol, 0.0)
+        return mailbox
+
+    mailbox = asyncio.run(scenario())
+    assert list(mailbox._pending) == ["B", "C"]
+    assert mailbox.get_metrics()["dropped"] == 1
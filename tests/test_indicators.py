@@ -0,0 +1,105 @@
+import math
+import random
+
+import pytest
+
+from src.strategies.indicators import IndicatorEngine
+
+
+def make_candles(count, start=100.0, seed=7):
+    rng = random.Random(seed)
+    candles = []
+    price = start
+    for index in range(count):
+        close = price * (1 + rng.uniform(-0.01, 0.01))
+        high = max(price, close) * (1 + rng.uniform(0, 0.005))
+        low = min(price, close) * (1 - rng.uniform(0, 0.005))
+        candles.append([index * 60_000, price, high, low, close, rng.uniform(1, 10)])
+        price = close
+    return candles
+
+
+def test_incremental_matches_batch_warm_up():
+    candles = make_candles(120)
+    incremental = IndicatorEngine()
+    for name, *params in (("ema", 10), ("rsi", 14), ("atr", 14), ("bollinger", 20, 2.0)):
+        incremental.get("BTC/USDT", "1m", name, *params)
+    for candle in candles:
+        incremental.sync("BTC/USDT", "1m", [candle])
+
+    batch = IndicatorEngine()
+    batch.sync("BTC/USDT", "1m", candles)
+
+    for name, *params in (("ema", 10), ("rsi", 14), ("atr", 14)):
+        assert batch.value("BTC/USDT", "1m", name, *params) == pytest.approx(
+            incremental.value("BTC/USDT", "1m", name, *params), rel=1e-9
+        )
+    assert batch.value("BTC/USDT", "1m", "bollinger", 20, 2.0) == pytest.approx(
+        incremental.value("BTC/USDT", "1m", "bollinger", 20, 2.0), rel=1e-9
+    )
+
+
+def test_rolling_stats_matches_window_and_sync_skips_seen_candles():
+    candles = make_candles(50)
+    engine = IndicatorEngine()
+    stats = engine.get("ETH/USDT", "1m", "stats", 20)
+
+    assert engine.sync("ETH/USDT", "1m", candles[:30]) == 30
+    assert engine.sync("ETH/USDT", "1m", candles) == 20
+
+    closes = [candle[4] for candle in candles[-20:]]
+    mean = sum(closes) / 20
+    assert stats.mean == pytest.approx(mean, rel=1e-12)
+    assert stats.std == pytest.approx(
+        math.sqrt(sum((close - mean) ** 2 for close in closes) / 20), rel=1e-9
+    )
+
+
+def test_indicators_are_shared_per_key():
+    engine = IndicatorEngine()
+    assert engine.get("BTC/USDT", "1m", "rsi", 14) is engine.get("BTC/USDT", "1m", "rsi", 14)
+    assert engine.get("BTC/USDT", "1m", "rsi", 14) is not engine.get("BTC/USDT", "5m", "rsi", 14)
+
+    for price, volume in ((10.0, 1.0), (20.0, 3.0)):
+        engine.update("BTC/USDT", "tick", price, volume=volume)
+    assert engine.value("BTC/USDT", "tick", "vwap") == pytest.approx(17.5)
+
+
+def test_forming_candle_replaces_the_newest_bar():
+    candles = make_candles(30)
+    forming = IndicatorEngine()
+    momentum = forming.get("BTC/USDT", "1m", "momentum", 10)
+    rsi = forming.get("BTC/USDT", "1m", "rsi", 14)
+    forming.sync("BTC/USDT", "1m", candles)
+
+    before = momentum.value
+    revised = candles[-1][:4] + [candles[-1][4] * 1.02, candles[-1][5]]
+    revised[2] = max(revised[2], revised[4])
+    assert forming.sync("BTC/USDT", "1m", candles[:-1] + [revised]) == 1
+    assert forming.bar_count("BTC/USDT", "1m") == 30
+    assert momentum.value != before
+
+    closed = IndicatorEngine()
+    closed.sync("BTC/USDT", "1m", candles[:-1] + [revised])
+    assert momentum.value == pytest.approx(closed.value("BTC/USDT", "1m", "momentum", 10))
+    assert rsi.value == pytest.approx(closed.value("BTC/USDT", "1m", "rsi", 14), rel=1e-9)
+
+    # Indicators created while the newest bar is forming can replace it too
+    ema = forming.get("BTC/USDT", "1m", "ema", 10)
+    forming.sync("BTC/USDT", "1m", candles)
+    reference = IndicatorEngine()
+    reference.sync("BTC/USDT", "1m", candles)
+    assert ema.value == pytest.approx(reference.value("BTC/USDT", "1m", "ema", 10), rel=1e-9)
+
+
+def test_sync_without_timestamps_keeps_held_indicators_current():
+    engine = IndicatorEngine()
+    candles = [{"close": close} for close in (100.0, 101.0, 102.0, 103.0)]
+    momentum = engine.get("BTC/USDT", "1m", "momentum", 3)
+
+    engine.sync("BTC/USDT", "1m", candles)
+    assert momentum.value == pytest.approx(103.0 / 101.0 - 1)
+
+    engine.sync("BTC/USDT", "1m", candles + [{"close": 110.0}])
+    assert momentum is engine.get("BTC/USDT", "1m", "momentum", 3)
+    assert momentum.value == pytest.approx(110.0 / 102.0 - 1)
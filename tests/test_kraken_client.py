@@ -0,0 +1,67 @@
+import json
+import time
+from pathlib import Path
+
+from src.exchange.kraken_client import MARKETS_CACHE_DIR, load_cached_markets
+
+MARKET = {"symbol": "BTC/USDT", "id": "XBTUSDT", "altname": "XBTUSDT"}
+
+
+class FakeExchange:
+    id = "kraken"
+
+    def __init__(self):
+        self.markets = None
+        self.currencies = None
+        self.options = {}
+        self.fetches = 0
+
+    def set_markets(self, markets, currencies=None):
+        self.markets = markets
+        self.currencies = currencies
+
+    def load_markets(self, reload=False):
+        self.fetches += 1
+        self.set_markets({"BTC/USDT": dict(MARKET)}, {"BTC": {"id": "XXBT"}})
+        # ccxt kraken's fetch_markets side effect
+        self.options["marketsByAltname"] = {"XBTUSDT": self.markets["BTC/USDT"]}
+        return self.markets
+
+
+def test_markets_fetched_once_then_served_from_cache(tmp_path):
+    first = FakeExchange()
+    assert not load_cached_markets(first, cache_dir=tmp_path)
+
+    second = FakeExchange()
+    assert load_cached_markets(second, cache_dir=tmp_path)
+
+    assert first.fetches == 1 and second.fetches == 0
+    assert second.markets == {"BTC/USDT": MARKET}
+    assert second.currencies == {"BTC": {"id": "XXBT"}}
+    assert second.options["marketsByAltname"] == first.options["marketsByAltname"]
+
+
+def test_cache_dir_is_under_the_repository_root():
+    root = Path(__file__).resolve().parents[1]
+    assert MARKETS_CACHE_DIR == root / "trading_data" / "cache"
+
+
+def test_expired_cache_is_refreshed(tmp_path):
+    cache_file = tmp_path / "kraken_markets.json"
+    cache_file.write_text(
+        json.dumps({"saved_at": time.time() - 120, "markets": {}, "currencies": {}})
+    )
+    exchange = FakeExchange()
+
+    assert not load_cached_markets(exchange, ttl=60, cache_dir=tmp_path)
+
+    assert exchange.fetches == 1
+    assert "BTC/USDT" in json.loads(cache_file.read_text())["markets"]
+
+
+def test_corrupt_cache_falls_back_to_fetch(tmp_path):
+    (tmp_path / "kraken_markets.json").write_text("{not json")
+    exchange = FakeExchange()
+
+    assert not load_cached_markets(exchange, cache_dir=tmp_path)
+    assert exchange.fetches == 1
@@ -0,0 +1,215 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import urllib.parse
+import zlib
+
+import pytest
+
+from src.mock_kraken.market import Instrument, MarketSimulator
+from src.mock_kraken.matching import MatchingEngine, MockKrakenError
+
+BTC = Instrument("BTC/USDT", 60000.0, price_precision=1, qty_precision=8)
+
+
+def kraken_checksum(bids, asks, price_precision, qty_precision):
+    """Client-side V2 checksum, written independently of the server"""
+
+    def fragment(value, precision):
+        return f"{value:.{precision}f}".replace(".", "").lstrip("0")
+
+    text = ""
+    for price, qty in sorted(asks.items())[:10] + sorted(bids.items(), reverse=True)[:10]:
+        text += fragment(price, price_precision) + fragment(qty, qty_precision)
+    return zlib.crc32(text.encode())
+
+
+def test_book_deltas_reconstruct_the_book_and_checksums_match():
+    market = MarketSimulator((BTC,), depth=25, seed=7)
+    payload, levels = market.book_payload("BTC/USDT", 10)
+    bids = {level["price"]: level["qty"] for level in payload["bids"]}
+    asks = {level["price"]: level["qty"] for level in payload["asks"]}
+    assert payload["checksum"] == kraken_checksum(bids, asks, 1, 8)
+
+    updates = 0
+    for _ in range(300):
+        market.step("BTC/USDT")
+        payload, levels = market.book_payload("BTC/USDT", 10, levels)
+        if payload is None:
+            continue
+        updates += 1
+        for side, key in ((bids, "bids"), (asks, "asks")):
+            for level in payload[key]:
+                if level["qty"] == 0:
+                    side.pop(level["price"], None)
+                else:
+                    side[level["price"]] = level["qty"]
+        assert payload["checksum"] == kraken_checksum(bids, asks, 1, 8)
+        assert max(bids) < min(asks)
+    assert updates > 250
+    assert [price for price, _ in levels[0]] == sorted(bids, reverse=True)
+
+
+def test_market_and_limit_orders_fill_hold_and_cancel():
+    market = MarketSimulator((BTC,), depth=50, seed=1)
+    engine = MatchingEngine(market, {"USDT": 10000.0})
+    fills, events = [], []
+    engine.on_fill.append(fills.append)
+    engine.on_order.append(lambda order: events.append((order.txid, order.status)))
+
+    order = engine.add_order("BTCUSDT", "buy", "market", 0.05)
+    assert order.status == "closed" and order.vol_exec == pytest.approx(0.05)
+    assert engine.balances["BTC"] == pytest.approx(0.05)
+    spent = order.cost * (1 + engine.taker_fee)
+    assert engine.balances["USDT"] == pytest.approx(10000.0 - spent)
+    assert market.drain_prints() and all(fill.liquidity == "taker" for fill in fills)
+
+    book = market.books["BTC/USDT"]
+    price = round(book.best_bid * 0.99, 1)
+    resting = engine.add_order("BTC/USDT", "buy", "limit", 0.1, price, cl_ord_id="dip")
+    assert resting.status == "open"
+    assert engine.held["USDT"] == pytest.approx(0.1 * price * (1 + engine.maker_fee))
+    with pytest.raises(MockKrakenError, match="EOrder:Insufficient funds"):
+        engine.add_order("BTC/USDT", "buy", "limit", 0.1, price)
+    with pytest.raises(MockKrakenError, match="EOrder:Post only order"):
+        engine.add_order("BTC/USDT", "sell", "limit", 0.01, book.best_bid, post_only=True)
+
+    assert engine.cancel_order("dip") == 1
+    assert engine.held["USDT"] == pytest.approx(0.0)
+    assert events[-1] == (resting.txid, "canceled")
+    with pytest.raises(MockKrakenError, match="EOrder:Unknown order"):
+        engine.cancel_order(resting.txid)
+
+
+def test_resting_order_fills_as_maker_when_market_trades_through():
+    market = MarketSimulator((BTC,), depth=50, seed=3)
+    engine = MatchingEngine(market, {"USDT": 10000.0, "BTC": 0.0})
+    book = market.books["BTC/USDT"]
+    order = engine.add_order("BTC/USDT", "buy", "limit", 0.01, round(book.best_bid, 1))
+
+    book.move(-0.01)
+    assert engine.match_resting("BTC/USDT") == 1
+    assert order.status == "closed" and engine.fills[-1].liquidity == "maker"
+    assert engine.balances["BTC"] == pytest.approx(0.01)
+    assert engine.held.get("USDT", 0.0) == pytest.approx(0.0)
+    assert market.drain_prints()[-1]["side"] == "sell"
+
+
+def sign(secret, path, nonce, body):
+    digest = hashlib.sha256((nonce + body).encode()).digest()
+    mac = hmac.new(base64.b64decode(secret), path.encode() + digest, hashlib.sha512)
+    return base64.b64encode(mac.digest()).decode()
+
+
+def test_server_rest_and_websocket_round_trip():
+    aiohttp = pytest.importorskip("aiohttp")
+    from src.mock_kraken import FaultConfig, MockKrakenServer, MockServerConfig
+
+    secret = base64.b64encode(b"mock-secret").decode()
+    config = MockServerConfig(
+        port=0,
+        instruments=(BTC,),
+        api_key="key",
+        api_secret=secret,
+        updates_per_second=200.0,
+        seed=5,
+        faults=FaultConfig(),
+    )
+
+    async def scenario():
+        async with MockKrakenServer(config) as server, aiohttp.ClientSession() as session:
+            nonce = iter(range(1, 1000))
+
+            async def private(method, **params):
+                params["nonce"] = str(next(nonce))
+                path = f"/0/private/{method}"
+                body = urllib.parse.urlencode(params)
+                headers = {
+                    "API-Key": "key",
+                    "API-Sign": sign(secret, path, params["nonce"], body),
+                    "Content-Type": "application/x-www-form-urlencoded",
+                }
+                async with session.post(server.rest_url + path, data=body, headers=headers) as r:
+                    return await r.json()
+
+            async with session.get(server.rest_url + "/0/public/Ticker?pair=BTCUSDT") as r:
+                ticker = await r.json()
+            assert ticker["error"] == [] and "BTCUSDT" in ticker["result"]
+
+            order = await private(
+                "AddOrder", pair="BTCUSDT", type="buy", ordertype="market", volume="0.01"
+            )
+            assert order["error"] == [] and order["result"]["txid"]
+            balance = await private("Balance")
+            assert float(balance["result"]["BTC"]) == pytest.approx(0.01)
+
+            # A replayed nonce is rejected like Kraken
+            body = "nonce=1"
+            headers = {"API-Key": "key", "API-Sign": sign(secret, "/0/private/Balance", "1", body)}
+            async with session.post(
+                server.rest_url + "/0/private/Balance", data=body, headers=headers
+            ) as r:
+                assert (await r.json())["error"] == ["EAPI:Invalid nonce"]
+
+            token = (await private("GetWebSocketsToken"))["result"]["token"]
+            urls = server.websocket_urls()
+
+            async with session.ws_connect(urls["public_url"]) as ws:
+                await ws.send_json(
+                    {"method": "subscribe", "params": {"channel": "book", "symbol": ["BTC/USDT"]}}
+                )
+                book = {}
+                checked = 0
+                async for message in ws:
+                    data = json.loads(message.data)
+                    if data.get("channel") != "book":
+                        continue
+                    payload = data["data"][0]
+                    if data["type"] == "snapshot":
+                        book = {
+                            "bids": {lv["price"]: lv["qty"] for lv in payload["bids"]},
+                            "asks": {lv["price"]: lv["qty"] for lv in payload["asks"]},
+                        }
+                    else:
+                        for key in ("bids", "asks"):
+                            for level in payload[key]:
+                                if level["qty"] == 0:
+                                    book[key].pop(level["price"], None)
+                                else:
+                                    book[key][level["price"]] = level["qty"]
+                    assert payload["checksum"] == kraken_checksum(book["bids"], book["asks"], 1, 8)
+                    checked += 1
+                    if checked == 20:
+                        break
+
+            async with session.ws_connect(urls["private_url"]) as ws:
+                await ws.send_json(
+                    {
+                        "method": "add_order",
+                        "req_id": 42,
+                        "params": {
+                            "order_type": "limit",
+                            "side": "buy",
+                            "order_qty": 0.01,
+                            "symbol": "BTC/USDT",
+                            "limit_price": 1000.0,
+                            "token": token,
+                        },
+                    }
+                )
+                async for message in ws:
+                    data = json.loads(message.data)
+                    if data.get("req_id") == 42:
+                        assert data["success"] and data["result"]["order_id"]
+                        break
+
+            async with session.post(
+                server.rest_url + "/mock/faults", json={"service_error_rate": 1.0}
+            ) as r:
+                assert (await r.json())["service_error_rate"] == 1.0
+            async with session.get(server.rest_url + "/0/public/Time") as r:
+                assert (await r.json())["error"] == ["EService:Unavailable"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,97 @@
+import asyncio
+import itertools
+
+from src.exchange.order_batcher import OrderBatcher
+from src.rate_limiting.kraken_rate_limiter import KrakenRateLimiter2025
+
+
+class FakeExchange:
+    def __init__(self, reject_symbols=()):
+        self.requests = []
+        self.reject_symbols = set(reject_symbols)
+        self._ids = itertools.count(1)
+
+    def _place(self, order):
+        if order["symbol"] in self.reject_symbols:
+            return {"id": None, "info": {"error": "EOrder:Insufficient funds"}}
+        return {"id": f"O{next(self._ids)}", "symbol": order["symbol"], "price": 1.0}
+
+    async def create_order(self, symbol, type, side, amount, price=None, params=None):
+        self.requests.append(("AddOrder", 1))
+        return self._place({"symbol": symbol})
+
+
+class BatchExchange(FakeExchange):
+    async def create_orders(self, orders):
+        self.requests.append(("AddOrderBatch", len(orders)))
+        return [self._place(order) for order in orders]
+
+
+def _orders(symbol, count):
+    return [
+        {"symbol": symbol, "type": "market", "side": "buy", "amount": 1.0 + i}
+        for i in range(count)
+    ]
+
+
+def test_pack_groups_by_pair_and_caps_batch_size():
+    batcher = OrderBatcher(BatchExchange())
+
+    batches = batcher.pack(_orders("XRP/USDT", 20) + _orders("ADA/USDT", 3))
+
+    assert [len(batch) for batch in batches] == [15, 5, 3]
+    assert {order["symbol"] for order in batches[2]} == {"ADA/USDT"}
+
+
+def test_pack_does_not_strand_a_single_order():
+    batcher = OrderBatcher(BatchExchange())
+
+    assert [len(batch) for batch in batcher.pack(_orders("XRP/USDT", 16))] == [14, 2]
+
+
+def test_pack_sizes_first_batch_to_penalty_headroom():
+    limiter = KrakenRateLimiter2025(enable_queue=False)
+    limiter.penalty_tracker.points = limiter.penalty_tracker.max_points - 4
+    batcher = OrderBatcher(BatchExchange(), limiter)
+
+    batches = batcher.pack(_orders("XRP/USDT", 20))
+
+    # 4 go now, the remaining 16 wait for decay in as few requests as possible
+    assert [len(batch) for batch in batches] == [4, 8, 8]
+
+
+def test_submit_uses_one_request_per_batch_and_keeps_order():
+    exchange = BatchExchange()
+    limiter = KrakenRateLimiter2025(enable_queue=False)
+    batcher = OrderBatcher(exchange, limiter)
+    orders = _orders("XRP/USDT", 6) + _orders("ADA/USDT", 1)
+
+    results = asyncio.run(batcher.submit(orders))
+
+    assert sorted(exchange.requests) == [("AddOrder", 1), ("AddOrderBatch", 6)]
+    assert all(result["success"] for result in results)
+    assert results[-1]["order"]["symbol"] == "ADA/USDT"
+    assert limiter.stats["requests_made"] == 2
+    assert limiter.penalty_tracker.points >= 6
+    assert batcher.stats["requests_saved"] == 5
+
+
+def test_submit_reports_per_order_failures():
+    exchange = BatchExchange(reject_symbols={"ADA/USDT"})
+    batcher = OrderBatcher(exchange)
+
+    results = asyncio.run(batcher.submit(_orders("ADA/USDT", 2) + _orders("XRP/USDT", 2)))
+
+    assert [result["success"] for result in results] == [False, False, True, True]
+    assert results[0]["error"] == "EOrder:Insufficient funds"
+    assert batcher.stats["failed_orders"] == 2
+
+
+def test_client_without_batch_support_falls_back_to_single_orders():
+    exchange = FakeExchange()
+    batcher = OrderBatcher(exchange)
+
+    results = asyncio.run(batcher.submit(_orders("XRP/USDT", 3)))
+
+    assert exchange.requests == [("AddOrder", 1)] * 3
+    assert all(result["success"] for result in results)
@@ -0,0 +1,83 @@
+import pytest
+
+order_book = pytest.importorskip("src.websocket.order_book")
+OrderBook = order_book.OrderBook
+
+
+def _snapshot():
+    return {
+        "bids": [{"price": 100.0, "qty": 1.0}, {"price": 99.0, "qty": 2.0}],
+        "asks": [{"price": 101.0, "qty": 1.5}, {"price": 102.0, "qty": 3.0}],
+    }
+
+
+def test_snapshot_sets_top_of_book():
+    book = OrderBook("BTC/USD", depth=10)
+    book.apply_snapshot(_snapshot())
+
+    assert book.best_bid == (100.0, 1.0)
+    assert book.best_ask == (101.0, 1.5)
+    assert book.spread == 1.0
+    assert book.mid_price == 100.5
+
+
+def test_delta_inserts_removes_and_truncates():
+    book = OrderBook("BTC/USD", depth=2)
+    book.apply_snapshot(_snapshot())
+
+    book.apply_update(
+        {
+            "bids": [{"price": 100.5, "qty": 0.5}, {"price": 100.0, "qty": 0}],
+            "asks": [{"price": 100.8, "qty": 2.0}],
+        }
+    )
+
+    assert book.bids.levels() == [(100.5, 0.5), (99.0, 2.0)]
+    assert book.asks.levels() == [(100.8, 2.0), (101.0, 1.5)]
+
+
+def test_to_dict_matches_orderbook_update_format():
+    book = OrderBook("BTC/USD")
+    book.apply_snapshot(_snapshot())
+
+    data = book.to_dict(depth=1)
+    assert data["bids"] == [{"price": 100.0, "volume": 1.0}]
+    assert data["asks"] == [{"price": 101.0, "volume": 1.5}]
+    assert book.to_update().best_bid.price == 100
+
+
+def _reference_checksum(asks, bids, price_precision, qty_precision):
+    import zlib
+
+    def fmt(value, precision):
+        return f"{value:.{precision}f}".replace(".", "").lstrip("0")
+
+    payload = "".join(
+        fmt(price, price_precision) + fmt(qty, qty_precision)
+        for price, qty in sorted(asks)[:10]
+    )
+    payload += "".join(
+        fmt(price, price_precision) + fmt(qty, qty_precision)
+        for price, qty in sorted(bids, reverse=True)[:10]
+    )
+    return zlib.crc32(payload.encode())
+
+
+def test_checksum_matches_reference_over_top_ten_levels():
+    bids = [(45280.0 - i * 0.5, 0.1 + i) for i in range(15)]
+    asks = [(45283.5 + i * 0.5, 0.00012 * (i + 1)) for i in range(15)]
+
+    book = OrderBook("BTC/USD", depth=25)
+    book.set_precision(1, 8)
+    book.apply_snapshot(
+        {
+            "bids": [{"price": p, "qty": q} for p, q in bids],
+            "asks": [{"price": p, "qty": q} for p, q in asks],
+            "checksum": _reference_checksum(asks, bids, 1, 8),
+        }
+    )
+    assert book.verify_checksum()
+
+    book.apply_update({"asks": [{"price": 45283.5, "qty": 0}], "checksum": 12345})
+    assert not book.verify_checksum()
+    assert book.compute_checksum() == _reference_checksum(asks[1:], bids, 1, 8)
@@ -0,0 +1,159 @@
+import asyncio
+import itertools
+
+import pytest
+
+order_entry = pytest.importorskip("src.websocket.order_entry")
+OrderEntryError = order_entry.OrderEntryError
+WebSocketOrderEntry = order_entry.WebSocketOrderEntry
+
+
+class FakeConnection:
+    """Private connection that acknowledges orders like Kraken's WS V2"""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.is_authenticated = True
+        self.sent = []
+        self.auto_ack = True
+        self._ids = itertools.count(1)
+
+    async def send_message(self, message, queue=True):
+        assert queue is False  # Orders must never be replayed after a reconnect
+        if not self.is_authenticated:
+            return False
+        self.sent.append(message)
+        if self.auto_ack:
+            asyncio.get_running_loop().call_soon(self._ack, message)
+        return True
+
+    def _ack(self, message):
+        response = {"method": message["method"], "req_id": message["req_id"]}
+        if message["params"].get("symbol") == "BAD/USDT":
+            response.update(success=False, error="EOrder:Insufficient funds")
+        else:
+            response.update(success=True, result={"order_id": f"W{next(self._ids)}"})
+        asyncio.ensure_future(self.websocket.emit("order_response", response))
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.auth_token = "token-1"
+        self.callbacks = {"order_response": [], "private_disconnected": []}
+        self.private_connection = FakeConnection(self)
+
+    def register_callback(self, event_type, callback):
+        self.callbacks[event_type].append(callback)
+
+    async def emit(self, event_type, data=None):
+        for callback in self.callbacks[event_type]:
+            await (callback(data) if data is not None else callback())
+
+
+class FakeRest:
+    def __init__(self):
+        self.calls = []
+
+    async def create_order(self, symbol, type, side, amount, price=None, params=None):
+        self.calls.append(("create_order", symbol))
+        return {"id": "R1", "symbol": symbol}
+
+    async def cancel_order(self, id, symbol=None, params=None):
+        self.calls.append(("cancel_order", id))
+        return {"id": id, "status": "canceled"}
+
+
+def _entry(**kwargs):
+    websocket = FakeWebSocket()
+    rest = FakeRest()
+    return WebSocketOrderEntry(websocket, rest, **kwargs), websocket, rest
+
+
+def test_order_goes_over_socket_with_token_and_req_id():
+    entry, websocket, rest = _entry()
+
+    order = asyncio.run(entry.create_order("XRP/USDT", "limit", "buy", 10.0, 0.5))
+
+    message = websocket.private_connection.sent[0]
+    assert message["method"] == "add_order"
+    assert message["params"]["token"] == "token-1"
+    assert message["params"]["limit_price"] == 0.5
+    assert isinstance(message["req_id"], int)
+    assert order["id"] == "W1"
+    assert rest.calls == []
+    assert entry.get_stats()["ack_latency"]["websocket"]["count"] == 1
+
+
+def test_concurrent_responses_resolve_their_own_requests():
+    entry, websocket, _ = _entry()
+
+    async def run():
+        return await asyncio.gather(
+            entry.create_order("XRP/USDT", "market", "buy", 1.0),
+            entry.cancel_order("O-OLD"),
+            entry.create_order("ADA/USDT", "market", "buy", 2.0),
+        )
+
+    placed, cancelled, second = asyncio.run(run())
+
+    assert placed["symbol"] == "XRP/USDT" and second["symbol"] == "ADA/USDT"
+    assert placed["id"] != second["id"]
+    assert cancelled["status"] == "canceled"
+    assert entry.get_stats()["pending"] == 0
+
+
+def test_rejection_raises_without_rest_retry():
+    entry, _, rest = _entry()
+
+    with pytest.raises(OrderEntryError, match="Insufficient funds") as excinfo:
+        asyncio.run(entry.create_order("BAD/USDT", "market", "buy", 1.0))
+
+    assert not excinfo.value.state_unknown
+    assert rest.calls == []
+    assert entry.stats["rejected"] == 1
+
+
+def test_falls_back_to_rest_when_socket_unavailable():
+    entry, websocket, rest = _entry()
+    websocket.private_connection.is_authenticated = False
+
+    order = asyncio.run(entry.create_order("XRP/USDT", "market", "buy", 1.0))
+
+    assert order["id"] == "R1"
+    assert rest.calls == [("create_order", "XRP/USDT")]
+    assert entry.stats["fallbacks"] == 1
+    assert entry.get_stats()["ack_latency"]["rest"]["count"] == 1
+
+
+def test_socket_loss_fails_in_flight_orders_as_unknown_then_uses_rest():
+    entry, websocket, rest = _entry()
+    websocket.private_connection.auto_ack = False
+
+    async def run():
+        in_flight = asyncio.ensure_future(entry.create_order("XRP/USDT", "market", "buy", 1.0))
+        await asyncio.sleep(0)
+        websocket.private_connection.is_authenticated = False
+        await websocket.emit("private_disconnected")
+        with pytest.raises(OrderEntryError) as excinfo:
+            await in_flight
+        assert excinfo.value.state_unknown
+        return await entry.create_order("XRP/USDT", "market", "buy", 1.0)
+
+    order = asyncio.run(run())
+
+    # The unacknowledged order is not resubmitted; the next one goes over REST
+    assert rest.calls == [("create_order", "XRP/USDT")]
+    assert order["id"] == "R1"
+    assert entry.stats["lost"] == 1
+
+
+def test_ack_timeout_reports_unknown_state():
+    entry, websocket, rest = _entry(ack_timeout=0.01)
+    websocket.private_connection.auto_ack = False
+
+    with pytest.raises(OrderEntryError) as excinfo:
+        asyncio.run(entry.create_order("XRP/USDT", "market", "buy", 1.0))
+
+    assert excinfo.value.state_unknown
+    assert rest.calls == []
+    assert entry.stats["timeouts"] == 1
@@ -0,0 +1,188 @@
+import asyncio
+
+from src.rate_limiting.kraken_rate_limiter import KrakenRateLimiter2025
+from src.rate_limiting.rate_limit_config import EndpointType
+from src.rate_limiting.request_queue import RequestPriority
+
+
+def _limiter():
+    return KrakenRateLimiter2025(enable_queue=False)
+
+
+def test_try_acquire_records_request():
+    limiter = _limiter()
+
+    assert limiter.try_acquire("Balance") == (True, "OK", 0.0)
+    assert limiter.stats["requests_made"] == 1
+    assert limiter.get_endpoint_stats("Balance")["requests"] == 1
+    assert limiter.penalty_tracker.points > 0
+
+
+def test_try_acquire_blocks_when_bucket_depleted():
+    limiter = _limiter()
+    capacity = limiter.config.private_limit
+
+    results = [limiter.try_acquire("Balance") for _ in range(capacity + 1)]
+
+    assert all(ok for ok, _, _ in results[:capacity])
+    ok, reason, wait = results[-1]
+    assert not ok
+    assert reason.startswith("Token bucket depleted")
+    assert wait > 0
+    assert limiter.stats["requests_blocked"] == 1
+
+
+def test_check_rate_limit_matches_try_acquire():
+    limiter = _limiter()
+
+    assert asyncio.run(limiter.check_rate_limit("Ticker")) == (True, "OK", 0.0)
+    assert limiter.get_endpoint_stats("Ticker")["requests"] == 1
+
+
+def test_reset_stats_keeps_endpoint_counters_live():
+    limiter = _limiter()
+    limiter.try_acquire("Balance")
+
+    limiter.reset_stats()
+    limiter.try_acquire("Balance")
+
+    assert limiter.get_endpoint_stats("Balance")["requests"] == 1
+
+
+def _fast_limiter(capacity=1, refill_rate=50.0):
+    limiter = _limiter()
+    for bucket in limiter.token_buckets.values():
+        bucket.capacity = capacity
+        bucket.tokens = float(capacity)
+        bucket.refill_rate = refill_rate
+    return limiter
+
+
+def test_waiters_wake_in_priority_order():
+    limiter = _fast_limiter()
+    limiter.try_acquire("Ticker")
+    order = []
+
+    async def wait(name, priority):
+        assert await limiter.wait_for_rate_limit("Ticker", priority=priority)
+        order.append(name)
+
+    async def main():
+        start = asyncio.get_running_loop().time()
+        await asyncio.gather(
+            wait("low", RequestPriority.LOW),
+            wait("normal", RequestPriority.NORMAL),
+            wait("critical", RequestPriority.CRITICAL),
+        )
+        return asyncio.get_running_loop().time() - start
+
+    elapsed = asyncio.run(main())
+
+    assert order == ["critical", "normal", "low"]
+    # Three tokens at 50/s arrive in ~60ms; exponential backoff would take seconds
+    assert elapsed < 0.5
+    assert limiter.wait_scheduler.stats["granted"] == 3
+
+
+def test_wait_times_out_and_stop_releases_waiters():
+    limiter = _fast_limiter(refill_rate=0.01)
+    limiter.try_acquire("Ticker")
+
+    async def main():
+        timed_out = await limiter.wait_for_rate_limit("Ticker", timeout_seconds=0.05)
+        parked = asyncio.create_task(limiter.wait_for_rate_limit("Ticker"))
+        await asyncio.sleep(0.01)
+        await limiter.stop()
+        return timed_out, await parked
+
+    assert asyncio.run(main()) == (False, False)
+
+
+def test_adaptive_mode_backs_off_on_rate_limit_errors_and_probes_upwards():
+    limiter = KrakenRateLimiter2025(account_tier="starter", enable_queue=False, adaptive=True)
+    tracker = limiter.penalty_tracker
+    base = limiter.config.max_penalty_points
+
+    limiter.record_response("AddOrder", ["EOrder:Rate limit exceeded"])
+    assert tracker.max_points == base * 0.8
+    assert tracker.points == tracker.max_points
+    assert limiter.stats["rate_limit_errors"] == 1
+
+    # Accepted requests near the (lowered) ceiling raise it additively
+    for _ in range(limiter.adaptive.config.increase_every):
+        tracker.points = tracker.max_points
+        limiter.record_response("AddOrder", latency=0.05)
+    assert tracker.max_points == base * 0.8 + 1
+
+
+def test_adaptive_calibration_persists_through_save_state(tmp_path):
+    path = tmp_path / "limiter.json"
+    limiter = KrakenRateLimiter2025(
+        account_tier="starter", enable_queue=False, adaptive=True, persistence_path=str(path)
+    )
+    limiter.record_response("Balance", "EAPI:Rate limit exceeded")
+    learned = limiter.penalty_tracker.max_points
+    asyncio.run(limiter._save_state())
+
+    restored = KrakenRateLimiter2025(
+        account_tier="starter", enable_queue=False, adaptive=True, persistence_path=str(path)
+    )
+    asyncio.run(restored._load_state())
+
+    assert restored.penalty_tracker.max_points == learned
+    assert restored.adaptive.stats["rate_limit_errors"] == 1
+
+
+def test_batch_charges_penalty_per_order_and_one_request_slot():
+    limiter = _limiter()
+    tokens = limiter.token_buckets[EndpointType.PRIVATE].tokens
+
+    assert limiter.try_acquire("AddOrderBatch", order_count=10)[0]
+
+    assert limiter.penalty_tracker.points == 10
+    assert limiter.token_buckets[EndpointType.PRIVATE].tokens == tokens - 1
+    assert limiter.get_endpoint_stats("AddOrderBatch")["requests"] == 1
+
+
+def test_order_capacity_tracks_penalty_headroom():
+    limiter = _limiter()
+    tracker = limiter.penalty_tracker
+
+    assert limiter.get_order_capacity() == int(tracker.max_points)
+    tracker.points = tracker.max_points - 3
+    assert limiter.get_order_capacity() == 3
+
+    limiter.token_buckets[EndpointType.PRIVATE].tokens = 0
+    assert limiter.get_order_capacity() == 0
+
+
+def test_adaptive_adjustments_are_flushed_in_the_background_without_stop(tmp_path):
+    path = tmp_path / "limiter.json"
+    limiter = KrakenRateLimiter2025(
+        account_tier="starter",
+        enable_queue=False,
+        adaptive=True,
+        persistence_path=str(path),
+        state_flush_interval=0.01,
+    )
+
+    async def run():
+        await limiter.start()
+        limiter.record_response("AddOrder", latency=0.05)
+        await asyncio.sleep(0.05)
+        assert not path.exists()  # Nothing learned yet
+
+        limiter.record_response("AddOrder", ["EOrder:Rate limit exceeded"])
+        # The order path only marks the state; the flush task writes it
+        assert limiter._state_dirty and not path.exists()
+        await asyncio.sleep(0.05)
+        assert path.exists() and not limiter._state_dirty
+
+    asyncio.run(run())  # Crash: stop() never runs
+    learned = limiter.penalty_tracker.max_points
+
+    restored = KrakenRateLimiter2025(
+        account_tier="starter", enable_queue=False, adaptive=True, persistence_path=str(path)
+    )
+    asyncio.run(restored._load_state())
+    assert restored.penalty_tracker.max_points == learned
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.replay import (
+    FakeExchange,
+    FakeExchangeError,
+    FakeTradeExecutor,
+    ReplaySocket,
+    VirtualClockEventLoop,
+    virtual_wall_clock,
+)
+from src.replay.recording import frame_from_dict, load_recording
+
+T0 = 1_718_000_000.0
+
+
+def run_virtual(coro_factory, start=T0):
+    loop = VirtualClockEventLoop(start=start)
+    try:
+        with virtual_wall_clock(loop):
+            return loop.run_until_complete(coro_factory())
+    finally:
+        loop.close()
+
+
+def ticker_frame(offset, price):
+    message = {"channel": "ticker", "type": "update", "data": [{"symbol": "BTC/USDT"}]}
+    message["data"][0]["last"] = price
+    return frame_from_dict({"t": (T0 + offset) * 1000, "raw": json.dumps(message)})
+
+
+def test_virtual_clock_skips_idle_time_and_keeps_timer_order():
+    async def scenario():
+        order = []
+
+        async def sleeper(name, delay):
+            await asyncio.sleep(delay)
+            order.append((name, time.time() - T0))
+
+        await asyncio.gather(sleeper("hour", 3600), sleeper("minute", 60), sleeper("day", 86400))
+        return order
+
+    started = time.perf_counter()
+    order = run_virtual(scenario)
+    assert time.perf_counter() - started < 5
+    assert order == [("minute", 60.0), ("hour", 3600.0), ("day", 86400.0)]
+
+
+def test_virtual_clock_guards_python_version_and_nested_patching():
+    from src.replay.clock import _check_loop_internals
+
+    loop, other = VirtualClockEventLoop(start=T0), VirtualClockEventLoop(start=0.0)
+    try:
+        with pytest.raises(RuntimeError, match="supports Python"):
+            _check_loop_internals(loop, version=(3, 99))
+
+        real_time = time.time
+        with virtual_wall_clock(loop):
+            assert time.time() == T0
+            with pytest.raises(RuntimeError, match="already routed"):
+                with virtual_wall_clock(other):
+                    pass
+        assert time.time is real_time
+    finally:
+        loop.close()
+        other.close()
+
+
+def test_replay_socket_paces_frames_and_answers_requests():
+    frames = load_recording(
+        [
+            ticker_frame(5.0, 2.0),
+            ticker_frame(1.0, 1.0),
+            frame_from_dict({"t": T0 + 1.0, "raw": {"method": "subscribe", "success": True}}),
+        ]
+    )
+
+    async def scenario():
+        socket = ReplaySocket("public", frames).open()
+        received = []
+
+        first = json.loads(await socket.recv())
+        received.append((first["data"][0]["last"], time.time() - T0))
+
+        await socket.send(
+            json.dumps(
+                {"method": "subscribe", "params": {"channel": "ticker", "symbol": ["BTC/USDT"]}}
+            )
+        )
+        ack = json.loads(await socket.recv())
+        received.append((ack["method"], ack["result"]["symbol"], time.time() - T0))
+
+        second = json.loads(await socket.recv())
+        received.append((second["data"][0]["last"], time.time() - T0))
+        return received, socket
+
+    received, socket = run_virtual(scenario)
+    # Recorded subscribe ack is skipped; the live request is acknowledged immediately
+    assert received == [(1.0, 1.0), ("subscribe", "BTC/USDT", 1.0), (2.0, 5.0)]
+    assert socket.frames_delivered == 3
+    assert socket.sent[0]["method"] == "subscribe"
+
+
+def test_silent_socket_sends_heartbeats_after_drain():
+    async def scenario():
+        socket = ReplaySocket("private", [], heartbeat_interval=1.0).open()
+        message = json.loads(await socket.recv())
+        return message, time.time() - T0, socket.drained.is_set()
+
+    assert run_virtual(scenario) == ({"channel": "heartbeat"}, 1.0, True)
+
+
+def test_fake_exchange_fills_at_touch_with_fees():
+    async def scenario():
+        exchange = FakeExchange({"USDT": 100.0}, taker_fee=0.01)
+        fills = []
+        exchange.on_fill.append(lambda order, balances: fills.append((order["side"], balances)))
+        exchange.update_quote("BTC/USDT", bid=9.0, ask=10.0, last=9.5)
+
+        executor = FakeTradeExecutor(exchange)
+        bought = await executor.execute_trade({"symbol": "BTC/USDT", "side": "buy", "amount": 50.5})
+        sold = await executor.execute_trade({"symbol": "BTC/USDT", "side": "sell", "amount": 1e9})
+        with pytest.raises(FakeExchangeError):
+            await exchange.create_order("BTC/USDT", "market", "sell", 1.0)
+        resting = await exchange.create_order("BTC/USDT", "limit", "buy", 1.0, price=9.5)
+        return exchange, bought, sold, fills, resting
+
+    exchange, bought, sold, fills, resting = asyncio.run(scenario())
+    assert bought["success"] and bought["price"] == 10.0
+    assert bought["amount"] == pytest.approx(5.0)
+    assert sold["success"] and sold["price"] == 9.0
+    assert exchange.balances["USDT"] == pytest.approx(100.0 - 50.5 + 45.0 * 0.99)
+    assert exchange.balances["BTC"] == pytest.approx(0.0)
+    assert [side for side, _ in fills] == ["buy", "sell"]
+    assert resting["status"] == "canceled"
+    assert exchange.rejected == 2
@@ -0,0 +1,179 @@
+import asyncio
+
+import pytest
+
+from src.exchange.request_coalescer import CoalescingExchange
+
+
+class FakeExchange:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = []
+        self.fail = False
+        self.name = "fake"
+
+    async def fetch_balance(self):
+        self.calls.append(("fetch_balance",))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("EAPI:Rate limit exceeded")
+        return {"USDT": {"free": 100.0}}
+
+    async def fetch_ticker(self, symbol):
+        self.calls.append(("fetch_ticker", symbol))
+        await asyncio.sleep(self.delay)
+        return {"symbol": symbol, "last": 1.0}
+
+    async def create_order(self, symbol, side, amount):
+        self.calls.append(("create_order", symbol))
+        return {"id": "O1"}
+
+    def describe(self):
+        return "fake exchange"
+
+
+def test_concurrent_identical_calls_share_one_request():
+    exchange = FakeExchange()
+    proxy = CoalescingExchange(exchange, ttls={"fetch_balance": 0})
+
+    async def run():
+        return await asyncio.gather(*(proxy.fetch_balance() for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert len(exchange.calls) == 1
+    assert all(result == {"USDT": {"free": 100.0}} for result in results)
+    # Every caller gets its own copy
+    assert len({id(result) for result in results}) == 5
+    stats = proxy.get_coalescing_stats()
+    assert stats["coalesced"] == 4
+    assert stats["saved_calls"] == 4
+
+
+def test_different_arguments_are_not_coalesced():
+    exchange = FakeExchange()
+    proxy = CoalescingExchange(exchange)
+
+    async def run():
+        await asyncio.gather(proxy.fetch_ticker("BTC/USDT"), proxy.fetch_ticker("ETH/USDT"))
+
+    asyncio.run(run())
+
+    assert len(exchange.calls) == 2
+
+
+def test_result_served_from_cache_within_ttl():
+    exchange = FakeExchange(delay=0)
+    proxy = CoalescingExchange(exchange, ttls={"fetch_balance": 60})
+
+    async def run():
+        first = await proxy.fetch_balance()
+        first["USDT"]["free"] = 0.0
+        return await proxy.fetch_balance()
+
+    second = asyncio.run(run())
+
+    assert len(exchange.calls) == 1
+    assert second["USDT"]["free"] == 100.0
+    assert proxy.get_coalescing_stats()["cache_hits"] == 1
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    exchange = FakeExchange()
+    exchange.fail = True
+    proxy = CoalescingExchange(exchange, ttls={"fetch_balance": 60})
+
+    async def run():
+        return await asyncio.gather(
+            *(proxy.fetch_balance() for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert len(exchange.calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    exchange.fail = False
+    asyncio.run(proxy.fetch_balance())
+    assert len(exchange.calls) == 2
+
+
+def test_mutating_call_invalidates_cache():
+    exchange = FakeExchange(delay=0)
+    proxy = CoalescingExchange(exchange, ttls={"fetch_balance": 60})
+
+    async def run():
+        await proxy.fetch_balance()
+        await proxy.create_order("BTC/USDT", "buy", 0.1)
+        await proxy.fetch_balance()
+
+    asyncio.run(run())
+
+    assert [call[0] for call in exchange.calls] == [
+        "fetch_balance",
+        "create_order",
+        "fetch_balance",
+    ]
+
+
+def test_read_in_flight_across_an_order_is_not_cached_or_shared():
+    exchange = FakeExchange(delay=0.05)
+    proxy = CoalescingExchange(exchange, ttls={"fetch_balance": 60})
+
+    async def run():
+        stale = asyncio.create_task(proxy.fetch_balance())
+        await asyncio.sleep(0)
+        await proxy.create_order("BTC/USDT", "buy", 0.1)
+        # Arrives after the order: must not join the pre-order read
+        fresh = asyncio.create_task(proxy.fetch_balance())
+        await asyncio.gather(stale, fresh)
+        await proxy.fetch_balance()  # Fresh result is cached
+
+        proxy.invalidate()
+        stale = asyncio.create_task(proxy.fetch_balance())
+        await asyncio.sleep(0)
+        await proxy.create_order("BTC/USDT", "buy", 0.1)
+        await stale
+        # The pre-order result finished after the invalidation: not cached
+        await proxy.fetch_balance()
+
+    asyncio.run(run())
+
+    assert [call[0] for call in exchange.calls] == [
+        "fetch_balance",
+        "create_order",
+        "fetch_balance",
+        "fetch_balance",
+        "create_order",
+        "fetch_balance",
+    ]
+    assert proxy.get_coalescing_stats()["cache_hits"] == 1
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call():
+    exchange = FakeExchange(delay=0.05)
+    proxy = CoalescingExchange(exchange, ttls={"fetch_balance": 0})
+
+    async def run():
+        leader = asyncio.create_task(proxy.fetch_balance())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(proxy.fetch_balance())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return await leader
+
+    assert asyncio.run(run()) == {"USDT": {"free": 100.0}}
+    assert len(exchange.calls) == 1
+
+
+def test_other_attributes_are_delegated():
+    exchange = FakeExchange()
+    proxy = CoalescingExchange(exchange)
+
+    assert proxy.describe() == "fake exchange"
+    assert proxy.name == "fake"
+    proxy.name = "renamed"
+    assert exchange.name == "renamed"
+    assert proxy.wrapped is exchange
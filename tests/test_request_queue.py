@@ -0,0 +1,70 @@
+import asyncio
+
+from src.rate_limiting.request_queue import QueueStrategy, RequestPriority, RequestQueue
+
+
+def test_weighted_fair_drains_queue_after_credits_go_negative():
+    async def drain():
+        queue = RequestQueue(strategy=QueueStrategy.WEIGHTED_FAIR)
+        priorities = list(RequestPriority)
+        for i in range(100):
+            await queue.enqueue(f"req-{i}", "AddOrder", "POST", priority=priorities[i % 5])
+        return [await queue.dequeue(timeout_seconds=0.1) for _ in range(100)]
+
+    drained = asyncio.run(drain())
+
+    assert all(request is not None for request in drained)
+
+
+def _ids(requests):
+    return [request.request_id for request in requests]
+
+
+def test_fifo_serves_oldest_across_priorities():
+    async def run():
+        queue = RequestQueue(strategy=QueueStrategy.FIFO)
+        await queue.enqueue("low", "Balance", "POST", priority=RequestPriority.LOW)
+        await queue.enqueue("critical", "AddOrder", "POST", priority=RequestPriority.CRITICAL)
+        await queue.enqueue("normal", "Ticker", "GET", priority=RequestPriority.NORMAL)
+        return [await queue.dequeue(timeout_seconds=0.1) for _ in range(3)]
+
+    assert _ids(asyncio.run(run())) == ["low", "critical", "normal"]
+
+
+def test_cancelled_requests_are_skipped_and_compacted():
+    async def run():
+        queue = RequestQueue(max_size=5000, strategy=QueueStrategy.PRIORITY_FIFO)
+        for i in range(2000):
+            await queue.enqueue(f"bg-{i}", "Ticker", "GET", priority=RequestPriority.BACKGROUND)
+        for i in range(1999):
+            assert await queue.cancel_request(f"bg-{i}")
+        await queue.enqueue("trade", "AddOrder", "POST", priority=RequestPriority.HIGH)
+
+        backlog = len(queue._queues[RequestPriority.BACKGROUND])
+        served = [await queue.dequeue(timeout_seconds=0.1) for _ in range(2)]
+        return queue, backlog, served
+
+    queue, backlog, served = asyncio.run(run())
+
+    assert _ids(served) == ["trade", "bg-1999"]
+    assert backlog < 200  # Tombstones were compacted, not left for dequeue to skip
+    assert queue.get_queue_size() == 0
+    assert queue.stats["total_cancelled"] == 1999
+
+
+def test_cleanup_expires_by_deadline_and_max_age():
+    async def run():
+        queue = RequestQueue(max_age_seconds=60.0)
+        await queue.enqueue("short", "AddOrder", "POST", timeout_seconds=0.01)
+        await queue.enqueue("old", "Balance", "POST")
+        await queue.enqueue("fresh", "Balance", "POST")
+        queue._requests["old"].created_at -= 120
+        await asyncio.sleep(0.02)
+        await queue._cleanup_expired_requests()
+        return queue, await queue.dequeue(timeout_seconds=0.1)
+
+    queue, request = asyncio.run(run())
+
+    assert request.request_id == "fresh"
+    assert queue.stats["total_expired"] == 2
+    assert queue.is_empty()
@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import pytest
+
+ring_buffer = pytest.importorskip("src.websocket.ring_buffer")
+
+
+def test_window_is_contiguous_after_wraparound():
+    buffer = ring_buffer.ColumnRingBuffer(3, {"price": "d"})
+    for price in (1.0, 2.0, 3.0, 4.0, 5.0):
+        buffer.append(price)
+
+    assert len(buffer) == 3
+    assert buffer.window("price").tolist() == [3.0, 4.0, 5.0]
+    assert buffer.window("price", 2).tolist() == [4.0, 5.0]
+    assert buffer.last("price") == 5.0
+
+
+def test_trade_buffer_round_trips_to_dicts():
+    buffer = ring_buffer.TradeBuffer(capacity=2)
+    for i, side in enumerate(("buy", "sell", "buy")):
+        buffer.add(
+            SimpleNamespace(timestamp=float(i), price=100.0 + i, volume=0.5, side=side, trade_id=i)
+        )
+
+    assert buffer.to_dicts() == [
+        {"side": "sell", "price": 101.0, "volume": 0.5, "timestamp": 1.0, "trade_id": 1},
+        {"side": "buy", "price": 102.0, "volume": 0.5, "timestamp": 2.0, "trade_id": 2},
+    ]
+
+
+def test_ohlc_buffer_replaces_in_progress_candle():
+    buffer = ring_buffer.OHLCBuffer(capacity=10)
+
+    def candle(timestamp, close):
+        return SimpleNamespace(
+            timestamp=timestamp,
+            open_price=1.0,
+            high=2.0,
+            low=0.5,
+            close=close,
+            volume=1.0,
+            interval=1,
+        )
+
+    buffer.add(candle(60.0, 1.1))
+    buffer.add(candle(90.0, 1.2))
+    buffer.add(candle(120.0, 1.3))
+
+    assert buffer.window("close").tolist() == [1.2, 1.3]
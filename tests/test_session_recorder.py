@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+session_recorder = pytest.importorskip("src.websocket.session_recorder")
+
+T0 = 1_718_000_000.0  # 2024-06-10T06:13:20Z
+
+
+def frame(channel, symbol=None, **fields):
+    message = {"channel": channel, "type": "update", "data": [dict(fields)]}
+    if symbol is not None:
+        message["data"][0]["symbol"] = symbol
+    return json.dumps(message)
+
+
+def record_day(tmp_path, **overrides):
+    config = session_recorder.RecorderConfig(
+        directory=str(tmp_path), codec="zlib", block_size=4096, **overrides
+    )
+    recorder = session_recorder.SessionRecorder(config)
+    recorder.start()
+    for second in range(0, 7200, 10):
+        now = T0 + second
+        recorder.record(frame("ticker", "BTC/USD", last=second), now, "ticker", "BTC/USD")
+        recorder.record(frame("ticker", "ETH/USD", last=second), now, "ticker", "ETH/USD")
+        recorder.record(frame("heartbeat"), now + 0.5, "heartbeat")
+        recorder.record(frame("balances"), now + 1, "balances", None, "private")
+    recorder.stop()
+    return recorder
+
+
+def test_window_for_one_symbol_reads_only_matching_blocks(tmp_path):
+    recorder = record_day(tmp_path)
+    assert recorder.recorded == 4 * 720 and recorder.dropped == 0
+    (path,) = recorder.files
+
+    reader = session_recorder.SessionReader(path)
+    start, end = T0 + 1800, T0 + 3600
+    selected = reader.blocks(start, end, channel="ticker", symbol="BTC/USD")
+    assert 0 < len(selected) < len(reader.blocks(channel="ticker"))
+
+    messages = list(reader.read(start, end, channel="ticker", symbol="BTC/USD"))
+    assert [json.loads(m.raw)["data"][0]["last"] for m in messages] == list(range(1800, 3600, 10))
+    assert {(m.channel, m.symbol, m.connection) for m in messages} == {
+        ("ticker", "BTC/USD", "public")
+    }
+
+    # Symbol-less frames stay in a symbol extract, other symbols do not
+    window = session_recorder.read_recordings(tmp_path, start, end, symbol="BTC/USD")
+    assert {m.channel for m in window} == {"ticker", "heartbeat", "balances"}
+    assert [m.time for m in window] == sorted(m.time for m in window)
+    assert {m.connection for m in window if m.channel == "balances"} == {"private"}
+
+
+def test_rotation_and_index_rebuild(tmp_path):
+    recorder = record_day(tmp_path, rotate_interval=3600.0)
+    assert len(recorder.files) == 3  # 06:13-07:00, 07:00-08:00, 08:00-08:13
+
+    path = recorder.files[1]
+    indexed = session_recorder.SessionReader(path).index
+    path.with_suffix(session_recorder.INDEX_SUFFIX).unlink()
+    assert session_recorder.SessionReader(path).index == indexed
+
+    # A torn final block (crash mid-write) is ignored
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+    assert session_recorder.SessionReader(path).rebuild_index() == indexed[:-1]
@@ -0,0 +1,53 @@
+import pytest
+
+shared_module = pytest.importorskip("src.websocket.shared_market_data")
+
+
+@pytest.fixture
+def market_data():
+    writer = shared_module.SharedMarketData.create(["BTC/USD", "ETH/USD"], (60, 300), capacity=3)
+    reader = shared_module.SharedMarketData.attach(
+        writer.name, ["BTC/USD", "ETH/USD"], (60, 300), capacity=3
+    )
+    yield writer, reader
+    reader.close()
+    writer.close()
+
+
+def test_quotes_combine_ticker_and_book_top(market_data):
+    writer, reader = market_data
+    assert reader.read_quote("BTC/USD") is None
+
+    writer.write_ticker("BTC/USD", 100.0, 101.0, 100.5, 12.0)
+    writer.write_book_top("BTC/USD", 100.2, 1.5, 100.8, 2.5)
+
+    assert reader.get_best_bid_ask("BTC/USD") == (100.2, 100.8)
+    ticker = reader.get_ticker("BTC/USD")
+    assert ticker["last"] == 100.5
+    assert ticker["mid_price"] == pytest.approx(100.5)
+    assert reader.read_quote("ETH/USD") is None
+
+
+def test_candle_ring_replaces_open_candle_and_wraps(market_data):
+    writer, reader = market_data
+    for index, start in enumerate((0, 60, 60, 120, 180, 240)):
+        writer.write_candle("BTC/USD", 60, start, index, index, index, index, index)
+
+    ohlcv = reader.get_ohlcv("BTC/USD", "1m")
+    assert [row[0] for row in ohlcv] == [120000, 180000, 240000]
+    assert reader.candle_count("BTC/USD", "1m") == 2
+    assert reader.get_ohlcv("BTC/USD", "1m", include_open=False)[-1][4] == 4
+
+    sequence, rows = reader.candles_view("BTC/USD", 60, limit=2)
+    assert rows.tolist()[0][0] == 180
+    assert reader.candles_valid("BTC/USD", 60, sequence)
+    rows.release()
+
+    writer.write_candle("BTC/USD", 60, 240, 5, 6, 5, 6, 7)
+    assert not reader.candles_valid("BTC/USD", 60, sequence)
+
+
+def test_attach_rejects_mismatched_layout(market_data):
+    writer, _ = market_data
+    with pytest.raises(ValueError):
+        shared_module.SharedMarketData.attach(writer.name, ["BTC/USD"], (60, 300), capacity=3)
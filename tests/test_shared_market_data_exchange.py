@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+shared_module = pytest.importorskip("src.websocket.shared_market_data")
+
+from src.exchange.shared_market_data_exchange import SharedMarketDataExchange  # noqa: E402
+
+
+class FakeExchange:
+    def __init__(self):
+        self.calls = []
+        self.name = "fake"
+
+    async def fetch_ticker(self, symbol, params=None):
+        self.calls.append(("fetch_ticker", symbol))
+        return {"symbol": symbol, "last": 1.0}
+
+    async def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=None, params=None):
+        self.calls.append(("fetch_ohlcv", symbol))
+        return []
+
+
+@pytest.fixture
+def market_data():
+    block = shared_module.SharedMarketData.create(["BTC/USD"], (60,), capacity=5)
+    block.mark_writer()
+    yield block
+    block.close()
+
+
+def test_ticker_served_from_shared_memory(market_data):
+    exchange = FakeExchange()
+    proxy = SharedMarketDataExchange(exchange, market_data)
+    market_data.write_ticker("BTC/USD", 99.0, 101.0, 100.0, 10.0, 98.0, 102.0, 97.0, 80.0)
+
+    ticker = asyncio.run(proxy.fetch_ticker("BTC/USD"))
+
+    assert exchange.calls == []
+    assert (ticker["bid"], ticker["ask"], ticker["last"]) == (99.0, 101.0, 100.0)
+    assert ticker["percentage"] == pytest.approx(25.0)
+    assert ticker["quoteVolume"] == pytest.approx(980.0)
+    assert proxy.get_best_bid_ask("BTC/USD") == (99.0, 101.0)
+
+
+def test_reads_fall_back_until_attached_and_when_stale(market_data):
+    exchange = FakeExchange()
+    proxy = SharedMarketDataExchange(exchange, max_age=5.0)
+    market_data.write_ticker("BTC/USD", 99.0, 101.0, 100.0, 10.0)
+
+    asyncio.run(proxy.fetch_ticker("BTC/USD"))
+    proxy.attach(market_data)
+    market_data._data[2] -= 60  # Writer heartbeat a minute old
+    asyncio.run(proxy.fetch_ticker("BTC/USD"))
+    asyncio.run(proxy.fetch_ticker("ETH/USD"))
+
+    assert exchange.calls == [("fetch_ticker", "BTC/USD")] * 2 + [("fetch_ticker", "ETH/USD")]
+    assert proxy.get_shared_stats()["fallbacks"] == 3
+
+
+def test_ohlcv_served_only_when_enough_candles(market_data):
+    exchange = FakeExchange()
+    proxy = SharedMarketDataExchange(exchange, market_data)
+    for start in (0, 60, 120):
+        market_data.write_candle("BTC/USD", 60, start, 1, 2, 0.5, 1.5, 3)
+
+    ohlcv = asyncio.run(proxy.fetch_ohlcv("BTC/USD", "1m", limit=3))
+    asyncio.run(proxy.fetch_ohlcv("BTC/USD", "1m", limit=4))
+    asyncio.run(proxy.fetch_ohlcv("BTC/USD", "1m", since=0, limit=2))
+
+    assert [row[0] for row in ohlcv] == [0, 60000, 120000]
+    assert exchange.calls == [("fetch_ohlcv", "BTC/USD")] * 2
+
+
+def test_other_attributes_are_delegated():
+    exchange = FakeExchange()
+    proxy = SharedMarketDataExchange(exchange)
+
+    assert proxy.name == "fake"
+    proxy.name = "renamed"
+    assert exchange.name == "renamed" and proxy.wrapped is exchange
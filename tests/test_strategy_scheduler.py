@@ -0,0 +1,78 @@
+import asyncio
+
+from src.core.strategy_scheduler import EventDrivenScheduler, LatencyHistogram
+
+
+def test_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.05, 0.05, 0.5, 2.0):
+        histogram.observe(value)
+
+    summary = histogram.to_dict()
+    assert summary["count"] == 5
+    assert summary["buckets"] == {"0.01": 1, "0.1": 3, "1.0": 4, "+Inf": 5}
+    assert summary["p50"] == 0.1
+    assert summary["max"] == 2.0
+    assert 'tick_bucket{strategy="a",le="+Inf"} 5' in histogram.to_prometheus(
+        "tick", {"strategy": "a"}
+    )
+
+
+def test_events_wake_only_subscribed_strategies_and_are_debounced():
+    async def scenario():
+        calls = {"btc": [], "eth": []}
+        emitted = []
+
+        def evaluator(name):
+            async def evaluate(symbols):
+                calls[name].append(symbols)
+                return [{"symbol": symbol, "side": "buy"} for symbol in symbols]
+
+            return evaluate
+
+        async def on_signals(signals):
+            emitted.extend(signals)
+
+        scheduler = EventDrivenScheduler(on_signals, fallback_interval=60)
+        scheduler.register("btc", evaluator("btc"), symbols=["BTC/USD"], debounce=0.02)
+        scheduler.register("eth", evaluator("eth"), symbols=["ETH/USD"])
+        scheduler.start()
+        await asyncio.sleep(0)
+
+        for _ in range(5):
+            scheduler.mark_dirty("BTC/USD")
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+        return scheduler, calls, emitted
+
+    scheduler, calls, emitted = asyncio.run(scenario())
+    assert calls == {"btc": [{"BTC/USD"}], "eth": []}
+    assert emitted == [{"symbol": "BTC/USD", "side": "buy"}]
+    assert scheduler.latency.count == 1
+    assert scheduler.get_metrics()["strategies"]["btc"]["runs"] == 1
+
+
+def test_max_rate_spaces_evaluations():
+    async def scenario():
+        runs = []
+
+        async def evaluate(symbols):
+            runs.append(asyncio.get_running_loop().time())
+            return []
+
+        async def on_signals(signals):
+            pass
+
+        scheduler = EventDrivenScheduler(on_signals, fallback_interval=60)
+        scheduler.register("fast", evaluate, symbols=["BTC/USD"], max_rate=20)
+        scheduler.start()
+        for _ in range(3):
+            scheduler.mark_dirty("BTC/USD")
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+        return runs
+
+    runs = asyncio.run(scenario())
+    assert len(runs) == 2
+    assert runs[1] - runs[0] >= 0.045
@@ -0,0 +1,50 @@
+import pytest
+
+registry_module = pytest.importorskip("src.websocket.subscription_registry")
+data_models = pytest.importorskip("src.websocket.data_models")
+
+
+def subscribe(registry, **params):
+    registry.record(data_models.SubscriptionRequest(method="subscribe", params=params))
+
+
+def unsubscribe(registry, **params):
+    registry.record(data_models.SubscriptionRequest(method="unsubscribe", params=params))
+
+
+def test_replay_batches_symbols_per_channel_group():
+    registry = registry_module.SubscriptionRegistry()
+    subscribe(registry, channel="ticker", symbol=["BTC/USD"])
+    subscribe(registry, channel="ticker", symbol=["ETH/USD", "BTC/USD"])
+    subscribe(registry, channel="book", symbol=["BTC/USD"], depth=10)
+    subscribe(registry, channel="balances", token="secret")
+
+    requests = {r.params["channel"]: r.params for r in registry.requests()}
+    assert requests["ticker"]["symbol"] == ["BTC/USD", "ETH/USD"]
+    assert requests["book"] == {"channel": "book", "depth": 10, "symbol": ["BTC/USD"]}
+    assert requests["balances"] == {"channel": "balances"}
+
+
+def test_new_params_move_symbol_and_unsubscribe_removes_it():
+    registry = registry_module.SubscriptionRegistry()
+    subscribe(registry, channel="book", symbol=["BTC/USD", "ETH/USD"], depth=10)
+    subscribe(registry, channel="book", symbol=["BTC/USD"], depth=25)
+    unsubscribe(registry, channel="book", symbol=["ETH/USD"])
+
+    requests = registry.requests()
+    assert [(r.params["depth"], r.params["symbol"]) for r in requests] == [(25, ["BTC/USD"])]
+
+    unsubscribe(registry, channel="book")
+    assert len(registry) == 0
+
+
+def test_filters_select_channels_and_symbols():
+    registry = registry_module.SubscriptionRegistry()
+    subscribe(registry, channel="ticker", symbol=["BTC/USD", "ETH/USD"])
+    subscribe(registry, channel="balances")
+
+    requests = registry.requests(
+        include_channel=lambda channel: channel != "balances",
+        include_symbol=lambda symbol: symbol.startswith("ETH"),
+    )
+    assert [r.params["symbol"] for r in requests] == [["ETH/USD"]]
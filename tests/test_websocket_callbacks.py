@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+kraken_websocket_v2 = pytest.importorskip("src.websocket.kraken_websocket_v2")
+KrakenWebSocketV2 = kraken_websocket_v2.KrakenWebSocketV2
+
+
+async def on_ticker(batch):
+    pass
+
+
+def test_unregister_outside_a_loop_detaches_the_consumer():
+    client = KrakenWebSocketV2()
+    client.register_callback("ticker", on_ticker)
+
+    client.unregister_callback("ticker", on_ticker)
+
+    assert client.callbacks["ticker"] == []
+    assert client.fanouts["ticker"].mailboxes == []
+
+
+def test_unregister_on_a_running_loop_stops_the_consumer_task():
+    client = KrakenWebSocketV2()
+    client.register_callback("ticker", on_ticker)
+    fanout = client.fanouts["ticker"]
+
+    async def run():
+        fanout.start()
+        mailbox = fanout.mailboxes[0]
+        client.unregister_callback("ticker", on_ticker)
+        assert len(client._fanout_tasks) == 1
+        await asyncio.gather(*client._fanout_tasks)
+        return mailbox
+
+    mailbox = asyncio.run(run())
+
+    assert fanout.mailboxes == []
+    assert mailbox._task is None  # Consumer task stopped
+    assert not client._fanout_tasks
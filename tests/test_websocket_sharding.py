@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+kraken_websocket_v2 = pytest.importorskip("src.websocket.kraken_websocket_v2")
+KrakenWebSocketConfig = kraken_websocket_v2.KrakenWebSocketConfig
+KrakenWebSocketV2 = kraken_websocket_v2.KrakenWebSocketV2
+SubscriptionRequest = kraken_websocket_v2.SubscriptionRequest
+
+SYMBOLS = ["BTC/USD", "ETH/USD", "XRP/USD", "ADA/USD", "SOL/USD", "DOT/USD", "LTC/USD"]
+
+
+class FakeConnection:
+    def __init__(self, name, fail_connect=False):
+        self.name = name
+        self.fail_connect = fail_connect
+        self.is_connected = False
+        self.is_authenticated = False
+        self.reconnects = 0
+        self.sent = []
+
+    async def connect(self, token=None):
+        self.is_connected = not self.fail_connect
+        return self.is_connected
+
+    async def reconnect(self):
+        self.reconnects += 1
+        self.is_connected = True
+
+    def get_status(self):
+        return {"connected": self.is_connected}
+
+    async def disconnect(self):
+        self.is_connected = False
+
+    async def send_message(self, message, queue=True):
+        self.sent.append(message)
+        return True
+
+
+def _client(shards, failing=()):
+    client = KrakenWebSocketV2(config=KrakenWebSocketConfig(public_shards=shards))
+    names = iter(range(shards))
+
+    def create():
+        index = next(names)
+        return FakeConnection(f"public-{index}", fail_connect=index in failing)
+
+    client._create_public_connection = create
+    return client
+
+
+def test_shard_assignment_is_stable_across_clients():
+    first, second = _client(4), _client(4)
+    asyncio.run(first.connect(private_channels=False))
+    asyncio.run(second.connect(private_channels=False))
+
+    shards = [first._shard_for_symbol(symbol) for symbol in SYMBOLS]
+
+    assert shards == [second._shard_for_symbol(symbol) for symbol in SYMBOLS]
+    assert all(0 <= shard < 4 for shard in shards)
+    assert len(set(shards)) > 1
+
+
+def test_connect_and_disconnect_cover_every_shard():
+    client = _client(3)
+
+    assert asyncio.run(client.connect(private_channels=False))
+    assert [c.is_connected for c in client.public_connections] == [True, True, True]
+    assert client.public_connection is client.public_connections[0]
+
+    asyncio.run(client.disconnect())
+    assert not any(c.is_connected for c in client.public_connections)
+
+
+def test_failed_shards_are_retried_in_the_background():
+    client = _client(3, failing={0, 2})
+
+    async def run():
+        assert await client.connect(private_channels=False)
+        await asyncio.sleep(0)  # Let the reconnect tasks run
+
+    asyncio.run(run())
+
+    assert [c.reconnects for c in client.public_connections] == [1, 0, 1]
+    assert all(c.is_connected for c in client.public_connections)
+    assert client.get_connection_status()["public_shards_connected"] == 3
+
+
+def test_connect_fails_when_no_shard_connects():
+    client = _client(2, failing={0, 1})
+
+    assert not asyncio.run(client.connect(private_channels=False))
+    assert not client.is_running
+    assert not any(c.reconnects for c in client.public_connections)
+
+
+def test_subscription_is_split_by_shard():
+    client = _client(3)
+    asyncio.run(client.connect(private_channels=False))
+
+    assert asyncio.run(client.subscribe_ticker(SYMBOLS))
+
+    sent = {}
+    for index, connection in enumerate(client.public_connections):
+        for message in connection.sent:
+            assert message["params"]["channel"] == "ticker"
+            for symbol in message["params"]["symbol"]:
+                sent[symbol] = index
+    assert sent == {symbol: client._shard_for_symbol(symbol) for symbol in SYMBOLS}
+
+
+def test_private_channels_stay_on_private_connection():
+    client = _client(3)
+    asyncio.run(client.connect(private_channels=False))
+    client.private_connection = FakeConnection("private")
+    client.private_connection.is_connected = True
+    client.private_connection.is_authenticated = True
+
+    routes = client._route_subscription(
+        SubscriptionRequest(params={"channel": "executions", "symbol": SYMBOLS}), private=True
+    )
+    assert routes == [(client.private_connection, routes[0][1])]
+    assert routes[0][1].params["symbol"] == SYMBOLS
+
+    assert asyncio.run(client.subscribe_balance())
+    assert [m["params"]["channel"] for m in client.private_connection.sent] == ["balances"]
+    assert not any(connection.sent for connection in client.public_connections)